@@ -9,6 +9,7 @@ for options trading strategies.
 try:
     from .parquet_data_loader import ParquetDataLoader
     from .ml_feature_engineering import MLFeatureEngineer
+    from .feature_store import FeatureStore
 except ImportError:
     # Fallback for direct imports
     import sys
@@ -17,5 +18,6 @@ except ImportError:
     sys.path.insert(0, current_dir)
     from parquet_data_loader import ParquetDataLoader
     from ml_feature_engineering import MLFeatureEngineer
+    from feature_store import FeatureStore
 
-__all__ = ['ParquetDataLoader', 'MLFeatureEngineer']
+__all__ = ['ParquetDataLoader', 'MLFeatureEngineer', 'FeatureStore']
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+🗂️ Resumable Backfill with a Download Manifest
+==============================================
+
+Completion index for historical downloads so re-runs only fetch what is
+missing:
+- ``BackfillManifest``: append-only JSONL index of completed
+  (ticker, date, granularity) units plus whole-day markers; a torn last
+  line from an interrupted run is ignored on load
+- ``ManifestBackfill``: fetches pending units through the pooled
+  PolygonClient in chunks, writes each CSV atomically (tmp + rename) and
+  only then records it, so an interruption at any point resumes cleanly
+- Incremental mode fetches only the trading days after the last
+  completed day (nightly top-ups); range files (daily bars per contract)
+  record the date intervals they cover and only the gaps are requested
+
+Empty results are recorded too (a contract with no trades that day is
+not re-requested); failed requests are not, so they retry next run.
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import json
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from src.data.polygon_client import PolygonClient, bars_to_frame
+    from src.data.daily_bar_cache import Interval, merge_intervals, subtract_intervals
+except ImportError:
+    from polygon_client import PolygonClient, bars_to_frame
+    from daily_bar_cache import Interval, merge_intervals, subtract_intervals
+
+DAY_MARKER = '*'            # Ticker used for "every contract of this day is complete"
+
+
+def trading_days(start: date, end: date) -> List[date]:
+    """Weekdays in [start, end]; holidays resolve to empty days and are marked complete"""
+    days, current = [], start
+    while current <= end:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def atomic_write_csv(df: pd.DataFrame, path: str):
+    """Write ``df`` so readers only ever see the complete previous or new file"""
+    tmp = f"{path}.tmp"
+    df.to_csv(tmp)
+    os.replace(tmp, path)
+
+
+class BackfillManifest:
+    """Append-only index of completed download units"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[Tuple[str, str, str], Dict] = {}
+        self._handle = None
+        self.load()
+
+    @staticmethod
+    def _key(ticker: str, day, granularity: str) -> Tuple[str, str, str]:
+        return ticker, str(day), granularity
+
+    def load(self):
+        self.entries = {}
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue                          # Torn write from an interrupted run
+                self.entries[self._key(entry['ticker'], entry['date'], entry['granularity'])] = entry
+
+    def is_done(self, ticker: str, day, granularity: str) -> bool:
+        return self._key(ticker, day, granularity) in self.entries
+
+    def record(self, ticker: str, day, granularity: str, rows: int, path: Optional[str] = None,
+               start: Optional[date] = None):
+        """
+        Mark a unit complete (idempotent: re-recording just updates the entry)
+
+        Range files pass ``start``: the entry then covers ``start..day``.
+        """
+        entry = {'ticker': ticker, 'date': str(day), 'granularity': granularity, 'rows': rows,
+                 'path': path, 'fetched_at': datetime.now().isoformat(timespec='seconds')}
+        if start is not None:
+            entry['start'] = str(start)
+        if self._handle is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._handle = open(self.path, 'a')
+            if self._handle.tell() > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._handle.write('\n')     # Never extend a torn line
+        self._handle.write(json.dumps(entry) + '\n')
+        self.entries[self._key(ticker, day, granularity)] = entry
+
+    def flush(self):
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+
+    def mark_day(self, day, granularity: str, contracts: int):
+        self.record(DAY_MARKER, day, granularity, contracts)
+
+    def day_done(self, day, granularity: str) -> bool:
+        return self.is_done(DAY_MARKER, day, granularity)
+
+    def last_completed_day(self, granularity: str) -> Optional[date]:
+        days = [entry['date'] for (ticker, _, g), entry in self.entries.items()
+                if ticker == DAY_MARKER and g == granularity]
+        return datetime.strptime(max(days), '%Y-%m-%d').date() if days else None
+
+    def compact(self):
+        """Rewrite without superseded duplicates"""
+        self.close()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp, self.path)
+
+    def close(self):
+        if self._handle is not None:
+            self.flush()
+            self._handle.close()
+            self._handle = None
+
+
+class ManifestBackfill:
+    """Fetch only the units the manifest does not already hold"""
+
+    def __init__(self, client: PolygonClient, manifest: BackfillManifest, data_dir: str,
+                 granularity: str = '1min', chunk_size: int = 200):
+        self.client = client
+        self.manifest = manifest
+        self.data_dir = data_dir
+        self.granularity = granularity
+        self.chunk_size = chunk_size
+        self.multiplier, self.timespan = {'1min': (1, 'minute'), '1day': (1, 'day')}[granularity]
+        os.makedirs(data_dir, exist_ok=True)
+
+    def output_path(self, ticker: str, day: Optional[date] = None) -> str:
+        """Same naming as the extractors' CSV cache (``day=None`` for range files)"""
+        name = ticker.replace(':', '_') if ':' in ticker else ticker.lower()
+        suffix = f"_{day.strftime('%Y%m%d')}" if day is not None else ''
+        return os.path.join(self.data_dir, f"{name}_{self.granularity}{suffix}.csv")
+
+    def is_complete(self, ticker: str, day: date) -> bool:
+        """Recorded, and either empty or its file is still on disk"""
+        entry = self.manifest.entries.get(BackfillManifest._key(ticker, day, self.granularity))
+        return entry is not None and (entry['rows'] == 0 or os.path.exists(self.output_path(ticker, day)))
+
+    def _fetch(self, jobs: Dict[Any, Tuple], store: Callable[[Any, List[Dict]], None],
+               stats: Dict[str, int]):
+        """Run ``jobs`` chunk by chunk; ``store`` persists each result before it is recorded"""
+        keys = list(jobs)
+        for i in range(0, len(keys), self.chunk_size):
+            def on_done(key, outcome):
+                if isinstance(outcome, Exception):
+                    stats['failed'] += 1
+                    return
+                stats['fetched' if outcome else 'empty'] += 1
+                store(key, outcome)
+
+            self.client.fetch_many({key: jobs[key] for key in keys[i:i + self.chunk_size]}, progress=on_done)
+            self.manifest.flush()
+
+    def run(self, units: Iterable[Tuple[str, date]]) -> Dict[str, int]:
+        """Fetch one file per (ticker, day) for every unit not already complete"""
+        units = list(units)
+        todo = [(ticker, day) for ticker, day in units if not self.is_complete(ticker, day)]
+        stats = {'units': len(units), 'skipped': len(units) - len(todo), 'fetched': 0, 'empty': 0, 'failed': 0}
+
+        def store(key, bars):
+            ticker, day = key
+            path = None
+            if bars:
+                path = self.output_path(ticker, day)
+                atomic_write_csv(bars_to_frame(bars), path)
+            self.manifest.record(ticker, day, self.granularity, len(bars), path)
+
+        day_str = lambda day: day.strftime('%Y-%m-%d')
+        self._fetch({(ticker, day): (ticker, self.multiplier, self.timespan, day_str(day), day_str(day))
+                     for ticker, day in todo}, store, stats)
+        return stats
+
+    def covered_intervals(self, ticker: str) -> List[Interval]:
+        """Merged date intervals a ticker's range file is known to be complete for"""
+        parse = lambda value: datetime.strptime(value, '%Y-%m-%d').date()
+        return merge_intervals([(parse(entry.get('start', entry['date'])), parse(entry['date']))
+                                for (t, _, g), entry in self.manifest.entries.items()
+                                if t == ticker and g == self.granularity])
+
+    def top_up(self, tickers: Dict[str, Optional[date]], start: date, end: date) -> Dict[str, int]:
+        """
+        Fill one range file per ticker over ``start..end``
+
+        ``tickers`` maps ticker -> last day it can trade (expiration, or
+        None). Only the gaps between the intervals a ticker already covers
+        are requested, so an expired contract is never requested again and
+        an earlier range can still be added after a later one. Coverage
+        stops at yesterday: an unfinished day is fetched again next run.
+        """
+        yesterday = date.today() - timedelta(days=1)
+        jobs = {}
+        for ticker, last_day in tickers.items():
+            through = min(end, last_day) if last_day else end
+            for gap_start, gap_end in subtract_intervals(start, through, self.covered_intervals(ticker)):
+                jobs[(ticker, gap_start, gap_end)] = (ticker, self.multiplier, self.timespan,
+                                                     gap_start.strftime('%Y-%m-%d'), gap_end.strftime('%Y-%m-%d'))
+        requested = {ticker for ticker, _, _ in jobs}
+        stats = {'units': len(tickers), 'skipped': len(tickers) - len(requested), 'fetched': 0, 'empty': 0, 'failed': 0}
+
+        def store(key, bars):
+            ticker, gap_start, gap_end = key
+            path = self.output_path(ticker)
+            frame = bars_to_frame(bars)
+            if os.path.exists(path):
+                existing = pd.read_csv(path, index_col='timestamp', parse_dates=True)
+                frame = pd.concat([existing, frame]) if not frame.empty else existing
+                frame = frame[~frame.index.duplicated(keep='last')].sort_index()
+            if not frame.empty:
+                atomic_write_csv(frame, path)
+            covered_end = min(gap_end, yesterday)
+            if covered_end >= gap_start:
+                # Record the merged interval containing this gap (supersedes any entry ending there)
+                merged = merge_intervals(self.covered_intervals(ticker) + [(gap_start, covered_end)])
+                interval_start, interval_end = next(i for i in merged if i[0] <= gap_start <= i[1])
+                self.manifest.record(ticker, interval_end, self.granularity, len(frame),
+                                     path if not frame.empty else None, start=interval_start)
+
+        self._fetch(jobs, store, stats)
+        return stats
+
+    def load_range(self, ticker: str) -> pd.DataFrame:
+        path = self.output_path(ticker)
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_csv(path, index_col='timestamp', parse_dates=True)
+
+    def backfill_days(self, days: Iterable[date], units_for_day: Callable[[date], List[str]],
+                      on_day_complete: Optional[Callable[[date], None]] = None) -> Dict[str, int]:
+        """
+        Backfill whole days; ``units_for_day`` lists the tickers wanted for a day
+
+        A day whose units all completed gets a day marker, so later runs
+        skip it without listing its contracts again; ``on_day_complete``
+        runs just before the marker is written (e.g. consolidation).
+        """
+        totals = {'days': 0, 'days_skipped': 0, 'units': 0, 'skipped': 0, 'fetched': 0, 'empty': 0, 'failed': 0}
+        for day in days:
+            if self.manifest.day_done(day, self.granularity):
+                totals['days_skipped'] += 1
+                continue
+            tickers = units_for_day(day)
+            stats = self.run((ticker, day) for ticker in tickers)
+            for key, value in stats.items():
+                totals[key] += value
+            totals['days'] += 1
+            if stats['failed'] == 0 and day < date.today():
+                if on_day_complete is not None:
+                    on_day_complete(day)
+                self.manifest.mark_day(day, self.granularity, len(tickers))
+                self.manifest.flush()
+        return totals
+
+    def incremental(self, units_for_day: Callable[[date], List[str]], first_day: date,
+                    end: Optional[date] = None,
+                    on_day_complete: Optional[Callable[[date], None]] = None) -> Dict[str, int]:
+        """Fetch only the days after the last completed one (``first_day`` on an empty manifest)"""
+        last = self.manifest.last_completed_day(self.granularity)
+        start = last + timedelta(days=1) if last else first_day
+        end = end or date.today() - timedelta(days=1)
+        return self.backfill_days(trading_days(start, end), units_for_day, on_day_complete)
+
+
+def main():
+    """Demo: incremental top-up of 0DTE SPY 1-minute bars"""
+    print("🗂️ RESUMABLE BACKFILL DEMO")
+    print("=" * 60)
+    try:
+        client = PolygonClient.from_env()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    data_dir = "intraday_data"
+    manifest = BackfillManifest(os.path.join(data_dir, 'manifest.jsonl'))
+    backfill = ManifestBackfill(client, manifest, data_dir)
+
+    def zero_dte(day: date) -> List[str]:
+        day_str = day.strftime('%Y-%m-%d')
+        contracts = client.options_contracts('SPY', expiration_date=day_str, as_of=day_str)
+        return ['SPY'] + [c['ticker'] for c in contracts]
+
+    stats = backfill.incremental(zero_dte, first_day=date.today() - timedelta(days=7))
+    manifest.close()
+    print(f"✅ {stats}")
+
+
+if __name__ == "__main__":
+    main()
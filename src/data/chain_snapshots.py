@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+🧊 Per-Day 0DTE Chain Snapshots
+===============================
+
+A build step that turns each trading day's 0DTE rows into dense arrays
+indexed ``[minute, strike, right]`` (right 0 = call, 1 = put):
+
+    cached_data/0dte_snapshots/
+        2024-01-02.npz       # close / volume / vwap tensors + minute grid, strikes, spot
+        2024-01-03.npz
+        ...
+
+The minute grid is contiguous from the day's first to last bar, so the
+row for any timestamp is plain arithmetic, and a chain snapshot at any
+minute is one array slice. ``close`` and ``vwap`` are carried forward
+from each contract's last trade; ``volume`` is that minute's volume (0
+when it did not trade).
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import glob
+from datetime import date, datetime
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+RIGHTS = ('call', 'put')
+FIELDS = ('close', 'volume', 'vwap')
+MINUTE_NS = 60 * 10**9
+
+
+def _forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value forward along axis 0"""
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[0]).reshape(-1, *([1] * (values.ndim - 1))), 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = np.take_along_axis(values, index, axis=0)
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+class ChainSnapshot:
+    """Dense 0DTE chain for one day, sliceable by minute"""
+
+    def __init__(self, day: date, start_ns: int, strikes: np.ndarray, close: np.ndarray,
+                 volume: np.ndarray, vwap: np.ndarray, spot: Optional[np.ndarray] = None):
+        self.day = day
+        self.start_ns = int(start_ns)
+        self.strikes = strikes
+        self.close = close
+        self.volume = volume
+        self.vwap = vwap
+        self.spot = spot if spot is not None else np.full(close.shape[0], np.nan)
+
+    @property
+    def n_minutes(self) -> int:
+        return self.close.shape[0]
+
+    @property
+    def minutes(self) -> pd.DatetimeIndex:
+        return pd.date_range(pd.Timestamp(self.start_ns), periods=self.n_minutes, freq='min')
+
+    # ------------------------------------------------------------------
+    # Build / persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, day: date, options: pd.DataFrame) -> 'ChainSnapshot':
+        """
+        Tensor for one day's 0DTE rows
+
+        ``options`` needs ``datetime`` (or ms ``timestamp``), ``strike``,
+        ``option_type``, ``close``, ``volume`` and ``vwap``; an
+        ``underlying_price`` column becomes the per-minute spot.
+        """
+        if 'datetime' in options:
+            times = pd.to_datetime(options['datetime'])
+        else:
+            times = pd.to_datetime(options['timestamp'], unit='ms')
+        minute_ns = times.dt.floor('min').to_numpy(dtype='datetime64[ns]').view(np.int64)
+        start_ns = int(minute_ns.min())
+        minute_idx = (minute_ns - start_ns) // MINUTE_NS
+        n_minutes = int(minute_idx.max()) + 1
+
+        strikes = np.unique(options['strike'].to_numpy(dtype=float))
+        strike_idx = np.searchsorted(strikes, options['strike'].to_numpy(dtype=float))
+        if 'right' in options:                                  # Encoded by occ_symbols (CALL=0, PUT=1)
+            right_idx = options['right'].to_numpy().astype(np.int64)
+        else:
+            right_idx = (options['option_type'].astype(str).str.lower() == 'put').to_numpy().astype(np.int64)
+
+        shape = (n_minutes, len(strikes), 2)
+        tensors = {}
+        for field in FIELDS:
+            tensor = np.zeros(shape) if field == 'volume' else np.full(shape, np.nan)
+            tensor[minute_idx, strike_idx, right_idx] = options[field].to_numpy(dtype=float)
+            tensors[field] = tensor
+        tensors['close'] = _forward_fill(tensors['close'])
+        tensors['vwap'] = _forward_fill(tensors['vwap'])
+
+        spot = None
+        if 'underlying_price' in options:
+            spot = np.full(n_minutes, np.nan)
+            spot[minute_idx] = options['underlying_price'].to_numpy(dtype=float)
+            spot = _forward_fill(spot)
+        return cls(day, start_ns, strikes, tensors['close'], tensors['volume'], tensors['vwap'], spot)
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(tmp, start_ns=np.int64(self.start_ns), strikes=self.strikes, close=self.close,
+                            volume=self.volume, vwap=self.vwap, spot=self.spot)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'ChainSnapshot':
+        day = date.fromisoformat(os.path.splitext(os.path.basename(path))[0])
+        with np.load(path) as data:
+            return cls(day, int(data['start_ns']), data['strikes'], data['close'], data['volume'],
+                       data['vwap'], data['spot'])
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def minute_index(self, when: Union[datetime, pd.Timestamp]) -> int:
+        """Grid row for a timestamp (same clock as the dataset), -1 outside the day"""
+        offset = (pd.Timestamp(when).value - self.start_ns) // MINUTE_NS
+        return int(offset) if 0 <= offset < self.n_minutes else -1
+
+    def strike_index(self, strike: float) -> int:
+        position = int(np.searchsorted(self.strikes, strike))
+        return position if position < len(self.strikes) and self.strikes[position] == strike else -1
+
+    def price(self, when, strike: float, option_type: str) -> float:
+        """Last close of one contract as of ``when`` (NaN if unknown)"""
+        minute, column = self.minute_index(when), self.strike_index(strike)
+        if minute < 0 or column < 0:
+            return np.nan
+        return float(self.close[minute, column, RIGHTS.index(option_type.lower())])
+
+    def at(self, when: Union[datetime, pd.Timestamp]) -> pd.DataFrame:
+        """Chain as of one minute: one row per strike and right that has traded so far"""
+        minute = self.minute_index(when)
+        if minute < 0:
+            return pd.DataFrame(columns=['datetime', 'strike', 'option_type', 'close', 'volume', 'vwap',
+                                         'underlying_price'])
+        n_strikes = len(self.strikes)
+        frame = pd.DataFrame({
+            'datetime': pd.Timestamp(self.start_ns + minute * MINUTE_NS),
+            'strike': np.tile(self.strikes, 2),
+            'option_type': np.repeat(RIGHTS, n_strikes),
+            'close': self.close[minute].T.ravel(),
+            'volume': self.volume[minute].T.ravel(),
+            'vwap': self.vwap[minute].T.ravel(),
+            'underlying_price': self.spot[minute],
+        })
+        return frame[frame['close'].notna()].reset_index(drop=True)
+
+
+class ChainSnapshotStore:
+    """Directory of per-day ``.npz`` chain snapshots"""
+
+    def __init__(self, root: str = 'cached_data/0dte_snapshots'):
+        self.root = root
+        self._loaded: Dict[date, ChainSnapshot] = {}
+
+    def path(self, day: date) -> str:
+        return os.path.join(self.root, f"{day.isoformat()}.npz")
+
+    def days(self) -> List[date]:
+        return sorted(date.fromisoformat(os.path.splitext(os.path.basename(p))[0])
+                      for p in glob.glob(os.path.join(self.root, '*.npz')))
+
+    def has(self, day: date) -> bool:
+        return day in self._loaded or os.path.exists(self.path(day))
+
+    def build(self, dataset: pd.DataFrame, days: Optional[List[date]] = None,
+              overwrite: bool = False) -> Dict[date, str]:
+        """Write a snapshot for every day in ``dataset`` with same-day-expiry rows"""
+        zero_dte = dataset[dataset['days_to_expiry'] == 0]
+        written = {}
+        for day, rows in zero_dte.groupby('date', sort=True):
+            if (days is not None and day not in days) or (self.has(day) and not overwrite):
+                continue
+            snapshot = ChainSnapshot.from_frame(day, rows)
+            written[day] = snapshot.save(self.path(day))
+            self._loaded[day] = snapshot
+        return written
+
+    def load(self, day: date) -> Optional[ChainSnapshot]:
+        if day not in self._loaded:
+            if not os.path.exists(self.path(day)):
+                return None
+            self._loaded[day] = ChainSnapshot.load(self.path(day))
+        return self._loaded[day]
+
+
+def main():
+    """Build snapshots for the 0DTE dataset and time a full-day minute sweep"""
+    import time
+    print("🧊 0DTE CHAIN SNAPSHOTS")
+    print("=" * 60)
+    dataset_path = 'src/data/spy_options_20230830_20240829.parquet'
+    if not os.path.exists(dataset_path):
+        print(f"❌ Dataset not found: {dataset_path}")
+        return
+    dataset = pd.read_parquet(dataset_path)
+    dataset['datetime'] = pd.to_datetime(dataset['timestamp'], unit='ms')
+    dataset['date'] = dataset['datetime'].dt.date
+    dataset['days_to_expiry'] = (pd.to_datetime(dataset['expiration']) - dataset['datetime'].dt.normalize()).dt.days
+
+    store = ChainSnapshotStore()
+    started = time.perf_counter()
+    written = store.build(dataset)
+    print(f"✅ {len(written)} days written in {time.perf_counter() - started:.1f}s -> {store.root}")
+
+    days = store.days()
+    if days:
+        snapshot = store.load(days[-1])
+        started = time.perf_counter()
+        for minute in snapshot.minutes:
+            snapshot.at(minute)
+        print(f"⚡ {days[-1]}: {snapshot.n_minutes} minute snapshots in {time.perf_counter() - started:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
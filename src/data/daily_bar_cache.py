@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+📅 Range-Coalescing Daily Bar Cache
+===================================
+
+Daily bars keyed per (symbol, date) in one parquet file per symbol:
+
+    cached_data/daily_bars/SPY.parquet
+
+The file also records which date intervals have already been fetched
+(merged, in the parquet metadata), so weekends and holidays inside a
+fetched range are not mistaken for gaps. ``get(symbol, start, end,
+fetch)`` serves any range from the union of stored days and calls
+``fetch`` only for the uncovered sub-ranges. Today is never marked as
+covered because its bar is not final yet.
+
+``compact`` folds the old per-range files (``cache/real-data`` JSON,
+``spy_stock_data_*`` / ``vix_data_*`` CSVs) into the per-symbol files.
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import re
+import json
+import glob
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from src.data.typed_cache import SCHEMAS, TypedCache, to_table
+except ImportError:
+    from typed_cache import SCHEMAS, TypedCache, to_table
+
+Interval = Tuple[date, date]
+BAR_COLUMNS = [name for name in SCHEMAS['daily_bars'].names if name not in ('symbol', 'date')]
+RANGE_FILE = re.compile(r'^(?P<symbol>[A-Z^]+)_(?P<start>\d{4}-\d{2}-\d{2})_(?P<end>\d{4}-\d{2}-\d{2})_1Day$')
+LEGACY_CSV = re.compile(r'^(?P<prefix>spy_stock_data|vix_data)_(?P<start>\d{8})_(?P<end>\d{8})$')
+LEGACY_SYMBOLS = {'spy_stock_data': 'SPY', 'vix_data': '^VIX'}
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Union of closed date intervals (adjacent days merge)"""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(start: date, end: date, covered: List[Interval]) -> List[Interval]:
+    """Sub-ranges of [start, end] not inside any covered interval"""
+    gaps, cursor = [], start
+    for covered_start, covered_end in merge_intervals(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def normalize_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """Any daily-bar frame (date index or column, any case) -> date-indexed bar columns"""
+    if frame is None or frame.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], name='date'))
+    frame = frame.copy()
+    if isinstance(frame.columns, pd.MultiIndex):            # yfinance: (field, ticker)
+        frame.columns = frame.columns.get_level_values(0)
+    frame.columns = [str(column).lower() for column in frame.columns]
+    if 'date' in frame.columns:
+        frame = frame.set_index('date')
+    index = pd.to_datetime(frame.index)
+    if index.tz is not None:
+        index = index.tz_convert('America/New_York').tz_localize(None)
+    frame.index = pd.DatetimeIndex(index.normalize(), name='date')
+    frame = frame.rename(columns={'tradecount': 'trade_count', 'isrealdata': 'is_real_data'})
+    return frame.reindex(columns=BAR_COLUMNS)
+
+
+class DailyBarCache:
+    """Per-symbol daily bar store that only fetches uncovered date ranges"""
+
+    def __init__(self, cache_dir: str = 'cached_data/daily_bars'):
+        self.cache_dir = cache_dir
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._covered: Dict[str, List[Interval]] = {}
+        self.stats = {'hits': 0, 'fetches': 0, 'fetched_days': 0}
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol.replace('^', '').upper()}.parquet")
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _load(self, symbol: str):
+        if symbol in self._frames:
+            return
+        path = self.path(symbol)
+        if os.path.exists(path):
+            table = pq.read_table(path)
+            covered = json.loads((table.schema.metadata or {}).get(b'covered', b'[]'))
+            frame = table.to_pandas(date_as_object=False).drop(columns=['symbol']).set_index('date')
+            self._covered[symbol] = [(_as_date(a), _as_date(b)) for a, b in covered]
+        else:
+            frame = normalize_bars(None)
+            self._covered[symbol] = []
+        self._frames[symbol] = frame.sort_index()
+
+    def _save(self, symbol: str):
+        frame = self._frames[symbol].reset_index().assign(symbol=symbol)
+        table = to_table('daily_bars', frame)
+        covered = [[a.isoformat(), b.isoformat()] for a, b in self._covered[symbol]]
+        table = table.replace_schema_metadata(dict(table.schema.metadata or {},
+                                                   covered=json.dumps(covered)))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(symbol)
+        tmp = f"{path}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+
+    def add(self, symbol: str, bars: pd.DataFrame, start, end, save: bool = True):
+        """Merge bars fetched for [start, end] (newer rows win) and mark the range covered"""
+        self._load(symbol)
+        bars = normalize_bars(bars)
+        frame = pd.concat([self._frames[symbol], bars]) if not bars.empty else self._frames[symbol]
+        self._frames[symbol] = frame[~frame.index.duplicated(keep='last')].sort_index()
+
+        last_final_day = date.today() - timedelta(days=1)
+        start, end = _as_date(start), min(_as_date(end), last_final_day)
+        if start <= end:
+            self._covered[symbol] = merge_intervals(self._covered[symbol] + [(start, end)])
+        if save:
+            self._save(symbol)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def covered(self, symbol: str) -> List[Interval]:
+        self._load(symbol)
+        return list(self._covered[symbol])
+
+    def missing(self, symbol: str, start, end) -> List[Interval]:
+        return subtract_intervals(_as_date(start), _as_date(end), self.covered(symbol))
+
+    def load(self, symbol: str, start=None, end=None) -> pd.DataFrame:
+        """Stored bars only (no fetching)"""
+        self._load(symbol)
+        frame = self._frames[symbol]
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(_as_date(start))]
+        if end is not None:
+            frame = frame[frame.index <= pd.Timestamp(_as_date(end))]
+        return frame
+
+    def get(self, symbol: str, start, end,
+            fetch: Callable[[str, date, date], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Bars for [start, end], fetching only the gaps
+
+        ``fetch(symbol, gap_start, gap_end)`` returns daily bars for the
+        inclusive gap. Gaps fetched before a failing one are kept.
+        """
+        gaps = self.missing(symbol, start, end)
+        if not gaps:
+            self.stats['hits'] += 1
+        try:
+            for gap_start, gap_end in gaps:
+                bars = fetch(symbol, gap_start, gap_end)
+                self.stats['fetches'] += 1
+                self.stats['fetched_days'] += 0 if bars is None else len(bars)
+                self.add(symbol, bars, gap_start, gap_end, save=False)
+        finally:
+            if gaps:
+                self._save(symbol)
+        return self.load(symbol, start, end)
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def compact(self, paths: List[str]) -> Dict[str, int]:
+        """Fold per-range JSON/CSV/parquet files into the per-symbol files"""
+        touched = set()
+        for path in paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            match = RANGE_FILE.match(stem)
+            if match:
+                symbol = match['symbol']
+                bars = TypedCache().load(path, 'daily_bars')
+            else:
+                match = LEGACY_CSV.match(stem)
+                if not match:
+                    continue
+                symbol = LEGACY_SYMBOLS[match['prefix']]
+                bars = pd.read_csv(path)
+            self.add(symbol, bars, match['start'], match['end'], save=False)
+            touched.add(symbol)
+        for symbol in touched:
+            self._save(symbol)
+        return {symbol: len(self._frames[symbol]) for symbol in touched}
+
+
+def main():
+    """Compact the repository's per-range daily files and show coverage"""
+    print("📅 DAILY BAR CACHE")
+    print("=" * 60)
+    cache = DailyBarCache()
+    paths = (glob.glob(os.path.join('cache', 'real-data', '*_1Day.json'))
+             + glob.glob(os.path.join('cached_data', 'spy_stock_data_*.csv'))
+             + glob.glob(os.path.join('cached_data', 'vix_data_*.csv')))
+    for symbol, rows in cache.compact(paths).items():
+        print(f"💾 {symbol}: {rows} days -> {cache.path(symbol)}")
+        for start, end in cache.covered(symbol):
+            print(f"   ✅ covered {start} .. {end}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,10 +19,8 @@ import sys
 import pandas as pd
 import numpy as np
 import yfinance as yf
-from datetime import datetime, timedelta
-import requests
+from datetime import date, datetime, timedelta
 import json
-import time
 from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
@@ -31,6 +29,17 @@ warnings.filterwarnings('ignore')
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    from src.data.polygon_client import PolygonClient
+    from src.data.backfill_manifest import BackfillManifest, ManifestBackfill
+    from src.data.typed_cache import TypedCache
+    from src.data.daily_bar_cache import DailyBarCache
+except ImportError:
+    from polygon_client import PolygonClient
+    from backfill_manifest import BackfillManifest, ManifestBackfill
+    from typed_cache import TypedCache
+    from daily_bar_cache import DailyBarCache
+
 class DataExtractor:
     """Main data extraction and caching system"""
     
@@ -48,57 +57,71 @@ class DataExtractor:
         self.alpaca_stock_client = StockHistoricalDataClient(self.alpaca_api_key, self.alpaca_secret_key)
         self.alpaca_option_client = OptionHistoricalDataClient(self.alpaca_api_key, self.alpaca_secret_key)
         
+        # Pooled, rate-limited Polygon client (keep-alive session, retries, pagination)
+        self.polygon = PolygonClient(self.polygon_api_key)
+        
         # Data storage
         self.data_dir = "cached_data"
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # Per-contract daily bars, extended incrementally through the manifest
+        self.manifest = BackfillManifest(os.path.join(self.data_dir, 'manifest.jsonl'))
+        self.options_backfill = ManifestBackfill(self.polygon, self.manifest,
+                                                 os.path.join(self.data_dir, 'options_1day'), granularity='1day')
+        
+        # Contracts and option bars are cached as typed parquet, not pretty-printed JSON
+        self.typed_cache = TypedCache()
+        
+        # One file per symbol; overlapping date ranges only fetch the uncovered gaps
+        self.daily_bars = DailyBarCache(os.path.join(self.data_dir, 'daily_bars'))
+        
         print(f"🚀 DATA EXTRACTOR INITIALIZED")
         print(f"📁 Cache directory: {self.data_dir}")
         print(f"🔑 APIs: Polygon.io ✅, Alpaca ✅")
     
+    def _fetch_alpaca_daily(self, symbol: str, start: date, end: date) -> pd.DataFrame:
+        """Daily bars for an inclusive date range from Alpaca"""
+        from alpaca.data.requests import StockBarsRequest
+        from alpaca.data.timeframe import TimeFrame
+        
+        print(f"🌐 Fetching {symbol} daily bars {start} to {end} from Alpaca")
+        request_params = StockBarsRequest(
+            symbol_or_symbols=[symbol],
+            timeframe=TimeFrame.Day,
+            start=datetime.combine(start, datetime.min.time()),
+            end=datetime.combine(end, datetime.max.time())
+        )
+        bars = self.alpaca_stock_client.get_stock_bars(request_params)
+        if not bars.data or symbol not in bars.data:
+            return pd.DataFrame()
+        return pd.DataFrame([{
+            'date': bar.timestamp,
+            'open': bar.open,
+            'high': bar.high,
+            'low': bar.low,
+            'close': bar.close,
+            'volume': bar.volume,
+            'vwap': getattr(bar, 'vwap', None),
+            'trade_count': getattr(bar, 'trade_count', None)
+        } for bar in bars.data[symbol]])
+    
+    @staticmethod
+    def _fetch_yahoo_daily(symbol: str, start: date, end: date) -> pd.DataFrame:
+        """Daily bars for an inclusive date range from Yahoo Finance"""
+        print(f"🌐 Fetching {symbol} daily bars {start} to {end} from Yahoo Finance")
+        return yf.download(symbol, start=start, end=end + timedelta(days=1), progress=False)
+    
     def extract_spy_stock_data(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-        """Extract SPY stock data from Alpaca"""
+        """Extract SPY stock data from Alpaca (only days not already cached)"""
         print(f"\n📊 EXTRACTING SPY STOCK DATA")
         print(f"📅 Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         
         try:
-            from alpaca.data.requests import StockBarsRequest
-            from alpaca.data.timeframe import TimeFrame
-            
-            # Create request
-            request_params = StockBarsRequest(
-                symbol_or_symbols=['SPY'],
-                timeframe=TimeFrame.Day,
-                start=start_date,
-                end=end_date
-            )
+            df = self.daily_bars.get('SPY', start_date, end_date, self._fetch_alpaca_daily)
             
-            # Get data
-            bars = self.alpaca_stock_client.get_stock_bars(request_params)
-            
-            if bars.data and 'SPY' in bars.data:
-                # Convert to DataFrame
-                bar_list = []
-                for bar in bars.data['SPY']:
-                    bar_list.append({
-                        'date': bar.timestamp.date(),
-                        'timestamp': bar.timestamp,
-                        'open': bar.open,
-                        'high': bar.high,
-                        'low': bar.low,
-                        'close': bar.close,
-                        'volume': bar.volume
-                    })
-                
-                df = pd.DataFrame(bar_list)
-                df = df.set_index('date')
-                
-                # Save to cache
-                cache_file = f"{self.data_dir}/spy_stock_data_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
-                df.to_csv(cache_file)
-                
-                print(f"✅ Extracted {len(df)} SPY stock bars")
-                print(f"💾 Cached to: {cache_file}")
+            if not df.empty:
+                print(f"✅ {len(df)} SPY stock bars")
+                print(f"💾 Cached in: {self.daily_bars.path('SPY')}")
                 return df
             else:
                 print(f"❌ No SPY stock data received from Alpaca")
@@ -111,26 +134,17 @@ class DataExtractor:
             return pd.DataFrame()
     
     def extract_vix_data(self, start_date: datetime, end_date: datetime) -> pd.DataFrame:
-        """Extract VIX data from Yahoo Finance"""
+        """Extract VIX data from Yahoo Finance (only days not already cached)"""
         print(f"\n📈 EXTRACTING VIX DATA")
         print(f"📅 Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         
         try:
-            # Download VIX data
-            vix = yf.download('^VIX', start=start_date, end=end_date + timedelta(days=1), progress=False)
+            vix_df = self.daily_bars.get('^VIX', start_date, end_date, self._fetch_yahoo_daily)
             
-            if not vix.empty:
-                # Clean and prepare data
-                vix_df = vix[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
-                vix_df.columns = ['open', 'high', 'low', 'close', 'volume']
-                vix_df.index.name = 'date'
-                
-                # Save to cache
-                cache_file = f"{self.data_dir}/vix_data_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.csv"
-                vix_df.to_csv(cache_file)
-                
-                print(f"✅ Extracted {len(vix_df)} VIX bars")
-                print(f"💾 Cached to: {cache_file}")
+            if not vix_df.empty:
+                vix_df = vix_df[['open', 'high', 'low', 'close', 'volume']]
+                print(f"✅ {len(vix_df)} VIX bars")
+                print(f"💾 Cached in: {self.daily_bars.path('^VIX')}")
                 return vix_df
             else:
                 print(f"❌ No VIX data received from Yahoo Finance")
@@ -148,48 +162,29 @@ class DataExtractor:
         print(f"📊 Symbol: {symbol}")
         
         try:
-            url = f"https://api.polygon.io/v3/reference/options/contracts"
             params = {
                 'underlying_ticker': symbol,
-                'limit': 1000,
-                'apikey': self.polygon_api_key
+                'limit': 1000
             }
             
             all_contracts = []
-            next_url = None
-            page = 1
             
-            while True:
-                print(f"📄 Fetching page {page}...")
-                
-                if next_url:
-                    response = requests.get(next_url, timeout=30)
-                else:
-                    response = requests.get(url, params=params, timeout=30)
-                
-                data = response.json()
-                
+            # next_url pagination; the client's token bucket paces the pages
+            for page, data in enumerate(self.polygon.paginate("/v3/reference/options/contracts", params), 1):
                 if data.get('status') == 'OK' and data.get('results'):
                     contracts = data['results']
                     all_contracts.extend(contracts)
-                    print(f"   📋 Got {len(contracts)} contracts (Total: {len(all_contracts)})")
-                    
-                    # Check for next page
-                    if data.get('next_url'):
-                        next_url = data['next_url'] + f"&apikey={self.polygon_api_key}"
-                        page += 1
-                        time.sleep(0.1)  # Rate limiting
-                    else:
-                        break
+                    print(f"📄 Page {page}: got {len(contracts)} contracts (Total: {len(all_contracts)})")
                 else:
                     print(f"⚠️ No more contracts: {data.get('status', 'Unknown')}")
                     break
             
             if all_contracts:
                 # Save contracts to cache
-                cache_file = f"{self.data_dir}/polygon_spy_contracts_{datetime.now().strftime('%Y%m%d')}.json"
-                with open(cache_file, 'w') as f:
-                    json.dump(all_contracts, f, indent=2)
+                cache_file = self.typed_cache.save(
+                    'contracts', pd.DataFrame(all_contracts),
+                    f"{self.data_dir}/polygon_spy_contracts_{datetime.now().strftime('%Y%m%d')}.parquet"
+                )
                 
                 print(f"✅ Extracted {len(all_contracts)} total options contracts")
                 print(f"💾 Cached to: {cache_file}")
@@ -214,8 +209,16 @@ class DataExtractor:
             traceback.print_exc()
             return []
     
-    def extract_polygon_options_bars(self, contracts: List[Dict], start_date: datetime, end_date: datetime) -> Dict:
-        """Extract historical options bars for contracts"""
+    def extract_polygon_options_bars(self, contracts: List[Dict], start_date: datetime, end_date: datetime,
+                                     max_contracts: Optional[int] = None) -> Dict:
+        """
+        Extract historical options bars for contracts
+        
+        All active contracts are fetched concurrently over the pooled client
+        (``max_contracts`` optionally samples the first N). Each contract's
+        bars live in one file covering the days fetched so far; re-runs only
+        request the days after that, and expired contracts not at all.
+        """
         print(f"\n📊 EXTRACTING OPTIONS BARS FROM POLYGON.IO")
         print(f"📅 Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
         print(f"📋 Contracts: {len(contracts)}")
@@ -236,77 +239,50 @@ class DataExtractor:
             print(f"❌ No active contracts found for the period")
             return {}
         
-        # Limit to reasonable number for testing
-        sample_contracts = active_contracts[:100]  # Start with 100 contracts
-        print(f"📋 Sampling {len(sample_contracts)} contracts for extraction")
+        sample_contracts = active_contracts[:max_contracts] if max_contracts else active_contracts
+        print(f"📋 Topping up {len(sample_contracts)} contracts on {self.polygon.max_workers} workers")
         
         all_options_data = {}
+        by_ticker = {contract['ticker']: contract for contract in sample_contracts}
+        expirations = {ticker: datetime.strptime(contract['expiration_date'], '%Y-%m-%d').date()
+                       for ticker, contract in by_ticker.items()}
+        stats = self.options_backfill.top_up(expirations, start_date.date(), end_date.date())
+        print(f"📊 Fetched: {stats['fetched']}, up to date: {stats['skipped']}, "
+              f"no bars: {stats['empty']}, failed: {stats['failed']}")
         
-        # Process contracts in batches
-        batch_size = 10
-        for i in range(0, len(sample_contracts), batch_size):
-            batch = sample_contracts[i:i+batch_size]
-            print(f"📦 Processing batch {i//batch_size + 1}/{(len(sample_contracts)-1)//batch_size + 1}")
-            
-            for contract in batch:
-                try:
-                    ticker = contract['ticker']
-                    
-                    # Get bars for the entire period
-                    url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/day/{start_date.strftime('%Y-%m-%d')}/{end_date.strftime('%Y-%m-%d')}"
-                    params = {
-                        'adjusted': 'true',
-                        'sort': 'asc',
-                        'apikey': self.polygon_api_key
-                    }
-                    
-                    response = requests.get(url, params=params, timeout=15)
-                    data = response.json()
-                    
-                    if data.get('results') and len(data['results']) > 0:
-                        bars_data = []
-                        for bar in data['results']:
-                            bars_data.append({
-                                'date': datetime.fromtimestamp(bar['t'] / 1000).date(),
-                                'timestamp': datetime.fromtimestamp(bar['t'] / 1000),
-                                'open': bar.get('o', 0),
-                                'high': bar.get('h', 0),
-                                'low': bar.get('l', 0),
-                                'close': bar.get('c', 0),
-                                'volume': bar.get('v', 0),
-                                'strike': contract['strike_price'],
-                                'expiration': contract['expiration_date'],
-                                'option_type': contract['contract_type'].upper(),
-                                'underlying': contract['underlying_ticker']
-                            })
-                        
-                        all_options_data[ticker] = bars_data
-                        print(f"   ✅ {ticker}: {len(bars_data)} bars")
-                    else:
-                        print(f"   ⚠️ {ticker}: No bars")
-                        
-                except Exception as e:
-                    print(f"   ❌ {contract.get('ticker', 'unknown')}: {e}")
-                    continue
-            
-            # Rate limiting between batches
-            time.sleep(0.2)
+        for ticker, contract in by_ticker.items():
+            frame = self.options_backfill.load_range(ticker)
+            if frame.empty:
+                continue
+            frame = frame[(frame.index >= start_date) & (frame.index < end_date + timedelta(days=1))]
+            bars_data = []
+            for timestamp, bar in frame.iterrows():
+                bars_data.append({
+                    'date': timestamp.date(),
+                    'timestamp': timestamp.to_pydatetime(),
+                    'open': bar['open'],
+                    'high': bar['high'],
+                    'low': bar['low'],
+                    'close': bar['close'],
+                    'volume': bar['volume'],
+                    'strike': contract['strike_price'],
+                    'expiration': contract['expiration_date'],
+                    'option_type': contract['contract_type'].upper(),
+                    'underlying': contract['underlying_ticker']
+                })
+            if bars_data:
+                all_options_data[ticker] = bars_data
+        
+        print(f"📊 Requests: {self.polygon.stats['requests']}, retries: {self.polygon.stats['retries']}, "
+              f"failed contracts: {stats['failed']}")
         
         if all_options_data:
             # Save to cache
-            cache_file = f"{self.data_dir}/polygon_spy_options_bars_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.json"
-            with open(cache_file, 'w') as f:
-                # Convert datetime objects to strings for JSON serialization
-                serializable_data = {}
-                for ticker, bars in all_options_data.items():
-                    serializable_data[ticker] = []
-                    for bar in bars:
-                        bar_copy = bar.copy()
-                        bar_copy['date'] = bar_copy['date'].strftime('%Y-%m-%d')
-                        bar_copy['timestamp'] = bar_copy['timestamp'].isoformat()
-                        serializable_data[ticker].append(bar_copy)
-                
-                json.dump(serializable_data, f, indent=2)
+            cache_file = self.typed_cache.save(
+                'options_bars',
+                pd.DataFrame([dict(bar, ticker=ticker) for ticker, bars in all_options_data.items() for bar in bars]),
+                f"{self.data_dir}/polygon_spy_options_bars_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.parquet"
+            )
             
             print(f"✅ Extracted options bars for {len(all_options_data)} contracts")
             print(f"💾 Cached to: {cache_file}")
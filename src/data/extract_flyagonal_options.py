@@ -13,14 +13,17 @@ Uses Polygon.io Options Starter Plan for real 1-minute data.
 import os
 import pandas as pd
 from datetime import datetime, timedelta
-import requests
-import time
 from typing import Dict
 
 # Load environment
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    from src.data.polygon_client import PolygonClient, bars_to_frame
+except ImportError:
+    from polygon_client import PolygonClient, bars_to_frame
+
 class FlyagonalOptionsExtractor:
     """Extract specific options for Flyagonal strategy"""
     
@@ -29,6 +32,9 @@ class FlyagonalOptionsExtractor:
         if not self.polygon_api_key:
             raise ValueError("POLYGON_API_KEY not found")
         
+        # Pooled, rate-limited Polygon client (keep-alive session, retries, pagination)
+        self.polygon = PolygonClient(self.polygon_api_key)
+        
         self.data_dir = "intraday_data"
         os.makedirs(self.data_dir, exist_ok=True)
     
@@ -42,14 +48,10 @@ class FlyagonalOptionsExtractor:
             else:
                 # Fallback: get from Polygon
                 date_str = date.strftime('%Y-%m-%d')
-                url = f"https://api.polygon.io/v2/aggs/ticker/SPY/range/1/day/{date_str}/{date_str}"
-                params = {'apikey': self.polygon_api_key}
-                
-                response = requests.get(url, params=params, timeout=30)
-                data = response.json()
+                bars = self.polygon.aggregates('SPY', 1, 'day', date_str, date_str)
                 
-                if data.get('results'):
-                    return data['results'][0]['c']
+                if bars:
+                    return bars[0]['c']
                 else:
                     return 645.0  # Fallback estimate
         except Exception as e:
@@ -75,23 +77,15 @@ class FlyagonalOptionsExtractor:
         print(f"🎯 Required strikes: {required_strikes}")
         
         # Get all SPY option contracts from Polygon
-        url = "https://api.polygon.io/v3/reference/options/contracts"
-        params = {
-            'underlying_ticker': 'SPY',
-            'expiration_date': '2025-09-02',  # Match our test date expiration
-            'limit': 1000,
-            'apikey': self.polygon_api_key
-        }
-        
         print(f"🔍 Searching for contracts...")
-        response = requests.get(url, params=params, timeout=30)
-        data = response.json()
+        contracts = self.polygon.options_contracts(
+            'SPY', expiration_date='2025-09-02'  # Match our test date expiration
+        )
         
-        if not data.get('results'):
+        if not contracts:
             print(f"❌ No contracts found")
             return {}
         
-        contracts = data['results']
         print(f"📋 Found {len(contracts)} total contracts")
         
         # Find matching contracts
@@ -118,37 +112,11 @@ class FlyagonalOptionsExtractor:
         """Extract 1-minute data for a specific contract"""
         try:
             date_str = date.strftime('%Y-%m-%d')
-            url = f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/1/minute/{date_str}/{date_str}"
-            params = {
-                'adjusted': 'true',
-                'sort': 'asc',
-                'limit': 50000,
-                'apikey': self.polygon_api_key
-            }
-            
             print(f"📊 Extracting {ticker}...")
-            response = requests.get(url, params=params, timeout=30)
-            data = response.json()
+            bars = self.polygon.aggregates(ticker, 1, 'minute', date_str, date_str)
             
-            if data.get('status') == 'OK' and data.get('results'):
-                bars = data['results']
-                
-                # Convert to DataFrame
-                bar_list = []
-                for bar in bars:
-                    bar_list.append({
-                        'timestamp': datetime.fromtimestamp(bar['t'] / 1000),
-                        'open': bar.get('o', 0),
-                        'high': bar.get('h', 0),
-                        'low': bar.get('l', 0),
-                        'close': bar.get('c', 0),
-                        'volume': bar.get('v', 0),
-                        'vwap': bar.get('vw', 0),
-                        'transactions': bar.get('n', 0)
-                    })
-                
-                df = pd.DataFrame(bar_list)
-                df = df.set_index('timestamp')
+            if bars:
+                df = bars_to_frame(bars)
                 
                 # Save to cache
                 safe_ticker = ticker.replace(':', '_')
@@ -158,7 +126,7 @@ class FlyagonalOptionsExtractor:
                 print(f"   ✅ {len(df)} bars saved to {cache_file}")
                 return True
             else:
-                print(f"   ⚠️ No data: {data.get('status', 'Unknown')}")
+                print(f"   ⚠️ No data for {ticker}")
                 return False
                 
         except Exception as e:
@@ -185,14 +153,11 @@ class FlyagonalOptionsExtractor:
             print(f"📊 Missing: {missing}")
             return False
         
-        # Extract 1-minute data for each contract
+        # Extract 1-minute data for all legs concurrently (the client paces requests)
         print(f"\n📊 EXTRACTING 1-MINUTE BARS...")
-        success_count = 0
-        
-        for leg_name, ticker in contracts.items():
-            if self.extract_contract_1min_data(ticker, date):
-                success_count += 1
-            time.sleep(0.1)  # Rate limiting
+        jobs = {leg_name: (ticker, date) for leg_name, ticker in contracts.items()}
+        extracted, _ = self.polygon.fetch_many(jobs, fn=self.extract_contract_1min_data)
+        success_count = sum(1 for ok in extracted.values() if ok)
         
         print(f"\n🎉 EXTRACTION COMPLETE!")
         print(f"✅ Successfully extracted {success_count}/{len(contracts)} contracts")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+🗄️ Feature Store - Cached ML Feature Matrices
+=============================================
+
+Serves ML feature matrices from a versioned on-disk cache instead of
+regenerating them on every Phase 2 / Phase 3 / Phase 4 run.
+
+Entries are keyed by:
+- Source dataset fingerprint (sha256 of the parquet file)
+- Feature-set version (MLFeatureEngineer.FEATURE_SET_VERSION)
+- Lookback periods and sampling parameters
+
+Inside an entry, features are stored as one parquet partition per trading
+day, so a date range request only computes the days that are missing and
+column subsets can be read without loading all features.
+
+Layout:
+    feature_store/<key>/manifest.json
+    feature_store/<key>/date=YYYYMMDD.parquet
+
+Location: src/data/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime, date
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Generated partitions live in the (git-ignored) project cache, not the source tree
+DEFAULT_STORE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'cache', 'feature_store'
+)
+
+DateLike = Union[datetime, date, str]
+
+
+class FeatureStore:
+    """Versioned, per-day partitioned cache of ML feature matrices"""
+
+    MANIFEST_FILE = 'manifest.json'
+    FINGERPRINT_FILE = 'fingerprints.json'
+
+    def __init__(self, store_dir: str = DEFAULT_STORE_DIR, verbose: bool = True):
+        self.store_dir = store_dir
+        self.verbose = verbose
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        self._fingerprints = self._read_json(os.path.join(self.store_dir, self.FINGERPRINT_FILE), {})
+        self._manifests: Dict[str, Dict] = {}
+
+        if self.verbose:
+            print(f"🗄️ Feature Store: {self.store_dir}")
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def dataset_fingerprint(self, dataset_path: str) -> str:
+        """sha256 of the dataset file, memoized on (path, size, mtime)"""
+
+        abs_path = os.path.abspath(dataset_path)
+        stat = os.stat(abs_path)
+        cached = self._fingerprints.get(abs_path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+
+        if self.verbose:
+            print(f"   🔐 Hashing dataset: {os.path.basename(abs_path)}")
+
+        digest = hashlib.sha256()
+        with open(abs_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(8 * 1024 * 1024), b''):
+                digest.update(chunk)
+
+        self._fingerprints[abs_path] = {
+            'sha256': digest.hexdigest(),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns
+        }
+        self._write_json(os.path.join(self.store_dir, self.FINGERPRINT_FILE), self._fingerprints)
+        return digest.hexdigest()
+
+    def make_key(self, dataset_hash: str, feature_set_version: str,
+                 lookback_periods: Iterable[int], params: Optional[Dict] = None) -> str:
+        """Build the store key for a dataset / feature-set / parameter combination"""
+
+        key_fields = self._key_fields(dataset_hash, feature_set_version, lookback_periods, params)
+        payload = json.dumps(key_fields, sort_keys=True, default=str)
+        key = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+        manifest = self._manifest(key)
+        if not manifest.get('key_fields'):
+            manifest['key_fields'] = key_fields
+            manifest['created'] = datetime.now().isoformat()
+            self._save_manifest(key)
+
+        return key
+
+    @staticmethod
+    def _key_fields(dataset_hash: str, feature_set_version: str,
+                    lookback_periods: Iterable[int], params: Optional[Dict]) -> Dict:
+        return {
+            'dataset_hash': dataset_hash,
+            'feature_set_version': str(feature_set_version),
+            'lookback_periods': sorted(int(p) for p in lookback_periods),
+            'params': params or {}
+        }
+
+    # ------------------------------------------------------------------
+    # Reads / writes
+    # ------------------------------------------------------------------
+
+    def missing_days(self, key: str, days: Iterable[DateLike]) -> List[DateLike]:
+        """Days that have not been computed yet for this key"""
+
+        stored = self._manifest(key)['days']
+        return [d for d in days if self._day_id(d) not in stored]
+
+    def stored_days(self, key: str) -> List[str]:
+        """All computed days for this key (YYYY-MM-DD, sorted)"""
+
+        return sorted(self._manifest(key)['days'].keys())
+
+    def available_columns(self, key: str) -> List[str]:
+        """Union of feature columns stored under this key"""
+
+        return list(self._manifest(key).get('columns', []))
+
+    def put_day(self, key: str, day: DateLike, features_df: Optional[pd.DataFrame]):
+        """Store the feature matrix for one day (None/empty marks a day with no data)"""
+
+        manifest = self._manifest(key)
+        day_id = self._day_id(day)
+
+        if features_df is None or features_df.empty:
+            manifest['days'][day_id] = {'rows': 0, 'file': None}
+        else:
+            file_name = f"date={day_id.replace('-', '')}.parquet"
+            final_path = os.path.join(self._entry_dir(key), file_name)
+            tmp_path = final_path + '.tmp'
+            features_df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, final_path)
+
+            manifest['days'][day_id] = {'rows': int(len(features_df)), 'file': file_name}
+            known = manifest.setdefault('columns', [])
+            known.extend(c for c in features_df.columns if c not in known)
+
+        self._save_manifest(key)
+
+    def load(self, key: str, days: Optional[Iterable[DateLike]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load stored features for the given days (all days if None), optionally a column subset"""
+
+        manifest = self._manifest(key)
+        day_ids = sorted(manifest['days'].keys()) if days is None else [self._day_id(d) for d in days]
+
+        frames = []
+        for day_id in day_ids:
+            entry = manifest['days'].get(day_id)
+            if not entry or not entry['file']:
+                continue
+            path = os.path.join(self._entry_dir(key), entry['file'])
+            if columns is not None:
+                # Only read columns present in this partition (schemas can differ per day)
+                present = set(pq.read_schema(path).names)
+                frames.append(pd.read_parquet(path, columns=[c for c in columns if c in present]))
+            else:
+                frames.append(pd.read_parquet(path))
+
+        if not frames:
+            return pd.DataFrame(columns=columns) if columns is not None else pd.DataFrame()
+
+        return pd.concat(frames, ignore_index=True)
+
+    def get_or_compute(self, key: str, days: Iterable[DateLike],
+                       compute_fn: Callable[[DateLike], Optional[pd.DataFrame]],
+                       columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Serve features for the given days, computing and storing only the missing ones"""
+
+        days = list(days)
+        missing = self.missing_days(key, days)
+
+        if self.verbose:
+            print(f"🗄️ Feature store [{key}]: {len(days) - len(missing)} cached, {len(missing)} to compute")
+
+        for day in missing:
+            self.put_day(key, day, compute_fn(day))
+
+        return self.load(key, days, columns=columns)
+
+    def invalidate(self, key: str, days: Optional[Iterable[DateLike]] = None):
+        """Drop stored days (all days if None) so they are recomputed"""
+
+        manifest = self._manifest(key)
+        day_ids = list(manifest['days'].keys()) if days is None else [self._day_id(d) for d in days]
+
+        for day_id in day_ids:
+            entry = manifest['days'].pop(day_id, None)
+            if entry and entry['file']:
+                path = os.path.join(self._entry_dir(key), entry['file'])
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self._save_manifest(key)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _day_id(day: DateLike) -> str:
+        if isinstance(day, str):
+            return pd.Timestamp(day).strftime('%Y-%m-%d')
+        return day.strftime('%Y-%m-%d')
+
+    def _entry_dir(self, key: str) -> str:
+        path = os.path.join(self.store_dir, key)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _manifest(self, key: str) -> Dict:
+        if key not in self._manifests:
+            path = os.path.join(self._entry_dir(key), self.MANIFEST_FILE)
+            self._manifests[key] = self._read_json(path, {'key_fields': {}, 'days': {}, 'columns': []})
+        return self._manifests[key]
+
+    def _save_manifest(self, key: str):
+        path = os.path.join(self._entry_dir(key), self.MANIFEST_FILE)
+        self._write_json(path, self._manifests[key])
+
+    @staticmethod
+    def _read_json(path: str, default: Dict) -> Dict:
+        if not os.path.exists(path):
+            return default
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path: str, data: Dict):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+
+
+def main():
+    """Show the contents of the default feature store"""
+
+    store = FeatureStore()
+    keys = [k for k in sorted(os.listdir(store.store_dir))
+            if os.path.isdir(os.path.join(store.store_dir, k))]
+
+    print(f"📋 {len(keys)} feature store entries")
+    for key in keys:
+        manifest = store._manifest(key)
+        fields = manifest.get('key_fields', {})
+        rows = sum(d['rows'] for d in manifest['days'].values())
+        print(f"   🔑 {key}: v{fields.get('feature_set_version')} "
+              f"lookbacks={fields.get('lookback_periods')} "
+              f"{len(manifest['days'])} days, {rows:,} rows, {len(manifest.get('columns', []))} columns")
+
+
+if __name__ == "__main__":
+    main()
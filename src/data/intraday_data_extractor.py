@@ -16,9 +16,7 @@ import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import requests
 import json
-import time
 from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
@@ -27,6 +25,17 @@ warnings.filterwarnings('ignore')
 from dotenv import load_dotenv
 load_dotenv()
 
+try:
+    from src.data.polygon_client import PolygonClient, bars_to_frame
+    from src.data.backfill_manifest import BackfillManifest, ManifestBackfill, atomic_write_csv, trading_days
+    from src.data.intraday_store import IntradayBarStore
+    from src.data.typed_cache import TypedCache
+except ImportError:
+    from polygon_client import PolygonClient, bars_to_frame
+    from backfill_manifest import BackfillManifest, ManifestBackfill, atomic_write_csv, trading_days
+    from intraday_store import IntradayBarStore
+    from typed_cache import TypedCache
+
 class IntradayDataExtractor:
     """Intraday (1-minute) data extraction system"""
     
@@ -43,10 +52,20 @@ class IntradayDataExtractor:
         from alpaca.data.historical import StockHistoricalDataClient
         self.alpaca_stock_client = StockHistoricalDataClient(self.alpaca_api_key, self.alpaca_secret_key)
         
+        # Pooled, rate-limited Polygon client (keep-alive session, retries, pagination)
+        self.polygon = PolygonClient(self.polygon_api_key)
+        
         # Data storage
         self.data_dir = "intraday_data"
         os.makedirs(self.data_dir, exist_ok=True)
         
+        # Completion index: re-runs only fetch (contract, day) units not already on disk
+        self.manifest = BackfillManifest(os.path.join(self.data_dir, 'manifest.jsonl'))
+        self.backfill = ManifestBackfill(self.polygon, self.manifest, self.data_dir, granularity='1min')
+        
+        # Consolidated per-day parquet partitions read by the 1-minute backtests
+        self.store = IntradayBarStore(os.path.join(self.data_dir, 'store'))
+        
         print(f"🚀 INTRADAY DATA EXTRACTOR INITIALIZED")
         print(f"📁 Cache directory: {self.data_dir}")
         print(f"🔑 APIs: Polygon.io ✅, Alpaca ✅")
@@ -60,48 +79,27 @@ class IntradayDataExtractor:
         
         try:
             date_str = date.strftime('%Y-%m-%d')
-            url = f"https://api.polygon.io/v2/aggs/ticker/{symbol}/range/1/minute/{date_str}/{date_str}"
-            params = {
-                'adjusted': 'true',
-                'sort': 'asc',
-                'limit': 50000,  # Max limit for 1-minute bars
-                'apikey': self.polygon_api_key
-            }
+            cache_file = self.backfill.output_path(symbol, date.date())
+            if self.backfill.is_complete(symbol, date.date()):
+                print(f"✅ Already in manifest, loading {cache_file}")
+                return self._load_cached(cache_file)
             
-            print(f"🔍 API call: {url}")
-            response = requests.get(url, params=params, timeout=30)
-            data = response.json()
+            bars = self.polygon.aggregates(symbol, 1, 'minute', date_str, date_str)
             
-            if data.get('status') == 'OK' and data.get('results'):
-                bars = data['results']
-                
-                # Convert to DataFrame
-                bar_list = []
-                for bar in bars:
-                    bar_list.append({
-                        'timestamp': datetime.fromtimestamp(bar['t'] / 1000),
-                        'open': bar.get('o', 0),
-                        'high': bar.get('h', 0),
-                        'low': bar.get('l', 0),
-                        'close': bar.get('c', 0),
-                        'volume': bar.get('v', 0),
-                        'vwap': bar.get('vw', 0),
-                        'transactions': bar.get('n', 0)
-                    })
+            if bars:
+                df = bars_to_frame(bars)
                 
-                df = pd.DataFrame(bar_list)
-                df = df.set_index('timestamp')
-                
-                # Save to cache
-                cache_file = f"{self.data_dir}/{symbol.lower()}_1min_{date.strftime('%Y%m%d')}.csv"
-                df.to_csv(cache_file)
+                # Save to cache (atomically), then mark the unit complete
+                atomic_write_csv(df, cache_file)
+                self.manifest.record(symbol, date.date(), '1min', len(df), cache_file)
+                self.manifest.flush()
                 
                 print(f"✅ Extracted {len(df)} 1-minute bars for {symbol}")
                 print(f"💾 Cached to: {cache_file}")
                 print(f"📊 Time range: {df.index[0]} to {df.index[-1]}")
                 return df
             else:
-                print(f"❌ No 1-minute data: {data.get('status', 'Unknown')} - {data.get('message', '')}")
+                print(f"❌ No 1-minute data for {symbol} on {date_str}")
                 return pd.DataFrame()
                 
         except Exception as e:
@@ -118,53 +116,92 @@ class IntradayDataExtractor:
         
         try:
             date_str = date.strftime('%Y-%m-%d')
-            url = f"https://api.polygon.io/v2/aggs/ticker/{option_ticker}/range/1/minute/{date_str}/{date_str}"
-            params = {
-                'adjusted': 'true',
-                'sort': 'asc',
-                'limit': 50000,
-                'apikey': self.polygon_api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=30)
-            data = response.json()
-            
-            if data.get('status') == 'OK' and data.get('results'):
-                bars = data['results']
-                
-                # Convert to DataFrame
-                bar_list = []
-                for bar in bars:
-                    bar_list.append({
-                        'timestamp': datetime.fromtimestamp(bar['t'] / 1000),
-                        'open': bar.get('o', 0),
-                        'high': bar.get('h', 0),
-                        'low': bar.get('l', 0),
-                        'close': bar.get('c', 0),
-                        'volume': bar.get('v', 0),
-                        'vwap': bar.get('vw', 0),
-                        'transactions': bar.get('n', 0)
-                    })
-                
-                df = pd.DataFrame(bar_list)
-                df = df.set_index('timestamp')
-                
-                # Save to cache
-                safe_ticker = option_ticker.replace(':', '_')
-                cache_file = f"{self.data_dir}/{safe_ticker}_1min_{date.strftime('%Y%m%d')}.csv"
-                df.to_csv(cache_file)
-                
-                print(f"✅ Extracted {len(df)} 1-minute bars for {option_ticker}")
-                print(f"💾 Cached to: {cache_file}")
-                return df
-            else:
-                print(f"⚠️ No 1-minute options data: {data.get('status', 'Unknown')}")
-                return pd.DataFrame()
+            bars = self.polygon.aggregates(option_ticker, 1, 'minute', date_str, date_str)
+            return self._cache_options_bars(option_ticker, date, bars)
                 
         except Exception as e:
             print(f"❌ Error extracting 1-minute options data: {e}")
             return pd.DataFrame()
     
+    def extract_polygon_1min_options_batch(self, option_tickers: List[str], date: datetime) -> Dict[str, pd.DataFrame]:
+        """
+        Extract 1-minute bars for many contracts concurrently over the pooled client
+        
+        Contracts already recorded in the manifest are loaded from their CSV
+        instead of being requested again.
+        """
+        date_str = date.strftime('%Y-%m-%d')
+        print(f"\n📊 EXTRACTING 1-MIN OPTIONS DATA FOR {len(option_tickers)} CONTRACTS ({date_str})")
+        
+        stats = self.backfill.run((ticker, date.date()) for ticker in option_tickers)
+        print(f"📊 Fetched: {stats['fetched']}, already cached: {stats['skipped']}, "
+              f"empty: {stats['empty']}, failed: {stats['failed']}")
+        
+        options_data = {}
+        for ticker in option_tickers:
+            cache_file = self.backfill.output_path(ticker, date.date())
+            if os.path.exists(cache_file):
+                options_data[ticker] = self._load_cached(cache_file)
+        if options_data:
+            rows = self.store.write_day(date, options_data)
+            print(f"🧱 Stored {rows} rows in {self.store.partition_path(date)}")
+        return options_data
+    
+    def backfill_0dte_options(self, start: datetime, end: Optional[datetime] = None,
+                              strike_range: float = 20, incremental: bool = False) -> Dict[str, int]:
+        """
+        Backfill SPY plus the near-ATM 0DTE contracts for every trading day in a range
+        
+        Resumes where an interrupted run stopped; with ``incremental`` only
+        the days after the last completed one are fetched.
+        """
+        end = end or datetime.now() - timedelta(days=1)
+        daily = self.polygon.aggregates('SPY', 1, 'day', start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
+        closes = {datetime.fromtimestamp(bar['t'] / 1000).date(): bar['c'] for bar in daily}
+        
+        def zero_dte(day) -> List[str]:
+            if day not in closes:
+                return []                                       # Market holiday
+            day_str = day.strftime('%Y-%m-%d')
+            contracts = self.polygon.options_contracts('SPY', expiration_date=day_str, as_of=day_str)
+            return ['SPY'] + [c['ticker'] for c in contracts
+                              if abs(float(c['strike_price']) - closes[day]) <= strike_range]
+        
+        print(f"\n🗂️ BACKFILLING 0DTE 1-MIN DATA: {start.date()} to {end.date()}"
+              f"{' (incremental)' if incremental else ''}")
+        consolidate = lambda day: self.store.ingest_csv_dir(self.data_dir, days=[day])
+        if incremental:
+            stats = self.backfill.incremental(zero_dte, first_day=start.date(), end=end.date(),
+                                              on_day_complete=consolidate)
+        else:
+            stats = self.backfill.backfill_days(trading_days(start.date(), end.date()), zero_dte, consolidate)
+        print(f"✅ Days: {stats['days']} new, {stats['days_skipped']} already complete; "
+              f"contracts fetched: {stats['fetched']}, failed: {stats['failed']}")
+        return stats
+    
+    def _load_cached(self, cache_file: str) -> pd.DataFrame:
+        if not os.path.exists(cache_file):
+            return pd.DataFrame()                               # Recorded as empty
+        return pd.read_csv(cache_file, index_col='timestamp', parse_dates=True)
+    
+    def _cache_options_bars(self, option_ticker: str, date: datetime, bars: List[Dict]) -> pd.DataFrame:
+        """Convert one contract's bars and write its CSV cache"""
+        if not bars:
+            print(f"⚠️ No 1-minute options data for {option_ticker}")
+            return pd.DataFrame()
+        
+        df = bars_to_frame(bars)
+        
+        # Save to cache (atomically), then mark the unit complete
+        cache_file = self.backfill.output_path(option_ticker, date.date())
+        atomic_write_csv(df, cache_file)
+        self.manifest.record(option_ticker, date.date(), '1min', len(df), cache_file)
+        self.manifest.flush()
+        
+        print(f"✅ Extracted {len(df)} 1-minute bars for {option_ticker}")
+        print(f"💾 Cached to: {cache_file}")
+        return df
+    
     def extract_alpaca_1min_stock_data(self, symbol: str, date: datetime) -> pd.DataFrame:
         """Extract 1-minute stock bars from Alpaca for a single day"""
         print(f"\n📊 EXTRACTING 1-MIN STOCK DATA FROM ALPACA (BACKUP)")
@@ -237,18 +274,16 @@ class IntradayDataExtractor:
         print(f"\n📋 LOADING OPTIONS CONTRACTS FOR SAMPLING...")
         
         try:
-            with open('cached_data/polygon_spy_contracts_20250830.json', 'r') as f:
-                contracts = json.load(f)
+            # Typed contracts cache (a legacy JSON file is converted to parquet once)
+            typed_cache = TypedCache()
+            contracts_file = typed_cache.latest('cached_data', 'polygon_spy_contracts_')
+            if contracts_file is None:
+                raise FileNotFoundError("No cached Polygon contracts in cached_data/")
+            contracts = typed_cache.load(contracts_file, 'contracts',
+                                         columns=['ticker', 'expiration_date', 'strike_price'])
             
             # Filter for contracts that might have been active on this date
-            active_contracts = []
-            for contract in contracts:
-                try:
-                    exp_date = datetime.strptime(contract['expiration_date'], '%Y-%m-%d')
-                    if exp_date >= date:  # Contract was active
-                        active_contracts.append(contract)
-                except:
-                    continue
+            active_contracts = contracts[contracts['expiration_date'] >= date]
             
             print(f"📊 Found {len(active_contracts)} potentially active contracts")
             
@@ -261,29 +296,13 @@ class IntradayDataExtractor:
                 print(f"📊 SPY close price: ${atm_price:.2f}")
             
             # Find contracts near ATM
-            atm_contracts = []
-            for contract in active_contracts[:100]:  # Limit search
-                try:
-                    strike = float(contract['strike_price'])
-                    if abs(strike - atm_price) <= 20:  # Within $20 of ATM
-                        atm_contracts.append(contract)
-                except:
-                    continue
+            candidates = active_contracts.head(100)  # Limit search
+            atm_contracts = candidates[(candidates['strike_price'] - atm_price).abs() <= 20]  # Within $20 of ATM
             
             print(f"📊 Found {len(atm_contracts)} near-ATM contracts")
             
-            # Extract 1-minute data for a few sample contracts
-            sample_contracts = atm_contracts[:5]  # Just 5 for testing
-            options_data = {}
-            
-            for contract in sample_contracts:
-                ticker = contract['ticker']
-                option_df = self.extract_polygon_1min_options_data(ticker, date)
-                if not option_df.empty:
-                    options_data[ticker] = option_df
-                
-                # Rate limiting
-                time.sleep(0.1)
+            # Extract 1-minute data for the near-ATM contracts concurrently
+            options_data = self.extract_polygon_1min_options_batch(atm_contracts['ticker'].tolist(), date)
             
             print(f"\n📊 EXTRACTION SUMMARY FOR {date.strftime('%Y-%m-%d')}")
             print(f"=" * 60)
@@ -307,6 +326,14 @@ class IntradayDataExtractor:
 
 def main():
     """Main execution function"""
+    import argparse
+    parser = argparse.ArgumentParser(description='SPY intraday (1-minute) data extractor')
+    parser.add_argument('--backfill-start', help='Backfill 0DTE contracts from this date (YYYY-MM-DD)')
+    parser.add_argument('--backfill-end', help='Last day to backfill (default: yesterday)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only fetch days after the last completed one in the manifest')
+    args = parser.parse_args()
+    
     print("🎯 SPY INTRADAY (1-MINUTE) DATA EXTRACTOR")
     print("=" * 60)
     
@@ -322,6 +349,19 @@ def main():
     # Initialize extractor
     extractor = IntradayDataExtractor()
     
+    if args.backfill_start:
+        try:
+            extractor.backfill_0dte_options(
+                datetime.strptime(args.backfill_start, '%Y-%m-%d'),
+                datetime.strptime(args.backfill_end, '%Y-%m-%d') if args.backfill_end else None,
+                incremental=args.incremental
+            )
+        except KeyboardInterrupt:
+            print("\n⚠️ Backfill interrupted by user - rerun to resume")
+        finally:
+            extractor.manifest.close()
+        return
+    
     # Extract a recent trading day (yesterday or last Friday)
     today = datetime.now().date()
     
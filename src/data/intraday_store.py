@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+🧱 Consolidated Columnar Store for 1-Minute Intraday Bars
+=========================================================
+
+Replaces one-CSV-per-contract-per-day with one parquet partition per day:
+
+    intraday_data/store/date=2025-08-29/bars.parquet
+
+Rows are sorted by (contract, timestamp); ``contract`` and ``option_type``
+are dictionary-encoded, so a day with hundreds of contracts is one small
+file read in a single call. ``load_day_block`` returns the day as aligned
+2-D arrays (contracts x minutes) instead of a dict of DataFrames, so a
+leg lookup is an index, not a per-contract ``timestamp in df.index`` scan.
+
+Partitions are written atomically (tmp + rename) and re-writing a day
+replaces only the contracts supplied, so ingestion is idempotent. Each
+write re-validates the partition: a ``flags`` column holds the per-bar
+validity bitmask and the schema metadata the partition's stats; flagged
+bars are left out of ``load_day_block``.
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import glob
+import json
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from src.data.data_validation import validate_bars
+    from src.data.occ_symbols import CODEC, RIGHT_NAMES, TICKS_PER_DOLLAR, expiry_datetimes
+except ImportError:
+    from data_validation import validate_bars
+    from occ_symbols import CODEC, RIGHT_NAMES, TICKS_PER_DOLLAR, expiry_datetimes
+
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'vwap', 'transactions')
+
+SCHEMA = pa.schema([
+    ('contract', pa.dictionary(pa.int32(), pa.string())),
+    ('timestamp', pa.timestamp('ms')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+    ('vwap', pa.float64()),
+    ('transactions', pa.int64()),
+    ('strike', pa.float64()),
+    ('option_type', pa.dictionary(pa.int8(), pa.string())),
+    ('expiration', pa.date32()),
+    ('flags', pa.uint8()),
+])
+
+
+def _as_date(day) -> date:
+    return day.date() if isinstance(day, datetime) else day
+
+
+def _minute_grid(timestamps: np.ndarray):
+    """Sorted unique minutes and each row's grid column (linear time for minute-aligned bars)"""
+    ms = timestamps.astype('datetime64[ms]').astype(np.int64)
+    if len(ms) == 0 or np.any(ms % 60_000):
+        return np.unique(timestamps.astype('datetime64[ms]'), return_inverse=True)
+    offsets = (ms - ms.min()) // 60_000
+    present = np.zeros(int(offsets.max()) + 1, dtype=bool)
+    present[offsets] = True
+    grid = (ms.min() + np.flatnonzero(present) * 60_000).astype('datetime64[ms]')
+    return grid, (np.cumsum(present) - 1)[offsets]
+
+
+class DayBlock:
+    """One day's option minute bars aligned on a shared minute grid"""
+
+    def __init__(self, day: date, contracts: np.ndarray, strikes: np.ndarray, option_types: np.ndarray,
+                 expirations: np.ndarray, timestamps: np.ndarray, fields: Dict[str, np.ndarray]):
+        self.day = day
+        self.contracts = contracts              # (n_contracts,) Polygon tickers
+        self.strikes = strikes                  # (n_contracts,)
+        self.option_types = option_types        # (n_contracts,) 'call' / 'put'
+        self.expirations = expirations          # (n_contracts,) datetime64[D]
+        self.timestamps = timestamps            # (n_minutes,) datetime64[ms], sorted
+        self.fields = fields                    # name -> (n_contracts, n_minutes), NaN where no bar
+        self._rows = {contract: i for i, contract in enumerate(contracts)}
+
+    def __len__(self) -> int:
+        return len(self.contracts)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        fields = self.__dict__.get('fields', {})
+        if name in fields:
+            return fields[name]
+        raise AttributeError(name)
+
+    def row(self, contract: str) -> int:
+        return self._rows[contract]
+
+    def column(self, timestamp) -> int:
+        """Grid column of an exact minute, or -1 when no contract traded then"""
+        ts = np.datetime64(pd.Timestamp(timestamp).to_datetime64(), 'ms')
+        i = int(np.searchsorted(self.timestamps, ts))
+        return i if i < len(self.timestamps) and self.timestamps[i] == ts else -1
+
+    def find(self, strike: float, option_type: str) -> int:
+        """Row of the contract with this strike and type, or -1"""
+        rows = np.flatnonzero((np.abs(self.strikes - strike) < 0.01) & (self.option_types == option_type))
+        return int(rows[0]) if len(rows) else -1
+
+    def price(self, contract: str, timestamp, field: str = 'close') -> float:
+        """Bar value at an exact minute (NaN if the contract has no bar there)"""
+        col = self.column(timestamp)
+        return float(self.fields[field][self._rows[contract], col]) if col >= 0 else float('nan')
+
+    def frame(self, contract: str) -> pd.DataFrame:
+        """One contract as the legacy per-contract DataFrame (timestamp index, traded minutes only)"""
+        row = self._rows[contract]
+        traded = ~np.isnan(self.fields['close'][row])
+        return pd.DataFrame({field: values[row, traded] for field, values in self.fields.items()},
+                            index=pd.DatetimeIndex(self.timestamps[traded].astype('datetime64[ns]'),
+                                                   name='timestamp'))
+
+    def to_dict(self) -> Dict[str, pd.DataFrame]:
+        """Every contract as a legacy per-contract DataFrame (slices of one frame)"""
+        rows, cols = np.nonzero(~np.isnan(self.fields['close']))      # Row-major: grouped by contract
+        combined = pd.DataFrame({field: values[rows, cols] for field, values in self.fields.items()},
+                                index=pd.DatetimeIndex(self.timestamps[cols].astype('datetime64[ns]'),
+                                                       name='timestamp'))
+        bounds = np.searchsorted(rows, np.arange(len(self.contracts) + 1))
+        return {contract: combined.iloc[bounds[i]:bounds[i + 1]] for i, contract in enumerate(self.contracts)}
+
+
+class IntradayBarStore:
+    """Date-partitioned parquet store of 1-minute option bars"""
+
+    def __init__(self, root: str = 'intraday_data/store'):
+        self.root = root
+
+    def partition_path(self, day) -> str:
+        return os.path.join(self.root, f"date={_as_date(day).isoformat()}", 'bars.parquet')
+
+    def has_day(self, day) -> bool:
+        return os.path.exists(self.partition_path(day))
+
+    def days(self) -> List[date]:
+        found = glob.glob(os.path.join(self.root, 'date=*', 'bars.parquet'))
+        return sorted(datetime.strptime(os.path.basename(os.path.dirname(path))[5:], '%Y-%m-%d').date()
+                      for path in found)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _frames_to_long(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        parts = []
+        for contract, df in frames.items():
+            if df is None or df.empty:
+                continue
+            part = df.reset_index()[['timestamp'] + [c for c in BAR_FIELDS if c in df.columns]]
+            part.insert(0, 'contract', contract)
+            parts.append(part)
+        if not parts:
+            return pd.DataFrame(columns=['contract', 'timestamp'])
+        long = pd.concat(parts, ignore_index=True)
+        long['timestamp'] = pd.to_datetime(long['timestamp'])
+
+        # Contract attributes from the shared symbol dictionary, then broadcast
+        contracts = pd.Series(long['contract'].unique())
+        expiry, strike, right = CODEC.attributes(CODEC.encode(contracts))
+        occ = right >= 0
+        attributes = pd.DataFrame({
+            'contract': contracts,
+            'strike': np.where(occ, strike / TICKS_PER_DOLLAR, np.nan),
+            'option_type': np.where(occ, RIGHT_NAMES[np.maximum(right, 0)], None),
+            'expiration': expiry_datetimes(expiry).dt.date,
+        })
+        return long.merge(attributes, on='contract', how='left')
+
+    def write_day(self, day, frames: Dict[str, pd.DataFrame]) -> int:
+        """
+        Upsert per-contract minute bars into a day's partition
+
+        Contracts in ``frames`` replace their existing rows; others are kept.
+        Returns the number of rows in the partition.
+        """
+        new = self._frames_to_long(frames)
+        if new.empty:
+            return 0
+        path = self.partition_path(day)
+        if os.path.exists(path):
+            existing = pq.read_table(path).to_pandas()
+            existing['contract'] = existing['contract'].astype(str)
+            existing['option_type'] = existing['option_type'].astype(str)
+            new = pd.concat([existing[~existing['contract'].isin(new['contract'])], new], ignore_index=True)
+
+        for column in ('open', 'high', 'low', 'close', 'volume', 'vwap'):
+            new[column] = new[column].astype(float) if column in new else np.nan
+        new['transactions'] = new['transactions'].fillna(0).astype('int64') if 'transactions' in new else 0
+        new = new.sort_values(['contract', 'timestamp'], kind='stable')
+        new['flags'], stats = validate_bars(new, 'contract')
+        table = pa.Table.from_pandas(new[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+        table = table.replace_schema_metadata(dict(table.schema.metadata or {}, validation=json.dumps(stats)))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+        return table.num_rows
+
+    def ingest_csv_dir(self, directory: str = 'intraday_data', days: Optional[Iterable] = None) -> Dict[date, int]:
+        """Consolidate the extractors' ``O_SPY..._1min_YYYYMMDD.csv`` files into partitions"""
+        by_day: Dict[date, Dict[str, pd.DataFrame]] = {}
+        stamps = [_as_date(day).strftime('%Y%m%d') for day in days] if days is not None else ['*']
+        paths = [path for stamp in stamps for path in glob.glob(os.path.join(directory, f"O_*_1min_{stamp}.csv"))]
+        for path in paths:
+            stem = os.path.basename(path)[:-4]
+            ticker, day_str = stem.rsplit('_1min_', 1)
+            day = datetime.strptime(day_str, '%Y%m%d').date()
+            by_day.setdefault(day, {})[ticker.replace('_', ':', 1)] = pd.read_csv(
+                path, index_col='timestamp', parse_dates=True)
+        return {day: self.write_day(day, frames) for day, frames in sorted(by_day.items())}
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def validation_stats(self, day) -> Optional[Dict]:
+        """Stats recorded when the partition was last written"""
+        path = self.partition_path(day)
+        if not os.path.exists(path):
+            return None
+        metadata = pq.read_schema(path).metadata or {}
+        return json.loads(metadata[b'validation']) if b'validation' in metadata else None
+    
+    def load_day(self, day, columns: Optional[List[str]] = None,
+                 contracts: Optional[List[str]] = None) -> pd.DataFrame:
+        """Long-format bars for a day (optionally a subset of contracts / columns)"""
+        path = self.partition_path(day)
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=columns or SCHEMA.names)
+        filters = [('contract', 'in', list(contracts))] if contracts else None
+        return pq.read_table(path, columns=columns, filters=filters).to_pandas()
+
+    def load_day_block(self, day) -> Optional[DayBlock]:
+        """A day's bars as aligned (contracts x minutes) arrays, or None if not stored"""
+        path = self.partition_path(day)
+        if not os.path.exists(path):
+            return None
+        table = pq.read_table(path).combine_chunks().unify_dictionaries()
+        if 'flags' in table.column_names:
+            table = table.filter(pa.array(table.column('flags').to_numpy() == 0))
+
+        contract_column = table.column('contract').chunk(0) if table.num_rows else None
+        if contract_column is None:
+            return None
+        codes = contract_column.indices.to_numpy()
+        contracts = np.asarray(contract_column.dictionary.to_pylist(), dtype=object)
+
+        timestamps = table.column('timestamp').to_numpy()
+        grid, minute = _minute_grid(timestamps)
+
+        fields = {}
+        for field in BAR_FIELDS:
+            block = np.full((len(contracts), len(grid)), np.nan)
+            block[codes, minute] = table.column(field).to_numpy()
+            fields[field] = block
+
+        # Per-contract attributes from each contract's first row
+        present, first = np.unique(codes, return_index=True)
+        strikes = np.full(len(contracts), np.nan)
+        strikes[present] = table.column('strike').to_numpy()[first]
+        type_column = table.column('option_type').chunk(0)
+        type_names = np.asarray(type_column.dictionary.to_pylist(), dtype=object)
+        option_types = np.empty(len(contracts), dtype=object)
+        option_types[present] = type_names[type_column.indices.to_numpy()[first]]
+        expirations = np.full(len(contracts), np.datetime64('NaT'), dtype='datetime64[D]')
+        expirations[present] = table.column('expiration').to_numpy()[first]
+
+        keep = np.zeros(len(contracts), dtype=bool)
+        keep[present] = True                    # Drop dictionary entries with no rows
+        return DayBlock(_as_date(day), contracts[keep], strikes[keep], option_types[keep],
+                        expirations[keep], grid, {name: values[keep] for name, values in fields.items()})
+
+
+def main():
+    """Consolidate the cached per-contract CSVs and time a day load"""
+    import time
+    print("🧱 INTRADAY BAR STORE")
+    print("=" * 60)
+    store = IntradayBarStore()
+    written = store.ingest_csv_dir('intraday_data')
+    for day, rows in written.items():
+        print(f"💾 {day}: {rows} rows -> {store.partition_path(day)}")
+    for day in store.days():
+        started = time.perf_counter()
+        block = store.load_day_block(day)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"⚡ {day}: {len(block)} contracts x {len(block.timestamps)} minutes in {elapsed_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
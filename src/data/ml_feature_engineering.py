@@ -36,8 +36,12 @@ if project_root not in sys.path:
 
 try:
     from .parquet_data_loader import ParquetDataLoader
+    from .data_validation import VALIDATED_ATTR
+    from .occ_symbols import CALL, PUT, encode_frame, expiry_datetimes
 except ImportError:
     from src.data.parquet_data_loader import ParquetDataLoader
+    from src.data.data_validation import VALIDATED_ATTR
+    from src.data.occ_symbols import CALL, PUT, encode_frame, expiry_datetimes
 
 # Import BlackScholesGreeks from the enhanced strategy
 try:
@@ -50,6 +54,9 @@ warnings.filterwarnings('ignore')
 class MLFeatureEngineer:
     """Comprehensive feature engineering for ML-based 0DTE trading"""
     
+    # Bump whenever generated features change so cached feature matrices are rebuilt
+    FEATURE_SET_VERSION = "1.1.0"
+    
     def __init__(self):
         self.feature_categories = {
             'market_microstructure': [],
@@ -139,19 +146,31 @@ class MLFeatureEngineer:
         
         return features_df
     
+    @staticmethod
+    def _with_contract_codes(df: pd.DataFrame) -> pd.DataFrame:
+        """Integer expiry_id / right columns (loader frames already carry them)"""
+        if 'expiry_id' in df.columns and 'right' in df.columns:
+            return df
+        return encode_frame(df)
+    
     def _add_microstructure_features(self, df: pd.DataFrame, spy_price: float) -> pd.DataFrame:
         """Add market microstructure features with safety checks"""
         
+        # Loader frames were validated at ingestion (columns present, vwap > 0)
+        validated = df.attrs.get(VALIDATED_ATTR, False)
+        
         # Safety checks for required columns
-        required_cols = ['strike', 'option_type', 'expiration', 'timestamp', 'close', 'high', 'low', 'open']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            print(f"⚠️  Missing required columns: {missing_cols}")
-            return df
+        if not validated:
+            required_cols = ['strike', 'option_type', 'expiration', 'timestamp', 'close', 'high', 'low', 'open']
+            missing_cols = [col for col in required_cols if col not in df.columns]
+            if missing_cols:
+                print(f"⚠️  Missing required columns: {missing_cols}")
+                return df
+        df = self._with_contract_codes(df)
         
         # Price-based features
         df['moneyness'] = np.where(
-            df['option_type'] == 'call',
+            df['right'] == CALL,
             df['strike'] / spy_price,
             spy_price / df['strike']
         )
@@ -160,7 +179,7 @@ class MLFeatureEngineer:
         df['abs_log_moneyness'] = np.abs(df['log_moneyness'])
         
         # Time to expiration features
-        df['expiration_dt'] = pd.to_datetime(df['expiration'])
+        df['expiration_dt'] = expiry_datetimes(df['expiry_id']).to_numpy()
         df['timestamp_dt'] = pd.to_datetime(df['timestamp'], unit='ms')
         df['dte_hours'] = (df['expiration_dt'] - df['timestamp_dt']).dt.total_seconds() / 3600
         df['dte_days'] = df['dte_hours'] / 24
@@ -168,7 +187,7 @@ class MLFeatureEngineer:
         df['is_same_day'] = (df['dte_days'] < 0.5).astype(int)
         
         # Price efficiency features
-        df['price_efficiency'] = df['close'] / df['vwap']
+        df['price_efficiency'] = df['close'] / (df['vwap'] if validated else df['vwap'].where(df['vwap'] > 0))
         df['intraday_range'] = (df['high'] - df['low']) / df['close']
         df['price_impact'] = np.abs(df['close'] - df['open']) / df['open']
         
@@ -192,9 +211,10 @@ class MLFeatureEngineer:
         print("🔄 Calculating Greeks (vectorized)...")
         
         # Vectorized time to expiration calculation
-        expiration_dt = pd.to_datetime(df['expiration'])
+        df = self._with_contract_codes(df)
+        expiration_dt = expiry_datetimes(df['expiry_id']).to_numpy()
         timestamp_dt = pd.to_datetime(df['timestamp'], unit='ms')
-        tte_seconds = (expiration_dt - timestamp_dt).dt.total_seconds()
+        tte_seconds = pd.Series(expiration_dt - timestamp_dt.to_numpy(), index=df.index).dt.total_seconds()
         tte_years = np.maximum(tte_seconds / (365.25 * 24 * 3600), 1/365/24)
         
         # Vectorized IV estimation
@@ -238,7 +258,7 @@ class MLFeatureEngineer:
         
         if np.any(non_zero_mask):
             # Call options
-            call_mask = (df['option_type'] == 'call').values & non_zero_mask
+            call_mask = (df['right'] == CALL).values & non_zero_mask
             if np.any(call_mask):
                 prices[call_mask] = S * N_d1[call_mask] - K[call_mask] * np.exp(-r * T[call_mask]) * N_d2[call_mask]
                 deltas[call_mask] = N_d1[call_mask]
@@ -247,7 +267,7 @@ class MLFeatureEngineer:
                 rhos[call_mask] = (K[call_mask] * T[call_mask] * np.exp(-r * T[call_mask]) * N_d2[call_mask]) / 100
             
             # Put options
-            put_mask = (df['option_type'] == 'put').values & non_zero_mask
+            put_mask = (df['right'] == PUT).values & non_zero_mask
             if np.any(put_mask):
                 prices[put_mask] = K[put_mask] * np.exp(-r * T[put_mask]) * norm.cdf(-d2[put_mask]) - S * norm.cdf(-d1[put_mask])
                 deltas[put_mask] = N_d1[put_mask] - 1
@@ -261,8 +281,8 @@ class MLFeatureEngineer:
         
         # Handle 0DTE case (intrinsic value only)
         if np.any(zero_dte_mask):
-            call_0dte = (df['option_type'] == 'call').values & zero_dte_mask
-            put_0dte = (df['option_type'] == 'put').values & zero_dte_mask
+            call_0dte = (df['right'] == CALL).values & zero_dte_mask
+            put_0dte = (df['right'] == PUT).values & zero_dte_mask
             
             prices[call_0dte] = np.maximum(0, S - K[call_0dte])
             prices[put_0dte] = np.maximum(0, K[put_0dte] - S)
@@ -531,8 +551,9 @@ class MLFeatureEngineer:
         )
         
         # Skew indicators
-        df['call_option'] = (df['option_type'] == 'call').astype(int)
-        df['put_option'] = (df['option_type'] == 'put').astype(int)
+        df = self._with_contract_codes(df)
+        df['call_option'] = (df['right'] == CALL).astype(int)
+        df['put_option'] = (df['right'] == PUT).astype(int)
         
         # Implied volatility estimates based on moneyness
         df['iv_estimate'] = 0.20 + np.abs(df['log_moneyness']) * 0.3
@@ -18,6 +18,7 @@ Author: Advanced Options Trading System
 Version: 1.0.0
 """
 
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, time
@@ -26,20 +27,70 @@ from typing import Dict, List, Optional, Tuple, Union
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from src.data.spot_index import SpotIndex, SPOT_COLUMN, latest_spot
+except ImportError:
+    from spot_index import SpotIndex, SPOT_COLUMN, latest_spot
+
+try:
+    from src.data.shared_dataset import SharedDataset
+except ImportError:
+    from shared_dataset import SharedDataset
+
+try:
+    from src.data.data_validation import VALIDATED_ATTR, describe, validate_dataset
+except ImportError:
+    from data_validation import VALIDATED_ATTR, describe, validate_dataset
+
+try:
+    from src.data.occ_symbols import CALL, PUT, encode_frame, expiry_datetimes
+except ImportError:
+    from occ_symbols import CALL, PUT, encode_frame, expiry_datetimes
+
 class ParquetDataLoader:
     """High-performance loader for the year-long SPY options parquet dataset"""
     
-    def __init__(self, parquet_path: str = 'src/data/spy_options_20240830_20250830.parquet'):
+    def __init__(self, parquet_path: str = 'src/data/spy_options_20240830_20250830.parquet',
+                 shared_dir: Optional[str] = None):
         self.parquet_path = parquet_path
         self.full_dataset = None
+        self.shared = None
+        self.spot_index = None
+        self.validation_stats = None
         self.loaded_dates = set()
         
         print(f"🚀 Initializing Parquet Data Loader")
+        
+        if shared_dir:
+            # Worker: attach the coordinator's memory-mapped copy instead of loading
+            self.shared = SharedDataset.attach(shared_dir)
+            print(f"🧩 Shared dataset: {shared_dir} ({len(self.shared):,} records)")
+            return
+        
         print(f"📁 Dataset: {parquet_path}")
         
         # Load and prepare the full dataset
         self._load_full_dataset()
     
+    def share(self, directory: Optional[str] = None) -> str:
+        """Publish the prepared dataset for worker processes (``shared_dir``); reused while current"""
+        if directory is None:
+            stem = os.path.splitext(os.path.basename(self.parquet_path))[0]
+            directory = os.path.join('cached_data', 'shared', stem)
+        if not SharedDataset.is_current(directory, self.parquet_path):
+            SharedDataset.publish(self.full_dataset, directory, source=self.parquet_path)
+            print(f"🧩 Published shared dataset: {directory}")
+        return directory
+    
+    def _day_data(self, target_date) -> pd.DataFrame:
+        """All rows of one trading day (a private copy of validated rows)"""
+        if self.shared is not None:
+            day_data = self.shared.day(target_date)
+        else:
+            day_data = self.full_dataset[self.full_dataset['date'] == target_date].copy()
+        day_data.attrs[VALIDATED_ATTR] = True
+        return day_data
+    
     def _load_full_dataset(self):
         """Load and prepare the full parquet dataset"""
         
@@ -48,23 +99,32 @@ class ParquetDataLoader:
         # Load the parquet file
         df = pd.read_parquet(self.parquet_path)
         
+        # Validate once (mask cached next to the dataset) and keep clean rows only
+        flags, self.validation_stats = validate_dataset(self.parquet_path, df)
+        df = df[flags == 0].reset_index(drop=True)
+        print(f"🧪 Validation: {describe(self.validation_stats)}")
+        
         # Convert timestamp and prepare datetime columns
         df['datetime'] = pd.to_datetime(df['timestamp'], unit='ms')
         df['date'] = df['datetime'].dt.date
         df['time'] = df['datetime'].dt.time
         
-        # Parse expiration dates
-        df['expiration_date'] = pd.to_datetime(df['expiration'])
-        df['days_to_expiry'] = (df['expiration_date'] - df['datetime'].dt.normalize()).dt.days
+        # Contract identity as integers (expiry_id / strike_ticks / right), parsed once per symbol
+        df = encode_frame(df)
+        df['expiration_date'] = expiry_datetimes(df['expiry_id']).to_numpy()
+        trade_day = df['datetime'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        df['days_to_expiry'] = df['expiry_id'].to_numpy(dtype=np.int64) - trade_day
         
         # Add market hours filter
         df['market_hours'] = df['datetime'].dt.time.apply(
             lambda t: time(9, 30) <= t <= time(16, 0)
         )
         
-        # Calculate moneyness (will need SPY price for this)
-        # For now, we'll add this when we load specific dates
+        # Per-minute underlying price (SPY bars / put-call parity), saved next to the dataset
+        self.spot_index = SpotIndex.for_dataset(self.parquet_path, df)
+        df[SPOT_COLUMN] = self.spot_index.lookup(df['datetime'])
         
+        df.attrs[VALIDATED_ATTR] = True
         self.full_dataset = df
         
         print(f"✅ Dataset loaded: {len(df):,} records")
@@ -76,7 +136,10 @@ class ParquetDataLoader:
                            end_date: Optional[datetime] = None) -> List[datetime]:
         """Get list of available trading dates"""
         
-        dates = sorted(self.full_dataset['date'].unique())
+        if self.shared is not None:
+            dates = self.shared.dates()
+        else:
+            dates = sorted(self.full_dataset['date'].unique())
         
         if start_date:
             dates = [d for d in dates if d >= start_date.date()]
@@ -97,10 +160,8 @@ class ParquetDataLoader:
         print(f"📊 Loading options for {target_date_only}")
         
         # Filter by date
-        day_data = self.full_dataset[
-            (self.full_dataset['date'] == target_date_only) &
-            (self.full_dataset['market_hours'] == True)
-        ].copy()
+        day_data = self._day_data(target_date_only)
+        day_data = day_data[day_data['market_hours'] == True]
         
         if day_data.empty:
             print(f"❌ No data available for {target_date_only}")
@@ -112,8 +173,7 @@ class ParquetDataLoader:
         # Filter by days to expiry
         day_data = day_data[day_data['days_to_expiry'] <= max_dte]
         
-        # Get SPY price estimate (use median of all option prices as proxy)
-        # In real implementation, we'd load SPY stock data
+        # Latest SPY price from the per-minute spot index
         spy_price_estimate = self._estimate_spy_price(day_data)
         
         # Filter by strike range (within X% of SPY price)
@@ -125,20 +185,21 @@ class ParquetDataLoader:
                 (day_data['strike'] <= strike_max)
             ]
         
-        # Calculate moneyness
+        # Calculate moneyness against each row's own minute spot
         if spy_price_estimate:
+            spot = day_data[SPOT_COLUMN].fillna(spy_price_estimate)
             day_data['moneyness'] = np.where(
-                day_data['option_type'] == 'call',
-                (day_data['strike'] - spy_price_estimate) / spy_price_estimate,
-                (spy_price_estimate - day_data['strike']) / spy_price_estimate
+                day_data['right'] == CALL,
+                (day_data['strike'] - spot) / spot,
+                (spot - day_data['strike']) / spot
             )
         
         # Add liquidity score
         day_data['liquidity_score'] = self._calculate_liquidity_score(day_data)
         
         print(f"✅ Loaded {len(day_data):,} liquid options")
-        print(f"📊 Calls: {len(day_data[day_data['option_type'] == 'call']):,}")
-        print(f"📊 Puts: {len(day_data[day_data['option_type'] == 'put']):,}")
+        print(f"📊 Calls: {np.count_nonzero(day_data['right'] == CALL):,}")
+        print(f"📊 Puts: {np.count_nonzero(day_data['right'] == PUT):,}")
         if spy_price_estimate:
             print(f"📊 Estimated SPY: ${spy_price_estimate:.2f}")
         else:
@@ -152,8 +213,12 @@ class ParquetDataLoader:
         if options_data.empty:
             return None
         
-        # Method 1: Use ATM options (strikes closest to intrinsic value)
-        # For now, use a simple approach - median strike weighted by volume
+        # Joined spot index value at the latest minute
+        spot = latest_spot(options_data)
+        if spot is not None:
+            return spot
+        
+        # Fallback for frames without a spot: volume-weighted strikes
         
         # Get most recent data point
         latest_time = options_data['datetime'].max()
@@ -216,8 +281,8 @@ class ParquetDataLoader:
             ]
             
             # Separate by type and select best strikes
-            calls = momentum_options[momentum_options['option_type'] == 'call']
-            puts = momentum_options[momentum_options['option_type'] == 'put']
+            calls = momentum_options[momentum_options['right'] == CALL]
+            puts = momentum_options[momentum_options['right'] == PUT]
             
             # Select top liquid strikes for each type
             if not calls.empty:
@@ -245,8 +310,8 @@ class ParquetDataLoader:
         
         # Calculate market metrics
         total_volume = options_data['volume'].sum()
-        call_volume = options_data[options_data['option_type'] == 'call']['volume'].sum()
-        put_volume = options_data[options_data['option_type'] == 'put']['volume'].sum()
+        call_volume = options_data.loc[options_data['right'] == CALL, 'volume'].sum()
+        put_volume = options_data.loc[options_data['right'] == PUT, 'volume'].sum()
         
         put_call_ratio = put_volume / call_volume if call_volume > 0 else 0
         
@@ -287,7 +352,7 @@ class ParquetDataLoader:
     def get_dataset_statistics(self) -> Dict:
         """Get comprehensive statistics about the full dataset"""
         
-        df = self.full_dataset
+        df = self.full_dataset if self.shared is None else self.shared.frame()
         
         return {
             'total_records': len(df),
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+🌐 Pooled Polygon.io REST Client
+================================
+
+Shared HTTP layer for the historical data extractors:
+- One keep-alive ``requests.Session`` with a connection pool sized to the
+  worker count (no TCP/TLS handshake per contract)
+- Token-bucket rate limiter shared by all workers (replaces fixed sleeps)
+- Retry with exponential backoff on 429 / 5xx / connection errors,
+  honouring ``Retry-After``
+- ``next_url`` pagination for aggregates and reference endpoints
+- ``fetch_many`` runs many aggregate requests concurrently on a thread pool
+
+``base_url`` is configurable so the client can be pointed at a local
+HTTP stub in tests.
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+POLYGON_BASE_URL = "https://api.polygon.io"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class PolygonRequestError(Exception):
+    """A request failed permanently (non-retryable status or retries exhausted)"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the time waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class PolygonClient:
+    """Connection-pooled, rate-limited Polygon.io client"""
+
+    def __init__(self, api_key: str, base_url: str = POLYGON_BASE_URL, max_workers: int = 8,
+                 requests_per_second: float = 20.0, max_retries: int = 4, backoff: float = 0.5,
+                 timeout: float = 30.0, burst: Optional[float] = None,
+                 session: Optional[requests.Session] = None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.limiter = TokenBucket(requests_per_second, burst)
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.stats = {'requests': 0, 'retries': 0, 'pages': 0, 'failures': 0, 'rate_wait_s': 0.0}
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'PolygonClient':
+        api_key = os.getenv('POLYGON_API_KEY')
+        if not api_key:
+            raise ValueError("POLYGON_API_KEY not found")
+        return cls(api_key, **kwargs)
+
+    def _count(self, key: str, amount: float = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def get_json(self, path_or_url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET a path (or absolute ``next_url``) with rate limiting and retries"""
+        url = path_or_url if path_or_url.startswith('http') else f"{self.base_url}{path_or_url}"
+        params = dict(params or {})
+        params.setdefault('apikey', self.api_key)
+
+        for attempt in range(self.max_retries + 1):
+            self._count('rate_wait_s', self.limiter.acquire())
+            self._count('requests')
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error, retry_after = e, None
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if response.status_code not in RETRY_STATUS:
+                    self._count('failures')
+                    raise PolygonRequestError(f"{response.status_code} for {url}: {response.text[:200]}")
+                error = PolygonRequestError(f"{response.status_code} for {url}")
+                retry_after = response.headers.get('Retry-After')
+
+            if attempt == self.max_retries:
+                self._count('failures')
+                raise PolygonRequestError(f"Giving up after {attempt + 1} attempts: {error}")
+            self._count('retries')
+            delay = self.backoff * (2 ** attempt)
+            if retry_after is not None:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            time.sleep(delay)
+
+    def paginate(self, path: str, params: Optional[Dict[str, Any]] = None,
+                 max_pages: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield each page, following ``next_url`` (which Polygon returns without the API key)"""
+        data = self.get_json(path, params)
+        pages = 1
+        while True:
+            self._count('pages')
+            yield data
+            next_url = data.get('next_url')
+            if not next_url or (max_pages is not None and pages >= max_pages):
+                return
+            data = self.get_json(next_url)
+            pages += 1
+
+    def results(self, path: str, params: Optional[Dict[str, Any]] = None,
+                max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+        """All ``results`` across pages"""
+        rows: List[Dict[str, Any]] = []
+        for page in self.paginate(path, params, max_pages):
+            rows.extend(page.get('results') or [])
+        return rows
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def aggregates(self, ticker: str, multiplier: int, timespan: str, start: str, end: str,
+                   limit: int = 50000, adjusted: bool = True) -> List[Dict[str, Any]]:
+        """``/v2/aggs`` bars for one ticker (all pages)"""
+        path = f"/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{start}/{end}"
+        params = {'adjusted': 'true' if adjusted else 'false', 'sort': 'asc', 'limit': limit}
+        return self.results(path, params)
+
+    def options_contracts(self, underlying: str = 'SPY', **filters) -> List[Dict[str, Any]]:
+        """``/v3/reference/options/contracts`` (all pages)"""
+        params = {'underlying_ticker': underlying, 'limit': 1000}
+        params.update(filters)
+        return self.results("/v3/reference/options/contracts", params)
+
+    def fetch_many(self, jobs: Dict[Any, Tuple], fn: Optional[Callable] = None,
+                   progress: Optional[Callable[[Any, Any], None]] = None) -> Tuple[Dict[Any, Any], Dict[Any, Exception]]:
+        """
+        Run ``fn(*args)`` for every ``key -> args`` job on the worker pool
+
+        ``fn`` defaults to ``aggregates``. Returns (results, errors) keyed
+        like ``jobs``; one failed job never aborts the others.
+        """
+        fn = fn or self.aggregates
+        results: Dict[Any, Any] = {}
+        errors: Dict[Any, Exception] = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='polygon') as pool:
+            futures = {pool.submit(fn, *args): key for key, args in jobs.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    errors[key] = e
+                if progress is not None:
+                    progress(key, results.get(key, errors.get(key)))
+        return results, errors
+
+    def close(self):
+        self.session.close()
+
+
+def bars_to_frame(bars: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Aggregate bars -> DataFrame indexed by timestamp (the extractors' CSV layout)"""
+    if not bars:
+        return pd.DataFrame()
+    df = pd.DataFrame({
+        'timestamp': [datetime.fromtimestamp(bar['t'] / 1000) for bar in bars],
+        'open': [bar.get('o', 0) for bar in bars],
+        'high': [bar.get('h', 0) for bar in bars],
+        'low': [bar.get('l', 0) for bar in bars],
+        'close': [bar.get('c', 0) for bar in bars],
+        'volume': [bar.get('v', 0) for bar in bars],
+        'vwap': [bar.get('vw', 0) for bar in bars],
+        'transactions': [bar.get('n', 0) for bar in bars],
+    })
+    return df.set_index('timestamp')
+
+
+def main():
+    """Demo: fetch a few SPY option days concurrently"""
+    print("🌐 POLYGON CLIENT DEMO")
+    print("=" * 60)
+    try:
+        client = PolygonClient.from_env()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    contracts = client.options_contracts('SPY', expiration_date=datetime.now().strftime('%Y-%m-%d'))
+    print(f"📋 {len(contracts)} contracts expiring today")
+    day = datetime.now().strftime('%Y-%m-%d')
+    jobs = {c['ticker']: (c['ticker'], 1, 'minute', day, day) for c in contracts[:50]}
+    started = time.perf_counter()
+    results, errors = client.fetch_many(jobs)
+    print(f"✅ {len(results)} contracts, {sum(len(b) for b in results.values())} bars, "
+          f"{len(errors)} errors in {time.perf_counter() - started:.1f}s")
+    print(f"📊 Stats: {client.stats}")
+
+
+if __name__ == "__main__":
+    main()
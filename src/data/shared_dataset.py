@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+🧩 Memory-Mapped Shared Options Dataset
+=======================================
+
+Every backtester process used to read the options parquet into its own
+multi-GB DataFrame. Here a coordinator prepares the frame once and
+publishes it as one ``.npy`` file per column plus a manifest:
+
+    cached_data/shared/spy_options_20240830_20250830/
+        manifest.json        # columns, kinds, categories, per-day row ranges
+        strike.npy
+        option_type.npy      # int32 string dictionary codes
+        datetime.npy         # int64 nanoseconds
+        ...
+
+Rows are sorted by trading day, so each day is one contiguous row range.
+Workers ``attach`` the directory with ``np.load(mmap_mode='r')``: the
+columns are read-only views of the OS page cache, shared by all
+processes, so N workers use about 1x the dataset's memory. A worker only
+materializes the DataFrame rows it asks for (typically one day).
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import json
+import shutil
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = 'manifest.json'
+
+
+def _encode(series: pd.Series):
+    """Column -> (kind, numpy array, categories)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category', series.cat.codes.to_numpy(dtype=np.int32), [str(c) for c in series.cat.categories]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = pd.to_datetime(series)
+        if values.dt.tz is not None:
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        return 'datetime', values.to_numpy(dtype='datetime64[ns]').view(np.int64), None
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return 'array', series.to_numpy(), None
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred == 'date':
+        return 'date', pd.to_datetime(series).to_numpy(dtype='datetime64[ns]').view(np.int64), None
+    if inferred == 'time':
+        return 'time', pd.to_timedelta(series.astype(str)).to_numpy(dtype='timedelta64[ns]').view(np.int64), None
+    if inferred in ('string', 'empty'):
+        categorical = series.astype('category')
+        return 'string', categorical.cat.codes.to_numpy(dtype=np.int32), [str(c) for c in categorical.cat.categories]
+    raise ValueError(f"Column {series.name!r} ({inferred}) cannot be shared")
+
+
+def _decode(kind: str, values: np.ndarray, categories: Optional[List[str]]):
+    if kind == 'category':
+        return pd.Categorical.from_codes(np.asarray(values), categories=categories)
+    if kind == 'string':
+        strings = np.array(categories + [None], dtype=object)
+        return strings[np.asarray(values)]          # Code -1 (missing) picks the trailing None
+    if kind == 'datetime':
+        return np.asarray(values).view('datetime64[ns]')
+    if kind == 'date':
+        return pd.DatetimeIndex(np.asarray(values).view('datetime64[ns]')).date
+    if kind == 'time':
+        return pd.DatetimeIndex(np.asarray(values).view('datetime64[ns]')).time
+    return np.array(values)
+
+
+class SharedDataset:
+    """Columnar dataset published once and memory-mapped by every worker"""
+
+    def __init__(self, directory: str, manifest: Dict, arrays: Dict[str, np.ndarray]):
+        self.directory = directory
+        self.manifest = manifest
+        self.arrays = arrays
+        self._days = {date.fromisoformat(day): tuple(bounds) for day, bounds in manifest['days'].items()}
+
+    # ------------------------------------------------------------------
+    # Coordinator
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def publish(cls, frame: pd.DataFrame, directory: str, day_column: str = 'date',
+                source: Optional[str] = None) -> 'SharedDataset':
+        """Write ``frame`` (sorted by ``day_column``) as memory-mappable columns"""
+        days = pd.to_datetime(frame[day_column]).to_numpy(dtype='datetime64[D]')
+        order = np.argsort(days, kind='stable')
+        frame = frame.iloc[order]
+        days = days[order]
+
+        tmp = f"{directory}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        columns = {}
+        for name in frame.columns:
+            kind, values, categories = _encode(frame[name])
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+            columns[name] = {'kind': kind, 'categories': categories}
+
+        unique_days, starts = np.unique(days, return_index=True)
+        stops = np.append(starts[1:], len(days))
+        manifest = {
+            'rows': int(len(frame)),
+            'source': source,
+            'columns': columns,
+            'days': {str(day): [int(start), int(stop)] for day, start, stop in zip(unique_days, starts, stops)},
+        }
+        with open(os.path.join(tmp, MANIFEST), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(os.path.dirname(directory) or '.', exist_ok=True)
+        os.replace(tmp, directory)
+        return cls.attach(directory)
+
+    @staticmethod
+    def is_current(directory: str, source: str) -> bool:
+        """Published copy exists and is newer than its source file"""
+        manifest = os.path.join(directory, MANIFEST)
+        return (os.path.exists(manifest) and os.path.exists(source)
+                and os.path.getmtime(manifest) >= os.path.getmtime(source))
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def attach(cls, directory: str) -> 'SharedDataset':
+        """Zero-copy, read-only view of a published dataset"""
+        with open(os.path.join(directory, MANIFEST), 'r') as f:
+            manifest = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+                  for name in manifest['columns']}
+        return cls(directory, manifest, arrays)
+
+    def __len__(self) -> int:
+        return self.manifest['rows']
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.manifest['columns'])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw memory-mapped column (codes / int64 nanoseconds for encoded kinds)"""
+        return self.arrays[name]
+
+    def dates(self) -> List[date]:
+        return sorted(self._days)
+
+    def day_rows(self, day: date) -> slice:
+        start, stop = self._days.get(day, (0, 0))
+        return slice(start, stop)
+
+    def frame(self, rows: slice = slice(None), columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Materialize ``rows`` as a private DataFrame"""
+        data = {}
+        for name in columns or self.columns:
+            spec = self.manifest['columns'][name]
+            data[name] = _decode(spec['kind'], self.arrays[name][rows], spec['categories'])
+        start = rows.start or 0
+        return pd.DataFrame(data, index=pd.RangeIndex(start, start + len(next(iter(data.values())))))
+
+    def day(self, day: date, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self.frame(self.day_rows(day), columns)
+
+
+def main():
+    """Publish the year-long dataset and attach it the way a worker would"""
+    import time
+    print("🧩 SHARED DATASET")
+    print("=" * 60)
+    try:
+        from src.data.parquet_data_loader import ParquetDataLoader
+    except ImportError:
+        from parquet_data_loader import ParquetDataLoader
+    loader = ParquetDataLoader()
+    directory = loader.share()
+    started = time.perf_counter()
+    shared = SharedDataset.attach(directory)
+    print(f"✅ Attached {len(shared):,} rows ({shared.nbytes / 1024**2:.1f} MB mapped) "
+          f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+    day = shared.dates()[-1]
+    started = time.perf_counter()
+    frame = shared.day(day)
+    print(f"⚡ {day}: {len(frame):,} rows in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+📍 Per-Minute Underlying Spot Index
+===================================
+
+One SPY price per minute, built once and shared by every loader and
+strategy instead of re-estimating spot from strike medians on each call.
+
+Sources, best first:
+- SPY 1-minute bars (close), when available
+- Put-call parity across the chain: for 0DTE/near-dated SPY options the
+  carry term is negligible, so ``S ≈ K + C - P``. Each minute uses the
+  median over the few strikes where ``|C - P|`` is smallest (closest to
+  ATM, least affected by stale wings) of the nearest expiration.
+
+The parity pass is a single vectorized groupby over the whole chain. The
+series is saved next to the options dataset
+(``spy_options_*.parquet`` -> ``spy_options_*_spot.parquet``) and joined
+onto option rows by timestamp as an asof join (``underlying_price``
+column), so downstream spot lookups are a column read.
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+from datetime import datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+SPOT_COLUMN = 'underlying_price'
+DEFAULT_TOLERANCE = pd.Timedelta(minutes=15)      # Never carry a price across the overnight gap
+
+
+def _naive_utc(values) -> pd.DatetimeIndex:
+    """Timestamps as tz-naive UTC (the parquet datasets' convention)"""
+    index = pd.DatetimeIndex(pd.to_datetime(values))
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.as_unit('ns')
+
+
+def _times(frame: pd.DataFrame) -> pd.DatetimeIndex:
+    if 'datetime' in frame:
+        return _naive_utc(frame['datetime'])
+    return _naive_utc(pd.to_datetime(frame['timestamp'], unit='ms'))
+
+
+def build_parity_spot(options: pd.DataFrame, strikes_per_minute: int = 3) -> pd.Series:
+    """
+    Per-minute spot from put-call parity (vectorized)
+
+    ``options`` needs ``datetime`` (or ms ``timestamp``), ``strike``,
+    ``option_type`` ('call'/'put'), ``close`` and ``expiration``.
+    """
+    if options is None or options.empty:
+        return pd.Series(dtype=float, name=SPOT_COLUMN)
+
+    frame = pd.DataFrame({
+        'minute': _times(options).floor('min'),
+        'expiration': pd.to_datetime(options['expiration']).to_numpy(),
+        'strike': options['strike'].to_numpy(dtype=float),
+        'option_type': options['option_type'].astype(str).str.lower().to_numpy(),
+        'close': options['close'].to_numpy(dtype=float),
+    })
+    frame = frame[frame['close'] > 0]
+    frame = frame[frame['expiration'] == frame.groupby('minute')['expiration'].transform('min')]
+
+    pairs = frame.groupby(['minute', 'strike', 'option_type'])['close'].last().unstack('option_type')
+    if 'call' not in pairs or 'put' not in pairs:
+        return pd.Series(dtype=float, name=SPOT_COLUMN)
+    pairs = pairs.dropna(subset=['call', 'put']).reset_index()
+
+    pairs['implied'] = pairs['strike'] + pairs['call'] - pairs['put']
+    pairs['gap'] = (pairs['call'] - pairs['put']).abs()
+    nearest = pairs.sort_values(['minute', 'gap']).groupby('minute').head(strikes_per_minute)
+    spot = nearest.groupby('minute')['implied'].median()
+    spot.index.name = 'timestamp'
+    return spot.rename(SPOT_COLUMN)
+
+
+def build_bar_spot(bars: pd.DataFrame) -> pd.Series:
+    """Per-minute spot from SPY 1-minute bars (timestamp index or column, any tz)"""
+    if bars is None or bars.empty:
+        return pd.Series(dtype=float, name=SPOT_COLUMN)
+    frame = bars.copy()
+    frame.columns = [str(column).lower() for column in frame.columns]
+    if 'timestamp' in frame:
+        frame = frame.set_index('timestamp')
+    index = _naive_utc(frame.index).floor('min')
+    spot = pd.Series(frame['close'].to_numpy(dtype=float), index=pd.DatetimeIndex(index, name='timestamp'))
+    return spot[~spot.index.duplicated(keep='last')].sort_index().rename(SPOT_COLUMN)
+
+
+def spot_path(dataset_path: str) -> str:
+    """Sidecar file for a dataset: ``x.parquet`` -> ``x_spot.parquet``"""
+    return os.path.splitext(dataset_path)[0] + '_spot.parquet'
+
+
+def latest_spot(options_data: pd.DataFrame, column: str = SPOT_COLUMN) -> Optional[float]:
+    """Spot at the latest row of a frame that already carries the joined column"""
+    if options_data is None or options_data.empty or column not in options_data:
+        return None
+    rows = options_data[options_data[column].notna()]
+    if rows.empty:
+        return None
+    if 'datetime' in rows:
+        return float(rows[column].iloc[rows['datetime'].to_numpy().argmax()])
+    return float(rows[column].iloc[-1])
+
+
+class SpotIndex:
+    """Sorted per-minute spot series with O(1) minute lookups and asof joins"""
+
+    def __init__(self, series: pd.Series):
+        series = series.dropna()
+        series.index = _naive_utc(series.index)
+        series = series[~series.index.duplicated(keep='last')].sort_index()
+        self.series = series.rename(SPOT_COLUMN)
+        self._ns = series.index.asi8
+        self._values = series.to_numpy(dtype=float)
+        self._by_minute = dict(zip(self._ns.tolist(), self._values.tolist()))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @classmethod
+    def build(cls, options: Optional[pd.DataFrame] = None,
+              bars: Optional[pd.DataFrame] = None) -> 'SpotIndex':
+        """SPY bars where present, put-call parity for the remaining minutes"""
+        bar_spot = build_bar_spot(bars)
+        parity_spot = build_parity_spot(options)
+        if bar_spot.empty:
+            return cls(parity_spot)
+        return cls(bar_spot.combine_first(parity_spot))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = f"{path}.tmp"
+        self.series.rename_axis('timestamp').reset_index().to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> 'SpotIndex':
+        frame = pd.read_parquet(path)
+        return cls(frame.set_index('timestamp')[SPOT_COLUMN])
+
+    @classmethod
+    def for_dataset(cls, dataset_path: str, options: pd.DataFrame,
+                    bars: Optional[pd.DataFrame] = None) -> 'SpotIndex':
+        """Sidecar index for a dataset, rebuilt when the dataset is newer"""
+        path = spot_path(dataset_path)
+        if os.path.exists(path) and (not os.path.exists(dataset_path)
+                                     or os.path.getmtime(path) >= os.path.getmtime(dataset_path)):
+            return cls.load(path)
+        index = cls.build(options, bars)
+        try:
+            index.save(path)
+        except OSError as e:
+            print(f"⚠️ Could not save spot index {path}: {e}")
+        return index
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def at(self, when: Union[datetime, pd.Timestamp],
+           tolerance: pd.Timedelta = DEFAULT_TOLERANCE) -> Optional[float]:
+        """Spot at a minute (exact hit is a dict lookup), else the last one within ``tolerance``"""
+        key = _naive_utc([when]).floor('min').asi8[0]
+        value = self._by_minute.get(key)
+        if value is not None:
+            return value
+        position = np.searchsorted(self._ns, key, side='right') - 1
+        if position < 0 or key - self._ns[position] > tolerance.value:
+            return None
+        return float(self._values[position])
+
+    def lookup(self, times, tolerance: pd.Timedelta = DEFAULT_TOLERANCE) -> np.ndarray:
+        """Asof join of many timestamps at once (NaN where no spot within ``tolerance``)"""
+        keys = _naive_utc(times).asi8
+        if not len(self._ns):
+            return np.full(len(keys), np.nan)
+        positions = np.searchsorted(self._ns, keys, side='right') - 1
+        safe = np.maximum(positions, 0)
+        found = (positions >= 0) & (keys - self._ns[safe] <= tolerance.value)
+        return np.where(found, self._values[safe], np.nan)
+
+    def attach(self, options: pd.DataFrame, column: str = SPOT_COLUMN,
+               tolerance: pd.Timedelta = DEFAULT_TOLERANCE) -> pd.DataFrame:
+        """Copy of ``options`` with the spot joined on its timestamps (row order kept)"""
+        options = options.copy()
+        options[column] = self.lookup(_times(options), tolerance)
+        return options
+
+
+def main():
+    """Build the spot index for the year-long dataset and compare with the old estimate"""
+    import time
+    print("📍 UNDERLYING SPOT INDEX")
+    print("=" * 60)
+    dataset_path = 'src/data/spy_options_20240830_20250830.parquet'
+    if not os.path.exists(dataset_path):
+        print(f"❌ Dataset not found: {dataset_path}")
+        return
+    options = pd.read_parquet(dataset_path)
+    started = time.perf_counter()
+    index = SpotIndex.for_dataset(dataset_path, options)
+    print(f"✅ {len(index):,} minutes in {(time.perf_counter() - started):.2f}s -> {spot_path(dataset_path)}")
+    started = time.perf_counter()
+    joined = index.attach(options)
+    print(f"⚡ Joined {len(joined):,} rows in {(time.perf_counter() - started):.2f}s, "
+          f"{joined[SPOT_COLUMN].notna().mean():.1%} with a spot")
+
+
+if __name__ == "__main__":
+    main()
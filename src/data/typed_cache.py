@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+📦 Typed Binary Cache for JSON Data Files
+=========================================
+
+The pretty-printed JSON caches are parsed into Python object graphs on
+every start. This layer keeps each of them as a typed parquet file
+instead:
+
+- ``contracts``: ``cached_data/polygon_spy_contracts_*.json``
+- ``options_bars``: ``cached_data/polygon_spy_options_bars_*.json``
+- ``daily_bars``: ``cache/real-data/<SYMBOL>_<start>_<end>_1Day.json``
+
+Each kind has a fixed Arrow schema (dates as date32, strings repeated per
+row dictionary-encoded). A legacy JSON file is converted once into a
+``.parquet`` sidecar next to it; later loads read the sidecar straight
+into a DataFrame. Writers save typed parquet directly.
+
+Author: Advanced Options Trading System
+Version: 1.0.0
+"""
+
+import os
+import glob
+import json
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMAS = {
+    'contracts': pa.schema([
+        ('ticker', pa.string()),
+        ('underlying_ticker', _DICT),
+        ('contract_type', _DICT),
+        ('exercise_style', _DICT),
+        ('expiration_date', pa.date32()),
+        ('strike_price', pa.float64()),
+        ('shares_per_contract', pa.int32()),
+        ('primary_exchange', _DICT),
+        ('cfi', _DICT),
+    ]),
+    'options_bars': pa.schema([
+        ('ticker', _DICT),
+        ('date', pa.date32()),
+        ('timestamp', pa.timestamp('ms')),
+        ('open', pa.float64()),
+        ('high', pa.float64()),
+        ('low', pa.float64()),
+        ('close', pa.float64()),
+        ('volume', pa.float64()),
+        ('strike', pa.float64()),
+        ('expiration', pa.date32()),
+        ('option_type', _DICT),
+        ('underlying', _DICT),
+    ]),
+    'daily_bars': pa.schema([
+        ('symbol', _DICT),
+        ('date', pa.date32()),
+        ('open', pa.float64()),
+        ('high', pa.float64()),
+        ('low', pa.float64()),
+        ('close', pa.float64()),
+        ('volume', pa.int64()),
+        ('vwap', pa.float64()),
+        ('trade_count', pa.int64()),
+        ('is_real_data', pa.bool_()),
+    ]),
+}
+
+DATE_COLUMNS = {'contracts': ['expiration_date'], 'options_bars': ['date', 'expiration'], 'daily_bars': ['date']}
+
+
+def detect_kind(path: str) -> str:
+    name = os.path.basename(path)
+    if name.startswith('polygon_spy_contracts_'):
+        return 'contracts'
+    if name.startswith('polygon_spy_options_bars_'):
+        return 'options_bars'
+    if name.endswith('_1Day.json') or name.endswith('_1Day.parquet'):
+        return 'daily_bars'
+    raise ValueError(f"Unknown cache file kind: {path}")
+
+
+def _records_to_frame(kind: str, data) -> pd.DataFrame:
+    """Flatten one parsed JSON document into rows of the kind's schema"""
+    if kind == 'contracts':
+        return pd.DataFrame(data)
+    if kind == 'options_bars':
+        rows = [dict(bar, ticker=ticker) for ticker, bars in data.items() for bar in bars]
+        return pd.DataFrame(rows)
+    frame = pd.DataFrame(data.get('bars', []))
+    if 'dateString' in frame:
+        frame = frame.drop(columns=['date']).rename(columns={'dateString': 'date'})   # Drop the UTC midnight copy
+    return frame.rename(columns={'tradeCount': 'trade_count', 'isRealData': 'is_real_data'}) \
+        .drop(columns=['day'], errors='ignore').assign(symbol=data.get('symbol'))
+
+
+def to_table(kind: str, frame: pd.DataFrame) -> pa.Table:
+    """Coerce a DataFrame to the kind's schema (missing columns become nulls)"""
+    schema = SCHEMAS[kind]
+    frame = frame.copy()
+    for column in DATE_COLUMNS[kind]:
+        if column in frame:
+            frame[column] = pd.to_datetime(frame[column]).dt.date
+    if 'timestamp' in schema.names and 'timestamp' in frame:
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+    for field in schema:
+        if field.name not in frame:
+            frame[field.name] = None
+        elif pa.types.is_dictionary(field.type):
+            frame[field.name] = frame[field.name].astype(object)
+    return pa.Table.from_pandas(frame[schema.names], schema=schema, preserve_index=False)
+
+
+class TypedCache:
+    """Parquet sidecars with fixed schemas for the JSON data caches"""
+
+    @staticmethod
+    def typed_path(path: str) -> str:
+        return os.path.splitext(path)[0] + '.parquet'
+
+    def save(self, kind: str, frame: pd.DataFrame, path: str) -> str:
+        """Write ``frame`` as typed parquet (atomically); ``path`` may name the .json or .parquet"""
+        target = self.typed_path(path)
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        tmp = f"{target}.tmp"
+        pq.write_table(to_table(kind, frame), tmp)
+        os.replace(tmp, target)
+        return target
+
+    def convert(self, json_path: str, kind: Optional[str] = None) -> str:
+        """One-time JSON -> typed parquet conversion"""
+        kind = kind or detect_kind(json_path)
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        return self.save(kind, _records_to_frame(kind, data), json_path)
+
+    def load(self, path: str, kind: Optional[str] = None, columns: Optional[List[str]] = None,
+             filters: Optional[List] = None) -> pd.DataFrame:
+        """
+        Typed DataFrame for a cache file (``.json`` or ``.parquet``)
+
+        A JSON file without an up-to-date sidecar is converted first.
+        Dictionary columns come back as pandas categoricals, dates as
+        datetime64.
+        """
+        kind = kind or detect_kind(path)
+        typed = self.typed_path(path)
+        if path.endswith('.json') and os.path.exists(path):
+            if not os.path.exists(typed) or os.path.getmtime(typed) < os.path.getmtime(path):
+                self.convert(path, kind)
+        return pq.read_table(typed, columns=columns, filters=filters).to_pandas(date_as_object=False)
+
+    def latest(self, directory: str, prefix: str) -> Optional[str]:
+        """Newest cache file (by name date) for a prefix, preferring the typed copy"""
+        names = {os.path.splitext(p)[0] for ext in ('json', 'parquet')
+                 for p in glob.glob(os.path.join(directory, f"{prefix}*.{ext}"))}
+        if not names:
+            return None
+        stem = sorted(names)[-1]
+        return f"{stem}.parquet" if os.path.exists(f"{stem}.parquet") else f"{stem}.json"
+
+    def convert_all(self, directories: List[str]) -> Dict[str, str]:
+        """Convert every recognised JSON cache file that lacks a current sidecar"""
+        converted = {}
+        for directory in directories:
+            for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+                try:
+                    kind = detect_kind(path)
+                except ValueError:
+                    continue
+                typed = self.typed_path(path)
+                if not os.path.exists(typed) or os.path.getmtime(typed) < os.path.getmtime(path):
+                    converted[path] = self.convert(path, kind)
+        return converted
+
+
+def load_contracts(path: str) -> pd.DataFrame:
+    return TypedCache().load(path, 'contracts')
+
+
+def load_options_bars(path: str) -> pd.DataFrame:
+    return TypedCache().load(path, 'options_bars')
+
+
+def load_daily_bars(path: str) -> pd.DataFrame:
+    return TypedCache().load(path, 'daily_bars')
+
+
+def main():
+    """Convert the repository's JSON caches and compare load times"""
+    import time
+    print("📦 TYPED CACHE CONVERSION")
+    print("=" * 60)
+    cache = TypedCache()
+    for json_path, typed in cache.convert_all(['cached_data', os.path.join('cache', 'real-data')]).items():
+        print(f"💾 {json_path} -> {typed}")
+
+    for json_path in sorted(glob.glob('cached_data/*.json') + glob.glob('cache/real-data/*.json')):
+        started = time.perf_counter()
+        with open(json_path) as f:
+            json.load(f)
+        json_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        frame = cache.load(json_path)
+        typed_ms = (time.perf_counter() - started) * 1000
+        print(f"⚡ {os.path.basename(json_path)}: {len(frame)} rows, json {json_ms:.1f}ms -> parquet {typed_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
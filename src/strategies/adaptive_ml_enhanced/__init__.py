@@ -16,6 +16,7 @@ try:
         MarketRegime,
         TimeWindow
     )
+    from .compiled_models import CompiledModelScorer, export_compiled_models
 except ImportError:
     # Allow imports from different contexts
     from src.strategies.adaptive_ml_enhanced.strategy import (
@@ -25,11 +26,14 @@ except ImportError:
         MarketRegime,
         TimeWindow
     )
+    from src.strategies.adaptive_ml_enhanced.compiled_models import CompiledModelScorer, export_compiled_models
 
 __all__ = [
     'AdaptiveMLEnhancedStrategy',
     'AdaptiveMLEnhancedBacktester', 
     'StrategyType',
     'MarketRegime',
-    'TimeWindow'
+    'TimeWindow',
+    'CompiledModelScorer',
+    'export_compiled_models'
 ]
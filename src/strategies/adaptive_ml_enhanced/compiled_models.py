@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+⚡ Compiled Model Scoring - Array-Based ML Inference
+===================================================
+
+Converts the Phase 3 models (XGBoost + Random Forest tree ensembles,
+MLP neural networks and the feature scaler) into plain node arrays and
+weight matrices stored in one uncompressed npz file, and scores them with
+pure numpy.
+
+- Export needs scikit-learn / xgboost (runs once after training)
+- Scoring needs only numpy; members are memory-mapped straight out of the
+  npz so model startup is near-instant
+- Probabilities reproduce the framework predict_proba outputs
+
+Location: src/strategies/adaptive_ml_enhanced/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import os
+import json
+import zipfile
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+COMPILED_FORMAT_VERSION = 1
+
+# Rows scored per traversal block (bounds the rows x trees node matrix)
+SCORING_BLOCK_ROWS = 4096
+
+
+# ----------------------------------------------------------------------
+# Scoring (numpy only)
+# ----------------------------------------------------------------------
+
+class CompiledTreeEnsemble:
+    """Tree ensemble flattened into node arrays, traversed for all trees at once
+
+    kind == 'rf':  probability = mean of per-tree leaf class probability
+    kind == 'xgb': probability = sigmoid(base_margin + sum of leaf values)
+    """
+
+    def __init__(self, kind: str, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.kind = kind
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.right = arrays['right']
+        self.missing = arrays['missing']
+        self.value = arrays['value']
+        self.roots = arrays['roots']
+        self.max_depth = int(meta['max_depth'])
+        self.base_margin = float(meta.get('base_margin', 0.0))
+        self.classes_ = np.asarray(meta['classes'])
+
+    def positive_probability(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), SCORING_BLOCK_ROWS):
+            block = X[start:start + SCORING_BLOCK_ROWS]
+            out[start:start + len(block)] = self._score_block(block)
+        return out
+
+    def _score_block(self, X: np.ndarray) -> np.ndarray:
+        n_rows = len(X)
+        rows = np.arange(n_rows)[:, None]
+        nodes = np.broadcast_to(self.roots, (n_rows, len(self.roots))).copy()
+
+        for _ in range(self.max_depth):
+            is_leaf = self.left[nodes] < 0
+            if is_leaf.all():
+                break
+            x = X[rows, np.maximum(self.feature[nodes], 0)]
+            if self.kind == 'xgb':
+                go_left = x < self.threshold[nodes]
+            else:
+                go_left = x <= self.threshold[nodes]
+            child = np.where(go_left, self.left[nodes], self.right[nodes])
+            child = np.where(np.isnan(x), self.missing[nodes], child)
+            nodes = np.where(is_leaf, nodes, child)
+
+        leaf_values = self.value[nodes]
+        if self.kind == 'xgb':
+            margin = self.base_margin + leaf_values.sum(axis=1)
+            return 1.0 / (1.0 + np.exp(-margin))
+        return leaf_values.mean(axis=1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        p = self.positive_probability(X)
+        if len(self.classes_) < 2:
+            return p[:, None]
+        return np.column_stack([1.0 - p, p])
+
+
+class CompiledMLP:
+    """Multi-layer perceptron stored as weight matrices"""
+
+    _ACTIVATIONS = {
+        'relu': lambda z: np.maximum(z, 0.0),
+        'tanh': np.tanh,
+        'logistic': lambda z: 1.0 / (1.0 + np.exp(-z)),
+        'identity': lambda z: z
+    }
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        n_layers = int(meta['n_layers'])
+        self.weights = [arrays[f'W{i}'] for i in range(n_layers)]
+        self.biases = [arrays[f'b{i}'] for i in range(n_layers)]
+        self.activation = self._ACTIVATIONS[meta['activation']]
+        self.out_activation = meta['out_activation']
+        self.classes_ = np.asarray(meta['classes'])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        a = np.asarray(X, dtype=np.float64)
+        last = len(self.weights) - 1
+        for i, (W, b) in enumerate(zip(self.weights, self.biases)):
+            a = a @ W + b
+            if i < last:
+                a = self.activation(a)
+
+        if self.out_activation == 'softmax':
+            a = np.exp(a - a.max(axis=1, keepdims=True))
+            return a / a.sum(axis=1, keepdims=True)
+
+        p = 1.0 / (1.0 + np.exp(-a[:, 0]))
+        return np.column_stack([1.0 - p, p])
+
+
+class CompiledScaler:
+    """StandardScaler as mean / scale vectors"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.mean_ = arrays['mean']
+        self.scale_ = arrays['scale']
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class CompiledModelScorer:
+    """Loads an exported npz and exposes the models with a predict_proba interface"""
+
+    def __init__(self, compiled_path: str):
+        self.compiled_path = compiled_path
+        arrays = _mmap_npz(compiled_path)
+        meta = json.loads(bytes(arrays.pop('__meta__')).decode('utf-8'))
+
+        if meta.get('format_version') != COMPILED_FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {meta.get('format_version')}")
+
+        self.feature_names: List[str] = meta['feature_names']
+        self.models: Dict[str, object] = {}
+        self.scaler: Optional[CompiledScaler] = None
+
+        for key, model_meta in meta['models'].items():
+            prefix = f'{key}__'
+            model_arrays = {k[len(prefix):]: v for k, v in arrays.items() if k.startswith(prefix)}
+            kind = model_meta['kind']
+            if kind == 'scaler':
+                self.scaler = CompiledScaler(model_arrays)
+            elif kind == 'mlp':
+                self.models[key] = CompiledMLP(model_arrays, model_meta)
+            else:
+                self.models[key] = CompiledTreeEnsemble(kind, model_arrays, model_meta)
+
+        print(f"⚡ Compiled models loaded: {len(self.models)} models"
+              f"{' + scaler' if self.scaler is not None else ''} ({os.path.basename(compiled_path)})")
+
+
+def _mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map every member of an uncompressed npz (falls back to np.load if compressed)"""
+
+    arrays = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                return dict(np.load(path, allow_pickle=False))
+
+            # Local file header: 30 fixed bytes + file name + extra field
+            f.seek(info.header_offset + 26)
+            name_len = int.from_bytes(f.read(2), 'little')
+            extra_len = int.from_bytes(f.read(2), 'little')
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(),
+                                         shape=shape, order='F' if fortran_order else 'C')
+    return arrays
+
+
+# ----------------------------------------------------------------------
+# Export (needs the training frameworks)
+# ----------------------------------------------------------------------
+
+def _flatten_sklearn_forest(model) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """RandomForestClassifier -> concatenated node arrays"""
+
+    positive_col = 1 if len(model.classes_) > 1 else 0
+    parts = {k: [] for k in ('feature', 'threshold', 'left', 'right', 'missing', 'value')}
+    roots, offset, max_depth = [], 0, 0
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left < 0
+        left = np.where(is_leaf, -1, tree.children_left + offset)
+        right = np.where(is_leaf, -1, tree.children_right + offset)
+
+        missing_left = getattr(tree, 'missing_go_to_left', None)
+        if missing_left is not None:
+            missing = np.where(missing_left.astype(bool), left, right)
+        else:
+            missing = right
+
+        value = tree.value[:, 0, :]
+        value = value / value.sum(axis=1, keepdims=True)
+
+        parts['feature'].append(tree.feature)
+        parts['threshold'].append(tree.threshold)
+        parts['left'].append(left)
+        parts['right'].append(right)
+        parts['missing'].append(missing)
+        parts['value'].append(value[:, positive_col])
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    arrays = {
+        'feature': np.concatenate(parts['feature']).astype(np.int32),
+        'threshold': np.concatenate(parts['threshold']).astype(np.float64),
+        'left': np.concatenate(parts['left']).astype(np.int32),
+        'right': np.concatenate(parts['right']).astype(np.int32),
+        'missing': np.concatenate(parts['missing']).astype(np.int32),
+        'value': np.concatenate(parts['value']).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.int32)
+    }
+    meta = {'kind': 'rf', 'max_depth': max_depth, 'classes': model.classes_.tolist()}
+    return arrays, meta
+
+
+def _flatten_xgboost(model, feature_names: List[str]) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """XGBClassifier (binary:logistic) -> concatenated node arrays"""
+
+    booster = model.get_booster()
+    dumps = booster.get_dump(dump_format='json')
+
+    # Respect early stopping: predict_proba only uses trees up to best_iteration
+    try:
+        best_iteration = model.best_iteration
+    except AttributeError:
+        best_iteration = None
+    if best_iteration is not None:
+        dumps = dumps[:best_iteration + 1]
+
+    names = booster.feature_names or [f'f{i}' for i in range(len(feature_names))]
+    feature_index = {name: i for i, name in enumerate(names)}
+
+    config = json.loads(booster.save_config())
+    base_score = float(config['learner']['learner_model_param']['base_score'].strip('[]'))
+    base_score = min(max(base_score, 1e-12), 1 - 1e-12)
+
+    feature, threshold, left, right, missing, value, roots = [], [], [], [], [], [], []
+    max_depth = 0
+
+    for dump in dumps:
+        tree = json.loads(dump)
+        tree_nodes = {}
+        stack = [(tree, 0)]
+        while stack:
+            node, depth = stack.pop()
+            tree_nodes[node['nodeid']] = node
+            max_depth = max(max_depth, depth)
+            for child in node.get('children', []):
+                stack.append((child, depth + 1))
+
+        # Pruning (e.g. gamma > 0) leaves gaps in node ids: map each id to a compact slot
+        offset = len(feature)
+        slots = {node_id: offset + i for i, node_id in enumerate(sorted(tree_nodes))}
+        roots.append(slots[tree['nodeid']])
+        for node_id in sorted(tree_nodes):
+            node = tree_nodes[node_id]
+            if 'leaf' in node:
+                feature.append(-1)
+                threshold.append(0.0)
+                left.append(-1)
+                right.append(-1)
+                missing.append(-1)
+                value.append(node['leaf'])
+            else:
+                feature.append(feature_index[node['split']])
+                threshold.append(node['split_condition'])
+                left.append(slots[node['yes']])
+                right.append(slots[node['no']])
+                missing.append(slots[node['missing']])
+                value.append(0.0)
+
+    arrays = {
+        'feature': np.asarray(feature, dtype=np.int32),
+        'threshold': np.asarray(threshold, dtype=np.float32),
+        'left': np.asarray(left, dtype=np.int32),
+        'right': np.asarray(right, dtype=np.int32),
+        'missing': np.asarray(missing, dtype=np.int32),
+        'value': np.asarray(value, dtype=np.float64),
+        'roots': np.asarray(roots, dtype=np.int32)
+    }
+    meta = {
+        'kind': 'xgb',
+        'max_depth': max_depth + 1,
+        'base_margin': float(np.log(base_score / (1 - base_score))),
+        'classes': np.asarray(getattr(model, 'classes_', [0, 1])).tolist()
+    }
+    return arrays, meta
+
+
+def _flatten_mlp(model) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """MLPClassifier -> weight matrices"""
+
+    arrays = {}
+    for i, (W, b) in enumerate(zip(model.coefs_, model.intercepts_)):
+        arrays[f'W{i}'] = np.asarray(W, dtype=np.float64)
+        arrays[f'b{i}'] = np.asarray(b, dtype=np.float64)
+    meta = {
+        'kind': 'mlp',
+        'n_layers': len(model.coefs_),
+        'activation': model.activation,
+        'out_activation': model.out_activation_,
+        'classes': model.classes_.tolist()
+    }
+    return arrays, meta
+
+
+def compile_models(models: Dict[str, object], feature_names: List[str],
+                   output_path: str, scaler=None) -> str:
+    """Flatten in-memory models into one uncompressed npz file"""
+
+    all_arrays = {}
+    model_meta = {}
+
+    for key, model in models.items():
+        if hasattr(model, 'get_booster'):
+            arrays, meta = _flatten_xgboost(model, feature_names)
+        elif hasattr(model, 'estimators_'):
+            arrays, meta = _flatten_sklearn_forest(model)
+        elif hasattr(model, 'coefs_'):
+            arrays, meta = _flatten_mlp(model)
+        else:
+            print(f"   ⚠️  Skipping unsupported model type for {key}: {type(model).__name__}")
+            continue
+
+        model_meta[key] = meta
+        all_arrays.update({f'{key}__{name}': arr for name, arr in arrays.items()})
+
+    if scaler is not None:
+        n_features = len(feature_names)
+        mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros(n_features)
+        scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones(n_features)
+        all_arrays['scaler__mean'] = np.asarray(mean, dtype=np.float64)
+        all_arrays['scaler__scale'] = np.asarray(scale, dtype=np.float64)
+        model_meta['scaler'] = {'kind': 'scaler'}
+
+    meta = {
+        'format_version': COMPILED_FORMAT_VERSION,
+        'feature_names': list(feature_names),
+        'models': model_meta
+    }
+    all_arrays['__meta__'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+
+    # Uncompressed so members can be memory-mapped at load time
+    np.savez(output_path, **all_arrays)
+    return output_path
+
+
+def export_compiled_models(models_metadata_path: str, output_path: Optional[str] = None) -> str:
+    """Convert the joblib models listed in a Phase 3 metadata file and record the npz path in it"""
+
+    import joblib
+
+    with open(models_metadata_path, 'r') as f:
+        metadata = json.load(f)
+
+    models, scaler = {}, None
+    for model_key, model_path in metadata['model_files'].items():
+        if model_key == 'scaler':
+            scaler = joblib.load(model_path)
+        else:
+            models[model_key] = joblib.load(model_path)
+
+    if output_path is None:
+        output_path = models_metadata_path.replace('ml_models_metadata_', 'compiled_models_').replace('.json', '.npz')
+
+    print(f"⚡ Compiling {len(models)} models to {output_path}")
+    try:
+        compile_models(models, metadata['feature_names'], output_path, scaler=scaler)
+    except Exception:
+        # Never leave a partial or stale export behind for Phase 4 to pick up
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        if metadata.pop('compiled_models_file', None) is not None:
+            with open(models_metadata_path, 'w') as f:
+                json.dump(metadata, f, indent=2, default=str)
+        raise
+
+    metadata['compiled_models_file'] = output_path
+    with open(models_metadata_path, 'w') as f:
+        json.dump(metadata, f, indent=2, default=str)
+
+    return output_path
+
+
+def main():
+    """Export and verify compiled models for a Phase 3 metadata file"""
+
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python compiled_models.py <ml_models_metadata.json>")
+        return
+
+    compiled_path = export_compiled_models(sys.argv[1])
+
+    start = time.perf_counter()
+    scorer = CompiledModelScorer(compiled_path)
+    print(f"✅ Loaded in {(time.perf_counter() - start) * 1000:.1f}ms")
+    print(f"   📊 Features: {len(scorer.feature_names)}")
+    for key in sorted(scorer.models):
+        print(f"   🌲 {key}")
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,13 @@ warnings.filterwarnings('ignore')
 from dotenv import load_dotenv
 load_dotenv()
 
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.daily_bar_cache import DailyBarCache
+
 class PolygonOptionsData:
     """Polygon.io Options Starter Plan integration"""
     
@@ -230,6 +237,13 @@ class AlpacaOptionsData:
 class VIXDataProvider:
     """Real VIX data from Yahoo Finance"""
     
+    # Shared per-symbol daily cache: each backtest day's window only fetches uncovered days
+    cache = DailyBarCache(os.path.join(project_root, 'cached_data', 'daily_bars'))
+    
+    @staticmethod
+    def _download(symbol: str, start, end) -> pd.DataFrame:
+        return yf.download(symbol, start=start, end=end + timedelta(days=1), progress=False)
+    
     @staticmethod
     def get_vix_data(date: datetime) -> float:
         """Get VIX data for a specific date"""
@@ -238,16 +252,16 @@ class VIXDataProvider:
             start_date = date - timedelta(days=5)
             end_date = date + timedelta(days=2)
             
-            vix = yf.download('^VIX', start=start_date, end=end_date, progress=False)
+            vix = VIXDataProvider.cache.get('^VIX', start_date, end_date, VIXDataProvider._download)
             
             if not vix.empty:
                 # Get the closest date
                 target_date = date.strftime('%Y-%m-%d')
                 if target_date in vix.index.strftime('%Y-%m-%d'):
-                    vix_value = vix.loc[vix.index.strftime('%Y-%m-%d') == target_date, 'Close'].iloc[0]
+                    vix_value = vix.loc[vix.index.strftime('%Y-%m-%d') == target_date, 'close'].iloc[0]
                 else:
                     # Get the most recent value
-                    vix_value = vix['Close'].iloc[-1]
+                    vix_value = vix['close'].iloc[-1]
                 
                 print(f"✅ VIX data: {vix_value:.2f} for {date.strftime('%Y-%m-%d')}")
                 return float(vix_value)
@@ -39,6 +39,14 @@ except ImportError:
     from cash_management.position_sizer import ConservativeCashManager
     from market_intelligence.intelligence_engine import MarketIntelligenceEngine, MarketIntelligence
 
+try:
+    from src.utils.latency import timed
+except ImportError:
+    def timed(stage):
+        return lambda fn: fn
+
+from src.data.spot_index import latest_spot
+
 @dataclass
 class EnhancedStrategyRecommendation:
     """Enhanced strategy recommendation with market intelligence"""
@@ -135,6 +143,7 @@ class EnhancedHybridAdaptiveSelector:
         self.logger.info(f"   Market Intelligence Engine: ACTIVE")
         self.logger.info(f"   Strategy Matrix: 6 scenarios loaded")
     
+    @timed('strategy.select_optimal_strategy')
     def select_optimal_strategy(
         self, 
         options_data: pd.DataFrame,
@@ -796,7 +805,12 @@ class EnhancedHybridAdaptiveSelector:
         if options_data.empty:
             return 640.0  # Default SPY price
         
-        # Use the same logic as other components for consistency
+        # Spot index value joined by the data loaders
+        spot = latest_spot(options_data)
+        if spot is not None:
+            return spot
+        
+        # Frames without a joined spot: infer from moneyness
         if 'strike' in options_data.columns and 'moneyness' in options_data.columns:
             # Find ATM options (moneyness closest to 0)
             atm_options = options_data[abs(options_data['moneyness']) < 0.02]  # Within 2%
@@ -37,6 +37,8 @@ try:
 except ImportError:
     from gamma_exposure_analyzer import GammaExposureAnalyzer
 
+from src.data.spot_index import latest_spot
+
 @dataclass
 class MarketIntelligence:
     """Comprehensive market intelligence analysis"""
@@ -925,7 +927,12 @@ class MarketIntelligenceEngine:
         if options_data.empty:
             return 640.0  # Default SPY price
         
-        # Use the same logic as other components for consistency
+        # Spot index value joined by the data loaders
+        spot = latest_spot(options_data)
+        if spot is not None:
+            return spot
+        
+        # Frames without a joined spot: infer from moneyness
         if 'strike' in options_data.columns and 'moneyness' in options_data.columns:
             # Find ATM options (moneyness closest to 0)
             atm_options = options_data[abs(options_data['moneyness']) < 0.02]  # Within 2%
@@ -42,6 +42,8 @@ except ImportError:
     ALPACA_SDK_AVAILABLE = False
     print("❌ Alpaca SDK not available")
 
+from src.data.spot_index import SpotIndex, SPOT_COLUMN, latest_spot
+
 @dataclass
 class Hybrid0DTEPosition:
     """Position tracking for hybrid 0DTE trades"""
@@ -118,6 +120,7 @@ class True0DTEDataLoader:
     def __init__(self):
         self.dataset_path = '/Users/devops/Desktop/coding/advanced-options-strategies/src/data/spy_options_20230830_20240829.parquet'
         self.dataset = None
+        self.spot_index = None
         self._load_dataset()
     
     def _load_dataset(self):
@@ -140,6 +143,10 @@ class True0DTEDataLoader:
             # Filter for TRUE 0DTE options only
             self.dataset = self.dataset[self.dataset['days_to_expiry'] == 0].copy()
             
+            # Per-minute underlying price from 0DTE put-call parity
+            self.spot_index = SpotIndex.build(self.dataset)
+            self.dataset[SPOT_COLUMN] = self.spot_index.lookup(self.dataset['datetime'])
+            
             print(f"✅ TRUE 0DTE Dataset loaded: {len(self.dataset):,} records")
             print(f"📅 Date range: {self.dataset['date'].min()} to {self.dataset['date'].max()}")
             
@@ -197,6 +204,10 @@ class True0DTEDataLoader:
         if options_data.empty:
             return 400.0  # Fallback
         
+        spot = latest_spot(options_data)
+        if spot is not None:
+            return spot
+        
         # Use median strike as SPY price estimate
         return float(options_data['strike'].median())
 
@@ -26,7 +26,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
-from typing import Dict, List, Optional, Tuple, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any, Iterator
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -36,6 +37,27 @@ try:
 except ImportError:
     from hybrid_strategy_backtester import HybridStrategyBacktester
 
+from src.data.parquet_data_loader import ParquetDataLoader
+
+# Worker processes attach the coordinator's shared dataset once, in the pool initializer
+_worker_loader = None
+
+def _attach_shared_dataset(shared_dir: str):
+    global _worker_loader
+    _worker_loader = ParquetDataLoader(shared_dir=shared_dir)
+
+def _run_scenario(scenario: Dict, initial_balance: float,
+                  data_loader: Optional[ParquetDataLoader] = None) -> Dict:
+    """Backtest one scenario on an already loaded (or attached) dataset"""
+    backtester = HybridStrategyBacktester(
+        initial_balance, data_loader=data_loader if data_loader is not None else _worker_loader
+    )
+    return backtester.run_backtest(
+        scenario['start_date'],
+        scenario['end_date'],
+        max_days=scenario['max_days']
+    )
+
 class HybridMultiScenarioTester:
     """
     Test hybrid strategy across all market scenarios to validate improvement
@@ -44,8 +66,9 @@ class HybridMultiScenarioTester:
     Target: Significant improvement in scenario coverage and trade frequency
     """
     
-    def __init__(self, initial_balance: float = 25000):
+    def __init__(self, initial_balance: float = 25000, workers: int = 1):
         self.initial_balance = initial_balance
+        self.workers = workers
         
         # Define the same test scenarios as before for comparison
         self.test_scenarios = [
@@ -147,23 +170,11 @@ class HybridMultiScenarioTester:
         total_signals_all_scenarios = 0
         
         # Run backtest for each scenario
-        for i, scenario in enumerate(self.test_scenarios, 1):
-            print(f"\n🎯 SCENARIO {i}/{len(self.test_scenarios)}: {scenario['name']}")
-            print(f"📅 {scenario['description']}")
-            print(f"📆 Period: {scenario['start_date'].strftime('%Y-%m-%d')} to {scenario['end_date'].strftime('%Y-%m-%d')}")
-            print(f"🌍 Expected: {scenario['expected_regime']} regime, {scenario['expected_volatility']} volatility")
-            print("-" * 70)
-            
+        for scenario, outcome in self._scenario_outcomes():
             try:
-                # Initialize fresh backtester for each scenario
-                backtester = HybridStrategyBacktester(self.initial_balance)
-                
-                # Run backtest for this scenario
-                scenario_result = backtester.run_backtest(
-                    scenario['start_date'], 
-                    scenario['end_date'],
-                    max_days=scenario['max_days']
-                )
+                if isinstance(outcome, Exception):
+                    raise outcome
+                scenario_result = outcome
                 
                 # Analyze scenario success
                 trades_executed = scenario_result['trading_statistics']['total_trades']
@@ -233,6 +244,50 @@ class HybridMultiScenarioTester:
         
         return overall_results
     
+    def _print_scenario_header(self, i: int, scenario: Dict):
+        """Print the banner for one scenario"""
+        
+        print(f"\n🎯 SCENARIO {i}/{len(self.test_scenarios)}: {scenario['name']}")
+        print(f"📅 {scenario['description']}")
+        print(f"📆 Period: {scenario['start_date'].strftime('%Y-%m-%d')} to {scenario['end_date'].strftime('%Y-%m-%d')}")
+        print(f"🌍 Expected: {scenario['expected_regime']} regime, {scenario['expected_volatility']} volatility")
+        print("-" * 70)
+    
+    def _scenario_outcomes(self) -> Iterator[Tuple[Dict, Any]]:
+        """
+        Yield (scenario, result or exception) in scenario order
+        
+        The dataset is loaded once. With ``workers > 1`` it is published as
+        a memory-mapped copy that every worker process attaches, so N
+        workers share one copy of the data instead of loading N.
+        """
+        
+        data_loader = ParquetDataLoader()
+        
+        if self.workers <= 1:
+            for i, scenario in enumerate(self.test_scenarios, 1):
+                self._print_scenario_header(i, scenario)
+                try:
+                    yield scenario, _run_scenario(scenario, self.initial_balance, data_loader)
+                except Exception as e:
+                    yield scenario, e
+            return
+        
+        shared_dir = data_loader.share()
+        data_loader = None  # Coordinator no longer needs its private copy
+        print(f"🧩 Running {len(self.test_scenarios)} scenarios on {self.workers} workers")
+        
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_attach_shared_dataset,
+                                 initargs=(shared_dir,)) as pool:
+            futures = [pool.submit(_run_scenario, scenario, self.initial_balance)
+                       for scenario in self.test_scenarios]
+            for i, (scenario, future) in enumerate(zip(self.test_scenarios, futures), 1):
+                self._print_scenario_header(i, scenario)
+                try:
+                    yield scenario, future.result()
+                except Exception as e:
+                    yield scenario, e
+    
     def _print_scenario_summary(self, scenario_name: str, result: Dict, successful: bool):
         """Print summary for a single scenario"""
         
@@ -413,9 +468,15 @@ def main():
     print("🏗️ Following .cursorrules: Comprehensive scenario testing")
     print("=" * 90)
     
+    import argparse
+    parser = argparse.ArgumentParser(description="Hybrid multi-scenario validation")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Scenario worker processes sharing one memory-mapped dataset")
+    args = parser.parse_args()
+    
     try:
         # Initialize tester
-        tester = HybridMultiScenarioTester(25000)
+        tester = HybridMultiScenarioTester(25000, workers=args.workers)
         
         # Run comprehensive validation
         results = tester.run_comprehensive_test()
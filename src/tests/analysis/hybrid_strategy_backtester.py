@@ -52,12 +52,13 @@ class HybridStrategyBacktester:
     4. Comprehensive performance metrics
     """
     
-    def __init__(self, initial_balance: float = 25000):
+    def __init__(self, initial_balance: float = 25000,
+                 data_loader: Optional[ParquetDataLoader] = None):
         self.initial_balance = initial_balance
         self.current_balance = initial_balance
         
-        # Initialize components
-        self.data_loader = ParquetDataLoader()
+        # Initialize components (a loader can be shared across backtests)
+        self.data_loader = data_loader if data_loader is not None else ParquetDataLoader()
         self.strategy_selector = HybridAdaptiveSelector(initial_balance)
         self.cash_manager = ConservativeCashManager(initial_balance)
         
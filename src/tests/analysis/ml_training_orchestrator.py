@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+⚙️ ML Training Orchestrator - Parallel, Early-Stopped Model Training
+===================================================================
+
+Runs the Phase 3 (model family × target) training jobs concurrently under
+a CPU core budget instead of one after another:
+
+1. XGBoost - early stopping on the validation set (best iteration kept)
+2. Random Forest - trees grown in steps, stopped when validation loss stalls
+3. Neural Network - epoch-by-epoch training, best validation weights kept
+
+Also provides walk-forward time-series cross-validation with folds split
+on trading days and cached on disk, so repeated retrains reuse them.
+
+Results use the same dict layout as MLModelTrainer.train_*_models, so
+save_trained_models / analyze_feature_importance work unchanged.
+
+Location: src/tests/analysis/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import copy
+import hashlib
+import time
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+# ML Libraries
+try:
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    from sklearn.neural_network import MLPClassifier, MLPRegressor
+    from sklearn.model_selection import TimeSeriesSplit
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score, log_loss
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+    from sklearn.preprocessing import StandardScaler
+    ML_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️  ML libraries not available: {e}")
+    ML_AVAILABLE = False
+
+try:
+    import xgboost as xgb
+    XGB_AVAILABLE = True
+except ImportError:
+    XGB_AVAILABLE = False
+
+FAMILIES = ['xgboost', 'random_forest', 'neural_network']
+
+
+class MLTrainingOrchestrator:
+    """Concurrent, early-stopped training of all (model family × target) jobs"""
+
+    def __init__(self, core_budget: Optional[int] = None,
+                 early_stopping_rounds: int = 20,
+                 max_xgb_estimators: int = 1000,
+                 rf_step: int = 25, max_rf_estimators: int = 300, rf_patience: int = 2,
+                 max_nn_epochs: int = 300, nn_patience: int = 10,
+                 fold_cache_dir: Optional[str] = None):
+        if not ML_AVAILABLE:
+            raise ImportError("ML libraries required. Install with: pip install xgboost scikit-learn joblib")
+
+        self.core_budget = max(1, core_budget or os.cpu_count() or 1)
+        self.early_stopping_rounds = early_stopping_rounds
+        self.max_xgb_estimators = max_xgb_estimators
+        self.rf_step = rf_step
+        self.max_rf_estimators = max_rf_estimators
+        self.rf_patience = rf_patience
+        self.max_nn_epochs = max_nn_epochs
+        self.nn_patience = nn_patience
+        self.fold_cache_dir = fold_cache_dir or os.path.join(project_root, 'cache', 'fold_cache')
+
+        print(f"⚙️ ML Training Orchestrator: {self.core_budget} cores")
+        if not XGB_AVAILABLE:
+            print(f"   ⚠️  xgboost not installed - XGBoost jobs will be skipped")
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _plan(self, n_jobs: int) -> Tuple[int, int]:
+        """(concurrent jobs, threads per job) within the core budget"""
+
+        concurrent = max(1, min(n_jobs, self.core_budget))
+        threads_per_job = max(1, self.core_budget // concurrent)
+        return concurrent, threads_per_job
+
+    def train_all(self, X_train: pd.DataFrame, y_train: pd.DataFrame,
+                  X_val: pd.DataFrame, y_val: pd.DataFrame,
+                  families: List[str] = FAMILIES) -> Dict[str, Dict]:
+        """Train every (family × target) job concurrently; returns results per family"""
+
+        families = [f for f in families if f != 'xgboost' or XGB_AVAILABLE]
+        jobs = [(family, target) for family in families for target in y_train.columns]
+        concurrent, threads_per_job = self._plan(len(jobs))
+
+        print(f"\n⚙️ PARALLEL TRAINING: {len(jobs)} jobs, {concurrent} concurrent × {threads_per_job} threads")
+        print(f"=" * 50)
+
+        # Shared inputs: float32 matrices once, scaling once for all neural network jobs
+        X_tr = np.ascontiguousarray(X_train.to_numpy(dtype=np.float32))
+        X_va = np.ascontiguousarray(X_val.to_numpy(dtype=np.float32))
+        scaler = None
+        X_tr_scaled = X_va_scaled = None
+        if 'neural_network' in families:
+            scaler = StandardScaler()
+            X_tr_scaled = scaler.fit_transform(X_tr)
+            X_va_scaled = scaler.transform(X_va)
+
+        def run(job):
+            family, target = job
+            start = time.perf_counter()
+            y_tr = y_train[target].values
+            y_va = y_val[target].values
+            if family == 'xgboost':
+                model, metrics = self._train_xgboost(X_tr, y_tr, X_va, y_va, threads_per_job)
+            elif family == 'random_forest':
+                model, metrics = self._train_random_forest(X_tr, y_tr, X_va, y_va, threads_per_job)
+            else:
+                model, metrics = self._train_neural_network(X_tr_scaled, y_tr, X_va_scaled, y_va)
+            metrics['train_seconds'] = time.perf_counter() - start
+            print(f"   ✅ {family}/{target}: {list(metrics.keys())[0]} = {list(metrics.values())[0]:.4f} "
+                  f"({metrics['train_seconds']:.1f}s)")
+            return model, metrics
+
+        with ThreadPoolExecutor(max_workers=concurrent) as pool:
+            outputs = list(pool.map(run, jobs))
+
+        results = {family: {'models': {}, 'performance': {}} for family in families}
+        for (family, target), (model, metrics) in zip(jobs, outputs):
+            results[family]['models'][target] = model
+            results[family]['performance'][target] = metrics
+
+        for family in ('xgboost', 'random_forest'):
+            if family in results:
+                results[family]['feature_importance'] = {
+                    target: dict(zip(X_train.columns, model.feature_importances_))
+                    for target, model in results[family]['models'].items()
+                }
+        if 'neural_network' in results:
+            results['neural_network']['scaler'] = scaler
+
+        return results
+
+    # ------------------------------------------------------------------
+    # Per-family early-stopped trainers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_classification(y: np.ndarray) -> bool:
+        return len(np.unique(y)) <= 10
+
+    def _validation_loss(self, model, X_val: np.ndarray, y_val: np.ndarray, classification: bool) -> float:
+        if classification:
+            return log_loss(y_val, model.predict_proba(X_val), labels=model.classes_)
+        return mean_squared_error(y_val, model.predict(X_val))
+
+    @staticmethod
+    def _metrics(model, X_val: np.ndarray, y_val: np.ndarray, classification: bool) -> Dict:
+        """Same metric layout as MLModelTrainer"""
+
+        y_pred = model.predict(X_val)
+        if not classification:
+            return {
+                'mse': mean_squared_error(y_val, y_pred),
+                'mae': mean_absolute_error(y_val, y_pred),
+                'r2': r2_score(y_val, y_pred)
+            }
+
+        metrics = {
+            'accuracy': accuracy_score(y_val, y_pred),
+            'precision': precision_score(y_val, y_pred, average='weighted'),
+            'recall': recall_score(y_val, y_pred, average='weighted'),
+            'f1': f1_score(y_val, y_pred, average='weighted')
+        }
+        if len(np.unique(y_val)) == 2 and len(model.classes_) == 2:
+            metrics['auc'] = roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+        return metrics
+
+    def _train_xgboost(self, X_train, y_train, X_val, y_val, n_threads: int):
+        classification = self._is_classification(y_train)
+        params = dict(
+            n_estimators=self.max_xgb_estimators,
+            max_depth=6,
+            learning_rate=0.1,
+            subsample=0.8,
+            colsample_bytree=0.8,
+            random_state=42,
+            n_jobs=n_threads,
+            early_stopping_rounds=self.early_stopping_rounds
+        )
+        if classification:
+            model = xgb.XGBClassifier(eval_metric='logloss', **params)
+        else:
+            model = xgb.XGBRegressor(**params)
+
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+
+        metrics = self._metrics(model, X_val, y_val, classification)
+        metrics['best_iteration'] = int(model.best_iteration)
+        return model, metrics
+
+    def _train_random_forest(self, X_train, y_train, X_val, y_val, n_threads: int):
+        classification = self._is_classification(y_train)
+        model_cls = RandomForestClassifier if classification else RandomForestRegressor
+        model = model_cls(
+            n_estimators=self.rf_step,
+            max_depth=10,
+            min_samples_split=5,
+            min_samples_leaf=2,
+            random_state=42,
+            n_jobs=n_threads,
+            warm_start=True
+        )
+
+        best_loss, best_n, stalls = np.inf, self.rf_step, 0
+        while True:
+            model.fit(X_train, y_train)
+            loss = self._validation_loss(model, X_val, y_val, classification)
+            if loss < best_loss - 1e-6:
+                best_loss, best_n, stalls = loss, model.n_estimators, 0
+            else:
+                stalls += 1
+            if stalls >= self.rf_patience or model.n_estimators >= self.max_rf_estimators:
+                break
+            model.n_estimators += self.rf_step
+
+        # Keep only the trees up to the best validation checkpoint
+        model.estimators_ = model.estimators_[:best_n]
+        model.n_estimators = best_n
+        model.warm_start = False
+
+        metrics = self._metrics(model, X_val, y_val, classification)
+        metrics['n_estimators'] = best_n
+        return model, metrics
+
+    def _train_neural_network(self, X_train, y_train, X_val, y_val):
+        classification = self._is_classification(y_train)
+        params = dict(
+            hidden_layer_sizes=(100, 50),
+            activation='relu',
+            solver='adam',
+            alpha=0.001,
+            batch_size='auto',
+            learning_rate='constant',
+            learning_rate_init=0.001,
+            random_state=42
+        )
+        model = MLPClassifier(**params) if classification else MLPRegressor(**params)
+        classes = np.unique(y_train) if classification else None
+
+        best_loss, best_state, best_epoch, stalls = np.inf, None, 0, 0
+        for epoch in range(1, self.max_nn_epochs + 1):
+            if classification:
+                model.partial_fit(X_train, y_train, classes=classes)
+            else:
+                model.partial_fit(X_train, y_train)
+
+            loss = self._validation_loss(model, X_val, y_val, classification)
+            if loss < best_loss - 1e-6:
+                best_loss, best_epoch, stalls = loss, epoch, 0
+                best_state = (copy.deepcopy(model.coefs_), copy.deepcopy(model.intercepts_))
+            else:
+                stalls += 1
+                if stalls >= self.nn_patience:
+                    break
+
+        # Restore the best validation weights (keep the last epoch if no loss was finite)
+        if best_state is not None:
+            model.coefs_, model.intercepts_ = best_state
+        else:
+            print(f"   ⚠️  No finite validation loss in {epoch} epochs - keeping final weights")
+            best_epoch = epoch
+
+        metrics = self._metrics(model, X_val, y_val, classification)
+        metrics['best_epoch'] = best_epoch
+        return model, metrics
+
+    # ------------------------------------------------------------------
+    # Walk-forward cross-validation
+    # ------------------------------------------------------------------
+
+    def walk_forward_folds(self, dates: pd.Series, n_splits: int = 5) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """TimeSeriesSplit over trading days (a day is never split across train/test), cached on disk"""
+
+        day_values = pd.to_datetime(dates).dt.normalize().to_numpy()
+        cache_key = hashlib.sha256(day_values.tobytes() + str(n_splits).encode()).hexdigest()[:16]
+        cache_path = os.path.join(self.fold_cache_dir, f"folds_{cache_key}.npz")
+
+        if os.path.exists(cache_path):
+            cached = np.load(cache_path)
+            return [(cached[f'train_{i}'], cached[f'test_{i}']) for i in range(n_splits)]
+
+        unique_days = np.unique(day_values)
+        day_index = np.searchsorted(unique_days, day_values)
+
+        folds = []
+        for train_days, test_days in TimeSeriesSplit(n_splits=n_splits).split(unique_days):
+            folds.append((np.flatnonzero(np.isin(day_index, train_days)),
+                          np.flatnonzero(np.isin(day_index, test_days))))
+
+        os.makedirs(self.fold_cache_dir, exist_ok=True)
+        arrays = {}
+        for i, (train_idx, test_idx) in enumerate(folds):
+            arrays[f'train_{i}'] = train_idx
+            arrays[f'test_{i}'] = test_idx
+        np.savez(cache_path, **arrays)
+
+        return folds
+
+    def cross_validate(self, X: pd.DataFrame, y: pd.DataFrame, dates: pd.Series,
+                       n_splits: int = 5, families: List[str] = FAMILIES) -> Dict:
+        """Walk-forward CV: each fold trains on earlier days and validates on the following block"""
+
+        print(f"\n📈 WALK-FORWARD CROSS-VALIDATION ({n_splits} folds)")
+        print(f"=" * 50)
+
+        fold_results = []
+        for i, (train_idx, test_idx) in enumerate(self.walk_forward_folds(dates, n_splits), 1):
+            print(f"\n📅 Fold {i}/{n_splits}: {len(train_idx):,} train / {len(test_idx):,} test samples")
+            results = self.train_all(X.iloc[train_idx], y.iloc[train_idx],
+                                     X.iloc[test_idx], y.iloc[test_idx], families=families)
+            fold_results.append({family: res['performance'] for family, res in results.items()})
+
+        # Average the headline metric per (family, target) across folds
+        summary = {}
+        for family in fold_results[0]:
+            summary[family] = {}
+            for target in fold_results[0][family]:
+                metric = list(fold_results[0][family][target].keys())[0]
+                values = [fold[family][target][metric] for fold in fold_results]
+                summary[family][target] = {metric: float(np.mean(values)), f'{metric}_std': float(np.std(values))}
+
+        return {'folds': fold_results, 'summary': summary}
+
+
+def main():
+    """Parallel training on the Phase 2 dataset"""
+
+    from src.tests.analysis.phase3_ml_model_training import MLModelTrainer
+
+    dataset_path = "src/tests/analysis/ml_datasets/ml_dataset_20250801_20250829_20250830_232046_full.parquet"
+    if not os.path.exists(dataset_path):
+        print(f"❌ ML dataset not found: {dataset_path}")
+        return
+
+    trainer = MLModelTrainer()
+    results = trainer.run_complete_training(dataset_path, parallel=True)
+    if results:
+        print(f"\n✅ Parallel training complete: {results['metadata_file']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,18 +25,112 @@ from typing import Dict, List, Optional, Tuple
 
 from src.data.parquet_data_loader import ParquetDataLoader
 from src.data.ml_feature_engineering import MLFeatureEngineer
+from src.data.feature_store import FeatureStore
 
 class MLFeaturePreparation:
     """Phase 2: Prepare ML features for enhanced 0DTE strategy"""
     
-    def __init__(self):
-        self.loader = ParquetDataLoader()
+    def __init__(self, feature_store: Optional[FeatureStore] = None,
+                 loader: Optional[ParquetDataLoader] = None):
+        self.loader = loader or ParquetDataLoader()
         self.feature_engineer = MLFeatureEngineer()
+        self.feature_store = feature_store or FeatureStore()
+        
+    def _feature_store_key(self, lookback_periods: List[int], sample_size_per_day: int) -> str:
+        """Feature store key for the loaded dataset and current feature set"""
+        
+        dataset_hash = self.feature_store.dataset_fingerprint(self.loader.parquet_path)
+        return self.feature_store.make_key(
+            dataset_hash,
+            self.feature_engineer.FEATURE_SET_VERSION,
+            lookback_periods,
+            params={'sample_size_per_day': sample_size_per_day, 'min_volume': 5, 'random_state': 42}
+        )
+    
+    def load_or_compute_features(self, dates: List[datetime], sample_size_per_day: int = 500,
+                                 lookback_periods: Optional[List[int]] = None,
+                                 processing_stats: Optional[Dict] = None) -> Tuple[pd.DataFrame, str]:
+        """Feature matrix for the given days from the feature store, computing only missing days"""
+        
+        if lookback_periods is None:
+            lookback_periods = [5, 10, 20, 60]
+        if processing_stats is None:
+            processing_stats = {'days_from_cache': 0, 'processing_errors': []}
+        
+        # Feature store entry for this dataset / feature set / sampling combination
+        store_key = self._feature_store_key(lookback_periods, sample_size_per_day)
+        missing_dates = set(self.feature_store.missing_days(store_key, dates))
+        
+        print(f"🗄️ Feature store [{store_key}]: {len(dates) - len(missing_dates)} days cached, "
+              f"{len(missing_dates)} to compute")
+        
+        for i, date in enumerate(dates, 1):
+            if date not in missing_dates:
+                processing_stats['days_from_cache'] += 1
+                continue
+            
+            print(f"\n📅 Day {i}/{len(dates)}: {date.strftime('%Y-%m-%d')}")
+            
+            try:
+                features_df = self._compute_day_features(date, sample_size_per_day, lookback_periods)
+                # Empty results are stored too so days without data are not re-scanned
+                self.feature_store.put_day(store_key, date, features_df)
+                
+                if features_df is not None:
+                    print(f"   ✅ Generated {len(features_df.columns)} features for {len(features_df)} options")
+                
+            except Exception as e:
+                error_msg = f"Day {date.strftime('%Y-%m-%d')}: {str(e)}"
+                processing_stats['processing_errors'].append(error_msg)
+                print(f"   ❌ Error processing day: {e}")
+                continue
+        
+        return self.feature_store.load(store_key, dates), store_key
+    
+    def _compute_day_features(self, date: datetime, sample_size_per_day: int,
+                              lookback_periods: List[int]) -> Optional[pd.DataFrame]:
+        """Generate the feature matrix for one trading day (None if the day has no usable data)"""
+        
+        # Load options data for the day
+        options_data = self.loader.load_options_for_date(date, min_volume=5)
+        market_conditions = self.loader.analyze_market_conditions(date)
+        
+        if options_data.empty:
+            print(f"   ⚠️  No options data available")
+            return None
+        
+        spy_price = self.loader._estimate_spy_price(options_data)
+        if not spy_price:
+            print(f"   ⚠️  Could not estimate SPY price")
+            return None
+        
+        # Sample options for processing (to manage memory/time)
+        sample_size = min(sample_size_per_day, len(options_data))
+        options_sample = options_data.sample(n=sample_size, random_state=42).copy()
+        
+        print(f"   📊 Processing {len(options_sample)} options (SPY: ${spy_price:.2f})")
+        
+        # Generate comprehensive ML features
+        features_df = self.feature_engineer.generate_comprehensive_features(
+            options_sample, spy_price, market_conditions,
+            lookback_periods=lookback_periods, debug_mode=False
+        )
+        
+        # Add metadata
+        features_df['date'] = date
+        features_df['spy_price'] = spy_price
+        features_df['market_regime'] = market_conditions.get('market_regime', 'NEUTRAL')
+        
+        return features_df
         
     def prepare_ml_dataset(self, start_date: datetime, end_date: datetime,
-                          sample_days: int = 20, sample_size_per_day: int = 500) -> Dict:
+                          sample_days: int = 20, sample_size_per_day: int = 500,
+                          lookback_periods: Optional[List[int]] = None) -> Dict:
         """Prepare comprehensive ML dataset following .cursorrules methodology"""
         
+        if lookback_periods is None:
+            lookback_periods = [5, 10, 20, 60]
+        
         print("🤖 PHASE 2: ML FEATURE ENGINEERING & DATASET PREPARATION")
         print("=" * 80)
         print(f"📅 Period: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
@@ -50,70 +144,28 @@ class MLFeaturePreparation:
         
         print(f"📊 Processing {len(selected_dates)} trading days...")
         
-        all_features = []
         processing_stats = {
             'days_processed': 0,
+            'days_from_cache': 0,
             'total_options_processed': 0,
             'total_features_generated': 0,
             'feature_categories': {},
             'processing_errors': []
         }
         
-        for i, date in enumerate(selected_dates, 1):
-            print(f"\n📅 Day {i}/{len(selected_dates)}: {date.strftime('%Y-%m-%d')}")
-            
-            try:
-                # Load options data for the day
-                options_data = self.loader.load_options_for_date(date, min_volume=5)
-                market_conditions = self.loader.analyze_market_conditions(date)
-                
-                if options_data.empty:
-                    print(f"   ⚠️  No options data available")
-                    continue
-                
-                spy_price = self.loader._estimate_spy_price(options_data)
-                if not spy_price:
-                    print(f"   ⚠️  Could not estimate SPY price")
-                    continue
-                
-                # Sample options for processing (to manage memory/time)
-                sample_size = min(sample_size_per_day, len(options_data))
-                options_sample = options_data.sample(n=sample_size, random_state=42).copy()
-                
-                print(f"   📊 Processing {len(options_sample)} options (SPY: ${spy_price:.2f})")
-                
-                # Generate comprehensive ML features
-                features_df = self.feature_engineer.generate_comprehensive_features(
-                    options_sample, spy_price, market_conditions, debug_mode=False
-                )
-                
-                # Add metadata
-                features_df['date'] = date
-                features_df['spy_price'] = spy_price
-                features_df['market_regime'] = market_conditions.get('market_regime', 'NEUTRAL')
-                
-                all_features.append(features_df)
-                
-                processing_stats['days_processed'] += 1
-                processing_stats['total_options_processed'] += len(options_sample)
-                processing_stats['total_features_generated'] = len(features_df.columns)
-                
-                print(f"   ✅ Generated {len(features_df.columns)} features for {len(options_sample)} options")
-                
-            except Exception as e:
-                error_msg = f"Day {date.strftime('%Y-%m-%d')}: {str(e)}"
-                processing_stats['processing_errors'].append(error_msg)
-                print(f"   ❌ Error processing day: {e}")
-                continue
+        combined_features, store_key = self.load_or_compute_features(
+            selected_dates, sample_size_per_day, lookback_periods, processing_stats
+        )
         
-        if not all_features:
+        if combined_features.empty:
             raise ValueError("No features generated - check data availability")
         
-        # Combine all features
-        print(f"\n🔄 Combining features from {len(all_features)} days...")
-        combined_features = pd.concat(all_features, ignore_index=True)
+        processing_stats['days_processed'] = int(combined_features['date'].nunique())
+        processing_stats['total_options_processed'] = len(combined_features)
+        processing_stats['total_features_generated'] = len(combined_features.columns)
+        processing_stats['feature_store_key'] = store_key
         
-        print(f"✅ Combined dataset: {len(combined_features):,} samples × {len(combined_features.columns)} features")
+        print(f"\n✅ Combined dataset: {len(combined_features):,} samples × {len(combined_features.columns)} features")
         
         # Analyze feature quality
         feature_analysis = self._analyze_feature_quality(combined_features)
@@ -267,6 +319,10 @@ class MLFeaturePreparation:
             },
             'feature_analysis': feature_analysis,
             'processing_stats': processing_stats,
+            'feature_store': {
+                'store_dir': self.feature_store.store_dir,
+                'key': processing_stats.get('feature_store_key')
+            },
             'strategy': 'Enhanced 0DTE with Greeks - ML Dataset',
             'location': 'src/tests/analysis/ml_datasets/ (following .cursorrules)'
         }
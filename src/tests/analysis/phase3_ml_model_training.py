@@ -31,9 +31,12 @@ from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.data.feature_store import FeatureStore
+from src.strategies.adaptive_ml_enhanced.compiled_models import export_compiled_models
+from src.tests.analysis.ml_training_orchestrator import MLTrainingOrchestrator
+
 # ML Libraries
 try:
-    import xgboost as xgb
     from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
     from sklearn.linear_model import LogisticRegression
     from sklearn.neural_network import MLPClassifier, MLPRegressor
@@ -49,6 +52,14 @@ except ImportError as e:
     print("📦 Install with: pip install xgboost scikit-learn joblib")
     ML_AVAILABLE = False
 
+# XGBoost is only needed for the full Phase 3 run; feature/target preparation
+# (reused by the walk-forward harness) works with scikit-learn alone
+try:
+    import xgboost as xgb
+    XGB_AVAILABLE = True
+except ImportError:
+    XGB_AVAILABLE = False
+
 class MLModelTrainer:
     """
     Phase 3: Train ML models to enhance AdaptiveStrategySelector
@@ -62,6 +73,8 @@ class MLModelTrainer:
         self.scalers = {}
         self.feature_importance = {}
         self.performance_metrics = {}
+        self.feature_store_key = None
+        self.imputer = None
         
     def load_ml_dataset(self, dataset_path: str) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """Load the ML dataset created in Phase 2"""
@@ -75,7 +88,26 @@ class MLModelTrainer:
         df = pd.read_parquet(dataset_path)
         print(f"✅ Loaded dataset: {len(df):,} samples × {len(df.columns)} features")
         
-        # Create train/validation/test splits by date (temporal split)
+        return self._temporal_split(df)
+    
+    def load_ml_dataset_from_store(self, feature_store: FeatureStore, store_key: str,
+                                   days: Optional[List] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Load the Phase 2 feature matrix straight from the feature store (no regeneration)"""
+        
+        print(f"🗄️ Loading ML dataset from feature store [{store_key}]...")
+        
+        df = feature_store.load(store_key, days)
+        if df.empty:
+            raise FileNotFoundError(f"No stored features for key: {store_key}")
+        
+        self.feature_store_key = store_key
+        print(f"✅ Loaded dataset: {len(df):,} samples × {len(df.columns)} features")
+        
+        return self._temporal_split(df)
+    
+    def _temporal_split(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        """Create train/validation/test splits by date (temporal split)"""
+        
         df_sorted = df.sort_values('date').copy()
         
         total_samples = len(df_sorted)
@@ -92,14 +124,22 @@ class MLModelTrainer:
         
         return train_df, val_df, test_df
     
-    def prepare_features_and_targets(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Prepare features and target variables for ML training"""
+    def prepare_features_and_targets(self, df: pd.DataFrame,
+                                     imputer: Optional['SimpleImputer'] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Prepare features and target variables for ML training
+
+        The median imputer fitted here is kept in ``self.imputer``. Passing a
+        fitted ``imputer`` reuses its feature list and medians and only
+        transforms ``df`` (no statistics are taken from held-out data).
+        """
         
         print(f"🔧 Preparing features and targets...")
         
         # Exclude metadata columns and datetime columns
         exclude_cols = ['date', 'spy_price', 'market_regime', 'symbol', 'timestamp', 
-                       'underlying', 'expiration', 'option_type', 'datetime', 'expiration_dt']
+                       'underlying', 'expiration', 'option_type', 'datetime', 'expiration_dt',
+                       'expiry_id', 'strike_ticks', 'right']
         
         # Get all columns first
         all_cols = [col for col in df.columns if col not in exclude_cols]
@@ -145,22 +185,28 @@ class MLModelTrainer:
         # Use the feature_cols directly (already filtered for numeric)
         print(f"   📊 Using {len(feature_cols)} numeric features")
         
-        # Get the actual feature data
-        feature_data = df[feature_cols].copy()
-        
-        # Check for columns with all NaN values and remove them
-        valid_features = []
-        for col in feature_cols:
-            if not feature_data[col].isna().all():
-                valid_features.append(col)
-            else:
-                print(f"   Removing all-NaN column: {col}")
-        
-        print(f"   📊 Valid features after NaN check: {len(valid_features)}")
-        
-        # Handle missing values
-        imputer = SimpleImputer(strategy='median')
-        X_imputed = imputer.fit_transform(feature_data[valid_features])
+        if imputer is not None:
+            # Features and medians fitted on the training data; columns missing here are imputed
+            valid_features = list(imputer.feature_names_in_)
+            X_imputed = imputer.transform(df.reindex(columns=valid_features))
+        else:
+            # Get the actual feature data
+            feature_data = df[feature_cols].copy()
+            
+            # Check for columns with all NaN values and remove them
+            valid_features = []
+            for col in feature_cols:
+                if not feature_data[col].isna().all():
+                    valid_features.append(col)
+                else:
+                    print(f"   Removing all-NaN column: {col}")
+            
+            print(f"   📊 Valid features after NaN check: {len(valid_features)}")
+            
+            # Handle missing values
+            imputer = SimpleImputer(strategy='median')
+            X_imputed = imputer.fit_transform(feature_data[valid_features])
+            self.imputer = imputer
         
         # Create DataFrame with correct shape
         X = pd.DataFrame(
@@ -521,6 +567,7 @@ class MLModelTrainer:
             'model_files': model_files,
             'feature_names': list(X_train.columns),
             'target_variables': list(xgb_results['models'].keys()),
+            'feature_store_key': self.feature_store_key,
             'performance_metrics': {
                 'xgboost': xgb_results['performance'],
                 'random_forest': rf_results['performance'],
@@ -541,18 +588,44 @@ class MLModelTrainer:
         print(f"✅ Models saved to: {models_dir}")
         print(f"✅ Metadata saved to: {metadata_file}")
         
+        # Array-based export for fast, framework-free scoring in Phase 4 / live trading
+        try:
+            compiled_file = export_compiled_models(metadata_file)
+            print(f"✅ Compiled models saved to: {compiled_file}")
+        except Exception as e:
+            # export_compiled_models removed any partial file and metadata reference,
+            # so Phase 4 falls back to the joblib models rather than a stale export
+            print(f"❌ Compiled model export failed: {e}")
+            import traceback
+            traceback.print_exc()
+            print(f"   ⚠️  Phase 4 will load the joblib models from {metadata_file}")
+        
         return metadata_file
     
-    def run_complete_training(self, dataset_path: str) -> Dict:
-        """Run complete ML model training pipeline"""
+    def run_complete_training(self, dataset_path: Optional[str] = None,
+                              feature_store: Optional[FeatureStore] = None,
+                              feature_store_key: Optional[str] = None,
+                              parallel: bool = False, core_budget: Optional[int] = None) -> Dict:
+        """Run complete ML model training pipeline
+        
+        parallel=True trains all (model family × target) jobs concurrently with
+        early stopping via MLTrainingOrchestrator, limited to core_budget cores.
+        """
         
         print("🚀 PHASE 3: ML MODEL TRAINING & VALIDATION")
         print("🏗️ Following .cursorrules: src/tests/analysis/")
         print("=" * 80)
         
+        if not XGB_AVAILABLE:
+            print("❌ xgboost not available - install with: pip install xgboost")
+            return {}
+        
         try:
-            # Load dataset
-            train_df, val_df, test_df = self.load_ml_dataset(dataset_path)
+            # Load dataset (feature store entries avoid re-reading timestamped parquet exports)
+            if feature_store is not None and feature_store_key:
+                train_df, val_df, test_df = self.load_ml_dataset_from_store(feature_store, feature_store_key)
+            else:
+                train_df, val_df, test_df = self.load_ml_dataset(dataset_path)
             
             # Combine all data to ensure consistent feature selection
             all_df = pd.concat([train_df, val_df, test_df], ignore_index=True)
@@ -581,9 +654,16 @@ class MLModelTrainer:
             print(f"   Test samples: {len(X_test):,}")
             
             # Train models
-            xgb_results = self.train_xgboost_models(X_train, y_train, X_val, y_val)
-            rf_results = self.train_random_forest_models(X_train, y_train, X_val, y_val)
-            nn_results = self.train_neural_network_models(X_train, y_train, X_val, y_val)
+            if parallel:
+                orchestrator = MLTrainingOrchestrator(core_budget=core_budget)
+                family_results = orchestrator.train_all(X_train, y_train, X_val, y_val)
+                xgb_results = family_results['xgboost']
+                rf_results = family_results['random_forest']
+                nn_results = family_results['neural_network']
+            else:
+                xgb_results = self.train_xgboost_models(X_train, y_train, X_val, y_val)
+                rf_results = self.train_random_forest_models(X_train, y_train, X_val, y_val)
+                nn_results = self.train_neural_network_models(X_train, y_train, X_val, y_val)
             
             # Analyze feature importance
             feature_importance = self.analyze_feature_importance(xgb_results, rf_results)
@@ -623,7 +703,7 @@ def main():
     print("🏗️ Following .cursorrules: src/tests/analysis/")
     print("=" * 80)
     
-    if not ML_AVAILABLE:
+    if not ML_AVAILABLE or not XGB_AVAILABLE:
         print("❌ ML libraries not available")
         print("📦 Install with: pip install xgboost scikit-learn joblib")
         return
@@ -639,8 +719,8 @@ def main():
             print("🔄 Please run Phase 2 (phase2_ml_feature_preparation.py) first")
             return
         
-        # Run complete training
-        results = trainer.run_complete_training(dataset_path)
+        # Run complete training (parallel, early-stopped jobs)
+        results = trainer.run_complete_training(dataset_path, parallel=True)
         
         if results:
             print(f"\n📋 NEXT STEPS:")
@@ -26,6 +26,7 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
@@ -41,23 +42,47 @@ except ImportError:
 
 # Import our components
 from src.data.parquet_data_loader import ParquetDataLoader
+from src.data.feature_store import FeatureStore
+from src.strategies.adaptive_ml_enhanced.compiled_models import CompiledModelScorer
 from src.strategies.adaptive_ml_enhanced.strategy import AdaptiveMLEnhancedStrategy, StrategyType, MarketRegime, TimeWindow
 
 class MLModelLoader:
     """Load and manage trained ML models for strategy enhancement"""
     
-    def __init__(self, models_metadata_path: str):
-        if not ML_AVAILABLE:
-            raise ImportError("ML libraries required for model loading")
-        
+    TARGETS = ['target_profitable', 'target_high_confidence', 'target_high_value']
+    MODEL_TYPES = [('xgb', 'xgboost'), ('rf', 'random_forest'), ('nn', 'neural_network')]
+    
+    def __init__(self, models_metadata_path: str, max_workers: int = 1, use_compiled: bool = True):
         self.models_metadata_path = models_metadata_path
+        self.use_compiled = use_compiled
         self.models = {}
         self.scaler = None
         self.feature_names = []
         self.metadata = {}
         
+        # Optional thread pool for scoring models concurrently (tree ensembles release the GIL)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        
         self._load_models()
     
+    @classmethod
+    def from_models(cls, models: Dict, scaler, feature_names: List[str],
+                    metadata: Optional[Dict] = None, max_workers: int = 1) -> 'MLModelLoader':
+        """Wrap in-memory models (e.g. from a walk-forward window) without writing joblib files"""
+        
+        loader = cls.__new__(cls)
+        loader.models_metadata_path = None
+        loader.use_compiled = False
+        loader.models = dict(models)
+        loader.scaler = scaler
+        loader.feature_names = list(feature_names)
+        loader.metadata = dict(metadata or {})
+        loader.metadata.setdefault('feature_names', loader.feature_names)
+        loader.max_workers = max_workers
+        loader._executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+        return loader
+    
     def _load_models(self):
         """Load all trained models and metadata"""
         
@@ -72,6 +97,18 @@ class MLModelLoader:
         
         print(f"   📊 Expected features: {len(self.feature_names)}")
         
+        # Prefer the compiled array export: near-instant startup, numpy-only scoring
+        compiled_file = self.metadata.get('compiled_models_file')
+        if self.use_compiled and compiled_file and os.path.exists(compiled_file):
+            scorer = CompiledModelScorer(compiled_file)
+            self.models = scorer.models
+            self.scaler = scorer.scaler
+            print(f"✅ Loaded {len(self.models)} compiled models + scaler")
+            return
+        
+        if not ML_AVAILABLE:
+            raise ImportError("ML libraries required for model loading")
+        
         # Load models
         for model_key, model_path in model_files.items():
             if model_key == 'scaler':
@@ -83,62 +120,92 @@ class MLModelLoader:
         
         print(f"✅ Loaded {len(self.models)} models + scaler")
     
-    def predict_all_targets(self, features: pd.DataFrame) -> Dict[str, Dict]:
-        """Generate predictions for all targets using all model types"""
+    def _align_features(self, features: pd.DataFrame) -> np.ndarray:
+        """Build one contiguous float32 matrix in training column order (missing features = 0.0)"""
         
-        if features.empty:
-            return {}
-        
-        # Ensure features match training data
         missing_features = set(self.feature_names) - set(features.columns)
         if missing_features:
             print(f"⚠️  Missing features: {len(missing_features)} features")
-            # Add missing features with median values
-            for feature in missing_features:
-                features[feature] = 0.0
         
-        # Reorder features to match training
-        features_ordered = features[self.feature_names]
+        aligned = features.reindex(columns=self.feature_names, fill_value=0.0)
+        return np.ascontiguousarray(aligned.to_numpy(dtype=np.float32))
+    
+    @staticmethod
+    def _score_model(model, X: np.ndarray) -> Dict:
+        """One predict_proba call per model; class predictions derived from the probabilities"""
+        
+        proba = model.predict_proba(X)
+        classes = getattr(model, 'classes_', np.arange(proba.shape[1]))
+        return {
+            'probability': proba[:, 1] if proba.shape[1] > 1 else proba[:, 0],
+            'prediction': np.asarray(classes)[np.argmax(proba, axis=1)]
+        }
+    
+    def predict_all_targets(self, features: pd.DataFrame) -> Dict[str, Dict]:
+        """Generate predictions for all targets using all model types
         
-        predictions = {}
+        Fused path: features are aligned once, scaled once for the neural networks,
+        and each model runs a single predict_proba (optionally in parallel).
+        """
         
-        # Get predictions from each model type for each target
-        targets = ['target_profitable', 'target_high_confidence', 'target_high_value']
+        if features.empty:
+            return {}
         
-        for target in targets:
-            target_predictions = {}
-            
-            # XGBoost predictions
-            xgb_key = f'xgb_{target}'
-            if xgb_key in self.models:
-                xgb_pred = self.models[xgb_key].predict_proba(features_ordered)
-                target_predictions['xgboost'] = {
-                    'probability': xgb_pred[:, 1] if xgb_pred.shape[1] > 1 else xgb_pred[:, 0],
-                    'prediction': self.models[xgb_key].predict(features_ordered)
-                }
-            
-            # Random Forest predictions
-            rf_key = f'rf_{target}'
-            if rf_key in self.models:
-                rf_pred = self.models[rf_key].predict_proba(features_ordered)
-                target_predictions['random_forest'] = {
-                    'probability': rf_pred[:, 1] if rf_pred.shape[1] > 1 else rf_pred[:, 0],
-                    'prediction': self.models[rf_key].predict(features_ordered)
-                }
-            
-            # Neural Network predictions (needs scaling)
-            nn_key = f'nn_{target}'
-            if nn_key in self.models and self.scaler is not None:
-                features_scaled = self.scaler.transform(features_ordered)
-                nn_pred = self.models[nn_key].predict_proba(features_scaled)
-                target_predictions['neural_network'] = {
-                    'probability': nn_pred[:, 1] if nn_pred.shape[1] > 1 else nn_pred[:, 0],
-                    'prediction': self.models[nn_key].predict(features_scaled)
-                }
-            
-            predictions[target] = target_predictions
+        X = self._align_features(features)
+        X_scaled = None
+        if self.scaler is not None and any(f'nn_{t}' in self.models for t in self.TARGETS):
+            X_scaled = self.scaler.transform(X)
+        
+        # (target, model type, model, input matrix) for every available model
+        jobs = []
+        for target in self.TARGETS:
+            for prefix, model_type in self.MODEL_TYPES:
+                model = self.models.get(f'{prefix}_{target}')
+                if model is None:
+                    continue
+                if prefix == 'nn':
+                    # Neural Network predictions (needs scaling)
+                    if X_scaled is None:
+                        continue
+                    jobs.append((target, model_type, model, X_scaled))
+                else:
+                    jobs.append((target, model_type, model, X))
+        
+        if self._executor is not None:
+            results = list(self._executor.map(lambda job: self._score_model(job[2], job[3]), jobs))
+        else:
+            results = [self._score_model(model, X_in) for _, _, model, X_in in jobs]
+        
+        predictions = {target: {} for target in self.TARGETS}
+        for (target, model_type, _, _), result in zip(jobs, results):
+            predictions[target][model_type] = result
         
         return predictions
+    
+    def predict_ensemble_probabilities(self, features: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Per-row ensemble (mean across model types) probability for each target
+        
+        Lets backtests score every minute of a day in one batch and aggregate afterwards.
+        """
+        
+        predictions = self.predict_all_targets(features)
+        ensemble = {}
+        for target, by_model in predictions.items():
+            if by_model:
+                ensemble[target] = np.mean([p['probability'] for p in by_model.values()], axis=0)
+        return ensemble
+    
+    def close(self):
+        """Shut down the scoring thread pool (if one was created)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def __enter__(self) -> 'MLModelLoader':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 class MLEnhancedAdaptiveStrategy(AdaptiveMLEnhancedStrategy):
     """
@@ -227,8 +294,13 @@ class MLEnhancedAdaptiveStrategy(AdaptiveMLEnhancedStrategy):
         return features
     
     def generate_ml_enhanced_signal(self, options_data: pd.DataFrame, spy_price: float,
-                                  market_conditions: Dict, current_time: datetime) -> Dict:
-        """Generate signal enhanced with ML predictions"""
+                                  market_conditions: Dict, current_time: datetime,
+                                  precomputed_features: Optional[pd.DataFrame] = None) -> Dict:
+        """Generate signal enhanced with ML predictions
+        
+        precomputed_features: feature matrix served by the feature store for this day;
+        when provided it is scored directly instead of rebuilding features.
+        """
         
         print(f"🤖 ML-ENHANCED ADAPTIVE STRATEGY - Analyzing with ML...")
         print(f"📊 Data: {len(options_data)} options, SPY: ${spy_price:.2f}")
@@ -240,23 +312,26 @@ class MLEnhancedAdaptiveStrategy(AdaptiveMLEnhancedStrategy):
             print(f"   ❌ Base strategy rejected - no ML enhancement needed")
             return base_result
         
-        # Prepare features for ML prediction
-        ml_features = self._prepare_ml_features(options_data, spy_price, market_conditions)
+        # Prepare features for ML prediction (reuse stored features when available)
+        if precomputed_features is not None and not precomputed_features.empty:
+            ml_features = precomputed_features
+        else:
+            ml_features = self._prepare_ml_features(options_data, spy_price, market_conditions)
         
         if ml_features.empty:
             print(f"   ⚠️  No ML features available - using base signal")
             return base_result
         
-        # Get ML predictions
+        # Get ML predictions: every option row of the day scored in one fused batch
         try:
-            ml_predictions = self.ml_loader.predict_all_targets(ml_features)
+            ensemble_probs = self.ml_loader.predict_ensemble_probabilities(ml_features)
             
-            if not ml_predictions:
+            if not ensemble_probs:
                 print(f"   ⚠️  No ML predictions available - using base signal")
                 return base_result
             
             # Enhance the signal with ML predictions
-            enhanced_result = self._enhance_signal_with_ml(base_result, ml_predictions, options_data)
+            enhanced_result = self._enhance_signal_with_ml(base_result, ensemble_probs, options_data)
             
             return enhanced_result
             
@@ -265,30 +340,18 @@ class MLEnhancedAdaptiveStrategy(AdaptiveMLEnhancedStrategy):
             print(f"   🔄 Falling back to base signal")
             return base_result
     
-    def _enhance_signal_with_ml(self, base_result: Dict, ml_predictions: Dict, 
+    def _enhance_signal_with_ml(self, base_result: Dict, ensemble_probs: Dict[str, np.ndarray], 
                               options_data: pd.DataFrame) -> Dict:
-        """Enhance base signal using ML predictions"""
-        
-        # Extract ML predictions (use ensemble average)
-        profitable_probs = []
-        confidence_probs = []
-        value_probs = []
-        
-        for target, predictions in ml_predictions.items():
-            if target == 'target_profitable':
-                for model_type, pred in predictions.items():
-                    profitable_probs.extend(pred['probability'])
-            elif target == 'target_high_confidence':
-                for model_type, pred in predictions.items():
-                    confidence_probs.extend(pred['probability'])
-            elif target == 'target_high_value':
-                for model_type, pred in predictions.items():
-                    value_probs.extend(pred['probability'])
+        """Enhance base signal using per-row ensemble probabilities (averaged over the day)"""
+        
+        def day_average(target: str) -> float:
+            probs = ensemble_probs.get(target)
+            return float(np.mean(probs)) if probs is not None and len(probs) else 0.5
         
         # Calculate ensemble averages
-        avg_profitable_prob = np.mean(profitable_probs) if profitable_probs else 0.5
-        avg_confidence_prob = np.mean(confidence_probs) if confidence_probs else 0.5
-        avg_value_prob = np.mean(value_probs) if value_probs else 0.5
+        avg_profitable_prob = day_average('target_profitable')
+        avg_confidence_prob = day_average('target_high_confidence')
+        avg_value_prob = day_average('target_high_value')
         
         print(f"   🤖 ML Predictions:")
         print(f"      Profitable: {avg_profitable_prob:.3f}")
@@ -357,9 +420,28 @@ class MLEnhancedAdaptiveStrategy(AdaptiveMLEnhancedStrategy):
 class MLEnhancedBacktester:
     """Backtester for ML-Enhanced Adaptive Strategy"""
     
-    def __init__(self, ml_model_loader: MLModelLoader):
+    def __init__(self, ml_model_loader: MLModelLoader, feature_store: Optional[FeatureStore] = None,
+                 loader: Optional[ParquetDataLoader] = None):
         self.strategy = MLEnhancedAdaptiveStrategy(ml_model_loader)
-        self.loader = ParquetDataLoader()
+        self.loader = loader or ParquetDataLoader()
+        
+        # Score the exact features the models were trained on when Phase 3 recorded a store key
+        self.feature_store = feature_store
+        self.feature_store_key = ml_model_loader.metadata.get('feature_store_key')
+        if self.feature_store is not None and self.feature_store_key:
+            print(f"🗄️ Backtest scoring from feature store [{self.feature_store_key}]")
+    
+    def _stored_features(self, test_date: datetime) -> Optional[pd.DataFrame]:
+        """Model feature columns for one day from the feature store (None if not stored)"""
+        
+        if self.feature_store is None or not self.feature_store_key:
+            return None
+        
+        stored = self.feature_store.load(
+            self.feature_store_key, [test_date],
+            columns=self.strategy.ml_loader.feature_names
+        )
+        return stored if not stored.empty else None
     
     def run_ml_enhanced_backtest(self, start_date: datetime, end_date: datetime,
                                max_days: int = 10) -> Dict:
@@ -411,7 +493,8 @@ class MLEnhancedBacktester:
             
             # Generate ML-enhanced signal
             result = self.strategy.generate_ml_enhanced_signal(
-                options_data, spy_price, market_conditions, test_date
+                options_data, spy_price, market_conditions, test_date,
+                precomputed_features=self._stored_features(test_date)
             )
             
             # Record results
@@ -507,17 +590,15 @@ def main():
             print("🔄 Please run Phase 3 (phase3_ml_model_training.py) first")
             return
         
-        # Initialize ML model loader
-        ml_loader = MLModelLoader(models_metadata_path)
-        
-        # Initialize ML-enhanced backtester
-        backtester = MLEnhancedBacktester(ml_loader)
-        
-        # Run ML-enhanced backtest
-        end_date = datetime(2025, 8, 29)
-        start_date = datetime(2025, 8, 20)
-        
-        results = backtester.run_ml_enhanced_backtest(start_date, end_date, max_days=8)
+        # Initialize ML model loader and the ML-enhanced backtester
+        with MLModelLoader(models_metadata_path) as ml_loader:
+            backtester = MLEnhancedBacktester(ml_loader, feature_store=FeatureStore())
+            
+            # Run ML-enhanced backtest
+            end_date = datetime(2025, 8, 29)
+            start_date = datetime(2025, 8, 20)
+            
+            results = backtester.run_ml_enhanced_backtest(start_date, end_date, max_days=8)
         
         print(f"\n🎯 PHASE 4 COMPLETE - ML INTEGRATION SUCCESSFUL")
         print(f"=" * 80)
@@ -35,6 +35,11 @@ sys.path.append('/Users/devops/Desktop/coding/advanced-options-strategies')
 from src.strategies.hybrid_adaptive.enhanced_strategy_selector import EnhancedHybridAdaptiveSelector
 from src.strategies.cash_management.position_sizer import ConservativeCashManager
 from src.strategies.real_option_pricing.black_scholes_calculator import BlackScholesCalculator
+from src.data.spot_index import SpotIndex, SPOT_COLUMN, latest_spot
+from src.data.shared_dataset import SharedDataset
+from src.data.chain_snapshots import ChainSnapshot, ChainSnapshotStore
+from src.data.data_validation import describe, validate_dataset
+from src.data.occ_symbols import CALL, PUT, encode_frame, expiry_datetimes
 
 @dataclass
 class True0DTEPosition:
@@ -59,10 +64,25 @@ class True0DTEPosition:
 class True0DTEDataLoader:
     """Data loader specifically for the 2023-2024 dataset with TRUE 0DTE options"""
     
-    def __init__(self):
+    def __init__(self, shared_dir: Optional[str] = None):
         self.dataset_path = '/Users/devops/Desktop/coding/advanced-options-strategies/src/data/spy_options_20230830_20240829.parquet'
         self.full_dataset = None
-        self._load_dataset()
+        self.shared = None
+        self.spot_index = None
+        self.validation_stats = None
+        self.snapshots = ChainSnapshotStore()
+        if shared_dir:
+            # Worker: attach the coordinator's memory-mapped copy instead of loading
+            self.shared = SharedDataset.attach(shared_dir)
+            print(f"🧩 Shared TRUE 0DTE dataset: {shared_dir} ({len(self.shared):,} records)")
+        else:
+            self._load_dataset()
+    
+    def share(self, directory: str = 'cached_data/shared/spy_options_20230830_20240829') -> str:
+        """Publish the prepared dataset for worker processes (``shared_dir``); reused while current"""
+        if not SharedDataset.is_current(directory, self.dataset_path):
+            SharedDataset.publish(self.full_dataset, directory, source=self.dataset_path)
+        return directory
     
     def _load_dataset(self):
         """Load the 2023-2024 dataset with TRUE 0DTE options"""
@@ -72,16 +92,26 @@ class True0DTEDataLoader:
         
         self.full_dataset = pd.read_parquet(self.dataset_path)
         
+        # Validate once (mask cached next to the dataset) and keep clean rows only
+        flags, self.validation_stats = validate_dataset(self.dataset_path, self.full_dataset)
+        self.full_dataset = self.full_dataset[flags == 0].reset_index(drop=True)
+        print(f"🧪 Validation: {describe(self.validation_stats)}")
+        
         # Convert timestamps and dates
         self.full_dataset['datetime'] = pd.to_datetime(self.full_dataset['timestamp'], unit='ms')
         self.full_dataset['date'] = self.full_dataset['datetime'].dt.date
-        self.full_dataset['exp_date'] = pd.to_datetime(self.full_dataset['expiration']).dt.date
+        
+        # Integer contract identity (expiry_id / strike_ticks / right), parsed once per symbol
+        self.full_dataset = encode_frame(self.full_dataset)
+        self.full_dataset['exp_date'] = expiry_datetimes(self.full_dataset['expiry_id']).dt.date.to_numpy()
         
         # Calculate days to expiry
-        self.full_dataset['days_to_expiry'] = (
-            pd.to_datetime(self.full_dataset['expiration']) - 
-            pd.to_datetime(self.full_dataset['date'])
-        ).dt.days
+        trade_day = self.full_dataset['datetime'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        self.full_dataset['days_to_expiry'] = self.full_dataset['expiry_id'].to_numpy(dtype=np.int64) - trade_day
+        
+        # Per-minute underlying price, saved next to the dataset
+        self.spot_index = SpotIndex.for_dataset(self.dataset_path, self.full_dataset)
+        self.full_dataset[SPOT_COLUMN] = self.spot_index.lookup(self.full_dataset['datetime'])
         
         print(f"✅ Dataset loaded: {len(self.full_dataset):,} records")
         print(f"📅 Date range: {self.full_dataset['date'].min()} to {self.full_dataset['date'].max()}")
@@ -98,8 +128,15 @@ class True0DTEDataLoader:
         end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
         
         # Get dates that have 0DTE options
-        dte_0_data = self.full_dataset[self.full_dataset['days_to_expiry'] == 0]
-        available_dates = dte_0_data['date'].unique()
+        if self.shared is not None:
+            days_to_expiry = self.shared.column('days_to_expiry')
+            available_dates = [
+                d for d in self.shared.dates()
+                if (days_to_expiry[self.shared.day_rows(d)] == 0).any()
+            ]
+        else:
+            dte_0_data = self.full_dataset[self.full_dataset['days_to_expiry'] == 0]
+            available_dates = dte_0_data['date'].unique()
         
         # Filter by date range
         filtered_dates = [
@@ -122,10 +159,13 @@ class True0DTEDataLoader:
         print(f"📊 Loading TRUE 0DTE options for {target_date_only}")
         
         # Get 0DTE options for this date
-        day_data = self.full_dataset[
-            (self.full_dataset['date'] == target_date_only) &
-            (self.full_dataset['days_to_expiry'] == 0) &  # TRUE 0DTE
-            (self.full_dataset['volume'] >= min_volume)
+        if self.shared is not None:
+            day_data = self.shared.day(target_date_only)
+        else:
+            day_data = self.full_dataset[self.full_dataset['date'] == target_date_only]
+        day_data = day_data[
+            (day_data['days_to_expiry'] == 0) &  # TRUE 0DTE
+            (day_data['volume'] >= min_volume)
         ].copy()
         
         if day_data.empty:
@@ -151,8 +191,8 @@ class True0DTEDataLoader:
         # Add SPY price estimate
         day_data['spy_price_estimate'] = spy_price
         
-        calls = len(day_data[day_data['option_type'] == 'call'])
-        puts = len(day_data[day_data['option_type'] == 'put'])
+        calls = np.count_nonzero(day_data['right'] == CALL)
+        puts = np.count_nonzero(day_data['right'] == PUT)
         
         print(f"✅ Loaded {len(day_data)} TRUE 0DTE options")
         print(f"📊 Calls: {calls}, Puts: {puts}")
@@ -160,13 +200,48 @@ class True0DTEDataLoader:
         
         return day_data
     
+    def load_day_snapshot(self, trading_day) -> Optional[ChainSnapshot]:
+        """Dense minute x strike x call/put 0DTE chain for a day (built and saved on first use)"""
+        
+        day = trading_day.date() if isinstance(trading_day, datetime) else trading_day
+        snapshot = self.snapshots.load(day)
+        if snapshot is not None:
+            return snapshot
+        
+        if self.shared is not None:
+            day_data = self.shared.day(day)
+        else:
+            day_data = self.full_dataset[self.full_dataset['date'] == day]
+        day_data = day_data[day_data['days_to_expiry'] == 0]
+        if day_data.empty:
+            return None
+        
+        self.snapshots.build(day_data, days=[day])
+        return self.snapshots.load(day)
+    
+    def load_snapshot(self, current_datetime: datetime) -> pd.DataFrame:
+        """TRUE 0DTE chain as of one minute (last trade per contract so far)"""
+        
+        snapshot = self.load_day_snapshot(current_datetime.date())
+        if snapshot is None:
+            return pd.DataFrame()
+        
+        chain = snapshot.at(current_datetime)
+        chain['spy_price_estimate'] = chain[SPOT_COLUMN]
+        return chain
+    
     def _estimate_spy_price(self, options_data: pd.DataFrame) -> Optional[float]:
         """Estimate SPY price from options data"""
         
         if options_data.empty:
             return None
         
-        # Method 1: Find ATM options (strike closest to theoretical price)
+        # Joined spot index value at the latest minute
+        spot = latest_spot(options_data)
+        if spot is not None:
+            return spot
+        
+        # Fallback: find ATM options (strike closest to theoretical price)
         calls = options_data[options_data['option_type'] == 'call']
         puts = options_data[options_data['option_type'] == 'put']
         
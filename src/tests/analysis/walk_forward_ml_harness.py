@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+📈 Walk-Forward ML Retraining & Evaluation Harness
+==================================================
+
+Rolling out-of-sample evaluation of the Phase 3 models across the full
+parquet dataset:
+
+1. For each month, train on a trailing window of months
+2. Score the month through MLEnhancedBacktester (out-of-sample)
+3. Roll forward: features come from the feature store (only new days are
+   computed) and models are updated incrementally with the days that
+   entered the window instead of being retrained from scratch
+
+Incremental updates:
+- XGBoost: boosting continues from the previous booster on the new days
+- Random Forest: new trees are fitted on the new days, oldest trees are
+  dropped so the forest tracks the trailing window
+- Neural Network: a few partial_fit epochs on the new days (scaler frozen)
+
+A full retrain is done on the first window and every `full_retrain_every`
+windows (0 = never after the first).
+
+Location: src/tests/analysis/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+import pandas as pd
+import numpy as np
+from datetime import datetime
+import json
+from typing import Dict, List, Optional, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+from src.data.parquet_data_loader import ParquetDataLoader
+from src.data.feature_store import FeatureStore
+from src.tests.analysis.phase2_ml_feature_preparation import MLFeaturePreparation
+from src.tests.analysis.phase3_ml_model_training import MLModelTrainer
+from src.tests.analysis.phase4_ml_integration import MLModelLoader, MLEnhancedBacktester
+from src.tests.analysis.ml_training_orchestrator import MLTrainingOrchestrator
+
+FAMILY_PREFIX = {'xgboost': 'xgb', 'random_forest': 'rf', 'neural_network': 'nn'}
+
+
+class WalkForwardMLHarness:
+    """Monthly walk-forward retraining with out-of-sample ML-enhanced backtests"""
+
+    def __init__(self, train_months: int = 3, sample_size_per_day: int = 500,
+                 full_retrain_every: int = 0, core_budget: Optional[int] = None,
+                 incremental_xgb_rounds: int = 25, incremental_rf_trees: int = 25,
+                 max_rf_trees: int = 300, incremental_nn_epochs: int = 5,
+                 loader: Optional[ParquetDataLoader] = None,
+                 feature_store: Optional[FeatureStore] = None):
+        self.train_months = train_months
+        self.sample_size_per_day = sample_size_per_day
+        self.full_retrain_every = full_retrain_every
+        self.incremental_xgb_rounds = incremental_xgb_rounds
+        self.incremental_rf_trees = incremental_rf_trees
+        self.max_rf_trees = max_rf_trees
+        self.incremental_nn_epochs = incremental_nn_epochs
+
+        # One dataset load shared by feature preparation and every backtest window
+        self.loader = loader or ParquetDataLoader()
+        self.feature_prep = MLFeaturePreparation(feature_store=feature_store, loader=self.loader)
+        self.trainer = MLModelTrainer()
+        self.orchestrator = MLTrainingOrchestrator(core_budget=core_budget)
+
+        # Model state carried between windows
+        self.family_results: Optional[Dict[str, Dict]] = None
+        self.feature_names: List[str] = []
+        self.imputer = None
+        self.store_key: Optional[str] = None
+
+        print(f"📈 Walk-Forward ML Harness: {train_months}-month training window")
+
+    # ------------------------------------------------------------------
+    # Windows
+    # ------------------------------------------------------------------
+
+    def build_windows(self, start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None) -> List[Dict]:
+        """One window per month: trailing train_months of days -> next month of days"""
+
+        dates = self.loader.get_available_dates(start_date, end_date)
+        by_month: Dict[str, List[datetime]] = {}
+        for d in dates:
+            by_month.setdefault(d.strftime('%Y-%m'), []).append(d)
+        months = sorted(by_month)
+
+        windows = []
+        for i in range(self.train_months, len(months)):
+            train_days = [d for m in months[i - self.train_months:i] for d in by_month[m]]
+            windows.append({
+                'month': months[i],
+                'train_days': train_days,
+                'test_days': by_month[months[i]]
+            })
+        return windows
+
+    # ------------------------------------------------------------------
+    # Features / targets
+    # ------------------------------------------------------------------
+
+    def _features(self, days: List[datetime]) -> pd.DataFrame:
+        df, self.store_key = self.feature_prep.load_or_compute_features(days, self.sample_size_per_day)
+        return df
+
+    def _prepare(self, df: pd.DataFrame, align: bool) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Features/targets for one block
+
+        ``align=False`` (full retrain) fits the imputer and feature list;
+        ``align=True`` (new / test blocks) only transforms with them, so no
+        statistics come from days the models have not been trained on.
+        """
+
+        df = df.sort_values('date', kind='mergesort').reset_index(drop=True)
+        if align:
+            return self.trainer.prepare_features_and_targets(df, imputer=self.imputer)
+        X, y = self.trainer.prepare_features_and_targets(df)
+        self.imputer = self.trainer.imputer
+        return X, y
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def _full_train(self, train_df: pd.DataFrame):
+        """Full early-stopped retrain; the last 15% of the window's days is the validation set"""
+
+        days = np.sort(train_df['date'].unique())
+        split_day = days[int(len(days) * 0.85)]
+        X, y = self._prepare(train_df, align=False)
+        self.feature_names = list(X.columns)
+
+        is_train = (train_df.sort_values('date', kind='mergesort')['date'] < split_day).to_numpy()
+        self.family_results = self.orchestrator.train_all(X[is_train], y[is_train], X[~is_train], y[~is_train])
+
+    def _incremental_update(self, new_df: pd.DataFrame):
+        """Update the carried models with the days that entered the training window"""
+
+        X_new, y_new = self._prepare(new_df, align=True)
+        X = np.ascontiguousarray(X_new.to_numpy(dtype=np.float32))
+        print(f"\n🔄 Incremental update on {len(X):,} new samples")
+
+        for family, results in self.family_results.items():
+            for target, model in results['models'].items():
+                if target not in y_new.columns:
+                    continue
+                y = y_new[target].values
+
+                classes = getattr(model, 'classes_', None)
+                if classes is not None and not set(np.unique(y)).issubset(set(classes)):
+                    print(f"   ⚠️  {family}/{target}: unseen classes in new data - skipped")
+                    continue
+
+                if family == 'xgboost':
+                    # Continue boosting from the early-stopping checkpoint (later trees are discarded)
+                    try:
+                        best_iteration = model.best_iteration
+                    except AttributeError:
+                        best_iteration = None
+                    booster = model.get_booster()
+                    if best_iteration is not None:
+                        booster = booster[:best_iteration + 1]
+                    booster.set_attr(best_iteration=None, best_score=None)
+                    model.set_params(n_estimators=self.incremental_xgb_rounds, early_stopping_rounds=None)
+                    model.fit(X, y, xgb_model=booster, verbose=False)
+
+                elif family == 'random_forest':
+                    if len(np.unique(y)) < len(model.classes_):
+                        print(f"   ⚠️  {family}/{target}: single-class window - skipped")
+                        continue
+                    model.warm_start = True
+                    model.n_estimators = len(model.estimators_) + self.incremental_rf_trees
+                    model.fit(X, y)
+                    model.warm_start = False
+                    # Drop the oldest trees so the forest follows the trailing window
+                    if len(model.estimators_) > self.max_rf_trees:
+                        model.estimators_ = model.estimators_[-self.max_rf_trees:]
+                        model.n_estimators = len(model.estimators_)
+
+                elif family == 'neural_network':
+                    X_scaled = results['scaler'].transform(X)
+                    for _ in range(self.incremental_nn_epochs):
+                        model.partial_fit(X_scaled, y)
+
+            print(f"   ✅ {family} updated")
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def _model_loader(self) -> MLModelLoader:
+        models = {}
+        for family, results in self.family_results.items():
+            for target, model in results['models'].items():
+                models[f'{FAMILY_PREFIX[family]}_{target}'] = model
+        scaler = self.family_results.get('neural_network', {}).get('scaler')
+        return MLModelLoader.from_models(models, scaler, self.feature_names,
+                                         metadata={'feature_store_key': self.store_key})
+
+    def _out_of_sample_metrics(self, test_df: pd.DataFrame) -> Dict:
+        X_test, y_test = self._prepare(test_df, align=True)
+        X = np.ascontiguousarray(X_test.to_numpy(dtype=np.float32))
+
+        metrics = {}
+        for family, results in self.family_results.items():
+            if family == 'neural_network':
+                X_in = results['scaler'].transform(X)
+            else:
+                X_in = X
+            metrics[family] = {}
+            for target, model in results['models'].items():
+                if target in y_test.columns:
+                    metrics[family][target] = self.orchestrator._metrics(
+                        model, X_in, y_test[target].values, self.orchestrator._is_classification(y_test[target].values)
+                    )
+        return metrics
+
+    def run(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict:
+        """Run the walk-forward evaluation over all monthly windows"""
+
+        print("🚀 WALK-FORWARD ML EVALUATION")
+        print("🏗️ Following .cursorrules: src/tests/analysis/")
+        print("=" * 80)
+
+        windows = self.build_windows(start_date, end_date)
+        print(f"📊 {len(windows)} monthly windows")
+
+        window_results = []
+        previous_train_days: set = set()
+
+        for i, window in enumerate(windows):
+            print(f"\n{'=' * 80}")
+            print(f"📅 WINDOW {i + 1}/{len(windows)}: test month {window['month']} "
+                  f"({len(window['train_days'])} train days, {len(window['test_days'])} test days)")
+            print(f"{'=' * 80}")
+
+            # Features for train + test days (cached days are served from the feature store)
+            all_features = self._features(window['train_days'] + window['test_days'])
+            if all_features.empty:
+                print(f"   ⚠️  No features available - skipping window")
+                continue
+            test_keys = {d.date() for d in window['test_days']}
+            is_test = pd.to_datetime(all_features['date']).dt.date.isin(test_keys)
+            train_df, test_df = all_features[~is_test], all_features[is_test]
+
+            retrain = (self.family_results is None or
+                       (self.full_retrain_every and i % self.full_retrain_every == 0))
+            if retrain:
+                self._full_train(train_df)
+            else:
+                new_days = {d.date() for d in window['train_days']} - previous_train_days
+                new_df = train_df[pd.to_datetime(train_df['date']).dt.date.isin(new_days)]
+                if not new_df.empty:
+                    self._incremental_update(new_df)
+            previous_train_days = {d.date() for d in window['train_days']}
+
+            oos_metrics = self._out_of_sample_metrics(test_df) if not test_df.empty else {}
+
+            # Score the out-of-sample month through the ML-enhanced backtester
+            backtester = MLEnhancedBacktester(self._model_loader(), feature_store=self.feature_prep.feature_store,
+                                              loader=self.loader)
+            backtest = backtester.run_ml_enhanced_backtest(
+                window['test_days'][0], window['test_days'][-1], max_days=len(window['test_days'])
+            )
+
+            window_results.append({
+                'month': window['month'],
+                'mode': 'full_retrain' if retrain else 'incremental',
+                'train_days': len(window['train_days']),
+                'test_days': len(window['test_days']),
+                'out_of_sample_metrics': oos_metrics,
+                'base_signals': backtest['base_signals'],
+                'ml_enhanced_signals': backtest['ml_enhanced_signals'],
+                'avg_confidence_boost': float(np.mean(backtest['confidence_improvements']))
+                if backtest['confidence_improvements'] else 0.0
+            })
+
+        summary = self._summarize(window_results)
+        self._save_results(window_results, summary)
+        return {'windows': window_results, 'summary': summary}
+
+    def _summarize(self, window_results: List[Dict]) -> Dict:
+        """Average out-of-sample headline metric per (family, target) across windows"""
+
+        summary = {'windows': len(window_results), 'metrics': {}}
+        collected: Dict[Tuple[str, str, str], List[float]] = {}
+        for result in window_results:
+            for family, targets in result['out_of_sample_metrics'].items():
+                for target, metrics in targets.items():
+                    metric = list(metrics.keys())[0]
+                    collected.setdefault((family, target, metric), []).append(metrics[metric])
+
+        print(f"\n📊 WALK-FORWARD OUT-OF-SAMPLE SUMMARY ({len(window_results)} windows)")
+        print(f"=" * 80)
+        for (family, target, metric), values in sorted(collected.items()):
+            summary['metrics'].setdefault(family, {})[target] = {
+                metric: float(np.mean(values)),
+                f'{metric}_std': float(np.std(values))
+            }
+            print(f"   {family}/{target}: {metric} {np.mean(values):.4f} ± {np.std(values):.4f}")
+
+        summary['base_signals'] = int(sum(r['base_signals'] for r in window_results))
+        summary['ml_enhanced_signals'] = int(sum(r['ml_enhanced_signals'] for r in window_results))
+        return summary
+
+    def _save_results(self, window_results: List[Dict], summary: Dict):
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        path = os.path.join(os.path.dirname(__file__), f"walk_forward_ml_results_{timestamp}.json")
+        with open(path, 'w') as f:
+            json.dump({'windows': window_results, 'summary': summary}, f, indent=2, default=str)
+        print(f"💾 Results saved: {path}")
+
+
+def main():
+    """Run the year-long walk-forward evaluation"""
+
+    try:
+        harness = WalkForwardMLHarness(train_months=3)
+        harness.run()
+    except Exception as e:
+        print(f"❌ Error in walk-forward evaluation: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
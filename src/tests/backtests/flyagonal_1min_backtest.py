@@ -28,12 +28,21 @@ from typing import Dict, List, Optional, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.intraday_store import IntradayBarStore
+from src.data.daily_bar_cache import DailyBarCache
+
 class DataLoader:
     """Loads cached 1-minute and daily data"""
     
     def __init__(self):
         self.daily_data_dir = "cached_data"
         self.intraday_data_dir = "intraday_data"
+        self.store = IntradayBarStore(os.path.join(self.intraday_data_dir, 'store'))
         
     def load_spy_1min_data(self, date: datetime) -> pd.DataFrame:
         """Load SPY 1-minute data for a specific date"""
@@ -54,9 +63,21 @@ class DataLoader:
             print(f"❌ Error loading SPY 1-minute data: {e}")
             return pd.DataFrame()
     
+    def load_options_1min_block(self, date: datetime):
+        """A day's options minute bars as one aligned (contracts x minutes) block, or None"""
+        return self.store.load_day_block(date)
+    
     def load_options_1min_data(self, date: datetime) -> Dict[str, pd.DataFrame]:
         """Load all available options 1-minute data for a specific date"""
         try:
+            # Consolidated columnar store: one partition read for the whole day
+            block = self.load_options_1min_block(date)
+            if block is not None:
+                options_data = block.to_dict()
+                print(f"✅ Loaded {len(options_data)} options 1-minute datasets for {date.strftime('%Y-%m-%d')} (store)")
+                return options_data
+            
+            # Legacy per-contract CSVs (consolidate with src/data/intraday_store.py)
             date_str = date.strftime('%Y%m%d')
             options_data = {}
             
@@ -85,6 +106,11 @@ class DataLoader:
     def load_vix_data(self) -> pd.DataFrame:
         """Load cached VIX data"""
         try:
+            vix = DailyBarCache(os.path.join(self.daily_data_dir, 'daily_bars')).load('^VIX')
+            if not vix.empty:
+                print(f"✅ Loaded {len(vix)} VIX daily bars")
+                return vix
+            
             vix_files = [f for f in os.listdir(self.daily_data_dir) if f.startswith('vix_data_')]
             if vix_files:
                 file_path = f"{self.daily_data_dir}/{vix_files[0]}"
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+⚡ ASYNC EXECUTION MODEL FOR THE LIVE TRADERS
+============================================
+
+Keeps the trading event loop responsive. The Alpaca SDK clients are
+synchronous, so every REST call made directly from a coroutine blocks the
+loop for the full round-trip; pandas-heavy strategy selection does the
+same. This module offloads:
+
+1. Blocking broker/data I/O  -> bounded thread pool (run_io)
+2. CPU-heavy selection work  -> dedicated worker (run_cpu)
+
+Both paths enforce timeouts, and background jobs (e.g. an entry scan that
+waits on a slow chain fetch) run as tracked tasks that can be cancelled
+without touching position monitoring.
+
+Location: src/trading/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+class AsyncExecutor:
+    """
+    Offloads blocking work from the asyncio loop
+
+    ``run_io`` uses a bounded pool sized for concurrent REST calls;
+    ``run_cpu`` uses a separate single worker so a long strategy
+    selection never occupies the I/O slots. The CPU worker is a thread
+    rather than a process because the selection code works on trader
+    state (selectors, cash manager, loggers) that is not picklable.
+    """
+
+    def __init__(self, io_workers: int = 4, cpu_workers: int = 1,
+                 io_timeout: float = 10.0, cpu_timeout: float = 30.0):
+        self.io_timeout = io_timeout
+        self.cpu_timeout = cpu_timeout
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='trader-io')
+        self._cpu_pool = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix='trader-cpu')
+        self._background: Dict[str, asyncio.Task] = {}
+        self.logger = logging.getLogger(__name__)
+
+        self.stats = {'io_calls': 0, 'cpu_calls': 0, 'timeouts': 0, 'errors': 0, 'cancelled': 0}
+
+    async def _run(self, pool: ThreadPoolExecutor, timeout: Optional[float],
+                   fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # A call already running in a thread cannot be interrupted; it
+            # finishes in the background and its result is discarded.
+            self.stats['timeouts'] += 1
+            raise
+        except asyncio.CancelledError:
+            self.stats['cancelled'] += 1
+            raise
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+
+    async def run_io(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run a blocking broker/data call in the I/O pool"""
+        self.stats['io_calls'] += 1
+        return await self._run(self._io_pool, timeout or self.io_timeout, fn, *args, **kwargs)
+
+    async def run_cpu(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run CPU-heavy work (strategy selection, signal generation) on the worker"""
+        self.stats['cpu_calls'] += 1
+        return await self._run(self._cpu_pool, timeout or self.cpu_timeout, fn, *args, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Background jobs
+    # ------------------------------------------------------------------
+
+    def spawn(self, name: str, coro: Coroutine) -> bool:
+        """
+        Start a named background job unless one with that name is running
+
+        Returns False (and closes the coroutine) when the previous job is
+        still in flight, so slow jobs are skipped rather than queued.
+        """
+        task = self._background.get(name)
+        if task is not None and not task.done():
+            coro.close()
+            return False
+        task = asyncio.create_task(coro, name=name)
+        task.add_done_callback(self._log_task_result)
+        self._background[name] = task
+        return True
+
+    def is_busy(self, name: str) -> bool:
+        task = self._background.get(name)
+        return task is not None and not task.done()
+
+    def _log_task_result(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self.logger.error(f"❌ Background job {task.get_name()} failed: {error!r}")
+
+    async def cancel_all(self):
+        """Cancel every background job and wait for them to unwind"""
+        tasks = [task for task in self._background.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._background.clear()
+
+    async def shutdown(self):
+        """Cancel background jobs and release the worker pools"""
+        await self.cancel_all()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    """Demo: a slow fetch runs in the background while the monitor keeps ticking"""
+    import time
+
+    print("⚡ ASYNC EXECUTOR DEMO")
+    print("=" * 50)
+
+    def slow_chain_fetch():
+        time.sleep(0.5)
+        return "chain"
+
+    async def run_demo():
+        executor = AsyncExecutor(io_timeout=2.0)
+        ticks = 0
+
+        async def entry_scan():
+            chain = await executor.run_io(slow_chain_fetch)
+            print(f"   Entry scan received {chain}")
+
+        executor.spawn('entry_scan', entry_scan())
+        while executor.is_busy('entry_scan'):
+            ticks += 1
+            await asyncio.sleep(0.05)
+
+        print(f"✅ Position monitor ran {ticks} times during the fetch")
+        await executor.shutdown()
+
+    asyncio.run(run_demo())
+
+
+if __name__ == "__main__":
+    main()
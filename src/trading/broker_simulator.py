@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+🏦 LOCAL ORDER-MATCHING BROKER SIMULATOR
+=======================================
+
+Matches orders against historical bid/ask quotes (or quotes synthesized
+from minute bars) with the execution effects that backtest ``close``
+fills and instant paper fills both hide:
+
+1. Latency      - an order reaches the book ``LatencyModel`` seconds after
+                  the decision and fills against the quotes in force then
+2. Partial fills - each quote refresh offers only its displayed size
+3. Queue         - a resting limit order joins the back of the queue at its
+                   price and fills only after the traded volume ahead of it
+4. Slippage      - adverse ticks / fraction of the spread per fill, never
+                   through the limit
+
+Two ways in:
+
+- ``execute()``: synchronous per-order simulation for backtesters
+  (decision time in, final order out)
+- Alpaca ``TradingClient`` surface (``submit_order`` / ``get_order_by_id``
+  / ``cancel_order_by_id`` / ``get_all_positions``) on a trading clock,
+  so the paper trader and ``MultiLegOrderManager`` can trade against it
+
+``latency_sweep()`` replays one set of decisions at several latencies and
+reports what each millisecond costs in dollars.
+
+Location: src/trading/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.option_chain_cache import OCC_PATTERN
+from src.trading.trading_clock import TradingClock, WallClock
+
+
+def _is_buy(side) -> bool:
+    return str(getattr(side, 'value', side)).lower() == 'buy'
+
+
+def _ns(when) -> int:
+    return int(pd.Timestamp(when).value)
+
+
+@dataclass
+class LatencyModel:
+    """Decision-to-book delay: ``base_ms`` plus exponential jitter with mean ``jitter_ms``"""
+    base_ms: float = 50.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self):
+        self._rng = np.random.default_rng(self.seed)
+
+    def sample_ns(self) -> int:
+        jitter = self._rng.exponential(self.jitter_ms) if self.jitter_ms > 0 else 0.0
+        return int((self.base_ms + jitter) * 1_000_000)
+
+
+@dataclass
+class SlippageModel:
+    """Adverse price move per fill: fixed ticks plus a fraction of the quoted spread"""
+    ticks: int = 0
+    tick_size: float = 0.01
+    spread_fraction: float = 0.0
+
+    def adverse(self, bid: float, ask: float) -> float:
+        return self.ticks * self.tick_size + self.spread_fraction * max(ask - bid, 0.0)
+
+
+@dataclass
+class SimOrder:
+    """Simulated order (attribute names follow Alpaca's ``Order``)"""
+    id: str
+    symbol: Optional[str]
+    side: Any
+    qty: float
+    limit_price: Optional[float]
+    submitted_at: datetime
+    arrival_ns: int
+    client_order_id: Optional[str] = None
+    status: str = 'accepted'
+    filled_qty: float = 0.0
+    filled_avg_price: Optional[float] = None
+    filled_at: Optional[datetime] = None
+    legs: List[Any] = field(default_factory=list)
+    fills: List[tuple] = field(default_factory=list)          # (time_ns, qty, price)
+    # Matching state
+    next_index: int = -1
+    queue_ahead: Optional[float] = None
+
+    @property
+    def remaining(self) -> float:
+        return self.qty - self.filled_qty
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in ('accepted', 'new', 'partially_filled')
+
+
+class BrokerSimulator:
+    """
+    Order matching against per-symbol quote arrays
+
+    ``quotes`` columns: timestamp, symbol, bid, ask, bid_size, ask_size and
+    optionally volume (contracts traded until the next quote, consumed by
+    resting-order queues). A quote applies from its timestamp until the
+    next one for the same symbol.
+    """
+
+    def __init__(self, quotes: pd.DataFrame, latency: Optional[LatencyModel] = None,
+                 slippage: Optional[SlippageModel] = None, clock: Optional[TradingClock] = None,
+                 initial_cash: float = 25000.0):
+        self.latency = latency or LatencyModel()
+        self.slippage = slippage or SlippageModel()
+        self.clock = clock or WallClock()
+        self.initial_cash = initial_cash
+
+        self._books: Dict[str, Dict[str, np.ndarray]] = {}
+        frame = quotes.copy()
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+        if 'volume' not in frame.columns:
+            frame['volume'] = 0
+        frame = frame.sort_values(['symbol', 'timestamp'], kind='stable')
+        for symbol, rows in frame.groupby('symbol', sort=False):
+            self._books[str(symbol).replace('O:', '')] = {
+                'time': rows['timestamp'].values.astype('datetime64[ns]').astype(np.int64),
+                'bid': rows['bid'].to_numpy(dtype=float), 'ask': rows['ask'].to_numpy(dtype=float),
+                'bid_size': rows['bid_size'].to_numpy(dtype=float),
+                'ask_size': rows['ask_size'].to_numpy(dtype=float),
+                'volume': rows['volume'].to_numpy(dtype=float),
+            }
+        self.reset()
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_bars(cls, bars: pd.DataFrame, spread_pct: float = 0.04, min_half_spread: float = 0.01,
+                  quote_size: float = 10.0, **kwargs) -> 'BrokerSimulator':
+        """
+        Quotes synthesized around minute-bar closes (parquet schema)
+
+        A bar's quote is published when the bar completes, as in the
+        market replay; its volume feeds the queues of resting orders.
+        """
+        return cls(cls._bar_quotes(bars, spread_pct, min_half_spread, quote_size), **kwargs)
+
+    @classmethod
+    def from_replay(cls, server, quote_size: float = 10.0, **kwargs) -> 'BrokerSimulator':
+        """Match against a ``MarketReplayServer`` day (same synthesized spreads) on its clock"""
+        kwargs.setdefault('clock', server.clock)
+        options = cls._bar_quotes(server.options_bars, server.option_spread_pct, 0.01, quote_size)
+        spy = cls._bar_quotes(server.spy_bars.assign(symbol=server.underlying), 0.0,
+                              server.stock_half_spread, 100.0)
+        return cls(pd.concat([options, spy], ignore_index=True), **kwargs)
+
+    @staticmethod
+    def _bar_quotes(bars: pd.DataFrame, spread_pct: float, min_half_spread: float,
+                    quote_size: float) -> pd.DataFrame:
+        timestamps = bars['timestamp']
+        if not np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = pd.to_datetime(timestamps, unit='ms')
+        close = bars['close'].to_numpy(dtype=float)
+        half = np.maximum(close * spread_pct / 2, min_half_spread)
+        return pd.DataFrame({'timestamp': timestamps + pd.Timedelta(minutes=1), 'symbol': bars['symbol'],
+                             'bid': np.maximum(close - half, 0.0), 'ask': close + half,
+                             'bid_size': quote_size, 'ask_size': quote_size,
+                             'volume': bars['volume'].to_numpy(dtype=float)})
+
+    def reset(self):
+        """Clear orders, positions and cash (the quote arrays are kept)"""
+        self.cash = self.initial_cash
+        self.orders: Dict[str, SimOrder] = {}
+        self.positions: Dict[str, float] = {}
+        self._open: List[SimOrder] = []
+
+    # ------------------------------------------------------------------
+    # Book access
+    # ------------------------------------------------------------------
+
+    def quote_at(self, symbol: str, when_ns: int) -> Optional[Dict[str, float]]:
+        """Quote in force at ``when_ns`` (None before the first quote)"""
+        book = self._books.get(symbol.replace('O:', ''))
+        if book is None:
+            return None
+        i = int(np.searchsorted(book['time'], when_ns, side='right')) - 1
+        if i < 0:
+            return None
+        return {k: float(v[i]) for k, v in book.items()}
+
+    def mid_at(self, symbol: str, when) -> Optional[float]:
+        quote = self.quote_at(symbol, _ns(when))
+        return None if quote is None else (quote['bid'] + quote['ask']) / 2
+
+    # ------------------------------------------------------------------
+    # Backtest interface
+    # ------------------------------------------------------------------
+
+    def execute(self, symbol: str, side, qty: float, decision_time: datetime,
+                limit_price: Optional[float] = None, until: Optional[datetime] = None,
+                legs: Optional[List[Any]] = None) -> SimOrder:
+        """
+        Simulate one order decided at ``decision_time`` to completion
+
+        Matching runs until ``until`` (end of data by default); whatever is
+        still open then is cancelled.
+        """
+        order = self._new_order(symbol, side, qty, limit_price, decision_time, legs)
+        self._match(order, _ns(until) if until is not None else np.iinfo(np.int64).max)
+        if order.is_open:
+            order.status = 'canceled'
+        return order
+
+    # ------------------------------------------------------------------
+    # Alpaca TradingClient surface
+    # ------------------------------------------------------------------
+
+    def get_account(self) -> SimpleNamespace:
+        return SimpleNamespace(account_number='SIMULATOR', status='ACTIVE', cash=str(self.cash),
+                               buying_power=str(self.cash), equity=str(self.cash),
+                               options_trading_level=3)
+
+    def submit_order(self, order_data) -> SimOrder:
+        order = self._new_order(getattr(order_data, 'symbol', None), getattr(order_data, 'side', None),
+                                float(getattr(order_data, 'qty', 0) or 0),
+                                getattr(order_data, 'limit_price', None), self.clock.now(),
+                                getattr(order_data, 'legs', None) or None)
+        order.client_order_id = getattr(order_data, 'client_order_id', None) or order.id
+        self._open.append(order)
+        self._process()
+        return order
+
+    def get_order_by_id(self, order_id: str) -> SimOrder:
+        self._process()
+        return self.orders[str(order_id)]
+
+    def get_orders(self, filter=None) -> List[SimOrder]:
+        self._process()
+        return list(self.orders.values())
+
+    def cancel_order_by_id(self, order_id: str):
+        self._process()
+        order = self.orders[str(order_id)]
+        if order.is_open:
+            order.status = 'canceled'
+            self._open = [o for o in self._open if o.is_open]
+
+    def get_all_positions(self) -> List[SimpleNamespace]:
+        self._process()
+        return [SimpleNamespace(symbol=s, qty=str(q)) for s, q in self.positions.items() if q != 0]
+
+    def _process(self):
+        """Match every working order up to the clock's current time"""
+        if not self._open:
+            return
+        now_ns = _ns(self.clock.now())
+        for order in self._open:
+            self._match(order, now_ns)
+        self._open = [o for o in self._open if o.is_open]
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _new_order(self, symbol, side, qty, limit_price, decision_time, legs) -> SimOrder:
+        order = SimOrder(id=str(uuid.uuid4()), symbol=symbol.replace('O:', '') if symbol else 'MLEG',
+                         side=side, qty=qty, limit_price=None if limit_price is None else float(limit_price),
+                         submitted_at=decision_time, arrival_ns=_ns(decision_time) + self.latency.sample_ns())
+        if legs:
+            order.legs = [SimpleNamespace(symbol=l.symbol.replace('O:', ''), side=l.side,
+                                          ratio_qty=float(getattr(l, 'ratio_qty', 1) or 1),
+                                          filled_avg_price=None, filled_qty=0.0) for l in legs]
+        self.orders[order.id] = order
+        return order
+
+    def _match(self, order: SimOrder, until_ns: int):
+        if order.arrival_ns > until_ns or not order.is_open:
+            return
+        if order.legs:
+            self._match_legs(order, until_ns)
+            return
+        book = self._books.get(order.symbol)
+        if book is None:
+            order.status = 'new'
+            return
+        times = book['time']
+        if order.next_index < 0:
+            order.next_index = max(int(np.searchsorted(times, order.arrival_ns, side='right')) - 1, 0)
+        buy = _is_buy(order.side)
+        limit = order.limit_price
+        j = order.next_index
+        while j < len(times) and max(times[j], order.arrival_ns) <= until_ns and order.remaining > 0:
+            bid, ask = book['bid'][j], book['ask'][j]
+            touch = ask if buy else bid
+            marketable = limit is None or (touch <= limit if buy else touch >= limit)
+            if marketable:
+                price = touch + self.slippage.adverse(bid, ask) * (1 if buy else -1)
+                if limit is not None:
+                    price = min(price, limit) if buy else max(price, limit)
+                size = book['ask_size'][j] if buy else book['bid_size'][j]
+                self._fill(order, min(order.remaining, size), price, max(times[j], order.arrival_ns))
+            elif (limit >= bid if buy else limit <= ask):
+                # Resting at (or improving) the touch: traded volume works through the queue
+                if order.queue_ahead is None:
+                    at_touch = abs((bid if buy else ask) - limit) < 1e-9
+                    order.queue_ahead = (book['bid_size'][j] if buy else book['ask_size'][j]) if at_touch else 0.0
+                volume = book['volume'][j]
+                consumed = min(order.queue_ahead, volume)
+                order.queue_ahead -= consumed
+                available = volume - consumed
+                if available > 0:
+                    self._fill(order, min(order.remaining, available), limit, max(times[j], order.arrival_ns))
+            j += 1
+        order.next_index = j
+        if order.filled_qty == 0 and order.status == 'accepted':
+            order.status = 'new'
+
+    def _match_legs(self, order: SimOrder, until_ns: int):
+        """Multi-leg: every leg fills together at the quotes in force, net within the limit"""
+        books = [self._books.get(leg.symbol) for leg in order.legs]
+        if any(book is None for book in books):
+            order.status = 'new'
+            return
+        times = books[0]['time']
+        if order.next_index < 0:
+            order.next_index = max(int(np.searchsorted(times, order.arrival_ns, side='right')) - 1, 0)
+        j = order.next_index
+        while j < len(times) and max(times[j], order.arrival_ns) <= until_ns and order.remaining > 0:
+            when = max(times[j], order.arrival_ns)
+            quotes = [self.quote_at(leg.symbol, when) for leg in order.legs]
+            j += 1
+            if any(q is None for q in quotes):
+                continue
+            prices, sizes = [], []
+            for leg, q in zip(order.legs, quotes):
+                buy = _is_buy(leg.side)
+                adverse = self.slippage.adverse(q['bid'], q['ask'])
+                prices.append(q['ask'] + adverse if buy else q['bid'] - adverse)
+                sizes.append((q['ask_size'] if buy else q['bid_size']) / leg.ratio_qty)
+            net = sum(p * leg.ratio_qty * (1 if _is_buy(leg.side) else -1) for leg, p in zip(order.legs, prices))
+            if order.limit_price is not None and net > order.limit_price:
+                continue
+            qty = min(order.remaining, min(sizes))
+            for leg, price in zip(order.legs, prices):
+                self._apply_position(leg.symbol, leg.side, qty * leg.ratio_qty, price)
+                leg.filled_qty += qty * leg.ratio_qty
+                leg.filled_avg_price = price if leg.filled_avg_price is None else \
+                    (leg.filled_avg_price * (leg.filled_qty - qty * leg.ratio_qty) + price * qty * leg.ratio_qty) / leg.filled_qty
+            self._record(order, qty, net, when)
+        order.next_index = j
+        for leg in order.legs:
+            leg.status = 'filled' if leg.filled_qty and order.remaining == 0 else order.status
+        if order.filled_qty == 0 and order.status == 'accepted':
+            order.status = 'new'
+
+    def _fill(self, order: SimOrder, qty: float, price: float, when_ns: int):
+        if qty <= 0:
+            return
+        self._apply_position(order.symbol, order.side, qty, price)
+        self._record(order, qty, price, when_ns)
+
+    @staticmethod
+    def _record(order: SimOrder, qty: float, price: float, when_ns: int):
+        if qty <= 0:
+            return
+        order.fills.append((int(when_ns), qty, price))
+        previous = order.filled_avg_price or 0.0
+        order.filled_avg_price = (previous * order.filled_qty + price * qty) / (order.filled_qty + qty)
+        order.filled_qty += qty
+        order.filled_at = pd.Timestamp(int(when_ns)).to_pydatetime()
+        order.status = 'filled' if order.remaining <= 1e-9 else 'partially_filled'
+
+    def _apply_position(self, symbol: str, side, qty: float, price: float):
+        signed = qty if _is_buy(side) else -qty
+        multiplier = 100 if OCC_PATTERN.match(symbol) else 1
+        self.positions[symbol] = self.positions.get(symbol, 0.0) + signed
+        self.cash -= signed * price * multiplier
+
+    # ------------------------------------------------------------------
+    # Latency economics
+    # ------------------------------------------------------------------
+
+    def latency_sweep(self, decisions: List[Dict[str, Any]], latencies_ms: List[float],
+                      jitter_ms: float = 0.0, until_seconds: Optional[float] = None) -> pd.DataFrame:
+        """
+        Dollar cost of each latency for the same set of decisions
+
+        ``decisions``: dicts with symbol, side, qty, decision_time and
+        optional limit_price. Cost is measured against the mid at decision
+        time (per-contract multiplier applied); unfilled quantity is
+        reported separately as it has no price.
+        """
+        saved_latency = self.latency
+        rows = []
+        try:
+            for latency_ms in latencies_ms:
+                self.reset()
+                self.latency = LatencyModel(latency_ms, jitter_ms, seed=saved_latency.seed)
+                cost = filled = wanted = 0.0
+                for d in decisions:
+                    until = d['decision_time'] + timedelta(seconds=until_seconds) if until_seconds else None
+                    order = self.execute(d['symbol'], d['side'], d['qty'], d['decision_time'],
+                                         d.get('limit_price'), until)
+                    mid = self.mid_at(order.symbol, d['decision_time'])
+                    multiplier = 100 if OCC_PATTERN.match(order.symbol) else 1
+                    wanted += order.qty
+                    filled += order.filled_qty
+                    if order.filled_qty and mid is not None:
+                        sign = 1 if _is_buy(order.side) else -1
+                        cost += sign * (order.filled_avg_price - mid) * order.filled_qty * multiplier
+                rows.append({'latency_ms': latency_ms, 'fill_rate': filled / wanted if wanted else 0.0,
+                             'filled_qty': filled, 'execution_cost': cost})
+        finally:
+            self.latency = saved_latency
+            self.reset()
+        result = pd.DataFrame(rows)
+        result['cost_vs_fastest'] = result['execution_cost'] - result['execution_cost'].iloc[0]
+        return result
+
+
+def main():
+    """Demo: what latency costs on a trending option"""
+    print("🏦 BROKER SIMULATOR DEMO")
+    print("=" * 50)
+
+    # One contract's quotes every 100ms, drifting up a cent per update
+    times = pd.date_range('2025-08-29 10:00', periods=3000, freq='100ms')
+    mids = 2.00 + 0.01 * np.arange(len(times)) / 10
+    quotes = pd.DataFrame({'timestamp': times, 'symbol': 'SPY250829C00645000',
+                           'bid': mids - 0.02, 'ask': mids + 0.02, 'bid_size': 20, 'ask_size': 20})
+    broker = BrokerSimulator(quotes, slippage=SlippageModel(spread_fraction=0.1))
+
+    decisions = [{'symbol': 'SPY250829C00645000', 'side': 'buy', 'qty': 5,
+                  'decision_time': times[i].to_pydatetime()} for i in range(0, 2500, 10)]
+    started = pd.Timestamp.now()
+    sweep = broker.latency_sweep(decisions, [1, 50, 250, 1000])
+    elapsed = (pd.Timestamp.now() - started).total_seconds()
+    print(sweep.to_string(index=False))
+    print(f"✅ {len(decisions) * len(sweep)} orders simulated in {elapsed:.2f}s "
+          f"({len(decisions) * len(sweep) / elapsed:,.0f} orders/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,6 +34,7 @@ import logging
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from types import SimpleNamespace
 
 # Add project root to path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -61,6 +62,13 @@ sys.path.append(str(Path(__file__).parent.parent / 'tests' / 'analysis'))
 try:
     from fixed_dynamic_risk_backtester import FixedDynamicRiskBacktester
     from src.utils.detailed_logger import DetailedLogger
+    from src.trading.market_data_stream import StreamingMarketData
+    from src.trading.async_execution import AsyncExecutor
+    from src.trading.option_chain_cache import LiveOptionChainCache
+    from src.trading.market_replay import MarketReplayServer
+    from src.trading.state_journal import StateJournal
+    from src.trading.trading_clock import TradingClock, TradingScheduler, WallClock
+    from src.utils.latency import LATENCY, timed
     BACKTESTER_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️  Backtester not available: {e}")
@@ -80,8 +88,13 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
     Only changes: Historical parquet data → Live Alpaca market data
     """
     
-    def __init__(self, initial_balance: float = 25000):
-        if not ALPACA_AVAILABLE:
+    def __init__(self, initial_balance: float = 25000,
+                 market_stream: Optional['StreamingMarketData'] = None,
+                 use_streaming: bool = True,
+                 replay: Optional['MarketReplayServer'] = None,
+                 clock: Optional['TradingClock'] = None,
+                 journal_dir: Optional[str] = None):
+        if not ALPACA_AVAILABLE and replay is None:
             raise ImportError("Alpaca SDK required for live paper trading")
         if not BACKTESTER_AVAILABLE:
             raise ImportError("FixedDynamicRiskBacktester required for inheritance")
@@ -89,8 +102,48 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         # Initialize parent with EXACT same parameters as successful backtest
         super().__init__(initial_balance=initial_balance)
         
+        # Operational logger (the parent's self.logger is the DetailedLogger trade log)
+        self.live_logger = logging.getLogger(__name__)
+        
+        # Market replay stands in for Alpaca (no credentials or network needed)
+        self.replay = replay
+        
+        # Every time-dependent decision reads market time from this clock
+        self.clock = clock or (replay.clock if replay is not None else WallClock())
+        self.scheduler = TradingScheduler(self.clock)
+        
         # Initialize Alpaca clients for live data
-        self.setup_alpaca_clients()
+        if replay is not None:
+            self.setup_replay_clients(replay)
+        else:
+            self.setup_alpaca_clients()
+        
+        # Streaming SPY/0DTE quotes; REST polling remains the fallback
+        if market_stream is None and use_streaming:
+            if replay is not None:
+                market_stream = replay.market_data()
+            else:
+                market_stream = StreamingMarketData.from_alpaca(
+                    os.getenv('ALPACA_API_KEY'), os.getenv('ALPACA_SECRET_KEY'), clock=self.clock
+                )
+        self.market_stream = market_stream
+        self.quote_max_age_seconds = 5.0
+        self.heartbeat_seconds = 60
+        self.entry_check_interval_seconds = 60
+        self.last_entry_check = datetime.min
+        self.last_spy_price: Optional[float] = None
+        
+        # Blocking SDK calls and strategy selection run off the event loop
+        self.executor = AsyncExecutor(io_workers=4, io_timeout=10.0, cpu_timeout=30.0)
+        self.monitor_timeout_seconds = 2.0
+        
+        # Live 0DTE chain: one snapshot per session, then streaming quote deltas
+        self.option_chain = LiveOptionChainCache(underlying='SPY', strike_range=20.0)
+        if self.market_stream is not None:
+            self.market_stream.add_listener(self.option_chain.on_stream_event)
+        
+        # Crash-safe session state (positions, balance, counters) - replayed on startup
+        self.journal = StateJournal(journal_dir) if journal_dir else None
         
         # Trading state management
         self.is_trading = False
@@ -105,7 +158,7 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         ]
         
         # Performance tracking (inherits from parent but adds live tracking)
-        self.session_start_time = datetime.now()
+        self.session_start_time = self.clock.now()
         self.last_signal_check = datetime.min
         self.signals_generated_today = 0
         self.max_signals_per_day = 3
@@ -113,15 +166,12 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         # Enhanced logging for live trading
         self.setup_live_logging()
         
-        # Create a proper logger instance
-        self.logger = logging.getLogger(__name__)
-        
-        self.logger.info(f"🚀 DYNAMIC RISK PAPER TRADER INITIALIZED")
-        self.logger.info(f"   Session ID: {self.trading_session_id}")
-        self.logger.info(f"   Initial Balance: ${initial_balance:,.2f}")
-        self.logger.info(f"   Entry Times: {[t.strftime('%H:%M') for t in self.entry_times]}")
-        self.logger.info(f"   ✅ INHERITS PROVEN +14.34% MONTHLY RETURN LOGIC")
-        self.logger.info(f"   ✅ ALPACA PAPER TRADING MODE")
+        self.live_logger.info(f"🚀 DYNAMIC RISK PAPER TRADER INITIALIZED")
+        self.live_logger.info(f"   Session ID: {self.trading_session_id}")
+        self.live_logger.info(f"   Initial Balance: ${initial_balance:,.2f}")
+        self.live_logger.info(f"   Entry Times: {[t.strftime('%H:%M') for t in self.entry_times]}")
+        self.live_logger.info(f"   ✅ INHERITS PROVEN +14.34% MONTHLY RETURN LOGIC")
+        self.live_logger.info(f"   ✅ ALPACA PAPER TRADING MODE")
     
     def setup_alpaca_clients(self):
         """Initialize Alpaca clients for live market data"""
@@ -149,7 +199,15 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
             secret_key=secret_key
         )
         
-        self.logger.info("✅ Alpaca clients initialized (PAPER MODE)")
+        self.live_logger.info("✅ Alpaca clients initialized (PAPER MODE)")
+    
+    def setup_replay_clients(self, replay: 'MarketReplayServer'):
+        """Use the local market replay server in place of the Alpaca clients"""
+        self.trading_client = replay.trading_client(self.initial_balance)
+        self.stock_data_client = replay.stock_client()
+        self.option_data_client = replay.option_client()
+        
+        self.live_logger.info(f"🎞️ Replay clients initialized ({replay.trading_date}, {replay.speed:.0f}x)")
     
     def setup_live_logging(self):
         """Enhanced logging for live trading sessions"""
@@ -170,8 +228,10 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
             ]
         )
         
-        # Use parent's detailed logger but with live session ID
-        self.detailed_logger = DetailedLogger(session_id=self.trading_session_id)
+        # Session trade log: parent methods write to self.logger, so both names
+        # point at one DetailedLogger (CSV logs in logs/, as the report expects)
+        self.detailed_logger = DetailedLogger()
+        self.logger = self.detailed_logger
     
     async def start_paper_trading(self):
         """
@@ -180,37 +240,115 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         Uses EXACT same logic as backtesting but with real-time data
         """
         self.is_trading = True
-        self.logger.info("🎯 STARTING DYNAMIC RISK PAPER TRADING")
+        self.live_logger.info("🎯 STARTING DYNAMIC RISK PAPER TRADING")
         
         try:
             # Verify Alpaca connection
-            account = self.trading_client.get_account()
-            self.logger.info(f"✅ Connected to Alpaca Paper Trading")
-            self.logger.info(f"   Account: {account.account_number}")
-            self.logger.info(f"   Buying Power: ${float(account.buying_power):,.2f}")
+            account = await self.executor.run_io(self.trading_client.get_account)
+            self.live_logger.info(f"✅ Connected to Alpaca Paper Trading")
+            self.live_logger.info(f"   Account: {account.account_number}")
+            self.live_logger.info(f"   Buying Power: ${float(account.buying_power):,.2f}")
+            
+            if self.journal is not None:
+                self._restore_from_journal()
             
             # Log initial balance
             self.detailed_logger.log_balance_update(
-                timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                balance_before=0.0,
-                balance_after=self.current_balance,
-                change_amount=self.current_balance,
-                change_reason="INITIAL_BALANCE",
-                trade_id="INIT"
+                timestamp=self.clock.now().strftime('%Y-%m-%d %H:%M:%S'),
+                balance=self.current_balance,
+                change=self.current_balance,
+                reason="INITIAL_BALANCE"
             )
             
-            # Main trading loop (replaces backtesting date iteration)
-            self.logger.info("🔄 ENTERING LIVE TRADING LOOP")
-            while self.is_trading:
-                await self._live_trading_cycle()
-                await asyncio.sleep(60)  # Check every minute
+            self.clock.start()
+            if self.market_stream is not None:
+                await self.market_stream.start()
+                self.live_logger.info("📡 Streaming SPY quotes - position checks react to every update")
+            
+            # Main trading loop (replaces backtesting date iteration);
+            # heartbeat and cadence are market seconds on the trading clock
+            self.live_logger.info("🔄 ENTERING LIVE TRADING LOOP")
+            if self.market_stream is not None:
+                while not self._session_over():
+                    await self.market_stream.wait_for_update(timeout=self.heartbeat_seconds)
+                    await self._live_trading_cycle()
+            else:
+                self.scheduler.every(60, self._live_trading_cycle, name='trading_cycle')
+                await self.scheduler.run_until(self._session_over)
                 
         except Exception as e:
-            self.logger.error(f"❌ Paper trading error: {e}")
+            self.live_logger.error(f"❌ Paper trading error: {e}")
             self.is_trading = False
             raise
         finally:
+            await self.executor.cancel_all()
             await self._shutdown_paper_trading()
+            if self.market_stream is not None:
+                await self.market_stream.stop()
+            await self.executor.shutdown()
+            if self.journal is not None:
+                self.journal.close()
+    
+    def _restore_from_journal(self):
+        """
+        Rebuild session state from the journal after a restart
+        
+        The balance always carries over. Open positions and daily counters
+        only do within the same session date - a previous day's 0DTE
+        positions have expired.
+        """
+        state = self.journal.recover()
+        fields = state['fields']
+        today = self.clock.now().date()
+        if 'current_balance' in fields:
+            self.current_balance = fields['current_balance']
+        
+        if fields.get('session_date') != today:
+            for trade_id in state['positions']:
+                self.live_logger.warning(f"⚠️  Dropping journaled position {trade_id} from a previous session")
+                self.journal.close_position(trade_id)
+            self.journal.set_fields(session_date=today, signals_generated_today=0,
+                                    current_balance=self.current_balance)
+            return
+        
+        self.signals_generated_today = fields.get('signals_generated_today', 0)
+        self.last_signal_check = fields.get('last_signal_check', datetime.min)
+        for position in state['positions'].values():
+            self.open_positions.append(position)
+            self.cash_manager.add_position(
+                position_id=position['trade_id'],
+                strategy_type=position['strategy_type'],
+                cash_requirement=position['cash_used'],
+                max_loss=position['max_risk'],
+                max_profit=position['max_profit'],
+                strikes={}
+            )
+        self.live_logger.info(f"📓 Restored session from journal in {self.journal.stats['recovery_ms']:.1f}ms: "
+                              f"{len(self.open_positions)} open positions, balance ${self.current_balance:,.2f}")
+    
+    def _execute_iron_condor(self, options_data: pd.DataFrame, spy_price: float,
+                             trading_date, entry_time, strategy_recommendation: Dict) -> bool:
+        """Parent execution, journaled so the position survives a restart"""
+        opened = super()._execute_iron_condor(options_data, spy_price, trading_date,
+                                              entry_time, strategy_recommendation)
+        if opened and self.journal is not None:
+            self.journal.open_position(self.open_positions[-1])
+            self.journal.set_fields(current_balance=self.current_balance)
+        return opened
+    
+    def _close_position(self, position: Dict, trading_date: datetime, exit_reason: str, pnl: float):
+        """Parent close, journaled"""
+        super()._close_position(position, trading_date, exit_reason, pnl)
+        if self.journal is not None:
+            self.journal.close_position(position['trade_id'])
+            self.journal.set_fields(current_balance=self.current_balance)
+    
+    def _session_over(self) -> bool:
+        """True once trading stops (or the replay reaches the end of its session)"""
+        if self.is_trading and self.replay is not None and self.replay.finished:
+            self.live_logger.info("🎞️ Replay reached end of session")
+            self.stop_paper_trading()
+        return not self.is_trading
     
     async def _live_trading_cycle(self):
         """
@@ -218,7 +356,7 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         
         Uses EXACT same logic as FixedDynamicRiskBacktester but with live data
         """
-        current_time = datetime.now()
+        current_time = self.clock.now()
         
         try:
             # Check if market is open and it's a trading day
@@ -228,9 +366,13 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
             # Update existing positions (EXACT same method from parent)
             await self._update_live_positions(current_time)
             
-            # Check for new signals (EXACT same timing logic as backtesting)
-            if self._should_generate_signal(current_time):
-                await self._process_live_signal(current_time)
+            # Check for new signals (EXACT same timing logic as backtesting);
+            # streamed updates arrive far more often than entry scans are useful
+            if self._should_generate_signal(current_time) and \
+                    (current_time - self.last_entry_check).total_seconds() >= self.entry_check_interval_seconds:
+                self.last_entry_check = current_time
+                # Background job: a slow chain fetch must not stall position checks
+                self.executor.spawn('entry_scan', self._process_live_signal(current_time))
             
             # Log session progress every 30 minutes
             if (current_time - self.last_signal_check).total_seconds() > 1800:
@@ -238,7 +380,7 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
                 self.last_signal_check = current_time
                 
         except Exception as e:
-            self.logger.error(f"❌ Error in trading cycle: {e}")
+            self.live_logger.error(f"❌ Error in trading cycle: {e}")
     
     def _is_market_open(self, current_time: datetime) -> bool:
         """Check if market is open for options trading"""
@@ -271,8 +413,8 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         
         for entry_time in self.entry_times:
             # 15-minute window around each entry time
-            start_window = (datetime.combine(date.today(), entry_time) - timedelta(minutes=7)).time()
-            end_window = (datetime.combine(date.today(), entry_time) + timedelta(minutes=7)).time()
+            start_window = (datetime.combine(current_time.date(), entry_time) - timedelta(minutes=7)).time()
+            end_window = (datetime.combine(current_time.date(), entry_time) + timedelta(minutes=7)).time()
             
             if start_window <= current_time_only <= end_window:
                 # Check if we haven't generated a signal in the last 30 minutes
@@ -281,6 +423,7 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         
         return False
     
+    @timed('pipeline.entry_scan')
     async def _process_live_signal(self, current_time: datetime):
         """
         🎯 SIGNAL PROCESSING: Uses EXACT same methods as backtesting
@@ -289,22 +432,26 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         """
         try:
             # Get live market data (replaces parquet data loading)
-            spy_price = await self._get_live_spy_price()
-            options_data = await self._get_live_options_data(spy_price)
+            with LATENCY.span('data.spy_price'):
+                spy_price = await self._get_live_spy_price()
+            with LATENCY.span('data.options_chain'):
+                options_data = await self._get_live_options_data(spy_price)
             
             if options_data.empty:
-                self.logger.warning("⚠️  No options data available")
+                self.live_logger.warning("⚠️  No options data available")
                 return
             
             # Create market conditions (same format as backtesting)
             market_conditions = self._create_market_conditions(spy_price, current_time)
             
             # Use EXACT same strategy recommendation method from parent
-            strategy_recommendation = self._get_strategy_recommendation(
-                options_data, spy_price, market_conditions, current_time.time()
-            )
+            with LATENCY.span('strategy.recommendation'):
+                strategy_recommendation = await self.executor.run_cpu(
+                    self._get_strategy_recommendation,
+                    options_data, spy_price, market_conditions, current_time.time()
+                )
             
-            if strategy_recommendation and strategy_recommendation.get('strategy') == 'IRON_CONDOR':
+            if strategy_recommendation and strategy_recommendation.get('strategy_type') == 'IRON_CONDOR':
                 # Use EXACT same execution method from parent
                 success = self._execute_iron_condor(
                     options_data, spy_price, current_time.date(), 
@@ -314,31 +461,45 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
                 if success:
                     self.signals_generated_today += 1
                     self.last_signal_check = current_time
-                    self.logger.info(f"✅ Iron Condor signal executed successfully")
+                    if self.journal is not None:
+                        self.journal.set_fields(signals_generated_today=self.signals_generated_today,
+                                                last_signal_check=current_time)
+                    self.live_logger.info(f"✅ Iron Condor signal executed successfully")
                 else:
-                    self.logger.warning("⚠️  Iron Condor execution failed")
+                    self.live_logger.warning("⚠️  Iron Condor execution failed")
             
         except Exception as e:
-            self.logger.error(f"❌ Error processing live signal: {e}")
+            self.live_logger.error(f"❌ Error processing live signal: {e}")
     
-    async def _get_live_spy_price(self) -> float:
-        """Get current SPY price from Alpaca"""
+    async def _get_live_spy_price(self, timeout: Optional[float] = None) -> float:
+        """Get current SPY price (streamed quote book first, Alpaca REST fallback)"""
+        if self.market_stream is not None:
+            spy_price = self.market_stream.underlying_price(self.quote_max_age_seconds)
+            if spy_price is not None:
+                self.last_spy_price = spy_price
+                return spy_price
+        
         try:
-            # Get latest quote
-            request = StockLatestQuoteRequest(symbol_or_symbols="SPY")
-            quotes = self.stock_data_client.get_stock_latest_quote(request)
+            # Get latest quote (replay clients accept plain request objects)
+            request_type = StockLatestQuoteRequest if ALPACA_AVAILABLE else SimpleNamespace
+            request = request_type(symbol_or_symbols="SPY")
+            quotes = await self.executor.run_io(self.stock_data_client.get_stock_latest_quote,
+                                                request, timeout=timeout)
             
             if "SPY" in quotes:
                 quote = quotes["SPY"]
                 # Use midpoint of bid/ask
                 spy_price = (quote.bid_price + quote.ask_price) / 2
+                self.last_spy_price = float(spy_price)
                 return float(spy_price)
             else:
                 raise ValueError("No SPY quote available")
                 
         except Exception as e:
-            self.logger.error(f"❌ Error getting SPY price: {e}")
+            self.live_logger.error(f"❌ Error getting SPY price: {e}")
             # Fallback: use last known price or market price
+            if self.last_spy_price is not None:
+                return self.last_spy_price
             return 450.0  # Reasonable fallback
     
     async def _get_live_options_data(self, spy_price: float) -> pd.DataFrame:
@@ -349,24 +510,22 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         """
         try:
             # Get today's expiration date
-            today = datetime.now().date()
-            
-            # Request options chain for 0DTE
-            # Note: This is a simplified version - real implementation would need
-            # to handle Alpaca's specific options chain API format
+            today = self.clock.now().date()
+            self.option_chain.evict_expired(today)
             
-            # For now, return empty DataFrame - this would be implemented
-            # with actual Alpaca options chain API calls
-            self.logger.warning("⚠️  Live options data not yet implemented - using mock data")
+            # Snapshot the 0DTE chain only when needed; streaming deltas keep it current
+            if self.option_chain.needs_snapshot(spy_price, today):
+                loaded = await self.executor.run_io(
+                    self.option_chain.load_snapshot, self.option_data_client, spy_price, today
+                )
+                self.live_logger.info(f"🔗 0DTE chain snapshot: {loaded} contracts around ${spy_price:.2f}")
+                if self.market_stream is not None:
+                    await self.market_stream.subscribe_options(self.option_chain.stream_symbols())
             
-            # Return empty DataFrame to prevent errors
-            return pd.DataFrame(columns=[
-                'symbol', 'strike', 'option_type', 'expiration', 
-                'bid', 'ask', 'volume', 'open_interest'
-            ])
+            return self.option_chain.snapshot()
             
         except Exception as e:
-            self.logger.error(f"❌ Error getting options data: {e}")
+            self.live_logger.error(f"❌ Error getting options data: {e}")
             return pd.DataFrame()
     
     def _create_market_conditions(self, spy_price: float, current_time: datetime) -> Dict:
@@ -390,7 +549,7 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
         
         try:
             # Get current SPY price for position valuation
-            spy_price = await self._get_live_spy_price()
+            spy_price = await self._get_live_spy_price(timeout=self.monitor_timeout_seconds)
             
             # Check each position for closure (EXACT same logic as parent)
             positions_to_close = []
@@ -405,87 +564,83 @@ class DynamicRiskPaperTrader(FixedDynamicRiskBacktester):
                     positions_to_close.append((position, exit_reason, pnl))
             
             # Close positions using EXACT same method from parent
+            # (parent signature: position, trading_date, exit_reason, pnl)
             for position, exit_reason, pnl in positions_to_close:
-                self._close_position(
-                    position, current_time.date(), current_time.time(),
-                    spy_price, exit_reason, pnl
-                )
+                self._close_position(position, current_time, exit_reason, pnl)
+                self.open_positions.remove(position)
                 
         except Exception as e:
-            self.logger.error(f"❌ Error updating positions: {e}")
+            self.live_logger.error(f"❌ Error updating positions: {e}")
     
     def _log_session_progress(self):
         """Log current session progress"""
-        session_duration = datetime.now() - self.session_start_time
+        session_duration = self.clock.now() - self.session_start_time
         
-        self.logger.info(f"📊 SESSION PROGRESS:")
-        self.logger.info(f"   Duration: {session_duration}")
-        self.logger.info(f"   Current Balance: ${self.current_balance:,.2f}")
-        self.logger.info(f"   Open Positions: {len(self.open_positions)}")
-        self.logger.info(f"   Signals Today: {self.signals_generated_today}/{self.max_signals_per_day}")
+        self.live_logger.info(f"📊 SESSION PROGRESS:")
+        self.live_logger.info(f"   Duration: {session_duration}")
+        self.live_logger.info(f"   Current Balance: ${self.current_balance:,.2f}")
+        self.live_logger.info(f"   Open Positions: {len(self.open_positions)}")
+        self.live_logger.info(f"   Signals Today: {self.signals_generated_today}/{self.max_signals_per_day}")
         
         if hasattr(self, 'initial_balance'):
             pnl = self.current_balance - self.initial_balance
             pnl_pct = (pnl / self.initial_balance) * 100
-            self.logger.info(f"   Session P&L: ${pnl:+.2f} ({pnl_pct:+.2f}%)")
+            self.live_logger.info(f"   Session P&L: ${pnl:+.2f} ({pnl_pct:+.2f}%)")
     
     async def _shutdown_paper_trading(self):
         """Clean shutdown of paper trading session"""
-        self.logger.info("🛑 SHUTTING DOWN PAPER TRADING")
+        self.live_logger.info("🛑 SHUTTING DOWN PAPER TRADING")
         
         # Force close all open positions (EXACT same as backtesting)
         if self.open_positions:
-            self.logger.info(f"🔄 Force closing {len(self.open_positions)} open positions")
-            current_time = datetime.now()
-            spy_price = await self._get_live_spy_price()
+            self.live_logger.info(f"🔄 Force closing {len(self.open_positions)} open positions")
+            current_time = self.clock.now()
             
             for position in self.open_positions.copy():
-                self._close_position(
-                    position, current_time.date(), current_time.time(),
-                    spy_price, "SESSION_END", 0.0
-                )
+                self._close_position(position, current_time, "SESSION_END", 0.0)
+                self.open_positions.remove(position)
         
         # Generate final session summary (EXACT same as backtesting)
         session_summary = self.detailed_logger.generate_session_summary()
         
-        self.logger.info("📊 FINAL SESSION SUMMARY:")
-        self.logger.info(f"   Total Trades: {session_summary.get('total_trades', 0)}")
-        self.logger.info(f"   Win Rate: {session_summary.get('win_rate', 0):.1f}%")
-        self.logger.info(f"   Total P&L: ${session_summary.get('total_pnl', 0):+.2f}")
-        self.logger.info(f"   Final Balance: ${session_summary.get('final_balance', 0):,.2f}")
+        performance = session_summary.get('performance', {})
+        self.live_logger.info("📊 FINAL SESSION SUMMARY:")
+        self.live_logger.info(f"   Total Trades: {performance.get('total_trades', 0)}")
+        self.live_logger.info(f"   Win Rate: {performance.get('win_rate_pct', 0):.1f}%")
+        self.live_logger.info(f"   Total P&L: ${performance.get('total_pnl', 0):+.2f}")
+        self.live_logger.info(f"   Final Balance: ${performance.get('final_balance', 0):,.2f}")
         
         # Save session report
         await self._save_session_report(session_summary)
+        
+        if LATENCY.enabled:
+            self.live_logger.info(f"⏱️ Pipeline latency (us):\n{LATENCY.format_table()}")
+            self.live_logger.info(f"⏱️ Latency metrics written to {LATENCY.export()}")
     
     async def _save_session_report(self, session_summary: Dict):
         """Save comprehensive session report"""
         try:
             # Generate comprehensive report (same as backtesting)
-            from src.utils.comprehensive_backtest_report import ComprehensiveBacktestReport
+            from src.utils.comprehensive_backtest_report import generate_backtest_report
             
-            report_generator = ComprehensiveBacktestReport(
-                session_id=self.trading_session_id,
-                logs_dir=Path(project_root) / 'logs'
-            )
-            
-            report_path = report_generator.generate_backtest_report(
-                session_summary, is_live_session=True
-            )
+            report_path = generate_backtest_report(self.detailed_logger.session_id)
             
-            self.logger.info(f"📄 Session report saved: {report_path}")
+            self.live_logger.info(f"📄 Session report saved: {report_path}")
             
         except Exception as e:
-            self.logger.error(f"❌ Error saving session report: {e}")
+            self.live_logger.error(f"❌ Error saving session report: {e}")
     
     def stop_paper_trading(self):
         """Stop paper trading gracefully"""
         self.is_trading = False
-        self.logger.info("🛑 Paper trading stop requested")
+        self.live_logger.info("🛑 Paper trading stop requested")
 
 
 # CLI Interface for easy testing
-async def main():
-    """Main entry point for paper trading"""
+async def main(replay_parquet: Optional[str] = None, replay_date: Optional[str] = None,
+               spy_csv: Optional[str] = None, speed: float = 60.0,
+               journal_dir: Optional[str] = None):
+    """Main entry point for paper trading (optionally against a local market replay)"""
     print("🚀 DYNAMIC RISK PAPER TRADER")
     print("=" * 50)
     print("🎯 PERFECT BACKTESTING ALIGNMENT")
@@ -495,8 +650,21 @@ async def main():
     print()
     
     try:
+        if bool(replay_parquet) != bool(replay_date):
+            raise ValueError("--replay-parquet and --replay-date must be given together")
+        
         # Initialize paper trader
-        trader = DynamicRiskPaperTrader(initial_balance=25000)
+        replay = None
+        if replay_parquet:
+            replay = MarketReplayServer.from_parquet(
+                replay_parquet, datetime.strptime(replay_date, '%Y-%m-%d').date(),
+                spy_csv_path=spy_csv, speed=speed
+            )
+            print(f"🎞️ Replaying {replay_date} at {speed:.0f}x")
+        # Live sessions journal their state so a restart resumes mid-session
+        if journal_dir is None and replay is None:
+            journal_dir = os.path.join(project_root, 'logs', 'paper_state')
+        trader = DynamicRiskPaperTrader(initial_balance=25000, replay=replay, journal_dir=journal_dir)
         
         # Start paper trading
         await trader.start_paper_trading()
@@ -508,4 +676,16 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Dynamic risk paper trader")
+    parser.add_argument('--replay-parquet', help="Options parquet to replay instead of live Alpaca data")
+    parser.add_argument('--replay-date', help="Trading day to replay (YYYY-MM-DD)")
+    parser.add_argument('--spy-csv', help="Optional 1-minute SPY bars CSV for the replay")
+    parser.add_argument('--speed', type=float, default=60.0, help="Replay speed-up (1-1000x)")
+    parser.add_argument('--journal-dir', help="State journal directory (default logs/paper_state for live runs)")
+    args = parser.parse_args()
+    if bool(args.replay_parquet) != bool(args.replay_date):
+        parser.error("--replay-parquet and --replay-date must be given together")
+    
+    asyncio.run(main(args.replay_parquet, args.replay_date, args.spy_csv, args.speed, args.journal_dir))
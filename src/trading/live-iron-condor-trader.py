@@ -24,6 +24,7 @@ import os
 import asyncio
 import json
 from datetime import datetime, time, timedelta
+from time import perf_counter_ns
 from typing import Dict, List, Optional, Any, Tuple
 import logging
 from dataclasses import dataclass, asdict
@@ -56,6 +57,13 @@ try:
     from src.strategies.cash_management.position_sizer import ConservativeCashManager
     from src.strategies.real_option_pricing.black_scholes_calculator import BlackScholesCalculator
     from src.strategies.market_intelligence.intelligence_engine import MarketIntelligenceEngine
+    from src.trading.market_data_stream import StreamingMarketData
+    from src.trading.async_execution import AsyncExecutor
+    from src.trading.option_chain_cache import LiveOptionChainCache
+    from src.trading.order_manager import MultiLegOrderManager
+    from src.trading.position_monitor import VectorizedPositionMonitor
+    from src.trading.trading_clock import TradingClock, TradingScheduler, WallClock
+    from src.utils.latency import LATENCY, timed
 except ImportError as e:
     print(f"Import error: {e}")
     print("Please ensure all required framework modules are available")
@@ -95,6 +103,10 @@ class LiveIronCondorPosition:
     hold_time_hours: Optional[float] = None
     return_pct: Optional[float] = None
     
+    # Broker orders
+    entry_order_id: Optional[str] = None
+    exit_order_id: Optional[str] = None
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for logging/serialization"""
         return asdict(self)
@@ -105,9 +117,9 @@ class LiveIronCondorPosition:
         self.current_value = option_value
         self.unrealized_pnl = self.credit_received - option_value
     
-    def close_position(self, spy_price: float, exit_value: float, reason: str):
-        """Close the position and calculate final P&L"""
-        self.exit_time = datetime.now()
+    def close_position(self, spy_price: float, exit_value: float, reason: str, exit_time: datetime):
+        """Close the position and calculate final P&L (exit_time from the trading clock)"""
+        self.exit_time = exit_time
         self.exit_spy_price = spy_price
         self.realized_pnl = self.credit_received - exit_value
         self.exit_reason = reason
@@ -162,6 +174,7 @@ class LiveIronCondorSignalGenerator:
         
         return False
     
+    @timed('strategy.detect_flat_market')
     def detect_flat_market(self, options_data: pd.DataFrame, spy_price: float) -> Dict[str, Any]:
         """
         Detect flat market conditions suitable for Iron Condor
@@ -210,6 +223,7 @@ class LiveIronCondorSignalGenerator:
             'reason': f"{len(conditions)}/3 conditions met: {', '.join(conditions)}"
         }
     
+    @timed('strategy.generate_iron_condor_signal')
     def generate_iron_condor_signal(self, options_data: pd.DataFrame, spy_price: float, 
                                   account_balance: float) -> Optional[Dict[str, Any]]:
         """
@@ -337,10 +351,17 @@ class LiveIronCondorTrader:
     Integrates signal generation, execution, and risk management
     """
     
-    def __init__(self, initial_balance: float = 25000):
+    def __init__(self, initial_balance: float = 25000,
+                 market_stream: Optional[StreamingMarketData] = None,
+                 use_streaming: bool = True,
+                 clock: Optional[TradingClock] = None):
         if not ALPACA_AVAILABLE:
             raise ImportError("Alpaca SDK required for live trading")
         
+        # Market time source for every time-dependent decision
+        self.clock = clock or WallClock()
+        self.scheduler = TradingScheduler(self.clock)
+        
         # Initialize Alpaca clients
         self.trading_client = TradingClient(
             api_key=os.getenv('ALPACA_API_KEY'),
@@ -358,6 +379,29 @@ class LiveIronCondorTrader:
             secret_key=os.getenv('ALPACA_SECRET_KEY')
         )
         
+        # Streaming market data (SPY + 0DTE quotes) - REST polling is the fallback
+        if market_stream is None and use_streaming:
+            market_stream = StreamingMarketData.from_alpaca(
+                os.getenv('ALPACA_API_KEY'), os.getenv('ALPACA_SECRET_KEY'), clock=self.clock
+            )
+        self.market_stream = market_stream
+        self.quote_max_age_seconds = 5.0     # Older book quotes fall back to REST
+        self.heartbeat_seconds = 60          # Housekeeping cycle when the stream is quiet
+        self.entry_check_interval_seconds = 60
+        self.last_entry_check = datetime.min
+        
+        # Blocking SDK calls and signal generation run off the event loop
+        self.executor = AsyncExecutor(io_workers=4, io_timeout=10.0, cpu_timeout=30.0)
+        self.monitor_timeout_seconds = 2.0   # Position monitoring never waits longer on REST
+        
+        # Iron condors go out as one multi-leg order (concurrent legs as fallback)
+        self.order_manager = MultiLegOrderManager(self.trading_client, executor=self.executor, clock=self.clock)
+        
+        # Live 0DTE chain: one snapshot per session, then streaming quote deltas
+        self.option_chain = LiveOptionChainCache(underlying='SPY', strike_range=20.0)
+        if self.market_stream is not None:
+            self.market_stream.add_listener(self.option_chain.on_stream_event)
+        
         # Initialize framework components (EXACT MATCH to backtesting)
         self.signal_generator = LiveIronCondorSignalGenerator()
         self.cash_manager = ConservativeCashManager(initial_balance)
@@ -381,6 +425,13 @@ class LiveIronCondorTrader:
         self.profit_target_pct = 0.5  # EXACT: 50% of max profit
         self.stop_loss_pct = 0.5  # EXACT: 50% of max loss
         
+        # Open positions revalued and exit-checked in one batched pass per tick
+        self.position_monitor = VectorizedPositionMonitor(
+            max_hold_hours=self.max_hold_hours,
+            profit_target_pct=self.profit_target_pct,
+            stop_loss_pct=self.stop_loss_pct
+        )
+        
         # Trading state
         self.is_trading = False
         self.last_signal_time = datetime.min
@@ -415,36 +466,67 @@ class LiveIronCondorTrader:
         
         try:
             # Verify connection
-            account = self.trading_client.get_account()
+            account = await self.executor.run_io(self.trading_client.get_account)
             self.logger.info(f"✅ Connected to Alpaca - Account: {account.account_number}")
             
-            # Main trading loop
-            while self.is_trading:
-                await self._trading_cycle()
-                await asyncio.sleep(60)  # Check every minute
+            self.clock.start()
+            if self.market_stream is not None:
+                await self.market_stream.start()
+                self.logger.info("📡 Streaming SPY quotes - exits react to every update")
+            
+            # Main trading loop: event-driven with the stream, one-minute poll without
+            # (both in market seconds on the trading clock)
+            if self.market_stream is not None:
+                while self.is_trading:
+                    updated = await self.market_stream.wait_for_update(timeout=self.heartbeat_seconds)
+                    await self._trading_cycle(updated)
+            else:
+                self.scheduler.every(60, self._trading_cycle, name='trading_cycle')
+                await self.scheduler.run_until(lambda: not self.is_trading)
                 
         except Exception as e:
             self.logger.error(f"❌ Trading error: {e}")
             self.is_trading = False
-    
-    async def _trading_cycle(self):
-        """Single trading cycle - check for signals and manage positions"""
+        finally:
+            if self.market_stream is not None:
+                await self.market_stream.stop()
+            await self.executor.shutdown()
+            if LATENCY.enabled:
+                self.logger.info(f"⏱️ Pipeline latency (us):\n{LATENCY.format_table()}")
+                self.logger.info(f"⏱️ Latency metrics written to {LATENCY.export()}")
+    
+    async def _trading_cycle(self, updated_symbols: Optional[set] = None):
+        """
+        Single trading cycle - check for signals and manage positions
+        
+        With streaming, runs on each batch of updated symbols: exits are
+        re-evaluated on every SPY update, entry scans are throttled. Entry
+        scans run as a background job so a slow chain fetch never delays
+        position monitoring. ``updated_symbols`` of None (polling) or empty
+        (heartbeat) runs the full cycle; a batch of option-only updates
+        skips position valuation, which depends on SPY alone.
+        """
         try:
-            current_time = datetime.now()
+            current_time = self.clock.now()
             
             # Check if market is open (9:30 AM - 4:00 PM ET)
             if not self._is_market_hours(current_time):
                 return
             
-            # Update existing positions
-            await self._update_positions()
-            
-            # Check for exit conditions
-            await self._check_exit_conditions()
+            spy_updated = not updated_symbols or self.market_stream is None or \
+                self.market_stream.underlying in updated_symbols
+            if spy_updated:
+                # Update existing positions
+                await self._update_positions()
+                
+                # Check for exit conditions
+                await self._check_exit_conditions()
             
             # Check for new entry opportunities
-            if self._should_look_for_entries(current_time):
-                await self._check_entry_opportunities()
+            if self._should_look_for_entries(current_time) and \
+                    (current_time - self.last_entry_check).total_seconds() >= self.entry_check_interval_seconds:
+                self.last_entry_check = current_time
+                self.executor.spawn('entry_scan', self._check_entry_opportunities())
             
             # Update daily P&L and risk metrics
             self._update_performance_metrics()
@@ -490,13 +572,29 @@ class LiveIronCondorTrader:
         
         return True
     
+    async def _get_spy_price(self, timeout: Optional[float] = None) -> float:
+        """Current SPY mid - streamed quote book first, REST latest quote as fallback"""
+        if self.market_stream is not None:
+            spy_price = self.market_stream.underlying_price(self.quote_max_age_seconds)
+            if spy_price is not None:
+                return spy_price
+        
+        spy_quote_request = StockLatestQuoteRequest(symbol_or_symbols="SPY")
+        spy_quote = await self.executor.run_io(self.stock_data_client.get_stock_latest_quote,
+                                               spy_quote_request, timeout=timeout)
+        return float(spy_quote["SPY"].bid_price + spy_quote["SPY"].ask_price) / 2
+    
+    @timed('pipeline.entry_scan')
     async def _check_entry_opportunities(self):
         """Check for Iron Condor entry opportunities"""
+        # Quote-to-order latency starts at the SPY event that triggered this scan
+        trigger_ns = None
+        if LATENCY.enabled:
+            trigger_ns = (self.market_stream.last_underlying_ns if self.market_stream is not None else None) \
+                or perf_counter_ns()
         try:
             # Get current SPY price
-            spy_quote_request = StockLatestQuoteRequest(symbol_or_symbols="SPY")
-            spy_quote = self.stock_data_client.get_stock_latest_quote(spy_quote_request)
-            spy_price = float(spy_quote["SPY"].bid_price + spy_quote["SPY"].ask_price) / 2
+            spy_price = await self._get_spy_price()
             
             # Get 0DTE options data
             options_data = await self._get_0dte_options_data(spy_price)
@@ -506,7 +604,9 @@ class LiveIronCondorTrader:
                 return
             
             # Check market conditions
-            market_analysis = self.signal_generator.detect_flat_market(options_data, spy_price)
+            market_analysis = await self.executor.run_cpu(
+                self.signal_generator.detect_flat_market, options_data, spy_price
+            )
             
             self.logger.info(f"📊 Market Analysis: {market_analysis['reason']}")
             
@@ -514,16 +614,17 @@ class LiveIronCondorTrader:
                 self.logger.info("🎯 FLAT MARKET DETECTED - GENERATING SIGNAL")
                 
                 # Generate Iron Condor signal
-                signal = self.signal_generator.generate_iron_condor_signal(
+                signal = await self.executor.run_cpu(
+                    self.signal_generator.generate_iron_condor_signal,
                     options_data, spy_price, self.current_balance
                 )
                 
                 if signal:
                     self.signals_today += 1
-                    self.last_signal_time = datetime.now()
+                    self.last_signal_time = self.clock.now()
                     
                     # Execute the signal (paper trading)
-                    success = await self._execute_iron_condor_signal(signal, spy_price)
+                    success = await self._execute_iron_condor_signal(signal, spy_price, trigger_ns)
                     
                     if success:
                         self.logger.info("✅ IRON CONDOR POSITION OPENED")
@@ -532,52 +633,78 @@ class LiveIronCondorTrader:
                 else:
                     self.logger.info("❌ No valid Iron Condor signal generated")
             
+        except asyncio.TimeoutError:
+            self.logger.warning("⏱️ Entry opportunity check timed out - skipped this window")
         except Exception as e:
             self.logger.error(f"❌ Entry opportunity check failed: {e}")
     
     async def _get_0dte_options_data(self, spy_price: float) -> pd.DataFrame:
-        """Get 0DTE options data from Alpaca"""
+        """
+        Get 0DTE options data from the live chain cache
+        
+        The chain is snapshotted over ±$20 strikes when empty, on a new day or
+        when SPY drifts out of the covered range; otherwise it is already
+        current from streaming quote deltas and no REST call is made.
+        """
         try:
             # Get today's expiration date
-            today = datetime.now().date()
+            today = self.clock.now().date()
+            self.option_chain.evict_expired(today)
             
-            # Define strike range around current price
-            strike_range = 20  # $20 range around current price
-            min_strike = spy_price - strike_range
-            max_strike = spy_price + strike_range
+            if self.option_chain.needs_snapshot(spy_price, today):
+                loaded = await self.executor.run_io(
+                    self.option_chain.load_snapshot, self.option_data_client, spy_price, today
+                )
+                self.logger.info(f"🔗 0DTE chain snapshot: {loaded} contracts around ${spy_price:.2f}")
+                if self.market_stream is not None:
+                    await self.market_stream.subscribe_options(self.option_chain.stream_symbols())
             
-            # This is a simplified version - in production, use proper options chain API
-            # For now, return empty DataFrame to prevent errors
-            self.logger.warning("⚠️ 0DTE options data retrieval not fully implemented")
-            return pd.DataFrame()
+            return self.option_chain.snapshot()
             
         except Exception as e:
             self.logger.error(f"❌ Failed to get 0DTE options data: {e}")
             return pd.DataFrame()
     
-    async def _execute_iron_condor_signal(self, signal: Dict[str, Any], spy_price: float) -> bool:
-        """Execute Iron Condor signal (paper trading simulation)"""
+    async def _execute_iron_condor_signal(self, signal: Dict[str, Any], spy_price: float,
+                                          trigger_ns: Optional[int] = None) -> bool:
+        """Execute Iron Condor signal as one multi-leg paper order at the signal credit or better"""
         try:
-            # Create position object
+            entry_time = self.clock.now()
+            position_id = f"IC_{entry_time.strftime('%Y%m%d_%H%M%S')}"
+            if trigger_ns is not None:
+                LATENCY.record('pipeline.quote_to_order', perf_counter_ns() - trigger_ns)
+            order = await self.order_manager.open_iron_condor(
+                entry_time.date(), signal['put_short_strike'], signal['put_long_strike'],
+                signal['call_short_strike'], signal['call_long_strike'], signal['contracts'],
+                min_credit=signal['credit_per_spread'], client_order_id=position_id
+            )
+            if not order.filled:
+                self.logger.warning(f"⚠️  Iron Condor entry not filled ({order.status}: {order.error})")
+                return False
+            
+            # Create position object from the actual fill
+            credit = order.net_credit
             position = LiveIronCondorPosition(
-                position_id=f"IC_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                entry_time=datetime.now(),
+                position_id=position_id,
+                entry_time=entry_time,
                 spy_price_at_entry=spy_price,
                 put_short_strike=signal['put_short_strike'],
                 put_long_strike=signal['put_long_strike'],
                 call_short_strike=signal['call_short_strike'],
                 call_long_strike=signal['call_long_strike'],
                 contracts=signal['contracts'],
-                credit_received=signal['total_credit'],
-                max_loss=signal['max_loss'],
-                max_profit=signal['max_profit']
+                credit_received=credit,
+                max_loss=signal['max_loss'] + signal['total_credit'] - credit,
+                max_profit=credit,
+                entry_order_id=order.order_ids[0] if order.order_ids else None
             )
             
             # Add to open positions
             self.open_positions.append(position)
+            self.position_monitor.add(position, underlying=self.option_chain.underlying)
             
             # Update account balance
-            self.current_balance += signal['total_credit']
+            self.current_balance += credit
             
             # Log the trade
             self.logger.info(f"📊 IRON CONDOR OPENED:")
@@ -586,6 +713,8 @@ class LiveIronCondorTrader:
             self.logger.info(f"   Call Spread: ${position.call_short_strike:.0f}/${position.call_long_strike:.0f}")
             self.logger.info(f"   Contracts: {position.contracts}")
             self.logger.info(f"   Credit Received: ${position.credit_received:.2f}")
+            self.logger.info(f"   Order: {order.mode}, {order.round_trips} round-trip(s), "
+                             f"{order.exposure_seconds:.1f}s to fill")
             
             return True
             
@@ -600,14 +729,10 @@ class LiveIronCondorTrader:
         
         try:
             # Get current SPY price
-            spy_quote_request = StockLatestQuoteRequest(symbol_or_symbols="SPY")
-            spy_quote = self.stock_data_client.get_stock_latest_quote(spy_quote_request)
-            spy_price = float(spy_quote["SPY"].bid_price + spy_quote["SPY"].ask_price) / 2
-            
-            for position in self.open_positions:
-                # Calculate current option value using Black-Scholes
-                current_value = self._calculate_iron_condor_value(position, spy_price)
-                position.update_current_value(spy_price, current_value)
+            spy_price = await self._get_spy_price(timeout=self.monitor_timeout_seconds)
+            
+            # Revalue every open position in one batched pass
+            self.position_monitor.revalue({self.option_chain.underlying: spy_price}, self.clock.now())
                 
         except Exception as e:
             self.logger.error(f"❌ Failed to update positions: {e}")
@@ -616,7 +741,7 @@ class LiveIronCondorTrader:
         """Calculate current Iron Condor value using Black-Scholes"""
         try:
             # Time to expiration (0DTE - use hours remaining)
-            current_time = datetime.now()
+            current_time = self.clock.now()
             market_close = current_time.replace(hour=16, minute=0, second=0, microsecond=0)
             hours_to_expiry = max((market_close - current_time).total_seconds() / 3600, 0.01)
             time_to_expiry = hours_to_expiry / (24 * 365)  # Convert to years
@@ -649,54 +774,20 @@ class LiveIronCondorTrader:
             return 0.0
     
     async def _check_exit_conditions(self):
-        """Check if any positions should be exited (EXACT MATCH to backtesting logic)"""
-        positions_to_close = []
-        current_time = datetime.now()
+        """
+        Check if any positions should be exited (EXACT MATCH to backtesting logic)
         
-        for position in self.open_positions:
-            # Calculate current P&L using Black-Scholes (EXACT MATCH to backtesting)
-            current_pnl = self._calculate_position_pnl(position, position.current_spy_price or 0.0, current_time)
-            
-            should_close = False
-            exit_reason = ""
-            
-            # EXACT MATCH to backtesting exit conditions:
-            
-            # 1. Time-based exit (EXACT: 4 hours max hold OR time_exit_target)
-            if position.entry_time:
-                hold_hours = (current_time - position.entry_time).total_seconds() / 3600
-                if hold_hours >= self.max_hold_hours:
-                    should_close = True
-                    exit_reason = "TIME_EXIT"
-            
-            # 2. Profit target (EXACT: 50% of max profit)
-            profit_target = position.credit_received * self.profit_target_pct
-            if current_pnl >= profit_target:
-                should_close = True
-                exit_reason = "PROFIT_TARGET"
-            
-            # 3. Stop loss (EXACT: 50% of max loss)
-            stop_loss_level = position.max_loss * self.stop_loss_pct
-            if current_pnl <= -stop_loss_level:
-                should_close = True
-                exit_reason = "STOP_LOSS"
-            
-            # 4. End of day exit for 0DTE (EXACT: 3:00 PM or later)
-            if current_time.time() >= time(15, 0):
-                should_close = True
-                exit_reason = "END_OF_DAY"
-            
-            # 5. Market close buffer (EXACT: 15:30 buffer like backtesting)
-            if current_time.time() >= time(15, 30):
-                should_close = True
-                exit_reason = "MARKET_CLOSE_BUFFER"
-            
-            if should_close:
-                positions_to_close.append((position, current_pnl, exit_reason))
-        
-        # Close positions (EXACT MATCH to backtesting)
-        for position, pnl, exit_reason in positions_to_close:
-            await self._close_position_with_pnl(position, pnl, exit_reason, current_time)
+        Time exit (4h hold), profit target (50% of credit), stop loss (50% of
+        max loss), end of day (15:00) and market close buffer (15:30) are
+        evaluated for all positions at once by the position monitor, with the
+        same precedence and P&L as ``_calculate_position_pnl``.
+        """
+        current_time = self.clock.now()
+        positions_to_close = self.position_monitor.check_exits(current_time)
+        
+        # Close positions (EXACT MATCH to backtesting); exit orders go out concurrently
+        await asyncio.gather(*[self._close_position_with_pnl(position, pnl, exit_reason, current_time)
+                               for position, pnl, exit_reason in positions_to_close])
     
     def _calculate_position_pnl(self, position: LiveIronCondorPosition, spy_price: float, current_time: datetime) -> float:
         """Calculate current position P&L using Black-Scholes (EXACT MATCH to backtesting)"""
@@ -739,6 +830,18 @@ class LiveIronCondorTrader:
     async def _close_position_with_pnl(self, position: LiveIronCondorPosition, pnl: float, reason: str, exit_time: datetime):
         """Close a position with calculated P&L (EXACT MATCH to backtesting)"""
         try:
+            # Flatten at the broker first; an unfilled exit is retried next cycle
+            order = await self.order_manager.close_iron_condor(
+                position.entry_time.date(), position.put_short_strike, position.put_long_strike,
+                position.call_short_strike, position.call_long_strike, position.contracts,
+                client_order_id=f"{position.position_id}_EXIT"
+            )
+            if not order.filled:
+                self.logger.error(f"❌ Exit order for {position.position_id} not filled "
+                                  f"({order.status}: {order.error}) - retrying next cycle")
+                return
+            position.exit_order_id = order.order_ids[0] if order.order_ids else None
+            
             # Set exit details (EXACT MATCH to backtesting)
             position.exit_time = exit_time
             position.exit_spy_price = position.current_spy_price
@@ -762,6 +865,7 @@ class LiveIronCondorTrader:
             
             # Move to closed positions (EXACT MATCH to backtesting)
             self.open_positions.remove(position)
+            self.position_monitor.remove(position.position_id)
             self.closed_positions.append(position)
             
             # Log the closure (EXACT MATCH to backtesting format)
@@ -780,7 +884,7 @@ class LiveIronCondorTrader:
     
     async def _close_position(self, position: LiveIronCondorPosition, reason: str):
         """Legacy close method - redirects to new method with P&L calculation"""
-        current_time = datetime.now()
+        current_time = self.clock.now()
         pnl = self._calculate_position_pnl(position, position.current_spy_price or 0.0, current_time)
         await self._close_position_with_pnl(position, pnl, reason, current_time)
     
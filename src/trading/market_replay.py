@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+🎞️ LOCAL MARKET REPLAY SERVER
+=============================
+
+Serves a historical trading day through the same interfaces the live
+traders use from Alpaca, so the live loop can be soak-tested and profiled
+offline:
+
+- ReplayStockHistoricalDataClient   -> get_stock_latest_quote / get_stock_bars
+- ReplayOptionHistoricalDataClient  -> get_option_chain / get_option_latest_quote
+- ReplayTradingClient               -> get_account / submit_order / orders / positions
+- stock_stream() / option_stream()  -> ReplayDataStream (StockDataStream / OptionDataStream)
+
+Sources are the parquet options dataset (minute bars) and an optional
+1-minute SPY CSV; without SPY bars the underlying is inferred per minute
+from put-call parity. Replayed market time runs at 1x-1000x wall speed.
+Quotes are synthesized around bar closes since the historical data has
+no bid/ask.
+
+Location: src/trading/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.market_data_stream import ReplayDataStream, StreamingMarketData
+from src.trading.trading_clock import AcceleratedClock, TradingClock
+
+
+def _symbols(request_value) -> List[str]:
+    if isinstance(request_value, str):
+        return [request_value]
+    return list(request_value)
+
+
+class MarketReplayServer:
+    """
+    Replays one trading day of SPY and option minute bars
+
+    A bar becomes visible when it completes (``timestamp + 1 minute``), the
+    same moment the live minute-bar stream would publish it. Replayed time
+    comes from ``clock`` (an ``AcceleratedClock`` at ``speed`` by default);
+    pass a ``SimulatedClock`` to step the replay deterministically.
+    """
+
+    MIN_SPEED = 1.0
+    MAX_SPEED = 1000.0
+    _DAY_AGG = {'day_open': 'first', 'day_high': 'max', 'day_low': 'min',
+                'day_volume': 'sum', 'day_transactions': 'sum'}
+
+    def __init__(self, options_bars: pd.DataFrame, spy_bars: Optional[pd.DataFrame] = None,
+                 speed: float = 60.0, underlying: str = 'SPY',
+                 stock_half_spread: float = 0.01, option_spread_pct: float = 0.04,
+                 clock: Optional[TradingClock] = None):
+        if not self.MIN_SPEED <= speed <= self.MAX_SPEED:
+            raise ValueError(f"Replay speed must be between {self.MIN_SPEED:.0f}x and {self.MAX_SPEED:.0f}x")
+
+        self.speed = speed
+        self.underlying = underlying
+        self.stock_half_spread = stock_half_spread
+        self.option_spread_pct = option_spread_pct
+
+        self.options_bars = self._prepare_options(options_bars)
+        self.spy_bars = self._prepare_spy(spy_bars) if spy_bars is not None else \
+            self._infer_spy_from_parity(self.options_bars)
+        if self.spy_bars.empty:
+            raise ValueError("Replay data has no SPY bars and parity could not be inferred")
+
+        self.session_start: datetime = self.spy_bars['timestamp'].iloc[0].to_pydatetime()
+        self.session_end: datetime = self.spy_bars['available_at'].iloc[-1].to_pydatetime()
+        self.trading_date: date = self.session_start.date()
+
+        self._spy_available = self.spy_bars['available_at'].values
+        self._option_available = self.options_bars['available_at'].values
+        self._state: Optional[pd.DataFrame] = None
+        self._state_cursor = 0
+        self.clock = clock or AcceleratedClock(self.session_start, speed, end=self.session_end)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_parquet(cls, parquet_path: str, trading_date: date,
+                     spy_csv_path: Optional[str] = None, **kwargs) -> 'MarketReplayServer':
+        """One day from the options parquet (and optional 1-minute SPY CSV)"""
+        day_start = int(pd.Timestamp(trading_date).value // 1_000_000)
+        day_end = day_start + 86_400_000
+        options = pd.read_parquet(
+            parquet_path, filters=[('timestamp', '>=', day_start), ('timestamp', '<', day_end)]
+        )
+        spy_bars = pd.read_csv(spy_csv_path, parse_dates=['timestamp']) if spy_csv_path else None
+        if spy_bars is not None:
+            spy_bars = spy_bars[spy_bars['timestamp'].dt.date == trading_date]
+        return cls(options, spy_bars, **kwargs)
+
+    @staticmethod
+    def _prepare_options(options_bars: pd.DataFrame) -> pd.DataFrame:
+        df = options_bars.copy()
+        if not np.issubdtype(df['timestamp'].dtype, np.datetime64):
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        market_minutes = df['timestamp'].dt.time
+        df = df[(market_minutes >= datetime.strptime('09:30', '%H:%M').time()) &
+                (market_minutes < datetime.strptime('16:00', '%H:%M').time())]
+        df['stream_symbol'] = df['symbol'].str.replace('O:', '', regex=False)
+        df['available_at'] = df['timestamp'] + pd.Timedelta(minutes=1)
+        return df.sort_values(['available_at', 'stream_symbol'], kind='stable').reset_index(drop=True)
+
+    @staticmethod
+    def _prepare_spy(spy_bars: pd.DataFrame) -> pd.DataFrame:
+        df = spy_bars.copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if 'vwap' not in df.columns:
+            df['vwap'] = df['close']
+        if 'volume' not in df.columns:
+            df['volume'] = 0
+        df['available_at'] = df['timestamp'] + pd.Timedelta(minutes=1)
+        return df.sort_values('timestamp').reset_index(drop=True)
+
+    @staticmethod
+    def _infer_spy_from_parity(options: pd.DataFrame) -> pd.DataFrame:
+        """Per-minute SPY estimate: S ≈ K + C - P at the strike where C and P are closest"""
+        same_day = options[pd.to_datetime(options['expiration']).dt.date == options['timestamp'].dt.date]
+        source = same_day if not same_day.empty else options
+        pairs = source.pivot_table(index=['timestamp', 'strike'], columns='option_type',
+                                   values='close', aggfunc='last').dropna()
+        if pairs.empty or not {'call', 'put'} <= set(pairs.columns):
+            return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close',
+                                         'volume', 'vwap', 'available_at'])
+        pairs = pairs.reset_index()
+        pairs['gap'] = (pairs['call'] - pairs['put']).abs()
+        atm = pairs.loc[pairs.groupby('timestamp')['gap'].idxmin()]
+        price = (atm['strike'] + atm['call'] - atm['put']).values
+        spy = pd.DataFrame({'timestamp': atm['timestamp'].values, 'open': price, 'high': price,
+                            'low': price, 'close': price, 'volume': 0, 'vwap': price})
+        spy['available_at'] = spy['timestamp'] + pd.Timedelta(minutes=1)
+        return spy.reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # Replay time
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start replayed time (idempotent)"""
+        self.clock.start()
+
+    def seek(self, as_of: datetime):
+        """Jump replayed time to ``as_of`` (time keeps running if started)"""
+        self.clock.set(min(max(as_of, self.session_start), self.session_end))
+
+    def now(self) -> datetime:
+        """Current replayed market time"""
+        return min(self.clock.now(), self.session_end)
+
+    @property
+    def finished(self) -> bool:
+        return self.now() >= self.session_end
+
+    # ------------------------------------------------------------------
+    # Market state
+    # ------------------------------------------------------------------
+
+    def _visible_count(self, available: np.ndarray, as_of: Optional[datetime] = None) -> int:
+        as_of = np.datetime64(as_of or self.now(), 'ns')
+        return int(np.searchsorted(available, as_of, side='right'))
+
+    def spy_bar(self, as_of: Optional[datetime] = None) -> Optional[pd.Series]:
+        n = self._visible_count(self._spy_available, as_of)
+        return self.spy_bars.iloc[n - 1] if n else None
+
+    def spy_quote(self, as_of: Optional[datetime] = None) -> Optional[SimpleNamespace]:
+        bar = self.spy_bar(as_of)
+        if bar is None:
+            return None
+        return SimpleNamespace(symbol=self.underlying,
+                               bid_price=float(bar['close']) - self.stock_half_spread,
+                               ask_price=float(bar['close']) + self.stock_half_spread,
+                               bid_size=100, ask_size=100,
+                               timestamp=bar['available_at'].to_pydatetime())
+
+    def _option_half_spread(self, price):
+        return np.maximum(np.asarray(price, dtype=float) * self.option_spread_pct / 2, 0.01)
+
+    def option_state(self, as_of: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Latest bar and cumulative day volume per contract as of the replay time
+
+        Maintained incrementally: only bars published since the previous
+        call are folded in (a backwards seek rebuilds from the open).
+        """
+        n = self._visible_count(self._option_available, as_of)
+        if n < self._state_cursor:
+            self._state, self._state_cursor = None, 0
+        if n == self._state_cursor:
+            return self._state if self._state is not None else self.options_bars.iloc[:0]
+
+        new_bars = self.options_bars.iloc[self._state_cursor:n]
+        grouped = new_bars.groupby('stream_symbol', sort=False)
+        last = grouped.tail(1).set_index('stream_symbol')
+        day = grouped.agg(
+            day_open=('open', 'first'), day_high=('high', 'max'), day_low=('low', 'min'),
+            day_volume=('volume', 'sum'), day_transactions=('transactions', 'sum')
+        )
+        if self._state is not None:
+            previous = self._state
+            last = pd.concat([previous[last.columns], last])
+            last = last[~last.index.duplicated(keep='last')]
+            day = pd.concat([previous[day.columns], day]).groupby(level=0, sort=False).agg(self._DAY_AGG)
+
+        state = last.join(day)
+        half_spread = self._option_half_spread(state['close'])
+        state['bid'] = np.maximum(state['close'] - half_spread, 0.0)
+        state['ask'] = state['close'] + half_spread
+        self._state, self._state_cursor = state, n
+        return state
+
+    def option_quote(self, symbol: str, as_of: Optional[datetime] = None) -> Optional[SimpleNamespace]:
+        state = self.option_state(as_of)
+        key = symbol.replace('O:', '')
+        if key not in state.index:
+            return None
+        row = state.loc[key]
+        return SimpleNamespace(symbol=key, bid_price=float(row['bid']), ask_price=float(row['ask']),
+                               bid_size=10, ask_size=10, timestamp=row['available_at'].to_pydatetime())
+
+    # ------------------------------------------------------------------
+    # Streams
+    # ------------------------------------------------------------------
+
+    def _stock_events(self) -> pd.DataFrame:
+        bars = self.spy_bars
+        half = self.stock_half_spread
+        quotes = pd.DataFrame({'timestamp': bars['available_at'], 'symbol': self.underlying, 'event': 'quote',
+                               'bid': bars['close'] - half, 'ask': bars['close'] + half,
+                               'bid_size': 100, 'ask_size': 100})
+        bar_events = pd.DataFrame({'timestamp': bars['available_at'], 'symbol': self.underlying, 'event': 'bar',
+                                   'open': bars['open'], 'high': bars['high'], 'low': bars['low'],
+                                   'close': bars['close'], 'volume': bars['volume'], 'vwap': bars['vwap']})
+        return pd.concat([quotes, bar_events], ignore_index=True)
+
+    def _option_events(self) -> pd.DataFrame:
+        bars = self.options_bars
+        half_spread = self._option_half_spread(bars['close'])
+        quotes = pd.DataFrame({'timestamp': bars['available_at'], 'symbol': bars['stream_symbol'],
+                               'event': 'quote', 'bid': np.maximum(bars['close'] - half_spread, 0.0),
+                               'ask': bars['close'] + half_spread, 'bid_size': 10, 'ask_size': 10})
+        trades = pd.DataFrame({'timestamp': bars['available_at'], 'symbol': bars['stream_symbol'],
+                               'event': 'trade', 'price': bars['close'], 'size': bars['volume']})
+        return pd.concat([quotes, trades], ignore_index=True)
+
+    def stock_stream(self) -> ReplayDataStream:
+        return ReplayDataStream(self._stock_events(), speed=self.speed, clock=self.clock)
+
+    def option_stream(self) -> ReplayDataStream:
+        return ReplayDataStream(self._option_events(), speed=self.speed, clock=self.clock)
+
+    def market_data(self) -> StreamingMarketData:
+        """Streaming ingestion layer wired to the replayed streams"""
+        return StreamingMarketData(self.stock_stream(), self.option_stream(),
+                                   underlying=self.underlying, clock=self.clock)
+
+    # ------------------------------------------------------------------
+    # Client stand-ins
+    # ------------------------------------------------------------------
+
+    def stock_client(self) -> 'ReplayStockHistoricalDataClient':
+        return ReplayStockHistoricalDataClient(self)
+
+    def option_client(self) -> 'ReplayOptionHistoricalDataClient':
+        return ReplayOptionHistoricalDataClient(self)
+
+    def trading_client(self, initial_cash: float = 25000.0) -> 'ReplayTradingClient':
+        return ReplayTradingClient(self, initial_cash)
+
+
+class ReplayStockHistoricalDataClient:
+    """Stand-in for ``alpaca.data.historical.StockHistoricalDataClient``"""
+
+    def __init__(self, server: MarketReplayServer):
+        self.server = server
+
+    def get_stock_latest_quote(self, request) -> Dict[str, Any]:
+        quotes = {}
+        for symbol in _symbols(request.symbol_or_symbols):
+            if symbol == self.server.underlying:
+                quote = self.server.spy_quote()
+                if quote is not None:
+                    quotes[symbol] = quote
+        return quotes
+
+    def get_stock_bars(self, request) -> SimpleNamespace:
+        """Minute bars visible so far (``.df`` like an Alpaca BarSet)"""
+        n = self.server._visible_count(self.server._spy_available)
+        bars = self.server.spy_bars.iloc[:n]
+        start = getattr(request, 'start', None)
+        if start is not None:
+            bars = bars[bars['timestamp'] >= pd.Timestamp(start)]
+        df = bars[['timestamp', 'open', 'high', 'low', 'close', 'volume', 'vwap']].copy()
+        df.insert(0, 'symbol', self.server.underlying)
+        return SimpleNamespace(df=df.set_index(['symbol', 'timestamp']),
+                               data={self.server.underlying: [SimpleNamespace(**r) for r in df.to_dict('records')]})
+
+
+class ReplayOptionHistoricalDataClient:
+    """Stand-in for ``alpaca.data.historical.OptionHistoricalDataClient``"""
+
+    def __init__(self, server: MarketReplayServer):
+        self.server = server
+
+    def get_option_chain(self, request) -> Dict[str, SimpleNamespace]:
+        """``{symbol: OptionsSnapshot}`` filtered like an OptionChainRequest"""
+        state = self.server.option_state()
+        if state.empty:
+            return {}
+        expiration = getattr(request, 'expiration_date', None)
+        if expiration is not None:
+            state = state[state['expiration'].astype(str) == str(expiration)]
+        gte = getattr(request, 'strike_price_gte', None)
+        lte = getattr(request, 'strike_price_lte', None)
+        if gte is not None:
+            state = state[state['strike'] >= gte]
+        if lte is not None:
+            state = state[state['strike'] <= lte]
+
+        snapshots = {}
+        for symbol, row in state.iterrows():
+            timestamp = row['available_at'].to_pydatetime()
+            snapshots[symbol] = SimpleNamespace(
+                symbol=symbol,
+                latest_quote=SimpleNamespace(bid_price=float(row['bid']), ask_price=float(row['ask']),
+                                             bid_size=10, ask_size=10, timestamp=timestamp),
+                latest_trade=SimpleNamespace(price=float(row['close']), size=int(row['volume']),
+                                             timestamp=timestamp),
+                daily_bar=SimpleNamespace(open=row['day_open'], high=row['day_high'], low=row['day_low'],
+                                          close=row['close'], volume=int(row['day_volume']),
+                                          vwap=row['vwap'], trade_count=int(row['day_transactions'])),
+                implied_volatility=None, greeks=None
+            )
+        return snapshots
+
+    def get_option_latest_quote(self, request) -> Dict[str, SimpleNamespace]:
+        quotes = {}
+        for symbol in _symbols(request.symbol_or_symbols):
+            quote = self.server.option_quote(symbol)
+            if quote is not None:
+                quotes[symbol] = quote
+        return quotes
+
+
+class ReplayTradingClient:
+    """
+    Stand-in for ``alpaca.trading.client.TradingClient``
+
+    Market orders fill immediately at the replayed quote (buy at ask, sell
+    at bid); limit orders fill only when marketable. Multi-leg orders fill
+    every leg or none.
+    """
+
+    def __init__(self, server: MarketReplayServer, initial_cash: float = 25000.0):
+        self.server = server
+        self.cash = initial_cash
+        self.orders: Dict[str, SimpleNamespace] = {}
+        self.positions: Dict[str, float] = {}
+
+    def get_account(self) -> SimpleNamespace:
+        return SimpleNamespace(account_number='REPLAY', status='ACTIVE', cash=str(self.cash),
+                               buying_power=str(self.cash), equity=str(self.cash),
+                               options_trading_level=3)
+
+    def _quote(self, symbol: str) -> Optional[SimpleNamespace]:
+        if symbol == self.server.underlying:
+            return self.server.spy_quote()
+        return self.server.option_quote(symbol)
+
+    @staticmethod
+    def _is_buy(side) -> bool:
+        return str(getattr(side, 'value', side)).lower() == 'buy'
+
+    def _fill_price(self, symbol: str, side, limit_price: Optional[float]) -> Optional[float]:
+        quote = self._quote(symbol)
+        if quote is None:
+            return None
+        price = quote.ask_price if self._is_buy(side) else quote.bid_price
+        if limit_price is not None:
+            marketable = price <= limit_price if self._is_buy(side) else price >= limit_price
+            if not marketable:
+                return None
+        return float(price)
+
+    def submit_order(self, order_data) -> SimpleNamespace:
+        qty = float(getattr(order_data, 'qty', 0) or 0)
+        limit_price = getattr(order_data, 'limit_price', None)
+        legs = getattr(order_data, 'legs', None) or []
+        now = self.server.now()
+
+        if legs:
+            # Net debit (+) / credit (-) per unit across all legs
+            fills = []
+            for leg in legs:
+                price = self._fill_price(leg.symbol, leg.side, None)
+                if price is None:
+                    break
+                ratio = float(getattr(leg, 'ratio_qty', 1) or 1)
+                fills.append((leg, price, ratio))
+            net_price = sum(p * r * (1 if self._is_buy(l.side) else -1) for l, p, r in fills)
+            filled = len(fills) == len(legs) and (limit_price is None or net_price <= float(limit_price))
+            leg_orders = [self._record_fill(l.symbol, l.side, qty * r, p, now) for l, p, r in fills] if filled else []
+            order = self._new_order('MLEG', None, qty, 'filled' if filled else 'new',
+                                    net_price if filled else None, now, leg_orders)
+        else:
+            symbol = order_data.symbol
+            price = self._fill_price(symbol, order_data.side, limit_price)
+            if price is not None:
+                self._apply_position(symbol, order_data.side, qty, price)
+            order = self._new_order(symbol, order_data.side, qty, 'filled' if price is not None else 'new',
+                                    price, now, [])
+
+        order.client_order_id = getattr(order_data, 'client_order_id', None) or order.id
+        self.orders[order.id] = order
+        return order
+
+    def _apply_position(self, symbol: str, side, qty: float, price: float):
+        signed = qty if self._is_buy(side) else -qty
+        multiplier = 1 if symbol == self.server.underlying else 100
+        self.positions[symbol] = self.positions.get(symbol, 0.0) + signed
+        self.cash -= signed * price * multiplier
+
+    def _record_fill(self, symbol: str, side, qty: float, price: float, now: datetime) -> SimpleNamespace:
+        self._apply_position(symbol, side, qty, price)
+        return self._new_order(symbol, side, qty, 'filled', price, now, [])
+
+    @staticmethod
+    def _new_order(symbol, side, qty, status, price, now, legs) -> SimpleNamespace:
+        filled = status == 'filled'
+        return SimpleNamespace(id=str(uuid.uuid4()), client_order_id=None, symbol=symbol, side=side,
+                               qty=qty, filled_qty=qty if filled else 0.0, status=status,
+                               filled_avg_price=price, submitted_at=now,
+                               filled_at=now if filled else None, legs=legs)
+
+    def get_order_by_id(self, order_id: str) -> SimpleNamespace:
+        return self.orders[str(order_id)]
+
+    def get_orders(self, filter=None) -> List[SimpleNamespace]:
+        return list(self.orders.values())
+
+    def cancel_order_by_id(self, order_id: str):
+        order = self.orders[str(order_id)]
+        if order.status not in ('filled', 'canceled'):
+            order.status = 'canceled'
+
+    def get_all_positions(self) -> List[SimpleNamespace]:
+        return [SimpleNamespace(symbol=s, qty=str(q)) for s, q in self.positions.items() if q != 0]
+
+
+def main():
+    """Demo: replay the first minutes of a synthetic day at 1000x"""
+    print("🎞️ MARKET REPLAY SERVER DEMO")
+    print("=" * 50)
+
+    import asyncio
+
+    minutes = pd.date_range('2025-08-29 09:30', periods=5, freq='1min')
+    rows = []
+    for i, ts in enumerate(minutes):
+        spot = 640 + 0.1 * i
+        for strike in (638, 640, 642):
+            call = max(spot - strike, 0) + 1.0
+            put = call - (spot - strike)
+            for right, price in (('C', call), ('P', put)):
+                rows.append({'timestamp': int(ts.value // 1_000_000),
+                             'symbol': f"O:SPY250829{right}{strike * 1000:08d}",
+                             'open': price, 'high': price, 'low': price, 'close': price,
+                             'volume': 10, 'vwap': price, 'transactions': 1, 'underlying': 'SPY',
+                             'expiration': '2025-08-29', 'option_type': 'call' if right == 'C' else 'put',
+                             'strike': float(strike)})
+
+    server = MarketReplayServer(pd.DataFrame(rows), speed=1000)
+
+    async def run_demo():
+        market_data = server.market_data()
+        server.start()
+        await market_data.start()
+        while not server.finished:
+            await market_data.wait_for_update(timeout=0.05)
+        await market_data.stop()
+        print(f"   Replayed to {server.now():%H:%M} - SPY mid ${market_data.underlying_price():.2f}")
+        print(f"   Events streamed: {market_data.events_received}")
+
+    asyncio.run(run_demo())
+    chain = server.option_client().get_option_chain(SimpleNamespace(expiration_date=date(2025, 8, 29)))
+    print(f"✅ Chain snapshot: {len(chain)} contracts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+🧾 MULTI-LEG ORDER MANAGER
+==========================
+
+Submits iron condors (and any other multi-leg structure) to the broker
+with as little leg risk as possible:
+
+1. One multi-leg (``mleg``) order when the broker supports it - all four
+   legs fill together or not at all, in a single round-trip
+2. Otherwise every leg is submitted concurrently (one round-trip of
+   latency instead of four sequential ones)
+3. Fills are tracked asynchronously; if a per-leg submission cannot
+   complete, the outstanding legs are cancelled and the filled ones are
+   unwound so no naked short is left behind
+4. Expected positions are reconciled against the broker's
+
+Works with the Alpaca ``TradingClient`` and with the local stand-ins
+(``ReplayTradingClient``) - without the SDK, requests are plain
+namespaces with the same fields.
+
+Location: src/trading/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Alpaca SDK imports
+try:
+    from alpaca.trading.requests import MarketOrderRequest, LimitOrderRequest, OptionLegRequest
+    from alpaca.trading.enums import OrderClass, OrderSide, TimeInForce
+    ALPACA_AVAILABLE = True
+except ImportError:
+    ALPACA_AVAILABLE = False
+
+from src.trading.option_chain_cache import OCC_PATTERN, format_occ_symbol
+from src.trading.trading_clock import TradingClock, WallClock
+from src.utils.latency import timed
+
+
+def _status(order) -> str:
+    status = getattr(order, 'status', '')
+    return str(getattr(status, 'value', status)).lower()
+
+
+def _is_buy(side) -> bool:
+    return str(getattr(side, 'value', side)).lower() == 'buy'
+
+
+@dataclass
+class OrderLeg:
+    """One leg of a multi-leg order"""
+    symbol: str
+    side: str                  # 'buy' or 'sell'
+    ratio_qty: int = 1
+
+    def reversed(self) -> 'OrderLeg':
+        return OrderLeg(self.symbol, 'sell' if _is_buy(self.side) else 'buy', self.ratio_qty)
+
+
+@dataclass
+class OrderResult:
+    """Outcome of a multi-leg submission"""
+    status: str                                   # filled / canceled / rejected / unwound
+    mode: str                                     # mleg / legs
+    qty: float
+    order_ids: List[str] = field(default_factory=list)
+    fills: Dict[str, float] = field(default_factory=dict)         # symbol -> avg fill price
+    net_price: Optional[float] = None             # Per unit: debit (+) / credit (-)
+    submitted_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    round_trips: int = 0
+    error: Optional[str] = None
+
+    @property
+    def filled(self) -> bool:
+        return self.status == 'filled'
+
+    @property
+    def net_credit(self) -> float:
+        """Dollar credit received (negative for a debit)"""
+        return -(self.net_price or 0.0) * self.qty * 100
+
+    @property
+    def exposure_seconds(self) -> float:
+        """Market seconds from submission until the order was resolved"""
+        if self.submitted_at is None or self.completed_at is None:
+            return 0.0
+        return (self.completed_at - self.submitted_at).total_seconds()
+
+
+class MultiLegOrderManager:
+    """
+    Multi-leg order submission with per-leg fallback and fill tracking
+
+    ``executor`` (an ``AsyncExecutor``) keeps the blocking client calls off
+    the event loop; fill polling sleeps on the trading ``clock``.
+    """
+
+    TERMINAL_STATUSES = {'filled', 'canceled', 'cancelled', 'rejected', 'expired'}
+
+    def __init__(self, trading_client, executor=None, clock: Optional[TradingClock] = None,
+                 use_mleg: bool = True, fill_timeout: float = 10.0, poll_interval: float = 0.25):
+        self.trading_client = trading_client
+        self.executor = executor
+        self.clock = clock or WallClock()
+        self.use_mleg = use_mleg
+        self.fill_timeout = fill_timeout
+        self.poll_interval = poll_interval
+
+        self.expected_positions: Dict[str, float] = {}
+        self.stats = {'mleg_orders': 0, 'leg_orders': 0, 'mleg_fallbacks': 0,
+                      'unwinds': 0, 'round_trips': 0}
+        self.logger = logging.getLogger(__name__)
+
+    # ------------------------------------------------------------------
+    # Iron condors
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def iron_condor_legs(expiration: date, put_short: float, put_long: float,
+                         call_short: float, call_long: float, underlying: str = 'SPY') -> List[OrderLeg]:
+        """Opening legs: short put/call spreads (sell the inner strikes, buy the wings)"""
+        return [
+            OrderLeg(format_occ_symbol(underlying, expiration, 'put', put_short), 'sell'),
+            OrderLeg(format_occ_symbol(underlying, expiration, 'put', put_long), 'buy'),
+            OrderLeg(format_occ_symbol(underlying, expiration, 'call', call_short), 'sell'),
+            OrderLeg(format_occ_symbol(underlying, expiration, 'call', call_long), 'buy'),
+        ]
+
+    async def open_iron_condor(self, expiration: date, put_short: float, put_long: float,
+                               call_short: float, call_long: float, contracts: int,
+                               min_credit: Optional[float] = None,
+                               client_order_id: Optional[str] = None) -> OrderResult:
+        """Enter at a net credit of at least ``min_credit`` per spread (market if None)"""
+        legs = self.iron_condor_legs(expiration, put_short, put_long, call_short, call_long)
+        limit_price = -round(min_credit, 2) if min_credit is not None else None
+        return await self.submit(legs, contracts, limit_price, client_order_id)
+
+    async def close_iron_condor(self, expiration: date, put_short: float, put_long: float,
+                                call_short: float, call_long: float, contracts: int,
+                                client_order_id: Optional[str] = None) -> OrderResult:
+        """Exit at market - stop-outs favour speed over price"""
+        legs = self.iron_condor_legs(expiration, put_short, put_long, call_short, call_long)
+        return await self.submit([leg.reversed() for leg in legs], contracts, None, client_order_id)
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    @timed('trading.order_submit')
+    async def submit(self, legs: List[OrderLeg], qty: float, limit_price: Optional[float] = None,
+                     client_order_id: Optional[str] = None) -> OrderResult:
+        """
+        Submit ``legs`` as one multi-leg order, falling back to concurrent legs
+
+        ``limit_price`` is the net price per unit (negative for a credit).
+        The per-leg fallback sends market legs: a net limit cannot be
+        enforced leg by leg, and waiting on resting legs is the leg risk
+        this avoids.
+        """
+        if self.use_mleg:
+            result = await self._submit_mleg(legs, qty, limit_price, client_order_id)
+            if result.status != 'rejected':
+                return result
+            self.stats['mleg_fallbacks'] += 1
+            self.logger.warning(f"⚠️  Multi-leg order rejected ({result.error}) - submitting legs concurrently")
+        return await self._submit_legs(legs, qty, client_order_id)
+
+    async def _submit_mleg(self, legs: List[OrderLeg], qty: float, limit_price: Optional[float],
+                           client_order_id: Optional[str]) -> OrderResult:
+        result = OrderResult(status='rejected', mode='mleg', qty=qty, submitted_at=self.clock.now())
+        try:
+            order = await self._io(self.trading_client.submit_order,
+                                   self._mleg_request(legs, qty, limit_price, client_order_id))
+            self._round_trip(result)
+        except Exception as e:
+            self._round_trip(result)
+            result.error = str(e)
+            return result
+        self.stats['mleg_orders'] += 1
+        result.order_ids = [str(order.id)]
+
+        order = (await self._await_fills([order], result))[str(order.id)]
+        status = _status(order)
+        if status == 'filled':
+            result.status = 'filled'
+            result.net_price = float(order.filled_avg_price)
+            for leg_order in getattr(order, 'legs', None) or []:
+                result.fills[leg_order.symbol] = float(leg_order.filled_avg_price)
+            self._record_fills(legs, qty)
+        elif status == 'rejected':
+            result.error = 'rejected by broker'
+        else:
+            # Atomic order: cancelling leaves no partial legs behind
+            await self._cancel([order], result)
+            result.status = 'canceled'
+        result.completed_at = self.clock.now()
+        return result
+
+    async def _submit_legs(self, legs: List[OrderLeg], qty: float,
+                           client_order_id: Optional[str]) -> OrderResult:
+        result = OrderResult(status='rejected', mode='legs', qty=qty, submitted_at=self.clock.now())
+        requests = [self._leg_request(leg, qty * leg.ratio_qty,
+                                      f"{client_order_id}-{i}" if client_order_id else None)
+                    for i, leg in enumerate(legs)]
+        submitted = await asyncio.gather(
+            *[self._io(self.trading_client.submit_order, request) for request in requests],
+            return_exceptions=True
+        )
+        self._round_trip(result)
+        self.stats['leg_orders'] += len(legs)
+
+        orders = [o for o in submitted if not isinstance(o, BaseException)]
+        errors = [str(o) for o in submitted if isinstance(o, BaseException)]
+        result.order_ids = [str(o.id) for o in orders]
+        final = await self._await_fills(orders, result) if orders else {}
+
+        filled = {leg.symbol: final[str(order.id)] for leg, order in zip(legs, submitted)
+                  if not isinstance(order, BaseException) and _status(final[str(order.id)]) == 'filled'}
+        if len(filled) == len(legs):
+            result.status = 'filled'
+            for leg in legs:
+                price = float(filled[leg.symbol].filled_avg_price)
+                result.fills[leg.symbol] = price
+            result.net_price = sum(result.fills[l.symbol] * l.ratio_qty * (1 if _is_buy(l.side) else -1)
+                                   for l in legs)
+            self._record_fills(legs, qty)
+        else:
+            # Leg risk: cancel what is still working and flatten what already filled
+            await self._cancel([final[str(o.id)] for o in orders
+                                if _status(final[str(o.id)]) not in self.TERMINAL_STATUSES], result)
+            filled_legs = [leg for leg in legs if leg.symbol in filled]
+            if filled_legs:
+                await self._unwind(filled_legs, qty, result)
+                result.status = 'unwound'
+            else:
+                result.status = 'canceled' if orders else 'rejected'
+            result.error = '; '.join(errors) or f"{len(legs) - len(filled)} leg(s) not filled"
+        result.completed_at = self.clock.now()
+        return result
+
+    async def _unwind(self, legs: List[OrderLeg], qty: float, result: OrderResult):
+        self.stats['unwinds'] += 1
+        self.logger.warning(f"⚠️  Unwinding {len(legs)} filled leg(s) after incomplete multi-leg entry")
+        await asyncio.gather(
+            *[self._io(self.trading_client.submit_order,
+                       self._leg_request(leg.reversed(), qty * leg.ratio_qty, None)) for leg in legs],
+            return_exceptions=True
+        )
+        self._round_trip(result)
+
+    # ------------------------------------------------------------------
+    # Fill tracking and reconciliation
+    # ------------------------------------------------------------------
+
+    async def _await_fills(self, orders: List[Any], result: OrderResult) -> Dict[str, Any]:
+        """Poll working orders concurrently until all are terminal or the fill timeout passes"""
+        latest = {str(o.id): o for o in orders}
+        deadline = self.clock.monotonic() + self.fill_timeout
+        polls_left = max(1, math.ceil(self.fill_timeout / self.poll_interval))   # Bounded on a paused clock
+        while True:
+            working = [oid for oid, o in latest.items() if _status(o) not in self.TERMINAL_STATUSES]
+            if not working or polls_left == 0 or self.clock.monotonic() >= deadline:
+                return latest
+            polls_left -= 1
+            await self.clock.sleep(self.poll_interval)
+            refreshed = await asyncio.gather(
+                *[self._io(self.trading_client.get_order_by_id, oid) for oid in working],
+                return_exceptions=True
+            )
+            self._round_trip(result)
+            for oid, order in zip(working, refreshed):
+                if not isinstance(order, BaseException):
+                    latest[oid] = order
+
+    async def _cancel(self, orders: List[Any], result: OrderResult):
+        if not orders:
+            return
+        await asyncio.gather(*[self._io(self.trading_client.cancel_order_by_id, str(o.id)) for o in orders],
+                             return_exceptions=True)
+        self._round_trip(result)
+
+    def _record_fills(self, legs: List[OrderLeg], qty: float):
+        for leg in legs:
+            signed = qty * leg.ratio_qty * (1 if _is_buy(leg.side) else -1)
+            position = self.expected_positions.get(leg.symbol, 0.0) + signed
+            if position:
+                self.expected_positions[leg.symbol] = position
+            else:
+                self.expected_positions.pop(leg.symbol, None)
+
+    async def reconcile(self) -> Dict[str, Tuple[float, float]]:
+        """``{symbol: (expected, broker)}`` for every option position that disagrees"""
+        positions = await self._io(self.trading_client.get_all_positions)
+        broker = {p.symbol: float(p.qty) for p in positions}
+        symbols = set(self.expected_positions) | {s for s in broker if OCC_PATTERN.match(s)}
+        mismatches = {}
+        for symbol in sorted(symbols):
+            expected = self.expected_positions.get(symbol, 0.0)
+            actual = broker.get(symbol, 0.0)
+            if abs(expected - actual) > 1e-9:
+                mismatches[symbol] = (expected, actual)
+        if mismatches:
+            self.logger.warning(f"⚠️  Position mismatch vs broker: {mismatches}")
+        return mismatches
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def _mleg_request(self, legs: List[OrderLeg], qty: float, limit_price: Optional[float],
+                      client_order_id: Optional[str]):
+        if ALPACA_AVAILABLE:
+            fields = dict(qty=qty, order_class=OrderClass.MLEG, time_in_force=TimeInForce.DAY,
+                          client_order_id=client_order_id,
+                          legs=[OptionLegRequest(symbol=l.symbol, side=OrderSide(l.side), ratio_qty=l.ratio_qty)
+                                for l in legs])
+            if limit_price is not None:
+                return LimitOrderRequest(limit_price=limit_price, **fields)
+            return MarketOrderRequest(**fields)
+        return SimpleNamespace(qty=qty, order_class='mleg', time_in_force='day', limit_price=limit_price,
+                               client_order_id=client_order_id,
+                               legs=[SimpleNamespace(symbol=l.symbol, side=l.side, ratio_qty=l.ratio_qty)
+                                     for l in legs])
+
+    @staticmethod
+    def _leg_request(leg: OrderLeg, qty: float, client_order_id: Optional[str]):
+        if ALPACA_AVAILABLE:
+            return MarketOrderRequest(symbol=leg.symbol, qty=qty, side=OrderSide(leg.side),
+                                      time_in_force=TimeInForce.DAY, client_order_id=client_order_id)
+        return SimpleNamespace(symbol=leg.symbol, qty=qty, side=leg.side, time_in_force='day',
+                               limit_price=None, client_order_id=client_order_id)
+
+    async def _io(self, fn, *args):
+        if self.executor is not None:
+            return await self.executor.run_io(fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    def _round_trip(self, result: OrderResult):
+        result.round_trips += 1
+        self.stats['round_trips'] += 1
+
+
+def main():
+    """Demo: open and close an iron condor against the local market replay"""
+    print("🧾 MULTI-LEG ORDER MANAGER DEMO")
+    print("=" * 50)
+
+    import numpy as np
+    import pandas as pd
+    from src.trading.market_replay import MarketReplayServer
+
+    rows = []
+    for i, ts in enumerate(pd.date_range('2025-08-29 09:30', periods=5, freq='1min')):
+        spot = 640 + 0.1 * i
+        for strike in range(634, 647):
+            call = max(spot - strike, 0) + 1.5 * np.exp(-abs(spot - strike) / 4)
+            put = call - (spot - strike)
+            for right, price in (('C', call), ('P', put)):
+                rows.append({'timestamp': int(ts.value // 1_000_000),
+                             'symbol': f"O:SPY250829{right}{strike * 1000:08d}",
+                             'open': price, 'high': price, 'low': price, 'close': price,
+                             'volume': 10, 'vwap': price, 'transactions': 1, 'underlying': 'SPY',
+                             'expiration': '2025-08-29', 'option_type': 'call' if right == 'C' else 'put',
+                             'strike': float(strike)})
+    server = MarketReplayServer(pd.DataFrame(rows), speed=1000)
+    server.seek(datetime(2025, 8, 29, 9, 35))
+    manager = MultiLegOrderManager(server.trading_client(), clock=server.clock)
+
+    async def run_demo():
+        expiration = date(2025, 8, 29)
+        opened = await manager.open_iron_condor(expiration, 638, 636, 642, 644, contracts=2)
+        print(f"   Entry: {opened.status} via {opened.mode}, credit ${opened.net_credit:.2f}, "
+              f"{opened.round_trips} round-trip(s)")
+        closed = await manager.close_iron_condor(expiration, 638, 636, 642, 644, contracts=2)
+        print(f"   Exit: {closed.status}, debit ${-closed.net_credit:.2f}")
+        print(f"   Reconciliation mismatches: {await manager.reconcile()}")
+
+    asyncio.run(run_demo())
+    print(f"✅ Stats: {manager.stats}")
+
+
+if __name__ == "__main__":
+    main()
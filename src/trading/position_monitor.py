@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+📐 VECTORIZED POSITION MONITOR
+==============================
+
+Struct-of-arrays risk book for open iron condors. Strikes, contracts,
+credits, entry times and the latest underlying price of every open
+position live in numpy arrays, so each tick revalues all positions and
+evaluates every exit rule in a handful of array operations instead of a
+Python loop per position.
+
+Valuation and exit rules mirror LiveIronCondorTrader exactly
+(``_calculate_position_pnl`` / ``_check_exit_conditions``):
+1. Time exit after ``max_hold_hours``
+2. Profit target at ``profit_target_pct`` of the credit
+3. Stop loss at ``stop_loss_pct`` of the max loss
+4. End of day (15:00) and market close buffer (15:30)
+Later rules take precedence, as in the scalar checks.
+
+Positions are keyed by underlying, so one monitor can carry condors on
+several underlyings and revalue them from a single price map.
+
+Location: src/trading/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import time as time_module
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Exit reasons in precedence order (the scalar checks let later rules overwrite earlier ones)
+EXIT_REASONS = ('MARKET_CLOSE_BUFFER', 'END_OF_DAY', 'STOP_LOSS', 'PROFIT_TARGET', 'TIME_EXIT')
+
+
+class VectorizedPositionMonitor:
+    """
+    Open iron condors held as parallel arrays
+
+    ``positions`` holds the position objects row-aligned with the arrays;
+    removal swaps the last row into the freed slot, so adds and removes
+    are O(1) and the arrays stay dense for the batched math.
+    """
+
+    _FLOAT_FIELDS = ('put_short', 'put_long', 'call_short', 'call_long',
+                     'contracts', 'credit', 'max_loss', 'spot')
+
+    def __init__(self, max_hold_hours: float = 4.0, profit_target_pct: float = 0.5,
+                 stop_loss_pct: float = 0.5, end_of_day: time = time(15, 0),
+                 close_buffer: time = time(15, 30), market_close: time = time(16, 0),
+                 capacity: int = 16):
+        self.max_hold_hours = max_hold_hours
+        self.profit_target_pct = profit_target_pct
+        self.stop_loss_pct = stop_loss_pct
+        self.end_of_day = end_of_day
+        self.close_buffer = close_buffer
+        self.market_close = market_close
+
+        self.positions: List[Any] = []
+        self.underlyings: List[str] = []
+        self._underlying_codes: Dict[str, int] = {}
+        self._rows: Dict[str, int] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        n = len(self.positions)
+        for name in self._FLOAT_FIELDS:
+            grown = np.zeros(capacity, dtype=np.float64)
+            if n:
+                grown[:n] = getattr(self, name)[:n]
+            setattr(self, name, grown)
+        entry = np.zeros(capacity, dtype='datetime64[us]')
+        underlying = np.zeros(capacity, dtype=np.int32)
+        if n:
+            entry[:n] = self.entry_time[:n]
+            underlying[:n] = self.underlying[:n]
+        self.entry_time = entry
+        self.underlying = underlying
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, position_id: str) -> bool:
+        return position_id in self._rows
+
+    # ------------------------------------------------------------------
+    # Book maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, position, underlying: str = 'SPY'):
+        """Track an open position (LiveIronCondorPosition or any object with its fields)"""
+        if position.position_id in self._rows:
+            raise ValueError(f"Position already monitored: {position.position_id}")
+        row = len(self.positions)
+        if row == self.capacity:
+            self._allocate(self.capacity * 2)
+
+        code = self._underlying_codes.get(underlying)
+        if code is None:
+            code = self._underlying_codes[underlying] = len(self.underlyings)
+            self.underlyings.append(underlying)
+
+        self.put_short[row] = position.put_short_strike
+        self.put_long[row] = position.put_long_strike
+        self.call_short[row] = position.call_short_strike
+        self.call_long[row] = position.call_long_strike
+        self.contracts[row] = position.contracts
+        self.credit[row] = position.credit_received
+        self.max_loss[row] = position.max_loss
+        self.spot[row] = position.current_spy_price or 0.0
+        self.entry_time[row] = np.datetime64(position.entry_time, 'us')
+        self.underlying[row] = code
+
+        self.positions.append(position)
+        self._rows[position.position_id] = row
+
+    def remove(self, position_id: str):
+        """Stop tracking a position (no-op if unknown)"""
+        row = self._rows.pop(position_id, None)
+        if row is None:
+            return
+        last = len(self.positions) - 1
+        if row != last:
+            for name in self._FLOAT_FIELDS + ('entry_time', 'underlying'):
+                array = getattr(self, name)
+                array[row] = array[last]
+            moved = self.positions[last]
+            self.positions[row] = moved
+            self._rows[moved.position_id] = row
+        self.positions.pop()
+
+    # ------------------------------------------------------------------
+    # Batched valuation
+    # ------------------------------------------------------------------
+
+    def update_prices(self, prices: Dict[str, float]):
+        """Set the latest price per underlying; positions on missing underlyings keep theirs"""
+        n = len(self.positions)
+        if not n:
+            return
+        by_code = np.full(len(self.underlyings), np.nan)
+        for underlying, price in prices.items():
+            code = self._underlying_codes.get(underlying)
+            if code is not None and price is not None:
+                by_code[code] = price
+        latest = by_code[self.underlying[:n]]
+        known = ~np.isnan(latest)
+        self.spot[:n][known] = latest[known]
+
+    def values(self, current_time: datetime) -> np.ndarray:
+        """Current iron condor value of every position (same formula as the trader)"""
+        n = len(self.positions)
+        spot = self.spot[:n]
+        put_short, put_long = self.put_short[:n], self.put_long[:n]
+        call_short, call_long = self.call_short[:n], self.call_long[:n]
+
+        put_intrinsic = np.where(spot < put_short,
+                                 (put_short - spot) - np.maximum(0.0, put_long - spot), 0.0)
+        call_intrinsic = np.where(spot > call_short,
+                                  (spot - call_short) - np.maximum(0.0, spot - call_long), 0.0)
+
+        close = current_time.replace(hour=self.market_close.hour, minute=self.market_close.minute,
+                                     second=0, microsecond=0)
+        hours_to_expiry = max((close - current_time).total_seconds() / 3600, 0.01)
+        time_to_expiry = hours_to_expiry / (24 * 365)
+        time_value = np.maximum(0.0, self.credit[:n] * 0.1 * (time_to_expiry / 0.00274))
+
+        return np.maximum(0.0, (put_intrinsic + call_intrinsic + time_value) * self.contracts[:n] * 100)
+
+    def revalue(self, prices: Dict[str, float], current_time: datetime) -> np.ndarray:
+        """Apply ``prices``, revalue every position and write the marks back to the position objects"""
+        self.update_prices(prices)
+        marks = self.values(current_time)
+        for position, spot, value in zip(self.positions, self.spot[:len(marks)].tolist(), marks.tolist()):
+            position.update_current_value(spot, value)
+        return marks
+
+    def pnl(self, current_time: datetime) -> np.ndarray:
+        return self.credit[:len(self.positions)] - self.values(current_time)
+
+    # ------------------------------------------------------------------
+    # Batched exit rules
+    # ------------------------------------------------------------------
+
+    def exit_reasons(self, current_time: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate every exit rule for every position
+
+        Returns (pnl, reason_code) arrays; reason_code indexes EXIT_REASONS
+        and is -1 where the position stays open.
+        """
+        n = len(self.positions)
+        pnl = self.pnl(current_time)
+        hold_hours = (np.datetime64(current_time, 'us') - self.entry_time[:n]) / np.timedelta64(1, 'h')
+        clock = current_time.time()
+
+        conditions = [
+            np.full(n, clock >= self.close_buffer),
+            np.full(n, clock >= self.end_of_day),
+            pnl <= -(self.max_loss[:n] * self.stop_loss_pct),
+            pnl >= self.credit[:n] * self.profit_target_pct,
+            hold_hours >= self.max_hold_hours,
+        ]
+        return pnl, np.select(conditions, np.arange(len(EXIT_REASONS)), default=-1)
+
+    def check_exits(self, current_time: datetime) -> List[Tuple[Any, float, str]]:
+        """Positions to close as (position, pnl, exit_reason)"""
+        if not self.positions:
+            return []
+        pnl, codes = self.exit_reasons(current_time)
+        return [(self.positions[row], float(pnl[row]), EXIT_REASONS[codes[row]])
+                for row in np.flatnonzero(codes >= 0)]
+
+
+def main():
+    """Demo: revalue and check exits for a large book"""
+    from types import SimpleNamespace
+
+    print("📐 VECTORIZED POSITION MONITOR DEMO")
+    print("=" * 50)
+
+    rng = np.random.default_rng(7)
+    entry = datetime(2025, 8, 29, 10, 0)
+    monitor = VectorizedPositionMonitor()
+    spots = {'SPY': 640.0, 'QQQ': 560.0, 'IWM': 225.0}
+    for i in range(60):
+        underlying = list(spots)[i % 3]
+        center = spots[underlying] + rng.normal(0, 2)
+        monitor.add(SimpleNamespace(
+            position_id=f"IC_{i:03d}", entry_time=entry + timedelta(minutes=i),
+            put_short_strike=round(center - 3), put_long_strike=round(center - 5),
+            call_short_strike=round(center + 3), call_long_strike=round(center + 5),
+            contracts=1, credit_received=0.8, max_loss=120.0, current_spy_price=None,
+            update_current_value=lambda spot, value: None), underlying)
+
+    now = datetime(2025, 8, 29, 13, 0)
+    started = time_module.perf_counter()
+    for _ in range(1000):
+        monitor.revalue(spots, now)
+        exits = monitor.check_exits(now)
+    per_tick_us = (time_module.perf_counter() - started) / 1000 * 1e6
+
+    print(f"   Positions: {len(monitor)} across {len(monitor.underlyings)} underlyings")
+    print(f"   Tick (revalue + exit checks): {per_tick_us:.1f} us")
+    print(f"   Exits due: {len(exits)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+⏱️ TRADING CLOCK AND SCHEDULER
+==============================
+
+Pluggable time source for every time-dependent part of the live trading
+stack (traders, quote book, streams, replay server):
+
+1. WallClock         - real time (production)
+2. AcceleratedClock  - market time running at N x wall speed (replays)
+3. SimulatedClock    - time moves only when advanced (deterministic tests)
+
+All clocks expose ``now()``, ``monotonic()`` and async ``sleep()`` in
+*market* seconds, so cadences such as "every 60 seconds" mean the same
+thing at any speed. ``TradingScheduler`` runs periodic jobs on a clock.
+
+Location: src/trading/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import heapq
+import itertools
+import time as time_module
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+class TradingClock(ABC):
+    """Base interface: market-time now / monotonic / sleep"""
+
+    speed: float = 1.0
+
+    @abstractmethod
+    def now(self) -> datetime:
+        """Current market time"""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Monotonic market seconds (for ages and intervals)"""
+
+    @abstractmethod
+    async def sleep(self, seconds: float):
+        """Sleep ``seconds`` of market time"""
+
+    def start(self):
+        """Start the clock (no-op for clocks that are always running)"""
+
+    async def sleep_until(self, when: datetime):
+        delay = (when - self.now()).total_seconds()
+        if delay > 0:
+            await self.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+    async def wait_for(self, awaitable: Awaitable, timeout: Optional[float]):
+        """
+        ``asyncio.wait_for`` with the timeout in market seconds
+
+        Raises ``asyncio.TimeoutError`` if the clock passes the timeout first.
+        """
+        if timeout is None:
+            return await awaitable
+        task = asyncio.ensure_future(awaitable)
+        timer = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            done, _ = await asyncio.wait({task, timer}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            timer.cancel()
+            raise
+        timer.cancel()
+        if task in done:
+            return task.result()
+        task.cancel()
+        raise asyncio.TimeoutError()
+
+
+class WallClock(TradingClock):
+    """Real time"""
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time_module.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(seconds, 0.0))
+
+
+class AcceleratedClock(TradingClock):
+    """
+    Market time starting at ``start`` and running ``speed`` times faster
+    than the wall clock once started; frozen at ``start`` until then
+    """
+
+    def __init__(self, start: datetime, speed: float = 1.0, end: Optional[datetime] = None):
+        if speed <= 0:
+            raise ValueError("Clock speed must be positive")
+        self.speed = speed
+        self.end = end
+        self._base_time = start
+        self._base_mono = 0.0
+        self._started_at: Optional[float] = None
+
+    def start(self):
+        if self._started_at is None:
+            self._started_at = time_module.monotonic()
+
+    @property
+    def started(self) -> bool:
+        return self._started_at is not None
+
+    def _elapsed(self) -> float:
+        if self._started_at is None:
+            return 0.0
+        return (time_module.monotonic() - self._started_at) * self.speed
+
+    def now(self) -> datetime:
+        current = self._base_time + timedelta(seconds=self._elapsed())
+        return min(current, self.end) if self.end is not None else current
+
+    def monotonic(self) -> float:
+        return self._base_mono + self._elapsed()
+
+    def set(self, when: datetime):
+        """Jump to ``when`` (keeps running if started)"""
+        self._base_mono = self.monotonic() + max((when - self.now()).total_seconds(), 0.0)
+        self._base_time = when
+        if self._started_at is not None:
+            self._started_at = time_module.monotonic()
+
+    async def sleep(self, seconds: float):
+        await asyncio.sleep(max(seconds, 0.0) / self.speed)
+
+
+class SimulatedClock(TradingClock):
+    """
+    Deterministic clock: time only moves through ``run_for()`` / ``advance()``
+
+    ``sleep()`` registers its deadline as soon as it is called (not when the
+    awaiting task first runs), and ``run_for()`` wakes sleepers one deadline
+    at a time, letting each woken task run before time moves on, so every
+    task observes ``now()`` at its own deadline.
+    """
+
+    def __init__(self, start: datetime):
+        self._now = start
+        self._mono = 0.0
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    def now(self) -> datetime:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._mono
+
+    def sleep(self, seconds: float) -> Awaitable:
+        """Awaitable resolved once the clock reaches now + seconds"""
+        if seconds <= 0:
+            return asyncio.sleep(0)
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._sleepers, (self._mono + seconds, next(self._sequence), future))
+        return future
+
+    def advance(self, seconds: float):
+        """
+        Jump forward without yielding; every due sleeper is released but
+        observes the final time (use ``run_for`` for per-deadline wakeups)
+        """
+        target = self._mono + max(seconds, 0.0)
+        while self._sleepers and self._sleepers[0][0] <= target:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+        self._set_mono(target)
+
+    def set(self, when: datetime):
+        self.advance((when - self._now).total_seconds())
+
+    def _set_mono(self, mono: float):
+        self._now += timedelta(seconds=mono - self._mono)
+        self._mono = mono
+
+    @property
+    def pending_sleepers(self) -> int:
+        return sum(1 for _, _, future in self._sleepers if not future.done())
+
+    async def run_for(self, seconds: float):
+        """Advance ``seconds``, waking sleepers in deadline order and letting each run"""
+        target = self._mono + max(seconds, 0.0)
+        await self._drain()
+        while self._sleepers and self._sleepers[0][0] <= target:
+            deadline, _, future = heapq.heappop(self._sleepers)
+            if future.done():                  # Cancelled (e.g. a wait_for timer)
+                continue
+            self._set_mono(max(deadline, self._mono))
+            future.set_result(None)
+            await self._drain()
+        self._set_mono(target)
+        await self._drain()
+
+    @staticmethod
+    async def _drain(max_yields: int = 1000):
+        """Yield until no callbacks are ready, so woken tasks reach their next await"""
+        loop = asyncio.get_running_loop()
+        ready = getattr(loop, '_ready', None)     # Callback queue of the default loops
+        for _ in range(max_yields):
+            await asyncio.sleep(0)
+            if ready is not None and not ready:
+                break
+
+
+class TradingScheduler:
+    """
+    Periodic jobs on a trading clock
+
+    ``every(seconds, job)`` runs ``job`` (sync or async) on a fixed cadence
+    in market time; a job that overruns its interval is not stacked.
+    """
+
+    def __init__(self, clock: TradingClock):
+        self.clock = clock
+        self._jobs: Dict[str, Tuple[float, Callable]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.runs: Dict[str, int] = {}
+
+    def every(self, seconds: float, job: Callable, name: Optional[str] = None):
+        name = name or getattr(job, '__name__', f'job_{len(self._jobs)}')
+        self._jobs[name] = (seconds, job)
+        self.runs[name] = 0
+        if self._tasks:
+            self._tasks[name] = asyncio.create_task(self._run_job(name))
+        return name
+
+    async def _run_job(self, name: str):
+        interval, job = self._jobs[name]
+        next_run = self.clock.monotonic()
+        while True:
+            result = job()
+            if asyncio.iscoroutine(result):
+                await result
+            self.runs[name] += 1
+            next_run += interval
+            delay = next_run - self.clock.monotonic()
+            if delay < 0:
+                # Overran: skip missed slots instead of running back-to-back
+                next_run = self.clock.monotonic() + interval
+                delay = interval
+            await self.clock.sleep(delay)
+
+    def start(self):
+        for name in self._jobs:
+            if name not in self._tasks:
+                self._tasks[name] = asyncio.create_task(self._run_job(name))
+
+    async def run_until(self, should_stop: Callable[[], bool], poll_seconds: float = 1.0):
+        """Run all jobs until ``should_stop()`` is true (checked every poll_seconds)"""
+        self.start()
+        try:
+            while not should_stop():
+                await self.clock.sleep(poll_seconds)
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {}
+
+
+def main():
+    """Demo: one simulated hour of a 60-second cadence, instantly"""
+    print("⏱️ TRADING CLOCK DEMO")
+    print("=" * 50)
+
+    async def run_demo():
+        clock = SimulatedClock(datetime(2025, 8, 29, 9, 30))
+        scheduler = TradingScheduler(clock)
+        scheduler.every(60, lambda: None, name='trading_cycle')
+        scheduler.start()
+        await clock.run_for(3600)
+        await scheduler.stop()
+        print(f"   Clock at {clock.now():%H:%M}, cycles run: {scheduler.runs['trading_cycle']}")
+
+    asyncio.run(run_demo())
+
+    accelerated = AcceleratedClock(datetime(2025, 8, 29, 9, 30), speed=600)
+    accelerated.start()
+    time_module.sleep(0.1)
+    print(f"   Accelerated 600x: 0.1s wall -> {accelerated.now():%H:%M:%S}")
+    print("✅ Clocks ready")
+
+
+if __name__ == "__main__":
+    main()
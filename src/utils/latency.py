@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+⏱️ HOT-PATH LATENCY INSTRUMENTATION
+===================================
+
+Low-overhead span timing for the signal-to-order pipeline (quote
+arrival -> market analysis -> signal -> strategy selection -> order):
+
+1. ``span(stage)`` context manager and ``timed(stage)`` decorator time a
+   stage with ``time.perf_counter_ns`` (monotonic)
+2. Every stage feeds a log-linear histogram (8 sub-buckets per power of
+   two, ~6% resolution) - fixed memory, O(1) record
+3. ``stats()`` reports count / mean / p50 / p90 / p99 / max per stage and
+   ``export()`` writes them to a local JSON metrics file
+
+Disabled by default. Enable with ``TRADING_LATENCY_METRICS=1`` (and
+optionally ``TRADING_LATENCY_FILE=<path>``). When disabled, ``timed``
+returns the function unchanged (decided when the decorated module is
+imported) and ``span`` returns a shared no-op context; per-message paths
+check ``LATENCY.enabled`` themselves so they pay only a flag test.
+
+Location: src/utils/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import functools
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+DEFAULT_METRICS_FILE = os.path.join(project_root, 'logs', 'latency_metrics.json')
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations"""
+
+    SUB_BUCKETS = 8                 # Per power of two
+    N_BUCKETS = 64 * SUB_BUCKETS
+
+    def __init__(self):
+        self.counts: List[int] = [0] * self.N_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    @classmethod
+    def _index(cls, value_ns: int) -> int:
+        if value_ns < 2 * cls.SUB_BUCKETS:
+            return max(value_ns, 0)
+        shift = value_ns.bit_length() - 4
+        return (shift + 1) * cls.SUB_BUCKETS + (value_ns >> shift) - cls.SUB_BUCKETS
+
+    @classmethod
+    def _bucket_value(cls, index: int) -> float:
+        """Midpoint of a bucket's range"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return float(index)
+        shift = index // cls.SUB_BUCKETS - 1
+        lower = (index % cls.SUB_BUCKETS + cls.SUB_BUCKETS) << shift
+        return lower + (1 << shift) / 2
+
+    def record(self, value_ns: int):
+        self.counts[self._index(value_ns)] += 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def percentile(self, q: float) -> float:
+        """Approximate ``q``-th percentile (0-100) in nanoseconds"""
+        if self.count == 0:
+            return 0.0
+        target = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self._bucket_value(index), float(self.max_ns))
+        return float(self.max_ns)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_us': self.total_ns / self.count / 1e3 if self.count else 0.0,
+            'p50_us': self.percentile(50) / 1e3,
+            'p90_us': self.percentile(90) / 1e3,
+            'p99_us': self.percentile(99) / 1e3,
+            'max_us': self.max_ns / 1e3,
+        }
+
+
+class _NullSpan:
+    """Shared no-op span returned while instrumentation is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('recorder', 'stage', 'started')
+
+    def __init__(self, recorder: 'LatencyRecorder', stage: str):
+        self.recorder = recorder
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, time.perf_counter_ns() - self.started)
+        return False
+
+
+class LatencyRecorder:
+    """Per-stage latency histograms with JSON export"""
+
+    def __init__(self, enabled: bool = False, export_path: Optional[str] = None):
+        self.enabled = enabled
+        self.export_path = export_path or DEFAULT_METRICS_FILE
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, export_path: Optional[str] = None):
+        self.enabled = True
+        if export_path:
+            self.export_path = export_path
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def span(self, stage: str):
+        """``with recorder.span('strategy.select'):`` - no-op while disabled"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, stage)
+
+    def record(self, stage: str, elapsed_ns: int):
+        """Record an externally measured duration (e.g. quote arrival to order)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(int(elapsed_ns))
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator for sync or async functions (identity while disabled)"""
+        def decorate(fn: Callable) -> Callable:
+            if not self.enabled:
+                return fn
+            if asyncio.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    started = time.perf_counter_ns()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        self.record(stage, time.perf_counter_ns() - started)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter_ns()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(stage, time.perf_counter_ns() - started)
+            return wrapper
+        return decorate
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: h.summary() for stage, h in sorted(self.histograms.items())}
+
+    def export(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the current stats to a JSON metrics file (atomic replace)"""
+        if not self.enabled and not self.histograms:
+            return None
+        target = Path(path or self.export_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'generated_at': datetime.now().isoformat(timespec='seconds'), 'stages': self.stats()}
+        tmp = target.with_suffix(target.suffix + '.tmp')
+        tmp.write_text(json.dumps(payload, indent=2))
+        os.replace(tmp, target)
+        return str(target)
+
+    def format_table(self) -> str:
+        lines = [f"{'stage':<36}{'count':>8}{'p50 us':>12}{'p99 us':>12}{'max us':>12}"]
+        for stage, s in self.stats().items():
+            lines.append(f"{stage:<36}{s['count']:>8}{s['p50_us']:>12.1f}{s['p99_us']:>12.1f}{s['max_us']:>12.1f}")
+        return '\n'.join(lines)
+
+
+# Process-wide recorder shared by the data, strategy and trading modules
+LATENCY = LatencyRecorder(enabled=os.getenv('TRADING_LATENCY_METRICS', '0') == '1',
+                          export_path=os.getenv('TRADING_LATENCY_FILE'))
+
+
+def span(stage: str):
+    return LATENCY.span(stage)
+
+
+def timed(stage: str) -> Callable:
+    return LATENCY.timed(stage)
+
+
+def main():
+    """Demo: time a few synthetic stages and export the metrics"""
+    print("⏱️ LATENCY INSTRUMENTATION DEMO")
+    print("=" * 50)
+
+    recorder = LatencyRecorder(enabled=True)
+
+    @recorder.timed('strategy.fast_stage')
+    def fast_stage():
+        return sum(range(100))
+
+    for i in range(200):
+        fast_stage()
+        with recorder.span('data.slow_stage'):
+            time.sleep(0.0001 if i % 50 else 0.001)
+
+    print(recorder.format_table())
+    disabled = LatencyRecorder(enabled=False)
+    started = time.perf_counter_ns()
+    for _ in range(100_000):
+        with disabled.span('noop'):
+            pass
+    print(f"   Disabled span cost: {(time.perf_counter_ns() - started) / 100_000:.0f} ns")
+    path = recorder.export(os.path.join(project_root, 'logs', 'latency_demo.json'))
+    print(f"✅ Metrics written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Synthetic Option Chain Fixtures
+===============================
+
+Shared builders for small option-bar frames in the options-parquet layout
+(OCC ``symbol``, ms ``timestamp``, flat OHLC/volume defaults). Tests pass
+only what they vary: prices, strikes, expirations or seeded bad rows.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.occ_symbols import format_occ_symbol
+
+START = datetime(2024, 9, 3, 14, 30)
+CONTRACTS = ((550.0, 'call'), (550.0, 'put'), (555.0, 'call'))
+
+
+def occ_symbol(expiration: str, option_type: str, strike: float, underlying: str = 'SPY') -> str:
+    """Polygon-style ticker, e.g. ``O:SPY240903C00550000``"""
+    return 'O:' + format_occ_symbol(underlying, date.fromisoformat(expiration), option_type, strike)
+
+
+def option_bar(when: datetime, strike: float, option_type: str, expiration: str,
+               symbol: Optional[str] = None, **fields) -> Dict:
+    """One bar row; ``fields`` override the defaults or add columns"""
+    row = {'symbol': symbol or occ_symbol(expiration, option_type, strike),
+           'timestamp': int(pd.Timestamp(when).value // 10**6),
+           'open': 1.0, 'high': 1.3, 'low': 0.9, 'close': 1.1, 'volume': 20, 'vwap': 1.05,
+           'transactions': 4, 'underlying': 'SPY', 'expiration': expiration,
+           'option_type': option_type, 'strike': strike}
+    row.update(fields)
+    return row
+
+
+def synthetic_chain(minutes: int = 10, expirations: Iterable[str] = ('2024-09-03',),
+                    contracts: Iterable[Tuple[float, str]] = CONTRACTS, start: datetime = START) -> pd.DataFrame:
+    """Clean bars for every minute x expiration x (strike, type), in that order"""
+    return pd.DataFrame([option_bar(start + pd.Timedelta(minutes=minute), strike, option_type, expiration)
+                         for minute in range(minutes)
+                         for expiration in expirations
+                         for strike, option_type in contracts])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Async Execution Model Test
+==========================
+
+Validates the trader executor: offloaded I/O and CPU calls, timeout and
+error accounting, single-flight background jobs and shutdown.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+import unittest
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.async_execution import AsyncExecutor
+
+
+class TestAsyncExecutor(unittest.TestCase):
+    """Test offloading, timeouts, background jobs and shutdown"""
+
+    def test_calls_run_off_the_loop_thread(self):
+        async def run():
+            executor = AsyncExecutor()
+            loop_thread = threading.get_ident()
+            io_thread = await executor.run_io(threading.get_ident)
+            cpu_result = await executor.run_cpu(sum, [1, 2, 3])
+            await executor.shutdown()
+            return executor, loop_thread, io_thread, cpu_result
+
+        executor, loop_thread, io_thread, cpu_result = asyncio.run(run())
+        self.assertNotEqual(io_thread, loop_thread)
+        self.assertEqual(cpu_result, 6)
+        self.assertEqual((executor.stats['io_calls'], executor.stats['cpu_calls']), (1, 1))
+
+    def test_timeouts_and_errors_are_counted(self):
+        def fail():
+            raise ValueError("broker down")
+
+        async def run():
+            executor = AsyncExecutor(io_timeout=5.0)
+            started = time.monotonic()
+            with self.assertRaises(asyncio.TimeoutError):
+                await executor.run_io(time.sleep, 0.5, timeout=0.05)
+            elapsed = time.monotonic() - started
+            with self.assertRaises(asyncio.TimeoutError):
+                await executor.run_cpu(time.sleep, 0.5, timeout=0.05)
+            with self.assertRaises(ValueError):
+                await executor.run_io(fail)
+            await executor.shutdown()
+            return executor, elapsed
+
+        executor, elapsed = asyncio.run(run())
+        self.assertLess(elapsed, 0.4)                     # The loop did not wait for the thread
+        self.assertEqual(executor.stats['timeouts'], 2)
+        self.assertEqual(executor.stats['errors'], 1)
+
+    def test_spawn_skips_job_still_in_flight(self):
+        async def run():
+            executor = AsyncExecutor()
+            release = asyncio.Event()
+            runs = []
+
+            async def job(tag):
+                runs.append(tag)
+                await release.wait()
+
+            self.assertTrue(executor.spawn('entry_scan', job('first')))
+            await asyncio.sleep(0)
+            skipped = job('second')
+            self.assertFalse(executor.spawn('entry_scan', skipped))
+            self.assertIsNone(skipped.cr_frame)           # Closed, never awaited
+
+            self.assertTrue(executor.is_busy('entry_scan'))
+            release.set()
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            self.assertFalse(executor.is_busy('entry_scan'))
+            self.assertTrue(executor.spawn('entry_scan', job('third')))
+            await asyncio.sleep(0)
+            await executor.shutdown()
+            return runs
+
+        self.assertEqual(asyncio.run(run()), ['first', 'third'])
+
+    def test_cancel_all_and_shutdown(self):
+        async def run():
+            executor = AsyncExecutor()
+            cancelled = []
+
+            async def long_job():
+                try:
+                    await asyncio.sleep(60)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            executor.spawn('a', long_job())
+            executor.spawn('b', long_job())
+            await asyncio.sleep(0)
+            await executor.cancel_all()
+            self.assertFalse(executor.is_busy('a') or executor.is_busy('b'))
+
+            executor.spawn('c', long_job())
+            await asyncio.sleep(0)
+            await executor.shutdown()
+            with self.assertRaises(RuntimeError):
+                await executor.run_io(time.time)
+            return cancelled
+
+        self.assertEqual(len(asyncio.run(run())), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Backfill Manifest Test
+======================
+
+Resumable backfill against a counting in-process Polygon client: re-runs
+fetch nothing, failed units retry, a torn manifest line is ignored,
+incremental mode fetches only new days and range files are extended
+rather than refetched.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import date, datetime, timedelta
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.backfill_manifest import BackfillManifest, ManifestBackfill, trading_days
+from src.data.polygon_client import PolygonClient, PolygonRequestError
+
+
+class _CountingClient(PolygonClient):
+    """Serves synthetic bars for every request and records what was asked for"""
+
+    def __init__(self):
+        super().__init__('test-key', max_workers=4)
+        self.calls = []
+        self.failing = set()
+        self.empty = set()
+        self._lock = threading.Lock()
+
+    def aggregates(self, ticker, multiplier, timespan, start, end, limit=50000, adjusted=True):
+        with self._lock:
+            self.calls.append((ticker, start, end))
+        if ticker in self.failing:
+            raise PolygonRequestError(f"503 for {ticker}")
+        if ticker in self.empty:
+            return []
+        days = trading_days(datetime.strptime(start, '%Y-%m-%d').date(), datetime.strptime(end, '%Y-%m-%d').date())
+        step = 60_000 if timespan == 'minute' else 0
+        return [{'t': int(datetime(day.year, day.month, day.day, 10, 0).timestamp() * 1000) + i * step,
+                 'o': 1.0, 'h': 1.2, 'l': 0.9, 'c': 1.1, 'v': 10, 'vw': 1.05, 'n': 3}
+                for day in days for i in range(3 if timespan == 'minute' else 1)]
+
+
+class TestBackfillManifest(unittest.TestCase):
+    """Resume, idempotency and incremental top-ups"""
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.data_dir, 'manifest.jsonl')
+        self.client = _CountingClient()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def _backfill(self, granularity='1min') -> ManifestBackfill:
+        return ManifestBackfill(self.client, BackfillManifest(self.manifest_path), self.data_dir,
+                                granularity=granularity, chunk_size=3)
+
+    def test_rerun_fetches_nothing_and_failures_resume(self):
+        units = [(f"O:SPY250829C00{strike}000", date(2025, 8, 29)) for strike in range(640, 648)]
+        self.client.failing = {units[2][0], units[5][0]}
+        self.client.empty = {units[7][0]}
+
+        stats = self._backfill().run(units)
+        self.assertEqual((stats['fetched'], stats['empty'], stats['failed']), (5, 1, 2))
+        self.assertTrue(os.path.exists(os.path.join(self.data_dir, 'O_SPY250829C00640000_1min_20250829.csv')))
+        self.assertFalse(any(name.endswith('.tmp') for name in os.listdir(self.data_dir)))
+
+        # New process: only the two failed units are requested again
+        self.client.failing, self.client.calls = set(), []
+        stats = self._backfill().run(units)
+        self.assertEqual(sorted(ticker for ticker, _, _ in self.client.calls), sorted([units[2][0], units[5][0]]))
+        self.assertEqual(stats['skipped'], 6)
+
+        self.client.calls = []
+        self.assertEqual(self._backfill().run(units)['skipped'], 8)
+        self.assertEqual(self.client.calls, [])
+
+    def test_torn_manifest_line_and_deleted_file_are_refetched(self):
+        units = [('SPY', date(2025, 8, 28)), ('SPY', date(2025, 8, 29))]
+        self._backfill().run(units)
+        backfill = self._backfill()
+        backfill.manifest.close()
+        with open(self.manifest_path, 'r+') as f:         # Interrupted mid-append
+            content = f.read()
+            f.seek(0)
+            f.write(content[:-20])
+            f.truncate()
+        os.remove(backfill.output_path('SPY', date(2025, 8, 28)))
+
+        self.client.calls = []
+        self._backfill().run(units)
+        self.assertEqual(sorted(start for _, start, _ in self.client.calls), ['2025-08-28', '2025-08-29'])
+        self.client.calls = []
+        self._backfill().run(units)                        # Records appended after the torn line survive
+        self.assertEqual(self.client.calls, [])
+
+    def test_incremental_only_fetches_days_after_last_complete(self):
+        universe = lambda day: ['SPY', f"O:SPY{day.strftime('%y%m%d')}C00645000"]
+        backfill = self._backfill()
+        stats = backfill.backfill_days(trading_days(date(2025, 8, 25), date(2025, 8, 27)), universe)
+        self.assertEqual((stats['days'], stats['fetched']), (3, 6))
+        self.assertEqual(backfill.manifest.last_completed_day('1min'), date(2025, 8, 27))
+
+        self.client.calls = []
+        stats = self._backfill().incremental(universe, first_day=date(2025, 8, 1), end=date(2025, 9, 1))
+        self.assertEqual(sorted({start for _, start, _ in self.client.calls}),
+                         ['2025-08-28', '2025-08-29', '2025-09-01'])     # Weekend skipped
+        self.assertEqual(stats['days_skipped'], 0)
+
+    def test_range_top_up_extends_files_and_skips_expired(self):
+        tickers = {'O:SPY250829C00645000': date(2025, 8, 29), 'O:SPY250926C00645000': date(2025, 9, 26)}
+        self._backfill('1day').top_up(tickers, date(2025, 8, 25), date(2025, 8, 29))
+
+        self.client.calls = []
+        backfill = self._backfill('1day')
+        stats = backfill.top_up(tickers, date(2025, 8, 25), date(2025, 9, 5))
+        self.assertEqual(self.client.calls, [('O:SPY250926C00645000', '2025-08-30', '2025-09-05')])
+        self.assertEqual(stats['skipped'], 1)                             # Expired on 8/29
+        frame = backfill.load_range('O:SPY250926C00645000')
+        self.assertEqual(len(frame), 10)
+        self.assertTrue(frame.index.is_unique)
+
+    def test_range_top_up_fetches_earlier_range_and_only_gaps(self):
+        ticker = 'O:SPY251219C00600000'
+        self._backfill('1day').top_up({ticker: None}, date(2024, 6, 1), date(2024, 6, 30))
+
+        self.client.calls = []
+        backfill = self._backfill('1day')
+        backfill.top_up({ticker: None}, date(2024, 1, 1), date(2024, 3, 31))
+        self.assertEqual(self.client.calls, [(ticker, '2024-01-01', '2024-03-31')])
+        self.assertEqual(len(backfill.load_range(ticker)), 20 + 65)
+
+        # Spanning range: only the April-May gap and July are requested
+        self.client.calls = []
+        backfill = self._backfill('1day')
+        backfill.top_up({ticker: date(2024, 7, 5)}, date(2024, 2, 1), date(2024, 7, 31))
+        self.assertEqual(sorted(self.client.calls), [(ticker, '2024-04-01', '2024-05-31'),
+                                                     (ticker, '2024-07-01', '2024-07-05')])
+        self.assertEqual(backfill.covered_intervals(ticker), [(date(2024, 1, 1), date(2024, 7, 5))])
+
+    def test_range_top_up_does_not_cover_unfinished_days(self):
+        ticker = 'O:SPY261219C00600000'
+        today = date.today()
+        self._backfill('1day').top_up({ticker: None}, today - timedelta(days=10), today)
+
+        self.client.calls = []
+        self._backfill('1day').top_up({ticker: None}, today - timedelta(days=10), today)
+        self.assertEqual(self.client.calls, [(ticker, today.strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d'))])
+
+
+if __name__ == '__main__':
+    unittest.main()
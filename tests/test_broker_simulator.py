@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Broker Simulator Test
+=====================
+
+Validates latency, partial fills, queue position, slippage, multi-leg
+matching, the Alpaca-shaped client surface and the latency sweep.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.broker_simulator import BrokerSimulator, LatencyModel, SlippageModel
+from src.trading.order_manager import MultiLegOrderManager
+from src.trading.trading_clock import SimulatedClock
+
+START = datetime(2025, 8, 29, 10, 0)
+CALL = 'SPY250829C00645000'
+PUT = 'SPY250829P00635000'
+
+
+def _quotes(n: int = 20, step_ms: int = 100, size: float = 10, volume: float = 0) -> pd.DataFrame:
+    """Two contracts quoted every ``step_ms``; the call drifts up a cent per quote"""
+    times = pd.date_range(START, periods=n, freq=f'{step_ms}ms')
+    call_mid = 2.00 + 0.01 * np.arange(n)
+    frames = [pd.DataFrame({'timestamp': times, 'symbol': CALL, 'bid': call_mid - 0.02, 'ask': call_mid + 0.02,
+                            'bid_size': size, 'ask_size': size, 'volume': volume}),
+              pd.DataFrame({'timestamp': times, 'symbol': PUT, 'bid': 1.48, 'ask': 1.52,
+                            'bid_size': size, 'ask_size': size, 'volume': volume})]
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestBrokerSimulator(unittest.TestCase):
+    """Execution effects and client surface"""
+
+    def test_latency_moves_fill_to_later_quote(self):
+        fast = BrokerSimulator(_quotes(), latency=LatencyModel(base_ms=10))
+        slow = BrokerSimulator(_quotes(), latency=LatencyModel(base_ms=350))
+        self.assertAlmostEqual(fast.execute(CALL, 'buy', 1, START).filled_avg_price, 2.02)
+        self.assertAlmostEqual(slow.execute(CALL, 'buy', 1, START).filled_avg_price, 2.05)
+
+    def test_partial_fills_across_quote_refreshes(self):
+        broker = BrokerSimulator(_quotes(size=10), latency=LatencyModel(base_ms=0))
+        order = broker.execute(CALL, 'buy', 25, START)
+        self.assertEqual(order.status, 'filled')
+        self.assertEqual([qty for _, qty, _ in order.fills], [10, 10, 5])
+        self.assertAlmostEqual(order.filled_avg_price, (10 * 2.02 + 10 * 2.03 + 5 * 2.04) / 25)
+
+        capped = broker.execute(CALL, 'buy', 25, START, until=START + timedelta(milliseconds=50))
+        self.assertEqual((capped.status, capped.filled_qty), ('canceled', 10))
+
+    def test_resting_limit_waits_for_queue_ahead(self):
+        broker = BrokerSimulator(_quotes(size=10, volume=6), latency=LatencyModel(base_ms=0))
+        # Joins the bid at 1.48 behind 10 contracts; 6 trade per quote
+        order = broker.execute(PUT, 'buy', 3, START, limit_price=1.48)
+        self.assertEqual(order.status, 'filled')
+        fill_times = [pd.Timestamp(t) for t, _, _ in order.fills]
+        self.assertEqual(fill_times[0], pd.Timestamp(START) + pd.Timedelta(milliseconds=100))
+        self.assertAlmostEqual(order.filled_avg_price, 1.48)
+        self.assertEqual([qty for _, qty, _ in order.fills], [2, 1])
+
+        below_touch = broker.execute(PUT, 'buy', 3, START, limit_price=1.40)
+        self.assertEqual((below_touch.status, below_touch.filled_qty), ('canceled', 0))
+
+    def test_slippage_never_crosses_limit(self):
+        broker = BrokerSimulator(_quotes(), latency=LatencyModel(base_ms=0),
+                                 slippage=SlippageModel(ticks=2))
+        self.assertAlmostEqual(broker.execute(PUT, 'sell', 1, START).filled_avg_price, 1.46)
+        self.assertAlmostEqual(broker.execute(PUT, 'sell', 1, START, limit_price=1.47).filled_avg_price, 1.47)
+
+    def test_multi_leg_fills_at_net_price(self):
+        broker = BrokerSimulator(_quotes(), latency=LatencyModel(base_ms=0))
+        legs = [SimpleNamespace(symbol=CALL, side='sell', ratio_qty=1),
+                SimpleNamespace(symbol=PUT, side='sell', ratio_qty=1)]
+        order = broker.execute(None, None, 2, START, limit_price=-3.0, legs=legs)
+        self.assertEqual(order.status, 'filled')
+        self.assertAlmostEqual(order.filled_avg_price, -(1.98 + 1.48))
+        self.assertEqual(broker.positions, {CALL: -2.0, PUT: -2.0})
+
+        too_greedy = broker.execute(None, None, 1, START, limit_price=-5.0, legs=legs)
+        self.assertEqual((too_greedy.status, too_greedy.filled_qty), ('canceled', 0))
+
+    def test_client_surface_fills_on_the_clock(self):
+        clock = SimulatedClock(START)
+        broker = BrokerSimulator(_quotes(), latency=LatencyModel(base_ms=250), clock=clock)
+        order = broker.submit_order(SimpleNamespace(symbol=CALL, qty=1, side='buy', limit_price=None))
+        self.assertEqual(broker.get_order_by_id(order.id).status, 'accepted')   # Still in flight
+        clock.advance(0.3)
+        filled = broker.get_order_by_id(order.id)
+        self.assertEqual(filled.status, 'filled')
+        self.assertAlmostEqual(filled.filled_avg_price, 2.04)
+        self.assertEqual(broker.get_all_positions()[0].qty, '1.0')
+
+    def test_order_manager_trades_against_simulator(self):
+        clock = SimulatedClock(START)
+        broker = BrokerSimulator(_quotes(), latency=LatencyModel(base_ms=150), clock=clock)
+        manager = MultiLegOrderManager(broker, clock=clock, fill_timeout=1.0, poll_interval=0.1)
+        legs = manager.iron_condor_legs(START.date(), 635, 630, 645, 650)[::2]      # Two short legs quoted here
+
+        async def run():
+            task = asyncio.ensure_future(manager.submit(legs, 1))
+            while not task.done():
+                await clock.run_for(0.1)
+                await asyncio.sleep(0.001)
+            return task.result()
+
+        result = asyncio.run(run())
+        self.assertTrue(result.filled)
+        self.assertGreaterEqual(result.exposure_seconds, 0.15)
+
+    def test_throughput_and_latency_sweep(self):
+        broker = BrokerSimulator(_quotes(n=3000), slippage=SlippageModel(spread_fraction=0.1))
+        decisions = [{'symbol': CALL, 'side': 'buy', 'qty': 5,
+                      'decision_time': START + timedelta(milliseconds=100 * i)} for i in range(2500)]
+        started = time.perf_counter()
+        sweep = broker.latency_sweep(decisions, [0, 100, 500])
+        orders_per_second = 3 * len(decisions) / (time.perf_counter() - started)
+
+        self.assertGreater(orders_per_second, 1000)
+        self.assertEqual(list(sweep['fill_rate']), [1.0, 1.0, 1.0])
+        # A cent per 100ms of drift on 5 contracts x 100 multiplier = $5 per order per 100ms
+        self.assertAlmostEqual(sweep['cost_vs_fastest'].iloc[1], 5.0 * len(decisions), places=4)
+        self.assertTrue(sweep['execution_cost'].is_monotonic_increasing)
+        self.assertEqual(broker.orders, {})                   # Sweep leaves no state behind
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+0DTE Chain Snapshot Test
+========================
+
+Builds the dense minute x strike x call/put tensors from a sparse 0DTE
+chain and checks every minute's snapshot against a brute-force "last
+trade so far" scan, the npz round trip, and True0DTEDataLoader.load_snapshot.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.chain_snapshots import ChainSnapshot, ChainSnapshotStore
+from src.data.shared_dataset import SharedDataset
+from tests.synthetic_options import option_bar
+
+DAY = date(2024, 1, 3)
+OPEN = datetime(2024, 1, 3, 14, 30)
+
+
+def _chain(seed: int = 7) -> pd.DataFrame:
+    """Sparse 0DTE trades plus a next-day expiry that must be ignored"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for minute in range(60):
+        for strike in (470.0, 471.0, 472.0, 473.0):
+            for option_type in ('call', 'put'):
+                if rng.random() < 0.4:
+                    when = OPEN + pd.Timedelta(minutes=minute)
+                    rows.append(option_bar(when, strike, option_type, '2024-01-03', datetime=when,
+                                           close=round(rng.uniform(0.1, 3.0), 2), volume=int(rng.integers(1, 50)),
+                                           vwap=round(rng.uniform(0.1, 3.0), 2),
+                                           underlying_price=471.5 + minute / 100, date=DAY, days_to_expiry=0))
+    first = rows[0]
+    rows.append(option_bar(first['datetime'], 480.0, first['option_type'], '2024-01-04', datetime=first['datetime'],
+                           close=first['close'], volume=first['volume'], vwap=first['vwap'],
+                           underlying_price=first['underlying_price'], date=DAY, days_to_expiry=1))
+    return pd.DataFrame(rows)
+
+
+class TestChainSnapshots(unittest.TestCase):
+    """Dense per-day tensors"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.chain = _chain()
+        self.zero_dte = self.chain[self.chain['days_to_expiry'] == 0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_every_minute_matches_last_trade_scan(self):
+        snapshot = ChainSnapshot.from_frame(DAY, self.zero_dte)
+        self.assertEqual(snapshot.close.shape, (snapshot.n_minutes, 4, 2))
+        self.assertEqual(snapshot.minute_index(OPEN - pd.Timedelta(minutes=1)), -1)
+        self.assertEqual(snapshot.minute_index(OPEN + pd.Timedelta(minutes=5, seconds=30)), 5)
+
+        for minute in snapshot.minutes:
+            chain = snapshot.at(minute)
+            seen = self.zero_dte[self.zero_dte['datetime'] <= minute]
+            expected = seen.sort_values('datetime').groupby(['strike', 'option_type'])['close'].last()
+            actual = chain.set_index(['strike', 'option_type'])['close'].sort_index()
+            pd.testing.assert_series_equal(actual, expected.sort_index(), check_names=False)
+            traded = self.zero_dte[self.zero_dte['datetime'] == minute]
+            self.assertEqual(chain['volume'].sum(), traded['volume'].sum())
+
+        row = self.zero_dte.iloc[-1]
+        self.assertEqual(snapshot.price(row['datetime'], row['strike'], row['option_type']), row['close'])
+        self.assertTrue(np.isnan(snapshot.price(OPEN, 999.0, 'call')))
+
+    def test_store_round_trip_keeps_only_zero_dte(self):
+        store = ChainSnapshotStore(os.path.join(self.tmp_dir, 'snapshots'))
+        self.assertEqual(list(store.build(self.chain)), [DAY])
+        self.assertEqual(store.days(), [DAY])
+
+        loaded = ChainSnapshotStore(store.root).load(DAY)
+        built = ChainSnapshot.from_frame(DAY, self.zero_dte)
+        self.assertNotIn(480.0, loaded.strikes)
+        for field in ('close', 'volume', 'vwap', 'spot'):
+            np.testing.assert_array_equal(getattr(loaded, field), getattr(built, field))
+        self.assertEqual(store.build(self.chain), {})                     # Already built
+
+    def test_true_0dte_loader_serves_minute_snapshots(self):
+        from src.tests.analysis.true_0dte_backtester import True0DTEDataLoader
+
+        shared_dir = os.path.join(self.tmp_dir, 'shared')
+        SharedDataset.publish(self.chain, shared_dir)
+        loader = True0DTEDataLoader(shared_dir=shared_dir)
+        loader.snapshots = ChainSnapshotStore(os.path.join(self.tmp_dir, 'snapshots'))
+
+        chain = loader.load_snapshot(OPEN + pd.Timedelta(minutes=30))
+        self.assertTrue(os.path.exists(loader.snapshots.path(DAY)))
+        self.assertAlmostEqual(chain['spy_price_estimate'].iloc[0], 471.8)
+        self.assertEqual(set(chain['strike']), {470.0, 471.0, 472.0, 473.0})
+        self.assertTrue(loader.load_snapshot(datetime(2024, 1, 4, 15, 0)).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Compiled Model Scoring Test
+===========================
+
+Validates that the array-based model export reproduces the probabilities
+of the trained scikit-learn / XGBoost models.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from types import SimpleNamespace
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.strategies.adaptive_ml_enhanced.compiled_models import CompiledModelScorer, compile_models
+
+try:
+    import xgboost as xgb
+    XGB_AVAILABLE = True
+except ImportError:
+    XGB_AVAILABLE = False
+
+XGB_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'xgb_booster_dump.json')
+
+
+class _FixtureBooster:
+    """Booster stand-in serving a saved get_dump / save_config pair"""
+
+    def __init__(self, fixture: dict):
+        self.fixture = fixture
+        self.feature_names = fixture['feature_names']
+
+    def get_dump(self, dump_format: str = 'json'):
+        return [json.dumps(tree) for tree in self.fixture['trees']]
+
+    def save_config(self) -> str:
+        return json.dumps({'learner': {'learner_model_param': {'base_score': self.fixture['base_score']}}})
+
+
+def _reference_xgb_probability(fixture: dict, x: np.ndarray, n_trees: int) -> float:
+    """XGBoost semantics walked node by node: yes if x < split, missing branch for NaN"""
+    base_score = float(fixture['base_score'].strip('[]'))
+    margin = np.log(base_score / (1 - base_score))
+    for tree in fixture['trees'][:n_trees]:
+        node = tree
+        while 'leaf' not in node:
+            value = x[int(node['split'][1:])]
+            target = node['missing'] if np.isnan(value) else (node['yes'] if value < node['split_condition'] else node['no'])
+            node = next(child for child in node['children'] if child['nodeid'] == target)
+        margin += node['leaf']
+    return 1.0 / (1.0 + np.exp(-margin))
+
+
+def _renumber_pruned(node: dict) -> dict:
+    """Copy of a dumped tree with gaps in its node ids, as left behind by pruning"""
+    renumber = lambda node_id: node_id if node_id == 0 else 3 * node_id + 4
+    node = dict(node, nodeid=renumber(node['nodeid']))
+    if 'children' in node:
+        node.update({key: renumber(node[key]) for key in ('yes', 'no', 'missing')})
+        node['children'] = [_renumber_pruned(child) for child in node['children']]
+    return node
+
+
+class TestCompiledModels(unittest.TestCase):
+    """Compare compiled numpy scoring against the framework models"""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(7)
+        cls.X = rng.normal(size=(600, 8)).astype(np.float32)
+        cls.y = (cls.X[:, 0] + 0.5 * cls.X[:, 3] + rng.normal(scale=0.5, size=600) > 0).astype(int)
+        cls.feature_names = [f'feature_{i}' for i in range(8)]
+
+        cls.scaler = StandardScaler().fit(cls.X)
+        cls.models = {
+            'rf_target_profitable': RandomForestClassifier(n_estimators=25, random_state=0).fit(cls.X, cls.y),
+            'nn_target_profitable': MLPClassifier(hidden_layer_sizes=(16, 8), max_iter=300,
+                                                  random_state=0).fit(cls.scaler.transform(cls.X), cls.y)
+        }
+        if XGB_AVAILABLE:
+            cls.models['xgb_target_profitable'] = xgb.XGBClassifier(n_estimators=30, max_depth=4).fit(cls.X, cls.y)
+
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.compiled_path = os.path.join(cls.tmp_dir, 'compiled_models_test.npz')
+        compile_models(cls.models, cls.feature_names, cls.compiled_path, scaler=cls.scaler)
+        cls.scorer = CompiledModelScorer(cls.compiled_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_random_forest_probabilities_match(self):
+        expected = self.models['rf_target_profitable'].predict_proba(self.X)
+        actual = self.scorer.models['rf_target_profitable'].predict_proba(self.X)
+        np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+    def test_mlp_probabilities_match_with_compiled_scaler(self):
+        expected = self.models['nn_target_profitable'].predict_proba(self.scaler.transform(self.X))
+        actual = self.scorer.models['nn_target_profitable'].predict_proba(self.scorer.scaler.transform(self.X))
+        np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+    @unittest.skipUnless(XGB_AVAILABLE, "xgboost not installed")
+    def test_xgboost_probabilities_match(self):
+        expected = self.models['xgb_target_profitable'].predict_proba(self.X)
+        actual = self.scorer.models['xgb_target_profitable'].predict_proba(self.X)
+        np.testing.assert_allclose(actual, expected, atol=1e-5)
+
+    def test_xgboost_fixture_flattening_matches_tree_walk(self):
+        with open(XGB_FIXTURE) as f:
+            fixture = json.load(f)
+        X = np.random.default_rng(3).normal(size=(300, 4)).astype(np.float32)
+        X[::7, 2] = np.nan                                    # Exercise missing-value branches
+        feature_names = [f'f{i}' for i in range(4)]
+
+        for best_iteration, n_trees in ((None, 3), (1, 2)):
+            model = SimpleNamespace(get_booster=lambda: _FixtureBooster(fixture),
+                                    best_iteration=best_iteration, classes_=np.array([0, 1]))
+            path = os.path.join(self.tmp_dir, f'compiled_xgb_fixture_{n_trees}.npz')
+            compile_models({'xgb_target_profitable': model}, feature_names, path)
+            actual = CompiledModelScorer(path).models['xgb_target_profitable'].predict_proba(X)[:, 1]
+            expected = [_reference_xgb_probability(fixture, row, n_trees) for row in X]
+            np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+    def test_xgboost_non_contiguous_node_ids_match_tree_walk(self):
+        with open(XGB_FIXTURE) as f:
+            fixture = json.load(f)
+        fixture['trees'] = [_renumber_pruned(tree) for tree in fixture['trees']]
+        X = np.random.default_rng(5).normal(size=(300, 4)).astype(np.float32)
+        X[::5, 1] = np.nan
+
+        model = SimpleNamespace(get_booster=lambda: _FixtureBooster(fixture),
+                                best_iteration=None, classes_=np.array([0, 1]))
+        path = os.path.join(self.tmp_dir, 'compiled_xgb_pruned.npz')
+        compile_models({'xgb_target_profitable': model}, [f'f{i}' for i in range(4)], path)
+        actual = CompiledModelScorer(path).models['xgb_target_profitable'].predict_proba(X)[:, 1]
+        expected = [_reference_xgb_probability(fixture, row, len(fixture['trees'])) for row in X]
+        np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+    def test_feature_names_round_trip(self):
+        self.assertEqual(self.scorer.feature_names, self.feature_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
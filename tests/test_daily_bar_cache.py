@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Daily Bar Cache Test
+====================
+
+Overlapping range requests against the per-symbol daily bar cache only
+fetch uncovered gaps; weekends inside a fetched range are not gaps, the
+unfinished current day is refetched, and per-range files compact into
+one file per symbol.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.daily_bar_cache import DailyBarCache, merge_intervals, subtract_intervals
+
+
+class _Fetcher:
+    """Weekday bars with close = day of month; records every requested range"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((start, end))
+        days = [d for d in pd.date_range(start, end) if d.weekday() < 5]
+        return pd.DataFrame({'date': days, 'open': 1.0, 'high': 2.0, 'low': 0.5,
+                             'close': [float(d.day) for d in days], 'volume': 100})
+
+
+class TestDailyBarCache(unittest.TestCase):
+    """Gap fetching and compaction"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.fetch = _Fetcher()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _cache(self) -> DailyBarCache:
+        return DailyBarCache(os.path.join(self.tmp_dir, 'daily_bars'))
+
+    def test_interval_arithmetic(self):
+        d = lambda day: date(2024, 1, day)
+        self.assertEqual(merge_intervals([(d(10), d(20)), (d(1), d(5)), (d(6), d(8))]), [(d(1), d(8)), (d(10), d(20))])
+        self.assertEqual(subtract_intervals(d(1), d(31), [(d(5), d(10)), (d(20), d(25))]),
+                         [(d(1), d(4)), (d(11), d(19)), (d(26), d(31))])
+        self.assertEqual(subtract_intervals(d(6), d(9), [(d(5), d(10))]), [])
+
+    def test_overlapping_ranges_only_fetch_gaps(self):
+        cache = self._cache()
+        q1 = cache.get('SPY', date(2024, 1, 1), date(2024, 3, 31), self.fetch)
+        self.assertEqual(len(q1), 65)
+        cache.get('SPY', date(2024, 2, 1), date(2024, 2, 29), self.fetch)       # Fully inside: no fetch
+        cache.get('SPY', date(2024, 2, 1), date(2024, 6, 30), self.fetch)
+        self.assertEqual(self.fetch.calls, [(date(2024, 1, 1), date(2024, 3, 31)),
+                                            (date(2024, 4, 1), date(2024, 6, 30))])
+
+        # A new process reads coverage from the single per-symbol file
+        restarted = self._cache()
+        frame = restarted.get('SPY', date(2024, 1, 6), date(2024, 1, 7), self.fetch)   # A weekend
+        self.assertTrue(frame.empty)
+        self.assertEqual(len(self.fetch.calls), 2)
+        self.assertEqual(os.listdir(os.path.join(self.tmp_dir, 'daily_bars')), ['SPY.parquet'])
+        self.assertEqual(restarted.load('SPY', date(2024, 5, 1), date(2024, 5, 3))['close'].tolist(), [1.0, 2.0, 3.0])
+
+    def test_current_day_is_not_marked_covered(self):
+        cache = self._cache()
+        today = date.today()
+        cache.get('SPY', today - timedelta(days=10), today, self.fetch)
+        self.assertEqual(cache.missing('SPY', today - timedelta(days=10), today), [(today, today)])
+
+    def test_failed_gap_keeps_earlier_gaps(self):
+        cache = self._cache()
+        cache.get('SPY', date(2024, 3, 1), date(2024, 3, 31), self.fetch)
+
+        def flaky(symbol, start, end):
+            if start > date(2024, 3, 31):
+                raise ConnectionError("rate limited")
+            return self.fetch(symbol, start, end)
+
+        with self.assertRaises(ConnectionError):
+            cache.get('SPY', date(2024, 2, 1), date(2024, 4, 30), flaky)
+        self.assertEqual(self._cache().missing('SPY', date(2024, 2, 1), date(2024, 4, 30)),
+                         [(date(2024, 4, 1), date(2024, 4, 30))])
+
+    def test_compacts_overlapping_range_files(self):
+        real_data = os.path.join(self.tmp_dir, 'real-data')
+        os.makedirs(real_data)
+        paths = []
+        for start, end in (('2024-01-01', '2024-01-31'), ('2024-01-15', '2024-02-29')):
+            days = [d for d in pd.date_range(start, end) if d.weekday() < 5]
+            bars = [{'day': i + 1, 'date': f"{d:%Y-%m-%d}T05:00:00.000Z", 'dateString': f"{d:%Y-%m-%d}",
+                     'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': float(d.day), 'volume': 10, 'vwap': 1.1,
+                     'tradeCount': 5, 'isRealData': True} for i, d in enumerate(days)]
+            path = os.path.join(real_data, f"SPY_{start}_{end}_1Day.json")
+            with open(path, 'w') as f:
+                json.dump({'symbol': 'SPY', 'startDate': start, 'endDate': end, 'timeframe': '1Day', 'bars': bars}, f)
+            paths.append(path)
+
+        cache = self._cache()
+        self.assertEqual(cache.compact(paths), {'SPY': 44})          # 23 + 21 weekdays
+        self.assertEqual(cache.covered('SPY'), [(date(2024, 1, 1), date(2024, 2, 29))])
+        frame = self._cache().get('SPY', date(2024, 1, 10), date(2024, 2, 20), self.fetch)
+        self.assertEqual(self.fetch.calls, [])
+        self.assertTrue(frame.index.is_unique)
+        self.assertEqual(frame['trade_count'].iloc[0], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Data Validation Test
+====================
+
+Seeds each kind of bad bar into a small chain and checks the ingestion
+bitmask flags exactly those rows, that the dataset sidecar is reused,
+that ParquetDataLoader drops flagged rows once, and that the intraday
+store records flags/stats per partition and keeps bad bars out of the
+day block.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.data_validation import (BAD_CONTRACT, BAD_OHLC, BAD_TIMESTAMP, DUPLICATE_BAR, NEGATIVE_PRICE,
+                                      VALIDATED_ATTR, ZERO_VWAP, validate_bars, validate_dataset, validity_path)
+from tests.synthetic_options import START, synthetic_chain
+
+
+def _dirty() -> pd.DataFrame:
+    frame = synthetic_chain()
+    frame.loc[4, 'vwap'] = 0.0                                  # ZERO_VWAP
+    frame.loc[7, 'close'] = -0.5                                # NEGATIVE_PRICE
+    frame.loc[10, ['high', 'low']] = [0.5, 0.9]                 # BAD_OHLC
+    frame.loc[13, 'strike'] = 560.0                             # Symbol says 550
+    frame.loc[16, 'timestamp'] = frame.loc[1, 'timestamp'] + 30_000   # Back in time for that contract
+    duplicate = frame.iloc[[20]]
+    return pd.concat([frame, duplicate], ignore_index=True)     # Row 30: DUPLICATE_BAR
+
+
+class TestDataValidation(unittest.TestCase):
+    """Bitmask, sidecar and pipeline integration"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_flags_exactly_the_seeded_rows(self):
+        flags, stats = validate_bars(_dirty())
+        expected = {4: ZERO_VWAP, 7: NEGATIVE_PRICE, 10: BAD_OHLC, 13: BAD_CONTRACT,
+                    16: BAD_TIMESTAMP, 30: DUPLICATE_BAR}
+        self.assertEqual({int(i): int(flags[i]) for i in np.flatnonzero(flags)}, expected)
+        self.assertEqual(stats['valid_rows'], 31 - 6)
+        self.assertFalse(stats['monotonic'])
+        self.assertEqual(stats['flags']['duplicate_bar'], 1)
+
+        flags, stats = validate_bars(synthetic_chain())
+        self.assertFalse(flags.any())
+        self.assertTrue(stats['monotonic'])
+
+    def test_dataset_sidecar_is_computed_once(self):
+        path = os.path.join(self.tmp_dir, 'spy_options_test.parquet')
+        frame = _dirty()
+        frame.to_parquet(path, index=False)
+        first, _ = validate_dataset(path, frame)
+        self.assertTrue(os.path.exists(validity_path(path)))
+        with mock.patch('src.data.data_validation.validate_bars', side_effect=AssertionError('revalidated')):
+            second, stats = validate_dataset(path, frame)
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(stats['valid_rows'], 25)
+
+    def test_parquet_loader_keeps_only_clean_rows(self):
+        from src.data.parquet_data_loader import ParquetDataLoader
+
+        path = os.path.join(self.tmp_dir, 'spy_options_test.parquet')
+        _dirty().to_parquet(path, index=False)
+        loader = ParquetDataLoader(path)
+        self.assertEqual(len(loader.full_dataset), 25)
+        self.assertEqual(loader.validation_stats['flags']['zero_vwap'], 1)
+        day = loader.load_options_for_date(START, min_volume=1)
+        self.assertTrue(day.attrs.get(VALIDATED_ATTR))
+        self.assertTrue((day['vwap'] > 0).all())
+
+    def test_store_partitions_carry_flags_and_stats(self):
+        from src.data.intraday_store import IntradayBarStore
+
+        index = pd.DatetimeIndex([START + pd.Timedelta(minutes=m) for m in range(4)], name='timestamp')
+        bars = pd.DataFrame({'open': 1.0, 'high': 1.2, 'low': 0.8, 'close': [1.0, 1.1, 1.2, 1.3],
+                             'volume': 5.0, 'vwap': [1.0, 0.0, 1.1, 1.2], 'transactions': 1}, index=index)
+        store = IntradayBarStore(os.path.join(self.tmp_dir, 'store'))
+        store.write_day(date(2024, 9, 3), {'O:SPY240903C00550000': bars})
+
+        stats = store.validation_stats(date(2024, 9, 3))
+        self.assertEqual((stats['rows'], stats['valid_rows'], stats['flags']['zero_vwap']), (4, 3, 1))
+        self.assertEqual(list(store.load_day(date(2024, 9, 3))['flags']), [0, ZERO_VWAP, 0, 0])
+        block = store.load_day_block(date(2024, 9, 3))
+        self.assertEqual(len(block.timestamps), 3)
+        self.assertTrue(np.isnan(block.price('O:SPY240903C00550000', START + pd.Timedelta(minutes=1))))
+
+
+if __name__ == '__main__':
+    unittest.main()
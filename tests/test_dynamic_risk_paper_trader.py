@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Dynamic Risk Paper Trader Replay Test
+=====================================
+
+Drives DynamicRiskPaperTrader through a short market replay on a
+simulated clock: no Alpaca SDK, credentials or network, and the session
+ends when the replay reaches the end of its data. A restart resumes the
+session from the state journal.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading import dynamic_risk_paper_trader
+from src.trading.market_replay import MarketReplayServer
+from src.trading.trading_clock import SimulatedClock
+
+OPEN = datetime(2025, 8, 29, 11, 0)
+
+
+def _options_bars(minutes: int = 40) -> pd.DataFrame:
+    """Parquet-schema minute bars consistent with put-call parity around a drifting SPY"""
+    rows = []
+    for i, ts in enumerate(pd.date_range(OPEN, periods=minutes, freq='1min')):
+        spot = 640.0 + 0.05 * i
+        for strike in range(630, 651):
+            call = max(spot - strike, 0) + 1.0
+            put = call - (spot - strike)
+            for right, price in (('C', call), ('P', put)):
+                rows.append({'timestamp': int(ts.value // 1_000_000),
+                             'symbol': f"O:SPY250829{right}{strike * 1000:08d}",
+                             'open': price, 'high': price, 'low': price, 'close': price,
+                             'volume': 50, 'vwap': price, 'transactions': 5, 'underlying': 'SPY',
+                             'expiration': '2025-08-29', 'option_type': 'call' if right == 'C' else 'put',
+                             'strike': float(strike)})
+    return pd.DataFrame(rows)
+
+
+@unittest.skipUnless(dynamic_risk_paper_trader.BACKTESTER_AVAILABLE, "backtester modules not importable")
+class TestPaperTraderReplay(unittest.TestCase):
+    """Run the live loop against the replay server"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp_dir)                             # DetailedLogger writes logs/ under cwd
+        self.patches = [
+            mock.patch.object(dynamic_risk_paper_trader, 'project_root', self.tmp_dir),
+            # The historical dataset is not needed when the replay supplies market data
+            mock.patch('unified_strategy_backtester.ParquetDataLoader'),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in reversed(self.patches):
+            patch.stop()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_session_runs_to_end_of_replay(self):
+        clock = SimulatedClock(OPEN)
+        replay = MarketReplayServer(_options_bars(), clock=clock)
+        with mock.patch.object(dynamic_risk_paper_trader, 'ALPACA_AVAILABLE', False):
+            trader = dynamic_risk_paper_trader.DynamicRiskPaperTrader(initial_balance=25000, replay=replay)
+        cycles = []
+        trading_cycle = trader._live_trading_cycle
+
+        async def counted_cycle():
+            cycles.append(clock.now())
+            await trading_cycle()
+
+        trader._live_trading_cycle = counted_cycle
+
+        async def run():
+            session = asyncio.create_task(trader.start_paper_trading())
+            while not session.done():
+                await clock.run_for(30)
+                await asyncio.sleep(0.01)                 # Let offloaded I/O complete
+            await session
+
+        with mock.patch.object(dynamic_risk_paper_trader, 'ALPACA_AVAILABLE', False):
+            asyncio.run(asyncio.wait_for(run(), timeout=60))
+
+        self.assertFalse(trader.is_trading)
+        self.assertEqual(clock.now().replace(second=0), replay.session_end)
+        self.assertTrue(all(OPEN <= t <= replay.session_end for t in cycles))
+        self.assertGreater(len(cycles), 20)               # Reacted to streamed updates
+
+        # The 11:30 entry window fetched the chain through the replay client
+        self.assertEqual(trader.option_chain.snapshot_date, replay.trading_date)
+        self.assertTrue(trader.market_stream.option_symbols)
+
+    def test_restart_resumes_journaled_session(self):
+        journal_dir = os.path.join(self.tmp_dir, 'paper_state')
+
+        def new_trader():
+            replay = MarketReplayServer(_options_bars(minutes=2), clock=SimulatedClock(OPEN))
+            with mock.patch.object(dynamic_risk_paper_trader, 'ALPACA_AVAILABLE', False):
+                trader = dynamic_risk_paper_trader.DynamicRiskPaperTrader(
+                    initial_balance=25000, replay=replay, journal_dir=journal_dir)
+            trader._restore_from_journal()
+            return trader
+
+        first = new_trader()
+        recommendation = {'strategy_type': 'IRON_CONDOR'}
+        for minute in (0, 1):
+            entry = OPEN.replace(minute=minute)
+            self.assertTrue(first._execute_iron_condor(pd.DataFrame(), 640.0, entry.date(), entry.time(),
+                                                       recommendation))
+        first._close_position(first.open_positions[0], OPEN, 'PROFIT_TARGET', 60.0)
+        first.open_positions.pop(0)
+        first.journal.set_fields(signals_generated_today=2, last_signal_check=OPEN)
+        first.journal.flush()
+        first.journal._stop.set()                          # Process dies here without a clean shutdown
+        first.journal._flusher.join()
+        first.journal._wal.close()
+
+        restarted = new_trader()
+        self.assertEqual([p['trade_id'] for p in restarted.open_positions],
+                         [p['trade_id'] for p in first.open_positions])
+        self.assertAlmostEqual(restarted.current_balance, first.current_balance)
+        self.assertEqual((restarted.signals_generated_today, restarted.last_signal_check), (2, OPEN))
+        self.assertEqual(len(restarted.cash_manager.open_positions), 1)
+        restarted.journal.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
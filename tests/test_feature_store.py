@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Feature Store Test
+==================
+
+Validates that the feature store serves cached feature matrices, only
+computes missing days and reads column subsets.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.feature_store import FeatureStore
+
+
+class TestFeatureStore(unittest.TestCase):
+    """Test feature store keys, incremental computation and column subsets"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = FeatureStore(os.path.join(self.tmp_dir, 'store'), verbose=False)
+
+        self.dataset_path = os.path.join(self.tmp_dir, 'dataset.parquet')
+        pd.DataFrame({'strike': [500.0, 505.0]}).to_parquet(self.dataset_path)
+
+        self.computed = []
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _compute(self, day):
+        self.computed.append(day)
+        return pd.DataFrame({
+            'date': [day, day],
+            'close': [1.0, 2.0],
+            'volume': [10, 20],
+            'greeks_delta': [0.4, -0.6]
+        })
+
+    def _key(self, lookbacks=(5, 10, 20, 60), version='1.0.0'):
+        dataset_hash = self.store.dataset_fingerprint(self.dataset_path)
+        return self.store.make_key(dataset_hash, version, lookbacks, {'sample_size_per_day': 500})
+
+    def test_key_depends_on_version_and_lookbacks(self):
+        base = self._key()
+        self.assertEqual(base, self._key(lookbacks=(60, 20, 10, 5)))
+        self.assertNotEqual(base, self._key(version='1.1.0'))
+        self.assertNotEqual(base, self._key(lookbacks=(5, 10)))
+
+    def test_only_missing_days_are_computed(self):
+        key = self._key()
+        first = [datetime(2025, 8, 1), datetime(2025, 8, 4)]
+        self.store.get_or_compute(key, first, self._compute)
+        self.assertEqual(len(self.computed), 2)
+
+        extended = first + [datetime(2025, 8, 5)]
+        df = self.store.get_or_compute(key, extended, self._compute)
+        self.assertEqual(self.computed[-1], datetime(2025, 8, 5))
+        self.assertEqual(len(self.computed), 3)
+        self.assertEqual(len(df), 6)
+
+        # A fresh store instance reuses the persisted manifest
+        reopened = FeatureStore(self.store.store_dir, verbose=False)
+        self.assertEqual(reopened.missing_days(key, extended), [])
+
+    def test_column_subset_and_empty_days(self):
+        key = self._key()
+        days = [datetime(2025, 8, 1), datetime(2025, 8, 2)]
+        self.store.put_day(key, days[0], self._compute(days[0]))
+        self.store.put_day(key, days[1], None)
+
+        subset = self.store.load(key, days, columns=['close', 'greeks_delta'])
+        self.assertEqual(list(subset.columns), ['close', 'greeks_delta'])
+        self.assertEqual(len(subset), 2)
+        self.assertEqual(self.store.missing_days(key, days), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Intraday Bar Store Test
+=======================
+
+Round-trips per-contract minute CSVs through the date-partitioned parquet
+store, checks the aligned day block, idempotent upserts and that the
+1-minute backtest DataLoader reads the store.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.intraday_store import IntradayBarStore
+
+DAY = date(2025, 8, 29)
+
+
+def _bars(minutes, close: float) -> pd.DataFrame:
+    index = pd.DatetimeIndex([datetime(2025, 8, 29, 9, 30) + pd.Timedelta(minutes=m) for m in minutes],
+                             name='timestamp')
+    n = len(index)
+    return pd.DataFrame({'open': close, 'high': close + 0.1, 'low': close - 0.1, 'close': close + np.arange(n),
+                         'volume': 10.0, 'vwap': close, 'transactions': 2}, index=index)
+
+
+class TestIntradayBarStore(unittest.TestCase):
+    """Columnar store and day block"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = IntradayBarStore(os.path.join(self.tmp_dir, 'store'))
+        self.frames = {
+            'O:SPY250829C00645000': _bars([0, 1, 2, 5], 2.0),
+            'O:SPY250829P00640000': _bars([1, 3], 1.5),
+            'O:SPY250902C00650000': _bars([4], 3.0),
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ingests_csvs_into_one_dictionary_encoded_partition(self):
+        for ticker, df in self.frames.items():
+            df.to_csv(os.path.join(self.tmp_dir, f"{ticker.replace(':', '_')}_1min_20250829.csv"))
+        self.assertEqual(self.store.ingest_csv_dir(self.tmp_dir), {DAY: 7})
+        self.assertEqual(self.store.days(), [DAY])
+
+        table = pq.read_table(self.store.partition_path(DAY))
+        self.assertTrue(str(table.schema.field('contract').type).startswith('dictionary'))
+        loaded = self.store.load_day(DAY, contracts=['O:SPY250829P00640000'])
+        self.assertEqual(list(loaded['close']), [1.5, 2.5])
+        self.assertEqual(set(loaded['option_type'].astype(str)), {'put'})
+
+    def test_day_block_is_aligned_on_the_union_minute_grid(self):
+        self.store.write_day(DAY, self.frames)
+        block = self.store.load_day_block(DAY)
+
+        self.assertEqual(block.close.shape, (3, 6))                     # Minutes 0-5 all traded by someone
+        row = block.row('O:SPY250829P00640000')
+        self.assertEqual(list(np.isnan(block.close[row])), [True, False, True, False, True, True])
+        self.assertEqual(block.price('O:SPY250829C00645000', datetime(2025, 8, 29, 9, 35)), 5.0)
+        self.assertTrue(np.isnan(block.price('O:SPY250829P00640000', datetime(2025, 8, 29, 9, 30))))
+        self.assertEqual(block.column(datetime(2025, 8, 29, 9, 40)), -1)
+        self.assertEqual(block.find(650, 'call'), block.row('O:SPY250902C00650000'))
+        self.assertEqual(str(block.expirations[block.row('O:SPY250902C00650000')]), '2025-09-02')
+
+        # Legacy dict-of-DataFrames view matches the input
+        for ticker, df in block.to_dict().items():
+            pd.testing.assert_frame_equal(df, self.frames[ticker].astype(float), check_index_type=False,
+                                          check_freq=False)
+
+    def test_rewriting_a_day_upserts_only_the_given_contracts(self):
+        self.store.write_day(DAY, self.frames)
+        self.store.write_day(DAY, {'O:SPY250829C00645000': _bars([0], 9.0)})
+        self.store.write_day(DAY, {'O:SPY250829C00645000': _bars([0], 9.0)})
+        loaded = self.store.load_day(DAY)
+        self.assertEqual(len(loaded), 4)
+        self.assertEqual(loaded.loc[loaded['contract'] == 'O:SPY250829C00645000', 'close'].tolist(), [9.0])
+        self.assertFalse(any(name.endswith('.tmp') for name in os.listdir(os.path.dirname(
+            self.store.partition_path(DAY)))))
+
+    def test_backtest_loader_reads_the_store(self):
+        sys.path.insert(0, os.path.join(project_root, 'src', 'tests', 'backtests'))
+        self.addCleanup(sys.path.remove, os.path.join(project_root, 'src', 'tests', 'backtests'))
+        from flyagonal_1min_backtest import DataLoader
+
+        self.store.write_day(DAY, self.frames)
+        loader = DataLoader()
+        loader.store = self.store
+        options = loader.load_options_1min_data(datetime(2025, 8, 29))
+        self.assertEqual(sorted(options), sorted(self.frames))
+        self.assertEqual(options['O:SPY250829C00645000'].loc[datetime(2025, 8, 29, 9, 32), 'close'], 4.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Latency Instrumentation Test
+============================
+
+Validates histogram percentiles, the zero-cost disabled path, sync/async
+timing and JSON export of the per-stage metrics.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+import unittest
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.utils.latency import LatencyHistogram, LatencyRecorder
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    """Histograms, recording and export"""
+
+    def test_histogram_percentiles_within_resolution(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 10_001):
+            histogram.record(value * 1000)                   # 1us .. 10ms
+        for q, expected in ((50, 5_000_000), (90, 9_000_000), (99, 9_900_000)):
+            self.assertAlmostEqual(histogram.percentile(q) / expected, 1.0, delta=0.07)
+        self.assertEqual(histogram.max_ns, 10_000_000)
+        self.assertEqual(histogram.summary()['count'], 10_000)
+
+    def test_disabled_recorder_is_a_no_op(self):
+        recorder = LatencyRecorder(enabled=False)
+
+        def stage():
+            return 42
+
+        self.assertIs(recorder.timed('strategy.stage')(stage), stage)
+        with recorder.span('data.stage'):
+            pass
+        recorder.record('pipeline.stage', 1000)
+        self.assertEqual(recorder.stats(), {})
+        self.assertIsNone(recorder.export())
+
+    def test_sync_and_async_stages_are_timed(self):
+        recorder = LatencyRecorder(enabled=True)
+
+        @recorder.timed('strategy.sync')
+        def sync_stage(x):
+            return x * 2
+
+        @recorder.timed('trading.async')
+        async def async_stage():
+            await asyncio.sleep(0.002)
+            return 'done'
+
+        self.assertEqual(sync_stage(21), 42)
+        self.assertEqual(asyncio.run(async_stage()), 'done')
+        with self.assertRaises(ValueError):
+            with recorder.span('data.failing'):
+                raise ValueError("stage errors are still timed")
+
+        stats = recorder.stats()
+        self.assertEqual(set(stats), {'strategy.sync', 'trading.async', 'data.failing'})
+        self.assertGreaterEqual(stats['trading.async']['p50_us'], 1500)
+
+    def test_export_writes_stage_summaries(self):
+        recorder = LatencyRecorder(enabled=True)
+        recorder.record('pipeline.quote_to_order', 250_000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = recorder.export(os.path.join(tmp, 'metrics', 'latency.json'))
+            with open(path) as f:
+                payload = json.load(f)
+        stage = payload['stages']['pipeline.quote_to_order']
+        self.assertEqual(stage['count'], 1)
+        self.assertAlmostEqual(stage['p99_us'], 250.0, delta=250.0 * 0.07)
+        self.assertIn('pipeline.quote_to_order', recorder.format_table())
+
+
+if __name__ == '__main__':
+    unittest.main()
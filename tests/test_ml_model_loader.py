@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Fused ML Inference Test
+=======================
+
+Validates that MLModelLoader's fused scoring path (one aligned matrix,
+one scaler pass, one predict_proba per model, optional thread pool)
+reproduces per-model predict_proba output.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, 'src', 'tests', 'analysis'))
+
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from phase4_ml_integration import MLModelLoader
+
+
+class TestFusedInference(unittest.TestCase):
+    """Compare fused predictions against direct model calls"""
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(11)
+        cls.feature_names = [f'feature_{i}' for i in range(6)]
+        X = rng.normal(size=(400, 6))
+        cls.scaler = StandardScaler().fit(X)
+        cls.models = {}
+        for j, target in enumerate(MLModelLoader.TARGETS):
+            y = (X[:, j] + rng.normal(scale=0.5, size=400) > 0).astype(int)
+            cls.models[f'rf_{target}'] = RandomForestClassifier(n_estimators=15, random_state=j).fit(X, y)
+            cls.models[f'nn_{target}'] = MLPClassifier(hidden_layer_sizes=(8,), max_iter=300,
+                                                       random_state=j).fit(cls.scaler.transform(X), y)
+        # Columns out of training order plus an extra column the models never saw
+        frame = pd.DataFrame(rng.normal(size=(50, 6)), columns=cls.feature_names)
+        cls.features = frame[cls.feature_names[::-1]].assign(unused=1.0)
+        cls.X = frame[cls.feature_names].to_numpy(dtype=np.float32)
+
+    def _expected(self, key: str) -> np.ndarray:
+        X = self.scaler.transform(self.X) if key.startswith('nn_') else self.X
+        return self.models[key].predict_proba(X)[:, 1]
+
+    def test_fused_predictions_match_per_model(self):
+        for workers in (1, 3):
+            with MLModelLoader.from_models(self.models, self.scaler, self.feature_names,
+                                           max_workers=workers) as loader:
+                predictions = loader.predict_all_targets(self.features)
+            for target in MLModelLoader.TARGETS:
+                for prefix, model_type in (('rf', 'random_forest'), ('nn', 'neural_network')):
+                    result = predictions[target][model_type]
+                    np.testing.assert_allclose(result['probability'],
+                                               self._expected(f'{prefix}_{target}'), atol=1e-6)
+                    self.assertEqual(len(result['prediction']), len(self.features))
+
+    def test_ensemble_is_row_mean_across_models(self):
+        loader = MLModelLoader.from_models(self.models, self.scaler, self.feature_names)
+        ensemble = loader.predict_ensemble_probabilities(self.features)
+        for target in MLModelLoader.TARGETS:
+            expected = (self._expected(f'rf_{target}') + self._expected(f'nn_{target}')) / 2
+            np.testing.assert_allclose(ensemble[target], expected, atol=1e-6)
+
+    def test_close_shuts_down_pool(self):
+        loader = MLModelLoader.from_models(self.models, self.scaler, self.feature_names, max_workers=2)
+        executor = loader._executor
+        loader.close()
+        self.assertIsNone(loader._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(int)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+ML Training Orchestrator Test
+=============================
+
+Validates early stopping for the Random Forest and Neural Network
+trainers, the core-budget scheduling plan and walk-forward fold caching.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.tests.analysis import ml_training_orchestrator
+from src.tests.analysis.ml_training_orchestrator import MLTrainingOrchestrator
+
+
+def _dataset(n_days: int = 12, rows_per_day: int = 40):
+    rng = np.random.default_rng(5)
+    n = n_days * rows_per_day
+    X = pd.DataFrame(rng.normal(size=(n, 5)), columns=[f'feature_{i}' for i in range(5)])
+    y = pd.DataFrame({'target_profitable': (X['feature_0'] + rng.normal(scale=0.3, size=n) > 0).astype(int)})
+    dates = pd.Series(np.repeat(pd.date_range('2025-08-01', periods=n_days, freq='B'), rows_per_day))
+    return X, y, dates
+
+
+class TestMLTrainingOrchestrator(unittest.TestCase):
+    """Early stopping, scheduling and fold cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.orchestrator = MLTrainingOrchestrator(
+            core_budget=4, rf_step=5, max_rf_estimators=200, rf_patience=1,
+            max_nn_epochs=200, nn_patience=3, fold_cache_dir=self.cache_dir)
+        self.X, self.y, self.dates = _dataset()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _split(self):
+        X = self.X.to_numpy(dtype=np.float32)
+        y = self.y['target_profitable'].to_numpy()
+        return X[:360], y[:360], X[360:], y[360:]
+
+    def test_core_budget_plan(self):
+        self.assertEqual(self.orchestrator._plan(6), (4, 1))
+        self.assertEqual(self.orchestrator._plan(2), (2, 2))
+        self.assertEqual(self.orchestrator._plan(1), (1, 4))
+
+    def test_random_forest_stops_early(self):
+        model, metrics = self.orchestrator._train_random_forest(*self._split(), n_threads=1)
+        self.assertLess(metrics['n_estimators'], 200)
+        self.assertEqual(len(model.estimators_), metrics['n_estimators'])
+        self.assertGreater(metrics['accuracy'], 0.7)
+
+    def test_neural_network_keeps_best_epoch(self):
+        model, metrics = self.orchestrator._train_neural_network(*self._split())
+        self.assertLess(metrics['best_epoch'], 200)
+        self.assertGreater(metrics['accuracy'], 0.7)
+
+    def test_neural_network_without_finite_loss_keeps_final_weights(self):
+        with mock.patch.object(MLTrainingOrchestrator, '_validation_loss', return_value=float('nan')):
+            model, metrics = self.orchestrator._train_neural_network(*self._split())
+        self.assertEqual(metrics['best_epoch'], self.orchestrator.nn_patience)
+        self.assertIsNotNone(model.coefs_)
+
+    def test_walk_forward_folds_split_on_days_and_are_cached(self):
+        folds = self.orchestrator.walk_forward_folds(self.dates, n_splits=3)
+        days = pd.to_datetime(self.dates).dt.normalize()
+        for train_idx, test_idx in folds:
+            self.assertLess(days.iloc[train_idx].max(), days.iloc[test_idx].min())
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        # Second call is served from the cache without re-splitting
+        with mock.patch.object(ml_training_orchestrator, 'TimeSeriesSplit') as splitter:
+            cached = self.orchestrator.walk_forward_folds(self.dates, n_splits=3)
+        splitter.assert_not_called()
+        for (train_a, test_a), (train_b, test_b) in zip(folds, cached):
+            np.testing.assert_array_equal(train_a, train_b)
+            np.testing.assert_array_equal(test_a, test_b)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+OCC Symbol Codec Test
+=====================
+
+Checks that symbols are parsed once into (expiry_id, strike_ticks, right),
+that the integer columns agree with the string columns they replace, the
+fallback for non-OCC symbols, and the loader's derived expiry columns.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.occ_symbols import (CALL, INVALID_EXPIRY, PUT, OCCCodec, expiry_datetimes, expiry_ids,
+                                  format_occ_symbol, parse_occ_symbol)
+from tests.synthetic_options import synthetic_chain
+
+
+def _chain() -> pd.DataFrame:
+    """Two expirations (0 and 1 DTE) and a half-dollar strike"""
+    return synthetic_chain(minutes=5, expirations=('2024-09-03', '2024-09-04'),
+                           contracts=((550.0, 'call'), (550.0, 'put'), (552.5, 'call')))
+
+
+class TestOCCSymbols(unittest.TestCase):
+    """Integer contract identity"""
+
+    def test_parse_and_format_round_trip(self):
+        self.assertEqual(parse_occ_symbol('O:SPY250902C00625000'), ('SPY', date(2025, 9, 2), 'call', 625.0))
+        self.assertEqual(format_occ_symbol('SPY', date(2025, 9, 2), 'put', 622.5), 'SPY250902P00622500')
+        with self.assertRaises(ValueError):
+            parse_occ_symbol('SPY')
+
+    def test_encode_frame_matches_string_columns(self):
+        chain = _chain()
+        codec = OCCCodec()
+        encoded = codec.encode_frame(chain)
+        self.assertEqual(len(codec), 6)
+
+        expected_days = pd.to_datetime(chain['expiration']).dt.as_unit('ns')
+        pd.testing.assert_series_equal(expiry_datetimes(encoded['expiry_id']), expected_days, check_names=False)
+        np.testing.assert_array_equal(encoded['strike_ticks'], (chain['strike'] * 1000).astype(int))
+        np.testing.assert_array_equal(encoded['right'] == CALL, chain['option_type'] == 'call')
+        np.testing.assert_array_equal(encoded['right'] == PUT, chain['option_type'] == 'put')
+
+        # Known symbols are looked up, not re-parsed
+        with mock.patch('src.data.occ_symbols.expiry_ids', side_effect=AssertionError('reparsed')):
+            again = codec.encode_frame(chain)
+        np.testing.assert_array_equal(again['expiry_id'], encoded['expiry_id'])
+
+    def test_non_occ_symbols_fall_back_to_columns(self):
+        frame = pd.DataFrame({'symbol': ['x', 'O:SPY240903P00550000'], 'expiration': ['2024-09-04', '2024-09-03'],
+                              'strike': [551.0, 550.0], 'option_type': ['call', 'put']})
+        encoded = OCCCodec().encode_frame(frame)
+        self.assertEqual(list(encoded['right']), [CALL, PUT])
+        self.assertEqual(list(encoded['strike_ticks']), [551000, 550000])
+        self.assertEqual(list(encoded['expiry_id']), list(expiry_ids(['2024-09-04', '2024-09-03'])))
+        self.assertEqual(expiry_ids(['not a date'])[0], INVALID_EXPIRY)
+
+    def test_parquet_loader_derives_expiry_from_codes(self):
+        from src.data.parquet_data_loader import ParquetDataLoader
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, 'spy_options_test.parquet')
+            _chain().to_parquet(path, index=False)
+            dataset = ParquetDataLoader(path).full_dataset
+            self.assertEqual(sorted(dataset['days_to_expiry'].unique()), [0, 1])
+            np.testing.assert_array_equal(dataset['expiration_date'].dt.date.astype(str), dataset['expiration'])
+        finally:
+            shutil.rmtree(tmp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
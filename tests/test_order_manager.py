@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Multi-Leg Order Manager Test
+============================
+
+Validates iron condor submission against the local replay broker: one
+multi-leg order when supported, concurrent per-leg fallback, unwinding
+of filled legs when the structure cannot complete, and reconciliation.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import unittest
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.market_replay import MarketReplayServer, ReplayTradingClient
+from src.trading.order_manager import MultiLegOrderManager
+
+EXPIRATION = date(2025, 8, 29)
+STRIKES = (638, 636, 642, 644)          # put short, put long, call short, call long
+
+
+def _options_bars(minutes: int = 5, strikes=range(634, 647)) -> pd.DataFrame:
+    rows = []
+    for i, ts in enumerate(pd.date_range('2025-08-29 09:30', periods=minutes, freq='1min')):
+        spot = 640.0 + 0.1 * i
+        for strike in strikes:
+            call = max(spot - strike, 0) + 1.5 * np.exp(-abs(spot - strike) / 4)
+            put = call - (spot - strike)
+            for right, price in (('C', call), ('P', put)):
+                rows.append({'timestamp': int(ts.value // 1_000_000),
+                             'symbol': f"O:SPY250829{right}{strike * 1000:08d}",
+                             'open': price, 'high': price, 'low': price, 'close': price,
+                             'volume': 10, 'vwap': price, 'transactions': 1, 'underlying': 'SPY',
+                             'expiration': '2025-08-29', 'option_type': 'call' if right == 'C' else 'put',
+                             'strike': float(strike)})
+    return pd.DataFrame(rows)
+
+
+class _NoMultiLegClient(ReplayTradingClient):
+    """Broker without multi-leg support"""
+
+    def submit_order(self, order_data):
+        if getattr(order_data, 'legs', None):
+            raise RuntimeError("order_class mleg not supported")
+        return super().submit_order(order_data)
+
+
+class TestMultiLegOrderManager(unittest.TestCase):
+    """Entry, fallback, unwind and reconciliation"""
+
+    def setUp(self):
+        self.server = MarketReplayServer(_options_bars(), speed=1000)
+        self.server.seek(datetime(2025, 8, 29, 9, 35))
+        self.server.start()                               # Fill timeouts run on replayed time
+
+    def _manager(self, client, **kwargs) -> MultiLegOrderManager:
+        kwargs.setdefault('fill_timeout', 0.05)
+        kwargs.setdefault('poll_interval', 0.01)
+        return MultiLegOrderManager(client, clock=self.server.clock, **kwargs)
+
+    def test_iron_condor_is_one_multi_leg_order(self):
+        client = self.server.trading_client()
+        manager = self._manager(client)
+
+        async def run():
+            opened = await manager.open_iron_condor(EXPIRATION, *STRIKES, contracts=2)
+            return opened, await manager.reconcile()
+
+        opened, mismatches = asyncio.run(run())
+        self.assertTrue(opened.filled)
+        self.assertEqual((opened.mode, opened.round_trips, len(client.orders)), ('mleg', 1, 1))
+        self.assertGreater(opened.net_credit, 0)
+        self.assertEqual(manager.expected_positions, {'SPY250829P00638000': -2.0, 'SPY250829P00636000': 2.0,
+                                                      'SPY250829C00642000': -2.0, 'SPY250829C00644000': 2.0})
+        self.assertEqual(mismatches, {})
+
+    def test_credit_limit_is_enforced_atomically(self):
+        client = self.server.trading_client()
+        manager = self._manager(client)
+        result = asyncio.run(manager.open_iron_condor(EXPIRATION, *STRIKES, contracts=1, min_credit=50.0))
+        self.assertEqual(result.status, 'canceled')
+        self.assertEqual(client.get_all_positions(), [])
+
+    def test_falls_back_to_concurrent_legs(self):
+        client = _NoMultiLegClient(self.server)
+        manager = self._manager(client)
+
+        async def run():
+            opened = await manager.open_iron_condor(EXPIRATION, *STRIKES, contracts=1)
+            closed = await manager.close_iron_condor(EXPIRATION, *STRIKES, contracts=1)
+            return opened, closed, await manager.reconcile()
+
+        opened, closed, mismatches = asyncio.run(run())
+        self.assertTrue(opened.filled and closed.filled)
+        self.assertEqual(opened.mode, 'legs')
+        self.assertEqual(len(opened.fills), 4)
+        self.assertEqual(manager.stats['mleg_fallbacks'], 2)
+        self.assertEqual(manager.expected_positions, {})
+        self.assertEqual(client.get_all_positions(), [])
+        self.assertEqual(mismatches, {})
+
+    def test_incomplete_legs_are_unwound(self):
+        # The 644 call wing has no market, so its leg never fills
+        server = MarketReplayServer(_options_bars(strikes=range(634, 644)), speed=1000)
+        server.seek(datetime(2025, 8, 29, 9, 35))
+        server.start()
+        client = _NoMultiLegClient(server)
+        manager = MultiLegOrderManager(client, clock=server.clock, fill_timeout=0.05, poll_interval=0.01)
+
+        result = asyncio.run(manager.open_iron_condor(EXPIRATION, *STRIKES, contracts=1))
+        self.assertEqual(result.status, 'unwound')
+        self.assertEqual(manager.stats['unwinds'], 1)
+        self.assertEqual(client.get_all_positions(), [])       # No naked short left behind
+        canceled = [o for o in client.orders.values() if o.status == 'canceled']
+        self.assertEqual([o.symbol for o in canceled], ['SPY250829C00644000'])
+
+    def test_reconcile_reports_broker_drift(self):
+        client = self.server.trading_client()
+        manager = self._manager(client)
+        asyncio.run(manager.open_iron_condor(EXPIRATION, *STRIKES, contracts=1))
+        client.positions['SPY250829C00644000'] = 0.0          # Leg closed outside the manager
+        mismatches = asyncio.run(manager.reconcile())
+        self.assertEqual(mismatches, {'SPY250829C00644000': (1.0, 0.0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Polygon Client Test
+===================
+
+Runs the pooled Polygon client and the flyagonal extractor against a
+local HTTP stub: ``next_url`` pagination, retry/backoff on 429 and 5xx,
+keep-alive connection reuse, concurrency and the token-bucket limit.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.polygon_client import PolygonClient, PolygonRequestError, TokenBucket
+
+DAY_MS = int(datetime(2025, 8, 29, 9, 30).timestamp() * 1000)
+
+
+class _PolygonStub(BaseHTTPRequestHandler):
+    """Minimal /v2/aggs endpoint: two pages per ticker, scripted failures"""
+
+    protocol_version = 'HTTP/1.1'            # Keep-alive, so connection reuse is observable
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        with server.lock:
+            server.requests.append((url.path, query))
+            server.connections.add(self.client_address)
+            failures = server.failures.get(url.path, [])
+            status = failures.pop(0) if failures else 200
+        time.sleep(server.delay)
+
+        if status != 200:
+            return self._reply(status, {'status': 'ERROR'}, {'Retry-After': '0'} if status == 429 else {})
+        ticker = url.path.split('/')[4]
+        if ticker == 'MISSING':
+            return self._reply(404, {'status': 'NOT_FOUND'})
+        page = int(query.get('cursor', ['1'])[0])
+        body = {'status': 'OK', 'results': [{'t': DAY_MS + (2 * (page - 1) + i) * 60_000, 'o': 1.0, 'h': 1.2,
+                                             'l': 0.9, 'c': 1.1, 'v': 10, 'vw': 1.05, 'n': 3} for i in range(2)]}
+        if page == 1:
+            body['next_url'] = f"http://{self.headers['Host']}{url.path}?cursor=2"
+        self._reply(200, body)
+
+    def _reply(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class TestPolygonClient(unittest.TestCase):
+    """Client behaviour against the local stub"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _PolygonStub)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests, self.server.connections, self.server.failures = [], set(), {}
+        self.server.delay = 0.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _client(self, **kwargs) -> PolygonClient:
+        kwargs.setdefault('requests_per_second', 1000)
+        kwargs.setdefault('backoff', 0.001)
+        return PolygonClient('test-key', base_url=self.base_url, **kwargs)
+
+    def test_follows_next_url_with_api_key(self):
+        client = self._client()
+        bars = client.aggregates('O:SPY250829C00645000', 1, 'minute', '2025-08-29', '2025-08-29')
+        self.assertEqual(len(bars), 4)
+        self.assertEqual([bar['t'] for bar in bars], sorted(bar['t'] for bar in bars))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertTrue(all(query['apikey'] == ['test-key'] for _, query in self.server.requests))
+        self.assertEqual(self.server.requests[0][1]['limit'], ['50000'])
+
+    def test_retries_transient_errors_but_not_client_errors(self):
+        path = '/v2/aggs/ticker/FLAKY/range/1/day/2025-08-29/2025-08-29'
+        self.server.failures[path] = [429, 503]
+        client = self._client()
+        self.assertEqual(len(client.aggregates('FLAKY', 1, 'day', '2025-08-29', '2025-08-29')), 4)
+        self.assertEqual(client.stats['retries'], 2)
+
+        with self.assertRaises(PolygonRequestError):
+            client.aggregates('MISSING', 1, 'day', '2025-08-29', '2025-08-29')
+        self.assertEqual(client.stats['retries'], 2)               # 404 is not retried
+
+        self.server.failures[path] = [500] * 10
+        with self.assertRaises(PolygonRequestError):
+            self._client(max_retries=2).aggregates('FLAKY', 1, 'day', '2025-08-29', '2025-08-29')
+
+    def test_fetch_many_is_concurrent_over_pooled_connections(self):
+        self.server.delay = 0.05
+        client = self._client(max_workers=8)
+        jobs = {f"T{i}": (f"T{i}", 1, 'minute', '2025-08-29', '2025-08-29') for i in range(16)}
+        jobs['MISSING'] = ('MISSING', 1, 'minute', '2025-08-29', '2025-08-29')
+
+        started = time.perf_counter()
+        results, errors = client.fetch_many(jobs)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 16)
+        self.assertEqual(list(errors), ['MISSING'])
+        self.assertLess(elapsed, 33 * 0.05 / 2)                    # Sequential would take ~1.65s
+        self.assertLessEqual(len(self.server.connections), 8)      # Keep-alive: one connection per worker
+
+    def test_token_bucket_paces_requests(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        started = time.perf_counter()
+        for _ in range(11):
+            bucket.acquire()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.18)
+
+        # 10 tickers x 2 pages at 100/s with no burst: shared across all workers
+        client = self._client(requests_per_second=100, burst=1)
+        started = time.perf_counter()
+        client.fetch_many({f"T{i}": (f"T{i}", 1, 'day', '2025-08-29', '2025-08-29') for i in range(10)})
+        self.assertGreaterEqual(time.perf_counter() - started, 0.18)
+        self.assertGreater(client.stats['rate_wait_s'], 0)
+
+    def test_flyagonal_extractor_writes_csv_from_pooled_client(self):
+        from src.data.extract_flyagonal_options import FlyagonalOptionsExtractor
+
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        with mock.patch.dict(os.environ, {'POLYGON_API_KEY': 'test-key'}):
+            extractor = FlyagonalOptionsExtractor()
+        extractor.polygon = self._client()
+        extractor.data_dir = data_dir
+
+        self.assertTrue(extractor.extract_contract_1min_data('O:SPY250829C00655000', datetime(2025, 8, 29)))
+        with open(os.path.join(data_dir, 'O_SPY250829C00655000_1min_20250829.csv')) as f:
+            self.assertEqual(len(f.read().strip().splitlines()), 5)   # Header + both pages
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Vectorized Position Monitor Test
+================================
+
+Validates the batched revaluation and exit checks against the live
+trader's scalar ``_calculate_position_pnl`` / ``_calculate_iron_condor_value``,
+exit precedence, O(1) removal and multi-underlying pricing.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import importlib.util
+import logging
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.position_monitor import VectorizedPositionMonitor
+
+_spec = importlib.util.spec_from_file_location(
+    'live_iron_condor_trader', os.path.join(project_root, 'src', 'trading', 'live-iron-condor-trader.py'))
+live_trader = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(live_trader)
+
+ENTRY = datetime(2025, 8, 29, 10, 0)
+
+
+def _position(i: int, center: float = 640.0, credit: float = 0.8, spot: float = 640.0,
+              entry: datetime = ENTRY) -> 'live_trader.LiveIronCondorPosition':
+    return live_trader.LiveIronCondorPosition(
+        position_id=f"IC_{i:03d}", entry_time=entry, spy_price_at_entry=spot,
+        put_short_strike=center - 3, put_long_strike=center - 5,
+        call_short_strike=center + 3, call_long_strike=center + 5,
+        contracts=1 + i % 3, credit_received=credit, max_loss=200.0 - 100 * credit,
+        max_profit=100 * credit, current_spy_price=spot)
+
+
+class TestVectorizedPositionMonitor(unittest.TestCase):
+    """Parity with the scalar trader logic and book maintenance"""
+
+    def setUp(self):
+        # The trader's scalar methods only touch self.logger
+        self.scalar = SimpleNamespace(logger=logging.getLogger(__name__),
+                                      clock=SimpleNamespace(now=lambda: self.now))
+        self.now = datetime(2025, 8, 29, 13, 0)
+
+    def test_values_and_pnl_match_scalar_trader(self):
+        rng = np.random.default_rng(3)
+        monitor = VectorizedPositionMonitor()
+        positions = [_position(i, center=640 + rng.normal(0, 4), credit=rng.uniform(0.3, 1.5),
+                               spot=640 + rng.normal(0, 6)) for i in range(40)]
+        for position in positions:
+            monitor.add(position)
+
+        for now in (datetime(2025, 8, 29, 10, 30), datetime(2025, 8, 29, 15, 59, 50)):
+            self.now = now
+            pnl = monitor.pnl(now)
+            values = monitor.values(now)
+            for row, position in enumerate(monitor.positions):
+                expected_pnl = live_trader.LiveIronCondorTrader._calculate_position_pnl(
+                    self.scalar, position, position.current_spy_price, now)
+                expected_value = live_trader.LiveIronCondorTrader._calculate_iron_condor_value(
+                    self.scalar, position, position.current_spy_price)
+                self.assertAlmostEqual(pnl[row], expected_pnl, places=9)
+                self.assertAlmostEqual(values[row], expected_value, places=9)
+
+    def test_exit_rules_and_precedence(self):
+        monitor = VectorizedPositionMonitor(max_hold_hours=4.0)
+        monitor.add(_position(0, spot=640.0))                                 # Holds
+        monitor.add(_position(3, spot=640.0, entry=ENTRY - timedelta(hours=1)))  # Held > 4h
+        monitor.add(_position(2, spot=650.0))                                 # Beyond the call wing
+
+        exits = {p.position_id: reason for p, _, reason in monitor.check_exits(datetime(2025, 8, 29, 13, 30))}
+        self.assertEqual(exits, {'IC_003': 'TIME_EXIT', 'IC_002': 'STOP_LOSS'})
+
+        # Time value has decayed below half the credit: profit target outranks the time exit
+        exits = {p.position_id: reason for p, _, reason in monitor.check_exits(datetime(2025, 8, 29, 14, 55))}
+        self.assertEqual(exits, {'IC_000': 'PROFIT_TARGET', 'IC_003': 'PROFIT_TARGET', 'IC_002': 'STOP_LOSS'})
+
+        # Clock rules override everything, the later buffer over end of day
+        late = monitor.check_exits(datetime(2025, 8, 29, 15, 30))
+        self.assertEqual({reason for _, _, reason in late}, {'MARKET_CLOSE_BUFFER'})
+        self.assertEqual(len(late), 3)
+
+    def test_revalue_writes_marks_and_handles_several_underlyings(self):
+        monitor = VectorizedPositionMonitor()
+        spy, qqq = _position(0, spot=640.0), _position(1, center=560.0, spot=560.0)
+        monitor.add(spy, 'SPY')
+        monitor.add(qqq, 'QQQ')
+
+        marks = monitor.revalue({'SPY': 645.0}, self.now)             # QQQ keeps its last price
+        self.assertEqual((spy.current_spy_price, qqq.current_spy_price), (645.0, 560.0))
+        self.assertAlmostEqual(spy.current_value, marks[0])
+        self.assertAlmostEqual(spy.unrealized_pnl, spy.credit_received - marks[0])
+        self.assertGreater(marks[0], marks[1])                       # SPY finished 2 through the short call
+
+    def test_remove_keeps_rows_aligned(self):
+        monitor = VectorizedPositionMonitor(capacity=2)
+        positions = [_position(i, center=600 + 10 * i, spot=600 + 10 * i) for i in range(5)]
+        for position in positions:
+            monitor.add(position)                                    # Grows past the initial capacity
+        monitor.remove('IC_001')
+        monitor.remove('IC_unknown')
+
+        self.assertEqual(len(monitor), 4)
+        self.assertNotIn('IC_001', monitor)
+        for row, position in enumerate(monitor.positions):
+            self.assertEqual(monitor.put_short[row], position.put_short_strike)
+            self.assertEqual(monitor.spot[row], position.current_spy_price)
+        with self.assertRaises(ValueError):
+            monitor.add(positions[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shared Dataset Test
+===================
+
+Publishes a prepared ParquetDataLoader frame as memory-mapped columns,
+checks a loader attached to it returns the same day data as the loader
+that owns the DataFrame, and that separate worker processes attach the
+same files instead of loading their own copy.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.parquet_data_loader import ParquetDataLoader
+from src.data.shared_dataset import SharedDataset
+
+DAYS = [datetime(2024, 9, 3), datetime(2024, 9, 4), datetime(2024, 9, 5)]
+
+
+def _dataset(path: str):
+    rows = []
+    for day in reversed(DAYS):                      # Stored out of day order on purpose
+        for minute in range(20):
+            stamp = day.replace(hour=14, minute=30) + pd.Timedelta(minutes=minute)
+            for strike in (545.0, 550.0, 555.0):
+                for option_type in ('call', 'put'):
+                    rows.append({'timestamp': int(pd.Timestamp(stamp).value // 10**6),
+                                 'symbol': f"O:SPY{day:%y%m%d}{option_type[0].upper()}{int(strike * 1000):08d}",
+                                 'open': 1.0, 'high': 1.2, 'low': 0.8, 'close': 1.0 + minute / 100,
+                                 'volume': 10 + minute, 'vwap': 1.0, 'transactions': 3, 'underlying': 'SPY',
+                                 'expiration': f"{day:%Y-%m-%d}", 'option_type': option_type, 'strike': strike})
+    pd.DataFrame(rows).to_parquet(path, index=False)
+
+
+def _worker_day_close(shared_dir: str, day) -> tuple:
+    """Runs in a child process: attach and summarize one day"""
+    loader = ParquetDataLoader(shared_dir=shared_dir)
+    frame = loader.load_options_for_date(datetime.combine(day, datetime.min.time()), min_volume=1)
+    return isinstance(loader.shared.column('close'), np.memmap), len(frame), float(frame['close'].sum())
+
+
+class TestSharedDataset(unittest.TestCase):
+    """Publish once, attach zero-copy"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.parquet_path = os.path.join(cls.tmp_dir, 'spy_options_test.parquet')
+        _dataset(cls.parquet_path)
+        cls.owner = ParquetDataLoader(cls.parquet_path)
+        cls.shared_dir = cls.owner.share(os.path.join(cls.tmp_dir, 'shared'))
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def test_columns_are_read_only_memory_maps_with_day_ranges(self):
+        shared = SharedDataset.attach(self.shared_dir)
+        self.assertEqual(len(shared), len(self.owner.full_dataset))
+        self.assertEqual(shared.dates(), [d.date() for d in DAYS])
+        strike = shared.column('strike')
+        self.assertIsInstance(strike, np.memmap)
+        self.assertFalse(strike.flags.writeable)
+        self.assertEqual(shared.day_rows(DAYS[0].date()), slice(0, 120))
+
+        day = shared.day(DAYS[1].date())
+        self.assertEqual(set(day['date']), {DAYS[1].date()})
+        self.assertEqual(day['time'].iloc[0].isoformat(), '14:30:00')
+        self.assertEqual(day['option_type'].dtype, self.owner.full_dataset['option_type'].dtype)
+
+    def test_attached_loader_matches_owning_loader(self):
+        attached = ParquetDataLoader(shared_dir=self.shared_dir)
+        self.assertIsNone(attached.full_dataset)
+        self.assertEqual(attached.get_available_dates(), self.owner.get_available_dates())
+
+        expected = self.owner.load_options_for_date(DAYS[2], min_volume=1).reset_index(drop=True)
+        actual = attached.load_options_for_date(DAYS[2], min_volume=1).reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual[expected.columns], expected, check_dtype=False)
+
+    def test_share_is_reused_while_current(self):
+        manifest = os.path.join(self.shared_dir, 'manifest.json')
+        before = os.path.getmtime(manifest)
+        self.assertEqual(self.owner.share(self.shared_dir), self.shared_dir)
+        self.assertEqual(os.path.getmtime(manifest), before)
+
+    def test_worker_processes_attach_the_published_files(self):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_worker_day_close, [self.shared_dir] * 3, [d.date() for d in DAYS]))
+        for day, (mapped, rows, close_sum) in zip(DAYS, results):
+            expected = self.owner.load_options_for_date(day, min_volume=1)
+            self.assertTrue(mapped)
+            self.assertEqual(rows, len(expected))
+            self.assertAlmostEqual(close_sum, expected['close'].sum())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Spot Index Test
+===============
+
+Builds the per-minute underlying series from put-call parity on a
+synthetic chain with a known spot path, checks SPY bars take precedence,
+the asof join (order kept, no carry across gaps), the sidecar file and
+that ParquetDataLoader and the strategy estimators read the joined value.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.spot_index import SPOT_COLUMN, SpotIndex, build_parity_spot, latest_spot, spot_path
+
+from tests.synthetic_options import START, option_bar
+
+
+def _spot(minute: int) -> float:
+    return 550.0 + 0.07 * minute
+
+
+def _chain(minutes: int = 30) -> pd.DataFrame:
+    """0DTE calls/puts on strikes 540-560 whose prices satisfy C - P = S - K exactly"""
+    rows = []
+    for minute in range(minutes):
+        spot = _spot(minute)
+        for strike in range(540, 561):
+            time_value = 0.8 * np.exp(-abs(spot - strike) / 4)
+            for option_type, intrinsic in (('call', max(spot - strike, 0)), ('put', max(strike - spot, 0))):
+                rows.append(option_bar(START + pd.Timedelta(minutes=minute), float(strike), option_type,
+                                       '2024-09-03', symbol='x', close=intrinsic + time_value, high=1.0,
+                                       low=1.0, volume=10, vwap=1.0, transactions=1))
+    # A stale deep-wing print must not move the estimate
+    rows[0]['close'] = 99.0
+    return pd.DataFrame(rows)
+
+
+class TestSpotIndex(unittest.TestCase):
+    """Parity series, joins and loader integration"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.chain = _chain()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parity_recovers_the_spot_path(self):
+        spot = build_parity_spot(self.chain)
+        self.assertEqual(len(spot), 30)
+        expected = np.array([_spot(m) for m in range(30)])
+        np.testing.assert_allclose(spot.to_numpy(), expected, atol=1e-9)
+
+    def test_bars_take_precedence_and_lookups_are_asof(self):
+        bars = pd.DataFrame({'timestamp': pd.date_range(START, periods=5, freq='min', tz='UTC'),
+                             'close': 600.0})
+        index = SpotIndex.build(self.chain, bars)
+        self.assertEqual(index.at(START + pd.Timedelta(minutes=2)), 600.0)
+        self.assertAlmostEqual(index.at(START + pd.Timedelta(minutes=10, seconds=40)), _spot(10))
+        self.assertAlmostEqual(index.at(START + pd.Timedelta(minutes=40)), _spot(29))       # Within tolerance
+        self.assertIsNone(index.at(START + pd.Timedelta(hours=18)))                        # Next morning
+        self.assertIsNone(index.at(START - pd.Timedelta(minutes=1)))
+
+        shuffled = self.chain.sample(frac=1, random_state=1).assign(
+            datetime=lambda df: pd.to_datetime(df['timestamp'], unit='ms'))
+        joined = index.attach(shuffled)
+        self.assertTrue(joined.index.equals(shuffled.index))
+        minutes = ((joined['datetime'] - START) / pd.Timedelta(minutes=1)).astype(int)
+        expected = np.where(minutes < 5, 600.0, _spot(1) + 0.07 * (minutes - 1))
+        np.testing.assert_allclose(joined[SPOT_COLUMN].to_numpy(), expected, atol=1e-9)
+        self.assertAlmostEqual(latest_spot(joined), _spot(29))
+
+    def test_sidecar_is_built_once(self):
+        dataset = os.path.join(self.tmp_dir, 'spy_options_test.parquet')
+        self.chain.to_parquet(dataset, index=False)
+        SpotIndex.for_dataset(dataset, self.chain)
+        self.assertTrue(os.path.exists(spot_path(dataset)))
+        with mock.patch('src.data.spot_index.build_parity_spot', side_effect=AssertionError('rebuilt')):
+            self.assertEqual(len(SpotIndex.for_dataset(dataset, self.chain)), 30)
+
+    def test_loader_and_strategies_share_the_joined_spot(self):
+        from src.data.parquet_data_loader import ParquetDataLoader
+        from src.strategies.market_intelligence.intelligence_engine import MarketIntelligenceEngine
+
+        dataset = os.path.join(self.tmp_dir, 'spy_options_test.parquet')
+        self.chain.to_parquet(dataset, index=False)
+        loader = ParquetDataLoader(dataset)
+        options = loader.load_options_for_date(START, min_volume=1)
+        self.assertAlmostEqual(loader._estimate_spy_price(options), _spot(29))
+        self.assertAlmostEqual(MarketIntelligenceEngine()._estimate_current_price(options), _spot(29))
+
+        first_minute = options[options['datetime'] == START]
+        call_545 = first_minute[(first_minute['strike'] == 545) & (first_minute['option_type'] == 'call')]
+        self.assertAlmostEqual(call_545['moneyness'].iloc[0], (545 - _spot(0)) / _spot(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+State Journal Test
+==================
+
+Validates write-ahead logging, snapshot + log recovery, torn-tail
+truncation and duplicate suppression after a crash mid-snapshot.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import date, datetime
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.state_journal import StateJournal
+
+
+def _position(i: int) -> dict:
+    return {'trade_id': f"IC_20250829_{i:06d}", 'strategy_type': 'IRON_CONDOR',
+            'entry_date': date(2025, 8, 29), 'premium_collected': 250.0 + i, 'cash_used': 625.0}
+
+
+class TestStateJournal(unittest.TestCase):
+    """Durability and recovery"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _journal(self, **kwargs) -> StateJournal:
+        kwargs.setdefault('flush_interval', 0)            # Flush explicitly in tests
+        return StateJournal(self.directory, **kwargs)
+
+    def _crash(self, journal: StateJournal):
+        """Drop the process state without a checkpoint"""
+        journal._wal.close()
+        journal._wal = None
+
+    def test_recovers_positions_and_fields_from_the_log(self):
+        journal = self._journal()
+        self.assertEqual(journal.recover()['positions'], {})
+        for i in range(3):
+            journal.open_position(_position(i))
+        journal.close_position(_position(1)['trade_id'])
+        journal.set_fields(current_balance=25750.0, last_signal_check=datetime(2025, 8, 29, 11, 30))
+        journal.set_fields(current_balance=25500.0)
+        journal.flush()
+        self._crash(journal)
+
+        state = self._journal().recover()
+        self.assertEqual(list(state['positions']), [_position(0)['trade_id'], _position(2)['trade_id']])
+        self.assertEqual(state['positions'][_position(2)['trade_id']], _position(2))
+        self.assertEqual(state['fields'], {'current_balance': 25500.0,
+                                           'last_signal_check': datetime(2025, 8, 29, 11, 30)})
+
+    def test_unflushed_records_are_lost_but_never_corrupt(self):
+        journal = self._journal()
+        journal.recover()
+        journal.open_position(_position(0))
+        journal.flush()
+        journal.open_position(_position(1))               # Still buffered at the crash
+        self._crash(journal)
+        self.assertEqual(list(self._journal().recover()['positions']), [_position(0)['trade_id']])
+
+    def test_torn_tail_is_truncated(self):
+        journal = self._journal()
+        journal.recover()
+        for i in range(4):
+            journal.open_position(_position(i))
+        journal.flush()
+        self._crash(journal)
+        with open(journal.wal_path, 'r+b') as f:          # Half-written last record
+            f.truncate(os.path.getsize(journal.wal_path) - 5)
+
+        recovered = self._journal()
+        self.assertEqual(len(recovered.recover()['positions']), 3)
+        self.assertGreater(recovered.stats['torn_bytes'], 0)
+        recovered.open_position(_position(9))             # Appends after the last good record
+        recovered.flush()
+        self._crash(recovered)
+        self.assertEqual(len(self._journal().recover()['positions']), 4)
+
+    def test_snapshot_bounds_replay_and_survives_crash_before_truncate(self):
+        journal = self._journal(snapshot_every=10)
+        journal.recover()
+        for i in range(25):
+            journal.open_position(_position(i))
+            journal.flush()
+        self.assertEqual(journal.stats['snapshots'], 2)
+
+        recovered = self._journal()
+        self.assertEqual(len(recovered.recover()['positions']), 25)
+        self.assertEqual(recovered.stats['recovered_records'], 5)   # Only the log after the snapshot
+        self._crash(recovered)
+
+        # Snapshot written but log never truncated: records it covers are skipped
+        with open(journal.wal_path, 'rb') as f:
+            log = f.read()
+        journal = self._journal()
+        journal.recover()
+        journal.checkpoint()
+        self._crash(journal)
+        with open(journal.wal_path, 'wb') as f:
+            f.write(log)
+        state = self._journal().recover()
+        self.assertEqual(len(state['positions']), 25)
+        self.assertEqual(state['seq'], 25)
+
+    def test_close_checkpoints_and_background_flush(self):
+        journal = StateJournal(self.directory, flush_interval=0.01)
+        journal.recover()
+        journal.set_fields(signals_generated_today=2)
+        deadline = time.monotonic() + 5
+        while journal.stats['flushes'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(journal.stats['flushes'], 1)                    # Group-committed off-thread
+        journal.close()
+        self.assertEqual(os.path.getsize(journal.wal_path), 8)          # Log folded into the snapshot
+        self.assertEqual(self._journal().recover()['fields'], {'signals_generated_today': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Trading Clock Test
+==================
+
+Validates the wall/accelerated/simulated clocks, the scheduler and that
+the replay server and streams follow a deterministic simulated clock.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.trading.trading_clock import AcceleratedClock, SimulatedClock, TradingClock, TradingScheduler
+from src.trading.market_data_stream import LatestQuoteBook
+from src.trading.market_replay import MarketReplayServer
+
+OPEN = datetime(2025, 8, 29, 9, 30)
+
+
+def _options_bars(minutes: int = 10) -> pd.DataFrame:
+    rows = []
+    for i, ts in enumerate(pd.date_range(OPEN, periods=minutes, freq='1min')):
+        spot = 640.0 + 0.1 * i
+        for strike in (638, 640, 642):
+            call = max(spot - strike, 0) + 1.0
+            put = call - (spot - strike)
+            for right, price in (('C', call), ('P', put)):
+                rows.append({'timestamp': int(ts.value // 1_000_000),
+                             'symbol': f"O:SPY250829{right}{strike * 1000:08d}",
+                             'open': price, 'high': price, 'low': price, 'close': price,
+                             'volume': 10, 'vwap': price, 'transactions': 1, 'underlying': 'SPY',
+                             'expiration': '2025-08-29', 'option_type': 'call' if right == 'C' else 'put',
+                             'strike': float(strike)})
+    return pd.DataFrame(rows)
+
+
+class TestTradingClock(unittest.TestCase):
+    """Test clocks, scheduling and clock-driven replay"""
+
+    def test_incomplete_clock_fails_at_construction(self):
+        class NoSleepClock(TradingClock):
+            def now(self):
+                return OPEN
+
+            def monotonic(self):
+                return 0.0
+
+        with self.assertRaises(TypeError):
+            NoSleepClock()
+
+    def test_simulated_sleepers_wake_in_deadline_order(self):
+        async def run():
+            clock = SimulatedClock(OPEN)
+            woken = []
+
+            async def sleeper(name, seconds):
+                await clock.sleep(seconds)
+                woken.append((name, clock.now()))
+
+            tasks = [asyncio.create_task(sleeper('late', 90)), asyncio.create_task(sleeper('early', 30))]
+            await clock.run_for(45)
+            self.assertEqual([name for name, _ in woken], ['early'])
+            await clock.run_for(60)
+            await asyncio.gather(*tasks)
+            return clock, woken
+
+        clock, woken = asyncio.run(run())
+        self.assertEqual(woken, [('early', OPEN + timedelta(seconds=30)),
+                                 ('late', OPEN + timedelta(seconds=90))])
+        self.assertEqual(clock.now(), OPEN + timedelta(seconds=105))
+
+    def test_scheduler_runs_on_market_cadence(self):
+        async def run():
+            clock = SimulatedClock(OPEN)
+            scheduler = TradingScheduler(clock)
+            seen = []
+            scheduler.every(60, lambda: seen.append(clock.now()), name='cycle')
+            scheduler.start()
+            await clock.run_for(150)
+            await scheduler.stop()
+            return seen
+
+        self.assertEqual(asyncio.run(run()), [OPEN + timedelta(minutes=m) for m in (0, 1, 2)])
+
+    def test_wait_for_times_out_in_market_time(self):
+        async def run():
+            clock = SimulatedClock(OPEN)
+            never = asyncio.Event()
+            waiter = asyncio.create_task(clock.wait_for(never.wait(), timeout=60))
+            await clock.run_for(59)
+            self.assertFalse(waiter.done())
+            await clock.run_for(1)
+            with self.assertRaises(asyncio.TimeoutError):
+                await waiter
+
+        asyncio.run(run())
+
+    def test_accelerated_clock_scales_sleep_and_seek(self):
+        async def run():
+            clock = AcceleratedClock(OPEN, speed=1000)
+            self.assertEqual(clock.now(), OPEN)          # Frozen until started
+            clock.start()
+            started = time.monotonic()
+            await clock.sleep(60)
+            return clock, time.monotonic() - started
+
+        clock, wall = asyncio.run(run())
+        self.assertLess(wall, 1.0)
+        self.assertGreaterEqual(clock.now(), OPEN + timedelta(seconds=60))
+        clock.set(OPEN + timedelta(hours=1))
+        self.assertLess(clock.now() - (OPEN + timedelta(hours=1)), timedelta(seconds=30))
+
+    def test_quote_age_uses_market_time(self):
+        clock = SimulatedClock(OPEN)
+        book = LatestQuoteBook(clock)
+        book.update_quote('SPY', 640.0, 640.2)
+        clock.advance(4)
+        self.assertAlmostEqual(book.mid('SPY', max_age_seconds=5), 640.1)
+        clock.advance(2)
+        self.assertIsNone(book.mid('SPY', max_age_seconds=5))
+
+    def test_replay_streams_follow_simulated_clock(self):
+        async def run():
+            clock = SimulatedClock(OPEN)
+            server = MarketReplayServer(_options_bars(), clock=clock)
+            market_data = server.market_data()
+            server.start()
+            await market_data.start()
+            await clock.run_for(180)
+            received = market_data.events_received
+            price = market_data.underlying_price()
+            await market_data.stop()
+            return server, received, price
+
+        server, received, price = asyncio.run(run())
+        # Bars 09:30-09:32 completed by 09:33: one quote + one bar each
+        self.assertEqual(server.now(), OPEN + timedelta(minutes=3))
+        self.assertEqual(received, 6)
+        self.assertAlmostEqual(price, 640.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Typed Cache Test
+================
+
+Converts each JSON cache layout (Polygon contracts, Polygon option bars,
+daily bars) to typed parquet once, then checks the loaders return typed
+DataFrames that match the JSON and that a newer JSON is re-converted.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.typed_cache import TypedCache, load_contracts, load_daily_bars, load_options_bars
+
+CONTRACTS = [
+    {'cfi': 'OCASPS', 'contract_type': 'call', 'exercise_style': 'american', 'expiration_date': '2025-09-02',
+     'primary_exchange': 'BATO', 'shares_per_contract': 100, 'strike_price': 640, 'ticker': 'O:SPY250902C00640000',
+     'underlying_ticker': 'SPY'},
+    {'cfi': 'OPASPS', 'contract_type': 'put', 'exercise_style': 'american', 'expiration_date': '2025-09-02',
+     'primary_exchange': 'BATO', 'shares_per_contract': 100, 'strike_price': 632.5,
+     'ticker': 'O:SPY250902P00632500', 'underlying_ticker': 'SPY'},
+]
+
+
+class TestTypedCache(unittest.TestCase):
+    """JSON -> typed parquet conversion and loaders"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_json(self, name: str, data) -> str:
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def test_contracts_convert_once_with_schema(self):
+        path = self._write_json('polygon_spy_contracts_20250830.json', CONTRACTS)
+        frame = load_contracts(path)
+        typed = TypedCache.typed_path(path)
+        self.assertTrue(os.path.exists(typed))
+        self.assertEqual(list(frame['strike_price']), [640.0, 632.5])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(frame['expiration_date']))
+        self.assertEqual(str(frame['contract_type'].dtype), 'category')
+        self.assertEqual(str(pq.read_schema(typed).field('expiration_date').type), 'date32[day]')
+
+        # Second load reads the sidecar without parsing the JSON again
+        with mock.patch('src.data.typed_cache.json.load', side_effect=AssertionError('re-parsed')):
+            self.assertEqual(len(load_contracts(path)), 2)
+
+        # A newer JSON is re-converted
+        time.sleep(0.01)
+        self._write_json('polygon_spy_contracts_20250830.json', CONTRACTS[:1])
+        os.utime(path, (time.time() + 5, time.time() + 5))
+        self.assertEqual(len(load_contracts(path)), 1)
+
+    def test_options_bars_flatten_ticker_mapping(self):
+        bar = {'date': '2025-08-27', 'timestamp': '2025-08-27T00:00:00', 'open': 186.7, 'high': 186.7,
+               'low': 185.57, 'close': 185.57, 'volume': 2, 'strike': 460, 'expiration': '2025-09-02',
+               'option_type': 'CALL', 'underlying': 'SPY'}
+        path = self._write_json('polygon_spy_options_bars_20240830_20250830.json',
+                                {'O:SPY250902C00460000': [bar], 'O:SPY250902C00530000': [dict(bar, close=117.26)]})
+        frame = load_options_bars(path)
+        self.assertEqual(list(frame['ticker'].astype(str)), ['O:SPY250902C00460000', 'O:SPY250902C00530000'])
+        self.assertEqual(list(frame['close']), [185.57, 117.26])
+        self.assertEqual(frame['timestamp'].iloc[0], pd.Timestamp('2025-08-27'))
+
+    def test_daily_bars_match_repository_file(self):
+        source = os.path.join(project_root, 'cache', 'real-data', 'SPY_2024-01-01_2024-03-31_1Day.json')
+        if not os.path.exists(source):
+            self.skipTest("cache/real-data not present")
+        path = os.path.join(self.tmp_dir, os.path.basename(source))
+        shutil.copy(source, path)
+        with open(source) as f:
+            bars = json.load(f)['bars']
+
+        frame = load_daily_bars(path)
+        self.assertEqual(len(frame), len(bars))
+        self.assertEqual(frame['date'].iloc[0], pd.Timestamp(bars[0]['dateString']))
+        self.assertEqual(frame['close'].tolist(), [bar['close'] for bar in bars])
+        self.assertEqual(frame['trade_count'].dtype, 'int64')
+        self.assertEqual(set(frame['symbol'].astype(str)), {'SPY'})
+
+    def test_latest_prefers_typed_file(self):
+        self._write_json('polygon_spy_contracts_20250101.json', CONTRACTS)
+        newest = self._write_json('polygon_spy_contracts_20250830.json', CONTRACTS)
+        cache = TypedCache()
+        self.assertEqual(cache.latest(self.tmp_dir, 'polygon_spy_contracts_'), newest)
+        cache.convert_all([self.tmp_dir])
+        self.assertEqual(cache.latest(self.tmp_dir, 'polygon_spy_contracts_'), TypedCache.typed_path(newest))
+        self.assertEqual(cache.convert_all([self.tmp_dir]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Walk-Forward ML Harness Test
+============================
+
+Synthetic walk-forward run: monthly window boundaries, feature-store reuse
+across windows, incremental Random Forest / Neural Network updates (models
+extended in place, not retrained) and scoring through
+MLModelLoader.from_models.
+
+Location: tests/ (following .cursorrules structure)
+Author: Advanced Options Trading System
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.data.feature_store import FeatureStore
+from src.tests.analysis.walk_forward_ml_harness import WalkForwardMLHarness
+
+DAYS = list(pd.bdate_range('2025-01-01', '2025-04-30').to_pydatetime())
+
+
+def _day_features(date: datetime, *_) -> pd.DataFrame:
+    """Deterministic per-day feature matrix with learnable targets"""
+    rng = np.random.default_rng(int(date.strftime('%Y%m%d')))
+    n = 30
+    frame = pd.DataFrame(rng.normal(size=(n, 4)), columns=[f'feature_{i}' for i in range(4)])
+    frame['target_profitable'] = (frame['feature_0'] + rng.normal(scale=0.3, size=n) > 0).astype(int)
+    frame['target_high_value'] = (frame['feature_1'] > 0).astype(int)
+    frame['date'] = pd.Timestamp(date)
+    return frame
+
+
+class TestWalkForwardHarness(unittest.TestCase):
+    """Windows, feature reuse and incremental model updates"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        dataset = os.path.join(self.tmp_dir, 'dataset.parquet')
+        pd.DataFrame({'x': [1]}).to_parquet(dataset)
+
+        loader = SimpleNamespace(
+            parquet_path=dataset,
+            get_available_dates=lambda start=None, end=None: [
+                d for d in DAYS if (start is None or d >= start) and (end is None or d <= end)]
+        )
+        self.harness = WalkForwardMLHarness(
+            train_months=2, sample_size_per_day=30, core_budget=2,
+            incremental_rf_trees=5, max_rf_trees=40, incremental_nn_epochs=2,
+            loader=loader, feature_store=FeatureStore(os.path.join(self.tmp_dir, 'store'), verbose=False))
+        self.harness.orchestrator.rf_step = 10
+        self.harness.orchestrator.max_rf_estimators = 20
+        self.harness.orchestrator.max_nn_epochs = 20
+
+        self.computed = []
+        self.harness.feature_prep._compute_day_features = \
+            lambda date, *args: self.computed.append(date) or _day_features(date)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_monthly_windows_have_no_look_ahead(self):
+        windows = self.harness.build_windows()
+        self.assertEqual([w['month'] for w in windows], ['2025-03', '2025-04'])
+        for window in windows:
+            self.assertLess(max(window['train_days']), min(window['test_days']))
+            self.assertEqual({d.strftime('%Y-%m') for d in window['test_days']}, {window['month']})
+        self.assertEqual(min(windows[1]['train_days']).month, 2)
+
+    def test_models_are_updated_incrementally_between_windows(self):
+        first, second = self.harness.build_windows()
+
+        features = self.harness._features(first['train_days'])
+        self.assertEqual(len(self.computed), len(first['train_days']))
+        self.harness._full_train(features)
+
+        rf = self.harness.family_results['random_forest']['models']['target_profitable']
+        nn = self.harness.family_results['neural_network']['models']['target_profitable']
+        old_trees = list(rf.estimators_)
+        old_weights = [w.copy() for w in nn.coefs_]
+
+        # Only the days that entered the trailing window are computed and trained on
+        new_days = sorted(set(second['train_days']) - set(first['train_days']))
+        self.computed.clear()
+        features = self.harness._features(second['train_days'])
+        self.assertEqual(sorted(self.computed), new_days)
+        new_df = features[pd.to_datetime(features['date']).isin(new_days)]
+        self.harness._incremental_update(new_df)
+
+        # Same model objects: RF extended with new trees, NN weights moved from where they were
+        self.assertIs(self.harness.family_results['random_forest']['models']['target_profitable'], rf)
+        self.assertIs(self.harness.family_results['neural_network']['models']['target_profitable'], nn)
+        self.assertEqual(len(rf.estimators_), len(old_trees) + 5)
+        self.assertTrue(all(a is b for a, b in zip(rf.estimators_, old_trees)))
+        self.assertFalse(all(np.array_equal(a, b) for a, b in zip(nn.coefs_, old_weights)))
+
+        # In-memory models score through the fused loader
+        test_df = self.harness._features(second['test_days'])
+        X_test, _ = self.harness._prepare(test_df, align=True)
+        with self.harness._model_loader() as loader:
+            ensemble = loader.predict_ensemble_probabilities(X_test)
+        self.assertEqual(len(ensemble['target_profitable']), len(X_test))
+        self.assertTrue(np.all((ensemble['target_profitable'] >= 0) & (ensemble['target_profitable'] <= 1)))
+
+        metrics = self.harness._out_of_sample_metrics(test_df)
+        self.assertGreater(metrics['random_forest']['target_profitable']['accuracy'], 0.6)
+
+    def test_test_blocks_are_imputed_with_training_statistics(self):
+        first, _ = self.harness.build_windows()
+        train_df = self.harness._features(first['train_days'])
+        self.harness._full_train(train_df)
+        train_median = train_df['feature_2'].median()
+
+        test_df = self.harness._features(first['test_days']).copy()
+        test_df.loc[test_df.index[::2], 'feature_2'] = np.nan
+        test_df['feature_3'] = np.nan                            # All-NaN in the test month
+        X_test, _ = self.harness._prepare(test_df, align=True)
+
+        self.assertEqual(list(X_test.columns), self.harness.feature_names)
+        self.assertTrue(np.allclose(X_test['feature_2'].iloc[::2], train_median))
+        self.assertTrue(np.allclose(X_test['feature_3'], train_df['feature_3'].median()))
+
+
+if __name__ == '__main__':
+    unittest.main()